@@ -4,8 +4,12 @@ from __future__ import annotations
 
 import contextlib
 import hashlib
+import json
 import os
 import shutil
+import sqlite3
+import sys
+import threading
 import time
 import uuid
 from dataclasses import dataclass
@@ -13,6 +17,7 @@ from pathlib import Path
 from typing import Any
 
 from paglets.core.errors import TransferError
+from paglets.persistence.storage import UsageCounter
 from paglets.remote.transport import ChunkedRequestReader, LimitedRequestReader
 
 ARTIFACT_COPY = "copy"
@@ -24,6 +29,8 @@ DEFAULT_ARTIFACT_MAX_BYTES = 1024**3
 DEFAULT_ARTIFACT_STORAGE_QUOTA_BYTES = 10 * 1024**3
 DEFAULT_ARTIFACT_SPOOL_TTL_SECONDS = 24 * 60 * 60
 STREAM_CHUNK_BYTES = 1024 * 1024
+ARTIFACT_CATALOG_FILENAME = "catalog.sqlite3"
+_FICLONE = 0x40049409
 
 
 @dataclass(frozen=True, slots=True)
@@ -128,7 +135,13 @@ class ArtifactWriteResult:
 
 
 class ArtifactStore:
-    """Host-owned binary artifact storage with atomic temp-file cleanup."""
+    """Host-owned binary artifact storage with atomic temp-file cleanup.
+
+    Blobs are content addressed: every artifact id is a catalog row pointing at
+    ``blobs/<sha256>.bin``, and identical uploads share one blob. The blob is
+    removed when its last artifact id is deleted, and quota counts each blob
+    once.
+    """
 
     def __init__(
         self,
@@ -138,6 +151,7 @@ class ArtifactStore:
         max_artifact_bytes: int | None = DEFAULT_ARTIFACT_MAX_BYTES,
         quota_bytes: int | None = DEFAULT_ARTIFACT_STORAGE_QUOTA_BYTES,
         spool_ttl_seconds: float = DEFAULT_ARTIFACT_SPOOL_TTL_SECONDS,
+        usage_reconcile_seconds: float | None = None,
     ):
         self.root = Path(root).expanduser().resolve(strict=False)
         self.host_url = host_url.rstrip("/")
@@ -145,9 +159,13 @@ class ArtifactStore:
         self.quota_bytes = None if quota_bytes is None else max(0, int(quota_bytes))
         self.spool_ttl_seconds = max(1.0, float(spool_ttl_seconds))
         self._blobs = self.root / "blobs"
-        self._meta = self.root / "metadata"
         self._tmp = self.root / "tmp"
+        self.usage = UsageCounter(self._measure_blobs, reconcile_interval=usage_reconcile_seconds)
         self._ensure_dirs()
+        self.catalog = ArtifactCatalog(
+            self.root / ARTIFACT_CATALOG_FILENAME, legacy_metadata_dir=self.root / "metadata"
+        )
+        self._migrate_legacy_blobs()
 
     def set_host_url(self, host_url: str) -> None:
         self.host_url = host_url.rstrip("/")
@@ -159,9 +177,8 @@ class ArtifactStore:
             with contextlib.suppress(OSError):
                 if current - path.stat().st_mtime >= self.spool_ttl_seconds:
                     path.unlink()
-        for ref in self.list():
-            if ref.expires_at > 0 and ref.expires_at <= current:
-                self.delete(ref.artifact_id)
+        for artifact_id in self.catalog.expired_ids(current):
+            self.delete(artifact_id)
 
     def create_from_path(
         self,
@@ -177,6 +194,17 @@ class ArtifactStore:
         if not path.is_file():
             raise TransferError(f"artifact source is not a file: {path}")
         size = path.stat().st_size
+        if expected_sha256:
+            existing = self.create_from_existing(
+                expected_sha256,
+                size_bytes=size,
+                owner_agent_id=owner_agent_id,
+                name=name or path.name,
+                compression=compression,
+                expires_at=expires_at,
+            )
+            if existing is not None:
+                return existing
         with path.open("rb") as handle:
             return self.create_from_stream(
                 handle,
@@ -229,8 +257,6 @@ class ArtifactStore:
         self._ensure_dirs()
         artifact_id = uuid.uuid4().hex
         tmp_path = self._tmp / f"{artifact_id}.part"
-        blob_path = self._blob_path(artifact_id)
-        meta_path = self._metadata_path(artifact_id)
         digest = hashlib.sha256()
         written = 0
         try:
@@ -248,74 +274,93 @@ class ArtifactStore:
             sha256 = digest.hexdigest()
             if expected_sha256 and sha256.casefold() != expected_sha256.casefold():
                 raise TransferError(f"artifact checksum mismatch: expected {expected_sha256}, got {sha256}")
-            self._reserve_quota(written)
-            blob_path.parent.mkdir(parents=True, exist_ok=True)
-            os.replace(tmp_path, blob_path)
-            created_at = time.time()
-            ref = ArtifactRef(
-                host_url=self.host_url,
-                artifact_id=artifact_id,
-                name=name,
-                size_bytes=written,
-                sha256=sha256,
-                compression=compression,
-                created_at=created_at,
-                expires_at=float(expires_at or 0.0),
-                owner_agent_id=owner_agent_id,
-            )
-            meta_path.write_text(_metadata_json(ref), encoding="utf-8")
+            blob_path = self._content_path(sha256)
+            with self.usage.lock:
+                if blob_path.is_file():
+                    tmp_path.unlink()
+                else:
+                    self._reserve_quota(written)
+                    try:
+                        os.replace(tmp_path, blob_path)
+                    except OSError:
+                        self.usage.adjust(-written)
+                        raise
+                ref = ArtifactRef(
+                    host_url=self.host_url,
+                    artifact_id=artifact_id,
+                    name=name,
+                    size_bytes=written,
+                    sha256=sha256,
+                    compression=compression,
+                    created_at=time.time(),
+                    expires_at=float(expires_at or 0.0),
+                    owner_agent_id=owner_agent_id,
+                )
+                self.catalog.put(ref)
             return ArtifactWriteResult(ref=ref, path=blob_path)
         except Exception:
             with contextlib.suppress(FileNotFoundError):
                 tmp_path.unlink()
-            with contextlib.suppress(FileNotFoundError):
-                blob_path.unlink()
-            with contextlib.suppress(FileNotFoundError):
-                meta_path.unlink()
             raise
 
-    def ref(self, artifact_id: str) -> ArtifactRef:
-        path = self._metadata_path(artifact_id)
-        if not path.exists():
-            raise TransferError(f"No artifact {artifact_id!r}")
-        import json
+    def create_from_existing(
+        self,
+        sha256: str,
+        *,
+        size_bytes: int = -1,
+        owner_agent_id: str = "",
+        name: str = "",
+        compression: str = "",
+        expires_at: float = 0.0,
+    ) -> ArtifactWriteResult | None:
+        """Register a new artifact id for an already stored blob.
 
-        payload = json.loads(path.read_text(encoding="utf-8"))
-        ref = ArtifactRef.from_wire(payload)
-        if ref.host_url != self.host_url:
+        Returns ``None`` when no blob with ``sha256`` (and ``size_bytes``, when
+        given) is stored, so the caller has to send the content.
+        """
+
+        digest = _safe_sha256(sha256)
+        blob_path = self._content_path(digest)
+        with self.usage.lock:
+            try:
+                size = blob_path.stat().st_size
+            except FileNotFoundError:
+                return None
+            if size_bytes >= 0 and size != size_bytes:
+                return None
             ref = ArtifactRef(
                 host_url=self.host_url,
-                artifact_id=ref.artifact_id,
-                name=ref.name,
-                size_bytes=ref.size_bytes,
-                sha256=ref.sha256,
-                compression=ref.compression,
-                created_at=ref.created_at,
-                expires_at=ref.expires_at,
-                owner_agent_id=ref.owner_agent_id,
+                artifact_id=uuid.uuid4().hex,
+                name=name,
+                size_bytes=size,
+                sha256=digest,
+                compression=compression,
+                created_at=time.time(),
+                expires_at=float(expires_at or 0.0),
+                owner_agent_id=owner_agent_id,
             )
-        return ref
+            self.catalog.put(ref)
+        return ArtifactWriteResult(ref=ref, path=blob_path)
+
+    def used_bytes(self) -> int:
+        """Bytes held by stored blobs, from the running usage counter."""
+
+        return self.usage.used_bytes()
+
+    def ref(self, artifact_id: str) -> ArtifactRef:
+        ref = self.catalog.get(_safe_artifact_id(artifact_id))
+        if ref is None:
+            raise TransferError(f"No artifact {artifact_id!r}")
+        return self._local_ref(ref)
 
     def list(self, *, owner_agent_id: str | None = None) -> list[ArtifactRef]:
-        self._ensure_dirs()
-        refs: list[ArtifactRef] = []
-        for path in sorted(self._meta.glob("*.json")):
-            try:
-                ref = self.ref(path.stem)
-            except Exception:
-                continue
-            if owner_agent_id is not None and ref.owner_agent_id != owner_agent_id:
-                continue
-            refs.append(ref)
-        return refs
+        return [self._local_ref(ref) for ref in self.catalog.list(owner_agent_id=owner_agent_id)]
 
     def open_reader(self, artifact_id: str):
-        self.ref(artifact_id)
-        return self._blob_path(artifact_id).open("rb")
+        return self.blob_path(artifact_id).open("rb")
 
     def blob_path(self, artifact_id: str) -> Path:
-        self.ref(artifact_id)
-        return self._blob_path(artifact_id)
+        return self._ref_blob_path(self.ref(artifact_id))
 
     def export_to_path(
         self,
@@ -323,30 +368,44 @@ class ArtifactStore:
         target: str | Path,
         *,
         expected_sha256: str | None = None,
+        move: bool = False,
     ) -> ArtifactRef:
+        """Write an artifact's content to ``target``.
+
+        With ``move`` the artifact is deleted afterwards; if no other artifact
+        shares its blob, the blob is hard-linked to ``target`` instead of
+        copied. Otherwise exports try a copy-on-write clone, and fall back to a
+        checksummed byte copy. Blobs were verified when stored, so linked and
+        cloned exports are not hashed again.
+        """
+
         ref = self.ref(artifact_id)
+        expected = expected_sha256 or ref.sha256
+        if expected and ref.sha256 and expected.casefold() != ref.sha256.casefold():
+            raise TransferError(f"artifact checksum mismatch: expected {expected}, got {ref.sha256}")
+        blob_path = self._ref_blob_path(ref)
         target_path = Path(target)
         target_path.parent.mkdir(parents=True, exist_ok=True)
         tmp_path = target_path.with_name(f".{target_path.name}.{uuid.uuid4().hex}.part")
-        digest = hashlib.sha256()
-        written = 0
         try:
-            with self.open_reader(artifact_id) as source, tmp_path.open("wb") as output:
-                while True:
-                    chunk = source.read(STREAM_CHUNK_BYTES)
-                    if not chunk:
-                        break
-                    data = bytes(chunk)
-                    digest.update(data)
-                    written += len(data)
-                    output.write(data)
-            sha256 = digest.hexdigest()
-            if written != ref.size_bytes:
-                raise TransferError(f"artifact size mismatch: expected {ref.size_bytes}, got {written}")
-            expected = expected_sha256 or ref.sha256
-            if expected and sha256.casefold() != expected.casefold():
-                raise TransferError(f"artifact checksum mismatch: expected {expected}, got {sha256}")
+            with self.usage.lock:
+                linked = (
+                    move
+                    and self.catalog.ids_by_sha256(ref.sha256) == [ref.artifact_id]
+                    and _link_file(blob_path, tmp_path)
+                )
+                if linked:
+                    self.delete(ref.artifact_id)
+            if not linked and not clone_file(blob_path, tmp_path):
+                with blob_path.open("rb") as source, tmp_path.open("wb") as output:
+                    _written, sha256 = copy_stream(source, output, expected_bytes=ref.size_bytes)
+                if expected and sha256.casefold() != expected.casefold():
+                    raise TransferError(f"artifact checksum mismatch: expected {expected}, got {sha256}")
+            if tmp_path.stat().st_size != ref.size_bytes:
+                raise TransferError(f"artifact size mismatch: expected {ref.size_bytes}, got {tmp_path.stat().st_size}")
             os.replace(tmp_path, target_path)
+            if move and not linked:
+                self.delete(ref.artifact_id)
             return ref
         except Exception:
             with contextlib.suppress(FileNotFoundError):
@@ -354,18 +413,39 @@ class ArtifactStore:
             raise
 
     def delete(self, artifact_id: str) -> None:
-        with contextlib.suppress(FileNotFoundError):
-            self._blob_path(artifact_id).unlink()
-        with contextlib.suppress(FileNotFoundError):
-            self._metadata_path(artifact_id).unlink()
+        artifact_id = _safe_artifact_id(artifact_id)
+        with self.usage.lock:
+            ref = self.catalog.get(artifact_id)
+            self.catalog.delete(artifact_id)
+            if ref is not None and ref.sha256 and self.catalog.ids_by_sha256(ref.sha256):
+                return
+            blob_path = self._blob_path(artifact_id) if ref is None else self._ref_blob_path(ref)
+            with contextlib.suppress(FileNotFoundError):
+                size = blob_path.stat().st_size
+                blob_path.unlink()
+                self.usage.adjust(-size)
 
     def delete_owner(self, owner_agent_id: str) -> None:
-        for ref in self.list(owner_agent_id=owner_agent_id):
-            self.delete(ref.artifact_id)
+        for artifact_id in self.catalog.owner_ids(owner_agent_id):
+            self.delete(artifact_id)
+
+    def _local_ref(self, ref: ArtifactRef) -> ArtifactRef:
+        if ref.host_url == self.host_url:
+            return ref
+        return ArtifactRef(
+            host_url=self.host_url,
+            artifact_id=ref.artifact_id,
+            name=ref.name,
+            size_bytes=ref.size_bytes,
+            sha256=ref.sha256,
+            compression=ref.compression,
+            created_at=ref.created_at,
+            expires_at=ref.expires_at,
+            owner_agent_id=ref.owner_agent_id,
+        )
 
     def _ensure_dirs(self) -> None:
         self._blobs.mkdir(parents=True, exist_ok=True)
-        self._meta.mkdir(parents=True, exist_ok=True)
         self._tmp.mkdir(parents=True, exist_ok=True)
 
     def _check_declared_size(self, size_bytes: int) -> None:
@@ -375,21 +455,178 @@ class ArtifactStore:
             )
 
     def _reserve_quota(self, incoming_size: int) -> None:
-        if self.quota_bytes is None:
-            return
+        with self.usage.lock:
+            projected = self.usage.used_bytes() + max(0, incoming_size)
+            if self.quota_bytes is not None and projected > self.quota_bytes:
+                raise TransferError(
+                    f"artifact storage quota exceeded: {projected} bytes would exceed {self.quota_bytes}"
+                )
+            self.usage.adjust(max(0, incoming_size))
+
+    def _measure_blobs(self) -> int:
         used = 0
         for path in self._blobs.glob("*.bin"):
             with contextlib.suppress(OSError):
                 used += path.stat().st_size
-        projected = used + max(0, incoming_size)
-        if projected > self.quota_bytes:
-            raise TransferError(f"artifact storage quota exceeded: {projected} bytes would exceed {self.quota_bytes}")
+        return used
 
     def _blob_path(self, artifact_id: str) -> Path:
         return self._blobs / f"{_safe_artifact_id(artifact_id)}.bin"
 
-    def _metadata_path(self, artifact_id: str) -> Path:
-        return self._meta / f"{_safe_artifact_id(artifact_id)}.json"
+    def _content_path(self, sha256: str) -> Path:
+        return self._blobs / f"{_safe_sha256(sha256)}.bin"
+
+    def _ref_blob_path(self, ref: ArtifactRef) -> Path:
+        if ref.sha256:
+            return self._content_path(ref.sha256)
+        return self._blob_path(ref.artifact_id)
+
+    def _migrate_legacy_blobs(self) -> None:
+        # Stores written before content addressing kept one blob per artifact id.
+        for path in self._blobs.glob("*.bin"):
+            if len(path.stem) == 64:
+                continue
+            ref = self.catalog.get(path.stem)
+            if ref is None or not ref.sha256:
+                continue
+            with contextlib.suppress(OSError, TransferError):
+                content_path = self._content_path(ref.sha256)
+                if content_path.exists():
+                    path.unlink()
+                else:
+                    os.replace(path, content_path)
+
+
+class ArtifactCatalog:
+    """SQLite index of artifact metadata, one row per artifact.
+
+    Listing by owner, expiry sweeps, and checksum lookups are indexed queries.
+    On first open, per-artifact ``metadata/*.json`` files from older stores are
+    imported into the catalog and removed.
+    """
+
+    _SCHEMA_VERSION = 1
+    _COLUMNS = "artifact_id, name, size_bytes, sha256, compression, created_at, expires_at, owner_agent_id"
+
+    def __init__(self, path: str | Path, *, legacy_metadata_dir: str | Path | None = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._migrate_schema()
+        if legacy_metadata_dir is not None:
+            self._import_legacy_metadata(Path(legacy_metadata_dir))
+
+    def put(self, ref: ArtifactRef) -> None:
+        with self._lock:
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO artifacts ({self._COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                _catalog_row(ref),
+            )
+
+    def get(self, artifact_id: str) -> ArtifactRef | None:
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT {self._COLUMNS} FROM artifacts WHERE artifact_id = ?",
+                (artifact_id,),
+            ).fetchone()
+        return None if row is None else _ref_from_catalog_row(row)
+
+    def list(self, *, owner_agent_id: str | None = None) -> list[ArtifactRef]:
+        with self._lock:
+            if owner_agent_id is None:
+                rows = self._connection.execute(f"SELECT {self._COLUMNS} FROM artifacts ORDER BY artifact_id")
+            else:
+                rows = self._connection.execute(
+                    f"SELECT {self._COLUMNS} FROM artifacts WHERE owner_agent_id = ? ORDER BY artifact_id",
+                    (owner_agent_id,),
+                )
+            return [_ref_from_catalog_row(row) for row in rows.fetchall()]
+
+    def owner_ids(self, owner_agent_id: str) -> list[str]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT artifact_id FROM artifacts WHERE owner_agent_id = ?",
+                (owner_agent_id,),
+            ).fetchall()
+        return [str(row[0]) for row in rows]
+
+    def expired_ids(self, now: float) -> list[str]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT artifact_id FROM artifacts WHERE expires_at > 0 AND expires_at <= ?",
+                (float(now),),
+            ).fetchall()
+        return [str(row[0]) for row in rows]
+
+    def ids_by_sha256(self, sha256: str) -> list[str]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT artifact_id FROM artifacts WHERE sha256 = ?",
+                (sha256.casefold(),),
+            ).fetchall()
+        return [str(row[0]) for row in rows]
+
+    def delete(self, artifact_id: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM artifacts WHERE artifact_id = ?", (artifact_id,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _migrate_schema(self) -> None:
+        version = int(self._connection.execute("PRAGMA user_version").fetchone()[0])
+        if version >= self._SCHEMA_VERSION:
+            return
+        self._connection.executescript(
+            f"""
+            BEGIN;
+            CREATE TABLE IF NOT EXISTS artifacts (
+                artifact_id TEXT PRIMARY KEY,
+                name TEXT NOT NULL DEFAULT '',
+                size_bytes INTEGER NOT NULL DEFAULT 0,
+                sha256 TEXT NOT NULL DEFAULT '',
+                compression TEXT NOT NULL DEFAULT '',
+                created_at REAL NOT NULL DEFAULT 0,
+                expires_at REAL NOT NULL DEFAULT 0,
+                owner_agent_id TEXT NOT NULL DEFAULT ''
+            );
+            CREATE INDEX IF NOT EXISTS artifacts_owner ON artifacts (owner_agent_id);
+            CREATE INDEX IF NOT EXISTS artifacts_expires ON artifacts (expires_at) WHERE expires_at > 0;
+            CREATE INDEX IF NOT EXISTS artifacts_sha256 ON artifacts (sha256);
+            PRAGMA user_version = {self._SCHEMA_VERSION};
+            COMMIT;
+            """
+        )
+
+    def _import_legacy_metadata(self, metadata_dir: Path) -> None:
+        if not metadata_dir.is_dir():
+            return
+        paths = []
+        rows = []
+        for path in sorted(metadata_dir.glob("*.json")):
+            try:
+                rows.append(_catalog_row(ArtifactRef.from_wire(json.loads(path.read_text(encoding="utf-8")))))
+            except (OSError, ValueError, KeyError, TypeError):
+                # Unreadable sidecars stay on disk for manual inspection.
+                continue
+            paths.append(path)
+        with self._lock:
+            self._connection.execute("BEGIN")
+            self._connection.executemany(
+                f"INSERT OR IGNORE INTO artifacts ({self._COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._connection.execute("COMMIT")
+        for path in paths:
+            with contextlib.suppress(OSError):
+                path.unlink()
+        with contextlib.suppress(OSError):
+            metadata_dir.rmdir()
 
 
 def paglet_file_ref_from_path(
@@ -460,10 +697,47 @@ def _safe_artifact_id(value: str) -> str:
     return text
 
 
-def _metadata_json(ref: ArtifactRef) -> str:
-    import json
+def _safe_sha256(value: str) -> str:
+    text = str(value or "").strip().casefold()
+    if len(text) != 64 or any(char not in "0123456789abcdef" for char in text):
+        raise TransferError(f"invalid sha256 digest {value!r}")
+    return text
 
-    return json.dumps(ref.to_wire(), indent=2, sort_keys=True) + "\n"
+
+def _link_file(source: Path, target: Path) -> bool:
+    try:
+        os.link(source, target)
+    except OSError:
+        return False
+    return True
+
+
+def _catalog_row(ref: ArtifactRef) -> tuple[Any, ...]:
+    return (
+        ref.artifact_id,
+        ref.name,
+        int(ref.size_bytes),
+        ref.sha256.casefold(),
+        ref.compression,
+        float(ref.created_at),
+        float(ref.expires_at),
+        ref.owner_agent_id,
+    )
+
+
+def _ref_from_catalog_row(row: tuple[Any, ...]) -> ArtifactRef:
+    artifact_id, name, size_bytes, sha256, compression, created_at, expires_at, owner_agent_id = row
+    return ArtifactRef(
+        host_url="",
+        artifact_id=str(artifact_id),
+        name=str(name),
+        size_bytes=int(size_bytes),
+        sha256=str(sha256),
+        compression=str(compression),
+        created_at=float(created_at),
+        expires_at=float(expires_at),
+        owner_agent_id=str(owner_agent_id),
+    )
 
 
 def copy_stream(source: Any, target: Any, *, expected_bytes: int | None = None) -> tuple[int, str]:
@@ -482,6 +756,29 @@ def copy_stream(source: Any, target: Any, *, expected_bytes: int | None = None)
     return written, digest.hexdigest()
 
 
+def clone_file(source: str | Path, target: str | Path) -> bool:
+    """Create ``target`` as a copy-on-write clone of ``source`` where supported.
+
+    Uses the Linux ``FICLONE`` ioctl (btrfs, XFS, bcachefs, ...). Returns
+    ``False`` without leaving ``target`` behind when the platform or file
+    system cannot clone, so callers fall back to a byte copy.
+    """
+
+    if sys.platform != "linux":
+        return False
+    import fcntl
+
+    target_path = Path(target)
+    with Path(source).open("rb") as src, target_path.open("xb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+            return True
+        except OSError:
+            pass
+    target_path.unlink()
+    return False
+
+
 def copy_path(source: str | Path, target: str | Path) -> None:
     target_path = Path(target)
     target_path.parent.mkdir(parents=True, exist_ok=True)
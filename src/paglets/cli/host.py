@@ -22,9 +22,10 @@ from paglets.config.startup import (
 )
 from paglets.core.context_events import ContextEvent
 from paglets.core.errors import PagletError
-from paglets.core.runtime_values import LaunchConfigSyncAction
+from paglets.core.runtime_values import HTTPServerMode, LaunchConfigSyncAction
 from paglets.persistence.storage import DEFAULT_PERSISTENT_STORAGE_QUOTA_BYTES
 from paglets.runtime.host import Host
+from paglets.runtime.mailbox import DEFAULT_MESSAGE_WORKERS
 from paglets.tooling import cli as host_helpers
 
 from .console import console, err_console
@@ -79,6 +80,26 @@ def run(
     artifact_storage_quota: Annotated[
         str, typer.Option("--artifact-storage-quota", help="Total artifact storage quota, e.g. 10G, or none.")
     ] = "10G",
+    child_pool_size: Annotated[
+        int, typer.Option("--child-pool-size", help="Pre-started warm child processes per pool key; 0 disables.")
+    ] = 0,
+    child_pool_preload: Annotated[
+        list[str] | None, typer.Option("--child-pool-preload", help="Module imported by warm children; repeatable.")
+    ] = None,
+    child_pool_class_preload: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--child-pool-class-preload",
+            help="Dedicated warm children for CLASS=MODULE[,MODULE]; repeatable.",
+        ),
+    ] = None,
+    message_workers: Annotated[
+        int, typer.Option("--message-workers", help="Host-wide worker threads that deliver paglet messages.")
+    ] = DEFAULT_MESSAGE_WORKERS,
+    http_server: Annotated[
+        HTTPServerMode,
+        typer.Option("--http-server", help="HTTP server front end: threaded or asyncio."),
+    ] = HTTPServerMode.THREADED,
     artifact_spool_ttl: Annotated[
         float, typer.Option("--artifact-spool-ttl", help="Artifact spool cleanup TTL in seconds.")
     ] = 24 * 60 * 60,
@@ -102,6 +123,7 @@ def run(
         persistent_quota = host_helpers._parse_size_or_none(persistent_storage_quota)
         artifact_max = host_helpers._parse_size_or_none(artifact_max_size)
         artifact_quota = host_helpers._parse_size_or_none(artifact_storage_quota)
+        class_preloads = host_helpers._parse_class_preloads(list(child_pool_class_preload or []))
     except ValueError as exc:
         raise typer.BadParameter(str(exc)) from exc
     if (connect_to or public_url) and not api_key:
@@ -191,6 +213,11 @@ def run(
         relay_queue_limit=relay_queue_limit,
         tags=list(tag or []),
         properties=host_properties,
+        child_pool_size=child_pool_size,
+        child_pool_preload=list(child_pool_preload or []),
+        child_pool_class_preload=class_preloads,
+        message_workers=message_workers,
+        http_server=http_server,
     )
 
     def shutdown(_signum, _frame):
@@ -207,8 +207,9 @@ class PagletContext:
         *,
         capability: str | None = None,
         scope: ServiceScope = ServiceScope.LOCAL,
+        refresh: bool = False,
     ) -> list[ServiceRecord]:
-        return self._host.lookup_services(name, capability=capability, scope=scope)
+        return self._host.lookup_services(name, capability=capability, scope=scope, refresh=refresh)
 
     def advertise_contract(
         self,
@@ -247,6 +248,7 @@ class PagletContext:
         *,
         operation: ServiceOperation[Any, Any] | None = None,
         scope: ServiceScope = ServiceScope.LOCAL,
+        refresh: bool = False,
     ) -> list[ServiceHandle]:
         from paglets.services.contracts import ServiceHandle
 
@@ -255,7 +257,7 @@ class PagletContext:
         capability = operation.name if operation is not None else None
         return [
             ServiceHandle(contract, record, self)
-            for record in self.lookup_services(contract.name, capability=capability, scope=scope)
+            for record in self.lookup_services(contract.name, capability=capability, scope=scope, refresh=refresh)
             if contract.matches_record(record)
         ]
 
@@ -396,6 +398,7 @@ class Paglet(Generic[StateT]):
     ACTIVE: ClassVar[int] = ACTIVE
     INACTIVE: ClassVar[int] = INACTIVE
     MAILBOX_WORKERS: ClassVar[int] = 4
+    MAX_CONCURRENT_MESSAGES: ClassVar[int] = 1
 
     def __init__(self, state: StateT | None = None, *, agent_id: str | None = None):
         state_cls = self.state_class()
@@ -420,6 +423,17 @@ class Paglet(Generic[StateT]):
             raise HostError(f"{cls.__name__}.State must be decorated with @dataclass")
         return state_cls
 
+    @classmethod
+    def message_concurrency(cls) -> int:
+        """Return how many ``handle_message`` calls may run at once.
+
+        Set ``MAX_CONCURRENT_MESSAGES`` above 1 to let the child run messages
+        on a thread pool of that size. Handlers then share ``self.state`` and
+        must use ``locked_state()`` for read-modify-write updates.
+        """
+
+        return max(1, int(cls.MAX_CONCURRENT_MESSAGES))
+
     @property
     def context(self) -> PagletContext:
         if self._context is None:
@@ -574,8 +588,9 @@ class Paglet(Generic[StateT]):
         *,
         capability: str | None = None,
         scope: ServiceScope = ServiceScope.LOCAL,
+        refresh: bool = False,
     ) -> list[ServiceRecord]:
-        return self.context.lookup_services(name, capability=capability, scope=scope)
+        return self.context.lookup_services(name, capability=capability, scope=scope, refresh=refresh)
 
     def advertise_contract(
         self,
@@ -608,8 +623,9 @@ class Paglet(Generic[StateT]):
         *,
         operation: ServiceOperation[Any, Any] | None = None,
         scope: ServiceScope = ServiceScope.LOCAL,
+        refresh: bool = False,
     ) -> list[ServiceHandle]:
-        return self.context.lookup_contracts(contract, operation=operation, scope=scope)
+        return self.context.lookup_contracts(contract, operation=operation, scope=scope, refresh=refresh)
 
     def require_contract(
         self,
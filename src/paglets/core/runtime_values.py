@@ -36,6 +36,11 @@ class LaunchConfigSyncAction(StrEnum):
     UPDATE_AVAILABLE = "update-available"
 
 
+class HTTPServerMode(StrEnum):
+    THREADED = "threaded"
+    ASYNCIO = "asyncio"
+
+
 EnumT = TypeVar("EnumT", bound=StrEnum)
 
 
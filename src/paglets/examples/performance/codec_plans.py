@@ -0,0 +1,173 @@
+# Copyright (c) 2026 by C. Klukas.
+# Licensed under the MIT License. See LICENSE for details.
+"""Compare compiled dataclass codec plans with the previous interpretive codec.
+
+Run from a checkout with ``uv run python -m paglets.examples.performance.codec_plans``. The
+reference functions below reproduce the pre-plan implementation, which resolved
+type hints and dispatched on ``get_origin``/``get_args`` for every value.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import types
+from collections.abc import Callable
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from pathlib import Path, PurePath
+from typing import Any, get_args, get_origin, get_type_hints
+
+from paglets.remote.transport import restore_binary_tag, restore_json_safe
+from paglets.serialization.codec import _coerce_key, _to_wire_value, dataclass_from_wire, dataclass_to_wire
+from paglets.system.compute_slots.agent import ComputeSlotRequest, ComputeSlotsState, SlotLease
+
+
+def reference_from_wire(cls: type, payload: dict[str, Any]) -> Any:
+    type_hints = get_type_hints(cls)
+    kwargs: dict[str, Any] = {}
+    for field in fields(cls):
+        if field.name in payload:
+            kwargs[field.name] = _reference_value(type_hints.get(field.name, field.type), payload[field.name])
+    return cls(**kwargs)
+
+
+def reference_to_wire(instance: Any) -> dict[str, Any]:
+    return {field.name: _reference_to_wire_value(getattr(instance, field.name)) for field in fields(instance)}
+
+
+def _reference_to_wire_value(value: Any) -> Any:
+    from paglets.remote.references import PagletProxyRef
+
+    if isinstance(value, PagletProxyRef):
+        return value.to_wire()
+    if is_dataclass(value) and not isinstance(value, type):
+        return reference_to_wire(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_reference_to_wire_value(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _reference_to_wire_value(item) for key, item in value.items()}
+    return _to_wire_value(value)
+
+
+def _reference_value(annotation: Any, value: Any) -> Any:
+    if value is None:
+        return None
+    if annotation is Any or annotation is object:
+        return restore_json_safe(value)
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin is types.UnionType or str(origin) == "typing.Union":
+        for arg in args:
+            if arg is not type(None):
+                return _reference_value(arg, value)
+    if origin in (list, tuple, set, frozenset):
+        items = [_reference_value(args[0] if args else Any, item) for item in value]
+        return origin(items) if origin is not list else items
+    if origin is dict:
+        key_type = args[0] if args else str
+        value_type = args[1] if len(args) > 1 else Any
+        return {_coerce_key(key_type, key): _reference_value(value_type, item) for key, item in value.items()}
+    if isinstance(annotation, type):
+        if is_dataclass(annotation):
+            return reference_from_wire(annotation, value)
+        if issubclass(annotation, Enum):
+            return annotation(value)
+        if issubclass(annotation, PurePath):
+            return Path(value)
+        if annotation in (bytes, bytearray):
+            return annotation(restore_binary_tag(value))
+        if annotation in (str, int, float, bool):
+            return annotation(value)
+    return restore_json_safe(value)
+
+
+def build_state(queue_length: int) -> ComputeSlotsState:
+    requests = [
+        ComputeSlotRequest(
+            request_id=f"request-{index}",
+            agent_id=f"agent-{index}",
+            agent_host_url="http://127.0.0.1:8765",
+            job_id=f"job-{index}",
+            cpu_cores=1 + index % 4,
+            memory_bytes=1024 * 1024 * (index % 64),
+            required_host_tags=("linux",),
+            preferred_host_tags=("ssd", "fast"),
+            submitted_at=float(index),
+        )
+        for index in range(queue_length)
+    ]
+    leases = {
+        f"lease-{index}": SlotLease(
+            lease_id=f"lease-{index}",
+            request=requests[index],
+            host_name="alpha",
+            host_url="http://127.0.0.1:8765",
+            work_dir_base="/tmp/paglets/work",
+            granted_at=float(index),
+            expires_at=float(index + 3600),
+            cpu_core_ids=[index % 8],
+        )
+        for index in range(min(queue_length, 256))
+    }
+    return ComputeSlotsState(
+        queued_requests=[dataclass_to_wire(request) for request in requests],
+        leases={key: dataclass_to_wire(lease) for key, lease in leases.items()},
+    )
+
+
+def best_of(repeat: int, action: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        action()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queue-length", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    state = build_state(args.queue_length)
+    wire = dataclass_to_wire(state)
+    queued = wire["queued_requests"]
+    leases = wire["leases"]
+    cases: list[tuple[str, Callable[[], Any], Callable[[], Any]]] = [
+        (
+            "ComputeSlotsState to_wire",
+            lambda: reference_to_wire(state),
+            lambda: dataclass_to_wire(state),
+        ),
+        (
+            "ComputeSlotsState from_wire",
+            lambda: reference_from_wire(ComputeSlotsState, wire),
+            lambda: dataclass_from_wire(ComputeSlotsState, wire),
+        ),
+        (
+            "queue scan ComputeSlotRequest",
+            lambda: [reference_from_wire(ComputeSlotRequest, item) for item in queued],
+            lambda: [dataclass_from_wire(ComputeSlotRequest, item) for item in queued],
+        ),
+        (
+            "lease scan SlotLease",
+            lambda: [reference_from_wire(SlotLease, item) for item in leases.values()],
+            lambda: [dataclass_from_wire(SlotLease, item) for item in leases.values()],
+        ),
+    ]
+    print(f"{'case':34} {'reference ms':>13} {'compiled ms':>12} {'speedup':>8}")
+    for name, reference, compiled in cases:
+        before = best_of(args.repeat, reference)
+        after = best_of(args.repeat, compiled)
+        print(f"{name:34} {before * 1000:13.2f} {after * 1000:12.2f} {before / max(after, 1e-9):7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
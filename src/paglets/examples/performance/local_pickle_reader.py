@@ -0,0 +1,165 @@
+# Copyright (c) 2026 by C. Klukas.
+# Licensed under the MIT License. See LICENSE for details.
+"""Compare the shared-memory pickle reader with the previous copying reader.
+
+Run from a checkout with
+``uv run python -m paglets.examples.performance.local_pickle_reader``.
+``ReferenceReader`` below reproduces the pre-change reader, which copied every
+slice of ``handle.buf`` into new ``bytes`` and read lines one byte at a time.
+The child-start case moves a small state the way ``ChildConfig.state_stream``
+does, the large-state case a state reply with many small values, and the bulk
+case a reply whose size is dominated by in-band ``bytes`` and ``str`` fields.
+"""
+
+from __future__ import annotations
+
+import argparse
+import pickle
+import time
+from collections.abc import Callable
+from multiprocessing import shared_memory
+from typing import Any
+
+from paglets.remote.transport import (
+    LOCAL_PICKLE_CHUNK_BYTES,
+    LOCAL_PICKLE_SEGMENT_BYTES,
+    SharedMemoryPickleWriter,
+    dump_pickle,
+    receive_local_pickle,
+    release_local_pickle_sender,
+)
+
+
+class ReferenceReader:
+    def __init__(self, stream: dict[str, Any]):
+        self._segments_meta = [dict(segment) for segment in stream.get("segments") or []]
+        self._segment_size = int(stream.get("segment_size") or LOCAL_PICKLE_SEGMENT_BYTES)
+        self._buffers_meta = [dict(buffer) for buffer in stream.get("buffers") or []]
+        self._remaining = int(stream.get("pickle_size", stream.get("total_size")) or 0)
+        self._handles = [
+            shared_memory.SharedMemory(name=str(segment["name"]), create=False) for segment in self._segments_meta
+        ]
+        self._index = 0
+        self._offset = 0
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            chunks: list[bytes] = []
+            while True:
+                chunk = self.read(LOCAL_PICKLE_CHUNK_BYTES)
+                if not chunk:
+                    return b"".join(chunks)
+                chunks.append(chunk)
+        remaining = min(int(size), self._remaining)
+        self._remaining -= remaining
+        chunks = []
+        while remaining > 0 and self._index < len(self._handles):
+            used = int(self._segments_meta[self._index].get("used") or 0)
+            if self._offset >= used:
+                self._index += 1
+                self._offset = 0
+                continue
+            amount = min(remaining, used - self._offset)
+            chunks.append(bytes(self._handles[self._index].buf[self._offset : self._offset + amount]))
+            self._offset += amount
+            remaining -= amount
+        return b"".join(chunks)
+
+    def readline(self, size: int = -1) -> bytes:
+        limit = None if size is None or size < 0 else int(size)
+        chunks: list[bytes] = []
+        while limit is None or sum(len(chunk) for chunk in chunks) < limit:
+            chunk = self.read(1)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            if chunk == b"\n":
+                break
+        return b"".join(chunks)
+
+    def out_of_band_buffers(self) -> list[bytearray]:
+        result = []
+        for buffer in self._buffers_meta:
+            offset, size = int(buffer["offset"]), int(buffer["size"])
+            data = bytearray(size)
+            written = 0
+            while written < size:
+                index, start = divmod(offset + written, self._segment_size)
+                amount = min(size - written, self._segment_size - start)
+                data[written : written + amount] = self._handles[index].buf[start : start + amount]
+                written += amount
+            result.append(data)
+        return result
+
+    def close(self) -> None:
+        for handle in self._handles:
+            handle.unlink()
+            handle.close()
+
+
+def reference_receive(stream: dict[str, Any]) -> Any:
+    reader = ReferenceReader(stream)
+    try:
+        return pickle.load(reader, buffers=reader.out_of_band_buffers())
+    finally:
+        reader.close()
+        release_local_pickle_sender(stream)
+
+
+def child_start_state() -> dict[str, Any]:
+    return {
+        "job_id": "job-0001",
+        "host_url": "http://127.0.0.1:9000",
+        "arguments": {f"option_{index}": index for index in range(64)},
+        "history": [{"step": index, "status": "ok"} for index in range(32)],
+    }
+
+
+def large_state(rows: int) -> dict[str, Any]:
+    return {"rows": [{"id": index, "name": f"row-{index}", "score": index * 0.25} for index in range(rows)]}
+
+
+def bulk_state(megabytes: int) -> dict[str, Any]:
+    return {"blob": bytes(range(256)) * (megabytes * 4096), "notes": "x" * (megabytes * 256 * 1024)}
+
+
+def shared_memory_stream(value: Any) -> dict[str, Any]:
+    # Plain segments without the arena or inlining, so only the reader differs.
+    writer = SharedMemoryPickleWriter(segment_size=LOCAL_PICKLE_SEGMENT_BYTES)
+    dump_pickle(value, writer)
+    return writer.finish()
+
+
+def best_of(repeat: int, receive: Callable[[dict[str, Any]], Any], value: Any) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        stream = shared_memory_stream(value)
+        started = time.perf_counter()
+        receive(stream)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--megabytes", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    print(f"{'case':>12} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+    cases = (
+        ("child start", child_start_state()),
+        ("large state", large_state(args.rows)),
+        ("bulk state", bulk_state(args.megabytes)),
+    )
+    for name, value in cases:
+        assert receive_local_pickle(shared_memory_stream(value)) == value
+        before = best_of(args.repeat, reference_receive, value)
+        after = best_of(args.repeat, receive_local_pickle, value)
+        print(f"{name:>12} {before * 1000:10.3f} {after * 1000:10.3f} {before / max(after, 1e-9):7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,65 @@
+# Copyright (c) 2026 by C. Klukas.
+# Licensed under the MIT License. See LICENSE for details.
+"""Compare list-of-floats state fields with typed buffer fields on the local pickle path.
+
+Run from a checkout with ``uv run python -m paglets.examples.performance.typed_buffers``.
+Each case converts a state dataclass with ``dataclass_to_wire`` and moves it
+through the shared-memory pickle stream used between a host and its paglet
+children.
+"""
+
+from __future__ import annotations
+
+import argparse
+import array
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from paglets.remote.transport import receive_local_pickle, start_local_pickle_sender
+from paglets.serialization.codec import dataclass_from_wire, dataclass_to_wire
+
+
+@dataclass
+class ListSamples:
+    samples: list[float] = field(default_factory=list)
+
+
+@dataclass
+class BufferSamples:
+    samples: array.array = field(default_factory=lambda: array.array("d"))
+
+
+def round_trip(cls: type, state: Any) -> Any:
+    stream = start_local_pickle_sender(dataclass_to_wire(state))
+    return dataclass_from_wire(cls, receive_local_pickle(stream))
+
+
+def best_of(repeat: int, action: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        action()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=2_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    values = [index * 0.5 for index in range(args.samples)]
+    as_list = ListSamples(samples=values)
+    as_buffer = BufferSamples(samples=array.array("d", values))
+    before = best_of(args.repeat, lambda: round_trip(ListSamples, as_list))
+    after = best_of(args.repeat, lambda: round_trip(BufferSamples, as_buffer))
+    print(f"{'samples':>10} {'list ms':>10} {'array ms':>10} {'speedup':>8}")
+    print(f"{args.samples:>10} {before * 1000:10.2f} {after * 1000:10.2f} {before / max(after, 1e-9):7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
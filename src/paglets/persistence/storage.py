@@ -3,6 +3,9 @@
 from __future__ import annotations
 
 import shutil
+import threading
+import time
+from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -23,12 +26,65 @@ class StorageStatus:
     available_bytes: int | None
 
 
-class ManagedStorage:
-    """Path-safe, quota-accounted storage rooted at one directory."""
+class UsageCounter:
+    """Running byte total for one directory tree.
+
+    ``measure`` walks the tree once on first use; afterwards owners adjust the
+    total as they write, replace, and delete files while holding ``lock``. With
+    ``reconcile_interval`` the tree is walked again at most that often, which
+    absorbs changes made behind the owner's back.
+    """
+
+    def __init__(self, measure: Callable[[], int], *, reconcile_interval: float | None = None):
+        self._measure = measure
+        self.reconcile_interval = None if reconcile_interval is None else max(0.0, float(reconcile_interval))
+        self.lock = threading.RLock()
+        self._used: int | None = None
+        self._measured_at = 0.0
+
+    def used_bytes(self) -> int:
+        with self.lock:
+            now = time.monotonic()
+            stale = self.reconcile_interval is not None and now - self._measured_at >= self.reconcile_interval
+            if self._used is None or stale:
+                self._used = max(0, int(self._measure()))
+                self._measured_at = now
+            return self._used
+
+    def adjust(self, delta: int) -> None:
+        with self.lock:
+            if self._used is not None:
+                self._used = max(0, self._used + int(delta))
 
-    def __init__(self, root: Path | str, *, quota_bytes: int | None = DEFAULT_PERSISTENT_STORAGE_QUOTA_BYTES):
+    def reset(self, used_bytes: int = 0) -> None:
+        with self.lock:
+            self._used = max(0, int(used_bytes))
+            self._measured_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """Forget the total so the next read walks the tree again."""
+
+        with self.lock:
+            self._used = None
+
+
+class ManagedStorage:
+    """Path-safe, quota-accounted storage rooted at one directory.
+
+    Usage is tracked by a :class:`UsageCounter`. Hosts pass one shared counter
+    per root so short-lived storage handles do not walk the tree again.
+    """
+
+    def __init__(
+        self,
+        root: Path | str,
+        *,
+        quota_bytes: int | None = DEFAULT_PERSISTENT_STORAGE_QUOTA_BYTES,
+        usage: UsageCounter | None = None,
+    ):
         self.root = Path(root).expanduser().resolve(strict=False)
         self.quota_bytes = None if quota_bytes is None else max(0, int(quota_bytes))
+        self.usage = usage or UsageCounter(lambda: directory_size(self.root))
 
     def read_bytes(self, path: Path | str) -> bytes:
         return self._resolve(path).read_bytes()
@@ -36,36 +92,64 @@ class ManagedStorage:
     def write_bytes(self, path: Path | str, data: bytes) -> Path:
         payload = bytes(data)
         target = self._resolve(path)
-        existing_size = target.stat().st_size if target.exists() and target.is_file() else 0
-        projected = self._used_bytes() - existing_size + len(payload)
-        if self.quota_bytes is not None and projected > self.quota_bytes:
-            raise StorageQuotaError(
-                f"managed storage quota exceeded: {projected} bytes would exceed {self.quota_bytes} bytes"
-            )
-        target.parent.mkdir(parents=True, exist_ok=True)
-        target.write_bytes(payload)
+        with self.usage.lock:
+            existing_size = self._check_quota(target, len(payload))
+            try:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                target.write_bytes(payload)
+            except BaseException:
+                self.usage.invalidate()
+                raise
+            self.usage.adjust(len(payload) - existing_size)
         return target
 
     def write_text(self, path: Path | str, text: str, *, encoding: str = "utf-8") -> Path:
         return self.write_bytes(path, text.encode(encoding))
 
+    def reserve_write(self, path: Path | str, size: int) -> Path:
+        """Account for a ``size``-byte write that the caller performs itself.
+
+        Paglet children use this to write storage files directly instead of
+        passing the data through the host. The quota check and usage update
+        happen here; a caller whose write then fails calls ``usage.invalidate()``.
+        """
+
+        target = self._resolve(path)
+        size = max(0, int(size))
+        with self.usage.lock:
+            existing_size = self._check_quota(target, size)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            self.usage.adjust(size - existing_size)
+        return target
+
     def delete(self, path: Path | str) -> None:
         target = self._resolve(path)
-        if target.is_dir() and not target.is_symlink():
-            shutil.rmtree(target)
-            return
-        try:
-            target.unlink()
-        except FileNotFoundError:
-            return
+        with self.usage.lock:
+            if target.is_dir() and not target.is_symlink():
+                removed = directory_size(target)
+                try:
+                    shutil.rmtree(target)
+                except BaseException:
+                    self.usage.invalidate()
+                    raise
+                self.usage.adjust(-removed)
+                return
+            try:
+                removed = target.stat().st_size if target.is_file() else 0
+                target.unlink()
+            except FileNotFoundError:
+                return
+            self.usage.adjust(-removed)
 
     def clear(self) -> None:
-        if self.root.exists():
-            shutil.rmtree(self.root)
-        self.root.mkdir(parents=True, exist_ok=True)
+        with self.usage.lock:
+            if self.root.exists():
+                shutil.rmtree(self.root)
+            self.root.mkdir(parents=True, exist_ok=True)
+            self.usage.reset(0)
 
     def status(self) -> StorageStatus:
-        used = self._used_bytes()
+        used = self.usage.used_bytes()
         return StorageStatus(
             root=str(self.root),
             used_bytes=used,
@@ -74,19 +158,37 @@ class ManagedStorage:
         )
 
     def _resolve(self, path: Path | str) -> Path:
-        candidate = (self.root / Path(path)).resolve(strict=False)
-        if candidate != self.root and self.root not in candidate.parents:
-            raise ValueError(f"managed storage path escapes root: {path!r}")
-        return candidate
-
-    def _used_bytes(self) -> int:
-        if not self.root.exists():
-            return 0
-        total = 0
-        for path in self.root.rglob("*"):
-            try:
-                if path.is_file():
-                    total += path.stat().st_size
-            except OSError:
-                continue
-        return total
+        return resolve_storage_path(self.root, path)
+
+    def _check_quota(self, target: Path, size: int) -> int:
+        existing_size = target.stat().st_size if target.exists() and target.is_file() else 0
+        projected = self.usage.used_bytes() - existing_size + size
+        if self.quota_bytes is not None and projected > self.quota_bytes:
+            raise StorageQuotaError(
+                f"managed storage quota exceeded: {projected} bytes would exceed {self.quota_bytes} bytes"
+            )
+        return existing_size
+
+
+def resolve_storage_path(root: Path, path: Path | str) -> Path:
+    """Resolve ``path`` below the resolved ``root`` and reject escapes."""
+
+    candidate = (root / Path(path)).resolve(strict=False)
+    if candidate != root and root not in candidate.parents:
+        raise ValueError(f"managed storage path escapes root: {path!r}")
+    return candidate
+
+
+def directory_size(root: Path) -> int:
+    """Sum the sizes of all regular files below ``root`` with one walk."""
+
+    if not root.exists():
+        return 0
+    total = 0
+    for path in root.rglob("*"):
+        try:
+            if path.is_file():
+                total += path.stat().st_size
+        except OSError:
+            continue
+    return total
@@ -7,11 +7,10 @@ import http.client
 import json
 import os
 import uuid
+from collections.abc import Callable, Iterator
 from pathlib import Path
 from typing import Any
-from urllib.error import HTTPError, URLError
 from urllib.parse import urlencode, urlparse
-from urllib.request import Request, urlopen
 
 from paglets.artifacts import STREAM_CHUNK_BYTES, ArtifactRef, copy_stream, file_sha256
 from paglets.config.env import DEFAULT_API_KEY_ENV
@@ -31,6 +30,7 @@ from paglets.core.errors import (
     TransferError,
 )
 from paglets.persistence.storage import StorageQuotaError
+from paglets.remote.connections import HTTPConnectionPool, shared_connection_pool
 from paglets.remote.transport import PICKLE_CONTENT_TYPE, dump_http_chunked_pickle, json_safe, restore_json_safe
 
 _ERROR_TYPES: dict[str, type[PagletError]] = {
@@ -49,14 +49,25 @@ _ERROR_TYPES: dict[str, type[PagletError]] = {
     "StorageQuotaError": StorageQuotaError,
     "TransferError": TransferError,
 }
+# Raised when a pooled keep-alive socket was closed by the peer while idle;
+# http.client.RemoteDisconnected is a ConnectionResetError.
+_STALE_CONNECTION_ERRORS = (BrokenPipeError, ConnectionResetError, ConnectionAbortedError)
+# Requests the peer may safely see twice when a reused socket fails after the
+# request was written; anything else is only resent if writing it failed.
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
 
 
 class HostClient:
-    """Tiny JSON HTTP client used by proxies and hosts."""
+    """Tiny JSON HTTP client used by proxies and hosts.
 
-    def __init__(self, timeout: float = 10.0, *, api_key: str | None = None):
+    Requests reuse keep-alive connections from ``pool``, which defaults to the
+    process-wide :func:`~paglets.remote.connections.shared_connection_pool`.
+    """
+
+    def __init__(self, timeout: float = 10.0, *, api_key: str | None = None, pool: HTTPConnectionPool | None = None):
         self.timeout = timeout
         self.api_key = api_key
+        self.pool = pool or shared_connection_pool()
 
     def get_json(self, url: str, *, timeout: float | None = None) -> Any:
         return self._request("GET", url, None, timeout=timeout)
@@ -66,8 +77,8 @@ class HostClient:
 
     def post_pickle(self, url: str, payload: dict[str, Any], *, timeout: float | None = None) -> Any:
         parsed = urlparse(url)
-        connection = _connection(parsed, timeout=self.timeout if timeout is None else timeout)
-        try:
+
+        def send(connection: http.client.HTTPConnection) -> None:
             connection.putrequest("POST", _request_target(parsed))
             connection.putheader("Host", parsed.netloc)
             connection.putheader("Content-Type", PICKLE_CONTENT_TYPE)
@@ -77,15 +88,15 @@ class HostClient:
             connection.putheader("Transfer-Encoding", "chunked")
             connection.endheaders()
             dump_http_chunked_pickle(connection, payload)
-            response = connection.getresponse()
-            raw = response.read().decode("utf-8")
+
+        try:
+            with self._exchange(parsed, send, timeout=timeout) as response:
+                raw = response.read().decode("utf-8")
             if response.status >= 400:
                 raise _error_from_response(response.status, raw, url)
             return restore_json_safe(json.loads(raw)) if raw else None
         except (OSError, http.client.HTTPException) as exc:
             raise RemoteHostError(f"Could not reach {url}: {exc}") from exc
-        finally:
-            connection.close()
 
     def upload_artifact(
         self,
@@ -102,6 +113,20 @@ class HostClient:
         source = Path(path)
         size = source.stat().st_size
         sha256 = expected_sha256 or file_sha256(source)
+        known = self._reuse_artifact(
+            host_url,
+            sha256,
+            {
+                "owner_agent_id": owner_agent_id,
+                "name": name or source.name,
+                "compression": compression,
+                "expires_at": float(expires_at or 0.0),
+                "size_bytes": size,
+            },
+            timeout=timeout,
+        )
+        if known is not None:
+            return known
         query = urlencode(
             {
                 "owner_agent_id": owner_agent_id,
@@ -113,8 +138,8 @@ class HostClient:
             }
         )
         parsed = urlparse(f"{host_url.rstrip('/')}/artifacts?{query}")
-        connection = _connection(parsed, timeout=self.timeout if timeout is None else timeout)
-        try:
+
+        def send(connection: http.client.HTTPConnection) -> None:
             connection.putrequest("POST", _request_target(parsed))
             connection.putheader("Host", parsed.netloc)
             connection.putheader("Content-Type", "application/octet-stream")
@@ -129,16 +154,29 @@ class HostClient:
                     if not chunk:
                         break
                     connection.send(chunk)
-            response = connection.getresponse()
-            raw = response.read().decode("utf-8", errors="replace")
+
+        try:
+            with self._exchange(parsed, send, timeout=timeout) as response:
+                raw = response.read().decode("utf-8", errors="replace")
             if response.status >= 400:
                 raise _error_from_response(response.status, raw, parsed.geturl())
             payload = restore_json_safe(json.loads(raw)) if raw else {}
             return ArtifactRef.from_wire(payload["artifact"])
         except (OSError, http.client.HTTPException) as exc:
             raise RemoteHostError(f"Could not reach {host_url}: {exc}") from exc
-        finally:
-            connection.close()
+
+    def _reuse_artifact(
+        self, host_url: str, sha256: str, payload: dict[str, Any], *, timeout: float | None
+    ) -> ArtifactRef | None:
+        # Preflight: a host that already stores this content registers a new
+        # artifact id for it, and the body is never sent.
+        try:
+            response = self.post_json(f"{host_url.rstrip('/')}/artifacts/sha256/{sha256}", payload, timeout=timeout)
+        except HostError:
+            # Hosts without content-addressed storage do not know the route.
+            return None
+        artifact = response.get("artifact") if isinstance(response, dict) else None
+        return None if artifact is None else ArtifactRef.from_wire(artifact)
 
     def download_artifact(
         self,
@@ -162,19 +200,21 @@ class HostClient:
         target_path.parent.mkdir(parents=True, exist_ok=True)
         tmp_path = target_path.with_name(f".{target_path.name}.{uuid.uuid4().hex}.part")
         parsed = urlparse(f"{ref.host_url.rstrip('/')}/artifacts/{ref.artifact_id}")
-        connection = _connection(parsed, timeout=self.timeout if timeout is None else timeout)
-        try:
+
+        def send(connection: http.client.HTTPConnection) -> None:
             connection.putrequest("GET", _request_target(parsed))
             connection.putheader("Host", parsed.netloc)
             if self.api_key:
                 connection.putheader("Authorization", f"Bearer {self.api_key}")
             connection.endheaders()
-            response = connection.getresponse()
-            if response.status >= 400:
-                raw = response.read().decode("utf-8", errors="replace")
-                raise _error_from_response(response.status, raw, parsed.geturl())
-            with tmp_path.open("wb") as output:
-                written, sha256 = copy_stream(response, output, expected_bytes=ref.size_bytes)
+
+        try:
+            with self._exchange(parsed, send, timeout=timeout, idempotent=True) as response:
+                if response.status >= 400:
+                    raw = response.read().decode("utf-8", errors="replace")
+                    raise _error_from_response(response.status, raw, parsed.geturl())
+                with tmp_path.open("wb") as output:
+                    written, sha256 = copy_stream(response, output, expected_bytes=ref.size_bytes)
             if written != ref.size_bytes:
                 raise TransferError(f"artifact size mismatch: expected {ref.size_bytes}, got {written}")
             if ref.sha256 and sha256.casefold() != ref.sha256.casefold():
@@ -188,7 +228,6 @@ class HostClient:
         finally:
             with contextlib.suppress(FileNotFoundError):
                 tmp_path.unlink()
-            connection.close()
 
     def artifact_metadata(self, host_url: str, artifact_id: str, *, timeout: float | None = None) -> ArtifactRef:
         response = self.get_json(
@@ -228,27 +267,77 @@ class HostClient:
         headers = {"Content-Type": "application/json", "Accept": "application/json"}
         if self.api_key:
             headers["Authorization"] = f"Bearer {self.api_key}"
-        req = Request(
-            url,
-            data=data,
-            method=method,
-            headers=headers,
-        )
+        parsed = urlparse(url)
+
+        def send(connection: http.client.HTTPConnection) -> None:
+            connection.request(method, _request_target(parsed), body=data, headers=headers)
+
         try:
-            with urlopen(req, timeout=self.timeout if timeout is None else timeout) as response:
-                raw = response.read().decode("utf-8")
-                return restore_json_safe(json.loads(raw)) if raw else None
-        except HTTPError as exc:
-            raw = exc.read().decode("utf-8", errors="replace")
-            error = _error_from_response(exc.code, raw, url)
+            with self._exchange(parsed, send, timeout=timeout, idempotent=method in _IDEMPOTENT_METHODS) as response:
+                raw = response.read().decode("utf-8", errors="replace")
+        except (OSError, http.client.HTTPException) as exc:
+            raise RemoteHostError(f"Could not reach {url}: {exc}") from exc
+        if response.status >= 400:
+            error = _error_from_response(response.status, raw, url)
             if isinstance(error, AuthenticationError) and not self.api_key:
                 raise AuthenticationError(
                     f"{error}; set {DEFAULT_API_KEY_ENV} or pass --api-key-env with an environment variable "
                     "containing a Paglets bearer API key"
-                ) from exc
-            raise error from exc
-        except URLError as exc:
-            raise RemoteHostError(f"Could not reach {url}: {exc.reason}") from exc
+                )
+            raise error
+        return restore_json_safe(json.loads(raw)) if raw else None
+
+    @contextlib.contextmanager
+    def _exchange(
+        self,
+        parsed: Any,
+        send: Callable[[http.client.HTTPConnection], None],
+        *,
+        timeout: float | None,
+        idempotent: bool = False,
+    ) -> Iterator[http.client.HTTPResponse]:
+        """Send one request on a pooled connection and yield its response.
+
+        The connection goes back to the pool only if the caller consumed the
+        whole response and the server kept the connection open. When a reused
+        connection turns out to be closed by the peer, the request is resent
+        once on a fresh connection, but only if writing it failed or the
+        request is ``idempotent``. A non-idempotent request that was fully
+        written may already have been processed, so its error is raised.
+        """
+
+        key = (parsed.scheme, parsed.netloc)
+        effective_timeout = self.timeout if timeout is None else timeout
+        connection = self.pool.get(key, timeout=effective_timeout)
+        retry = connection is not None
+        while True:
+            if connection is None:
+                connection = _connection(parsed, timeout=effective_timeout)
+            written = False
+            try:
+                send(connection)
+                written = True
+                response = connection.getresponse()
+                break
+            except _STALE_CONNECTION_ERRORS:
+                connection.close()
+                if not retry or (written and not idempotent):
+                    raise
+            except BaseException:
+                connection.close()
+                raise
+            retry = False
+            connection = None
+            self.pool.record_created()
+        try:
+            yield response
+        except BaseException:
+            connection.close()
+            raise
+        if _response_reusable(response):
+            self.pool.put(key, connection)
+        else:
+            connection.close()
 
 
 def _error_from_response(status: int, raw: str, url: str) -> PagletError:
@@ -261,6 +350,12 @@ def _error_from_response(status: int, raw: str, url: str) -> PagletError:
     return error_cls(payload.get("error", f"HTTP {status} from {url}"))
 
 
+def _response_reusable(response: Any) -> bool:
+    if getattr(response, "will_close", True):
+        return False
+    return bool(response.isclosed())
+
+
 def _connection(parsed: Any, *, timeout: float) -> http.client.HTTPConnection:
     if parsed.scheme == "https":
         return http.client.HTTPSConnection(parsed.netloc, timeout=timeout)
@@ -0,0 +1,124 @@
+# Copyright (c) 2026 by C. Klukas.
+# Licensed under the MIT License. See LICENSE for details.
+from __future__ import annotations
+
+import contextlib
+import http.client
+import select
+import threading
+import time
+from collections import deque
+from typing import Any
+
+HTTP_POOL_MAX_IDLE_PER_HOST = 8
+HTTP_POOL_IDLE_TIMEOUT_SECONDS = 20.0
+
+PoolKey = tuple[str, str]
+
+
+class HTTPConnectionPool:
+    """Bounded keep-alive pool of idle ``http.client`` connections per ``(scheme, netloc)``.
+
+    Connections are checked out exclusively and only returned after their
+    response was read completely. Idle connections older than ``idle_timeout``
+    or already closed by the peer are dropped instead of being handed out.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_idle_per_host: int = HTTP_POOL_MAX_IDLE_PER_HOST,
+        idle_timeout: float = HTTP_POOL_IDLE_TIMEOUT_SECONDS,
+    ):
+        self.max_idle_per_host = max(0, int(max_idle_per_host))
+        self.idle_timeout = float(idle_timeout)
+        self._idle: dict[PoolKey, deque[tuple[http.client.HTTPConnection, float]]] = {}
+        self._lock = threading.Lock()
+        self._created = 0
+        self._reused = 0
+
+    def get(self, key: PoolKey, *, timeout: float) -> http.client.HTTPConnection | None:
+        """Return a live idle connection for ``key`` with ``timeout`` applied, if any."""
+
+        now = time.monotonic()
+        stale: list[http.client.HTTPConnection] = []
+        found: http.client.HTTPConnection | None = None
+        with self._lock:
+            idle = self._idle.get(key)
+            while idle:
+                connection, released_at = idle.pop()
+                if now - released_at > self.idle_timeout or _is_dropped(connection):
+                    stale.append(connection)
+                    continue
+                found = connection
+                self._reused += 1
+                break
+            if found is None:
+                self._created += 1
+        for connection in stale:
+            with contextlib.suppress(Exception):
+                connection.close()
+        if found is not None:
+            found.timeout = timeout
+            if found.sock is not None:
+                found.sock.settimeout(timeout)
+        return found
+
+    def record_created(self) -> None:
+        """Count a connection opened without asking the pool, e.g. for a retry."""
+
+        with self._lock:
+            self._created += 1
+
+    def put(self, key: PoolKey, connection: http.client.HTTPConnection) -> None:
+        """Return a connection whose last response was fully read."""
+
+        if getattr(connection, "sock", None) is None:
+            return
+        evicted: http.client.HTTPConnection | None = None
+        with self._lock:
+            idle = self._idle.setdefault(key, deque())
+            idle.append((connection, time.monotonic()))
+            if len(idle) > self.max_idle_per_host:
+                evicted = idle.popleft()[0]
+        if evicted is not None:
+            with contextlib.suppress(Exception):
+                evicted.close()
+
+    def clear(self) -> None:
+        with self._lock:
+            connections = [connection for idle in self._idle.values() for connection, _released in idle]
+            self._idle.clear()
+        for connection in connections:
+            with contextlib.suppress(Exception):
+                connection.close()
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "idle": sum(len(idle) for idle in self._idle.values()),
+                "created": self._created,
+                "reused": self._reused,
+            }
+
+
+_SHARED_POOL = HTTPConnectionPool()
+
+
+def shared_connection_pool() -> HTTPConnectionPool:
+    """Return the process-wide pool used by every :class:`HostClient` by default."""
+
+    return _SHARED_POOL
+
+
+def _is_dropped(connection: http.client.HTTPConnection) -> bool:
+    sock = connection.sock
+    if sock is None:
+        return True
+    try:
+        # An idle keep-alive socket must not be readable; EOF or stray bytes
+        # mean the peer closed it or the previous exchange was not finished.
+        readable, _writable, _errors = select.select([sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
@@ -2,16 +2,20 @@
 # Licensed under the MIT License. See LICENSE for details.
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import importlib.metadata
 import ipaddress
 import json
+import math
 import os
+import random
 import socket
 import subprocess
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 from urllib.parse import urlparse
@@ -28,6 +32,15 @@ MESH_MULTICAST_PORT = 48765
 MESH_LAN_DISCOVERY_INTERVAL_SECONDS = 10.0
 MESH_LAN_DISCOVERY_TIMEOUT_SECONDS = 0.25
 MESH_LAN_DISCOVERY_WORKERS = 64
+MESH_LAN_DISCOVERY_CONCURRENCY = 128
+MESH_LAN_DISCOVERY_SLICE = 64
+MESH_LAN_DISCOVERY_MAX_IDLE_FACTOR = 8
+MESH_LAN_DISCOVERY_MAX_BACKOFF_SECONDS = 600.0
+MESH_GOSSIP_FANOUT = 3
+MESH_GOSSIP_INDIRECT_PROBES = 3
+MESH_GOSSIP_PROBE_TIMEOUT_SECONDS = 1.0
+MESH_GOSSIP_PIGGYBACK_LIMIT = 8
+MESH_GOSSIP_RETRANSMIT_MULTIPLIER = 3
 
 
 @dataclass(frozen=True, slots=True)
@@ -42,6 +55,7 @@ class HostRef:
     tags: tuple[str, ...] = ()
     properties: dict[str, str] = field(default_factory=dict)
     error: str | None = None
+    incarnation: int = 0
 
     def to_wire(self) -> dict[str, Any]:
         payload: dict[str, Any] = {
@@ -57,6 +71,8 @@ class HostRef:
         }
         if self.error:
             payload["error"] = self.error
+        if self.incarnation:
+            payload["incarnation"] = self.incarnation
         return payload
 
     @classmethod
@@ -72,6 +88,7 @@ class HostRef:
             tags=tuple(_normalize_tags(payload.get("tags", []))),
             properties=_normalize_properties(payload.get("properties", {})),
             error=str(payload["error"]) if payload.get("error") else None,
+            incarnation=int(payload.get("incarnation") or 0),
         )
 
 
@@ -149,7 +166,18 @@ def resolve_code_version(override: str | None = None) -> tuple[str, str | None]:
 
 
 class MeshRegistry:
-    """Version-gated host registry owned by a paglets host."""
+    """Version-gated host registry owned by a paglets host.
+
+    Membership is maintained with SWIM-style gossip. Each round probes at most
+    ``gossip_fanout`` members, taken round-robin from a shuffled member list,
+    with one ``POST /hosts/gossip`` each. If a probe fails, up to
+    ``MESH_GOSSIP_INDIRECT_PROBES`` other members are asked to reach the target
+    before it is marked offline. Membership changes travel as piggybacked
+    deltas on probes and replies. Incarnation numbers order them, so a host
+    that is wrongly reported offline refutes the report with a higher
+    incarnation. Seeds that are not members yet are bootstrapped with a full
+    ``/hosts/join``.
+    """
 
     def __init__(
         self,
@@ -163,6 +191,7 @@ class MeshRegistry:
         lan_discovery_interval: float = MESH_LAN_DISCOVERY_INTERVAL_SECONDS,
         gossip_interval: float = 1.0,
         offline_after: float = 10.0,
+        gossip_fanout: int = MESH_GOSSIP_FANOUT,
     ):
         self._host = host_runtime
         resolved_version, warning = resolve_code_version(code_version)
@@ -174,12 +203,21 @@ class MeshRegistry:
         self.lan_discovery_interval = max(1.0, float(lan_discovery_interval))
         self.gossip_interval = max(0.05, float(gossip_interval))
         self.offline_after = max(0.1, float(offline_after))
+        self.gossip_fanout = max(1, int(gossip_fanout))
         self._seeds = {normalize_host_url(peer) for peer in peers or []}
         self._hosts: dict[str, HostRef] = {}
         self._lock = threading.RLock()
         self._stop = threading.Event()
         self._threads: list[threading.Thread] = []
         self._last_lan_discovery_at = 0.0
+        self._lan_idle_sweeps = 0
+        self._lan_network: str | None = None
+        self._lan_cursor = 0
+        self._lan_misses: dict[tuple[str, int], tuple[int, float]] = {}
+        self._incarnation = 0
+        self._probe_order: list[str] = []
+        self._updates: dict[str, int] = {}
+        self._executor: ThreadPoolExecutor | None = None
 
     def start(self) -> None:
         self._stop.clear()
@@ -215,6 +253,11 @@ class MeshRegistry:
             if thread.is_alive():
                 thread.join(timeout=1)
         self._threads = []
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
 
     def add_seed(self, url: str) -> None:
         normalized = normalize_host_url(url)
@@ -311,11 +354,16 @@ class MeshRegistry:
             tags=ref.tags,
             properties=dict(ref.properties),
             error=ref.error,
+            incarnation=ref.incarnation,
         )
         with self._lock:
             existing = self._hosts.get(normalized.url)
             if existing is None or existing.last_seen <= normalized.last_seen or normalized.online:
+                if existing is not None and existing.incarnation > normalized.incarnation:
+                    normalized = replace(normalized, incarnation=existing.incarnation)
                 self._hosts[normalized.url] = normalized
+                if existing is None or existing.online != normalized.online:
+                    self._queue_update(normalized.url)
         return normalized
 
     def join(self, url: str) -> list[HostRef]:
@@ -362,7 +410,10 @@ class MeshRegistry:
                 properties=_normalize_properties(health.get("properties", {})),
             )
             self.register(remote_ref)
-            response = self._host.client.post_json(f"{remote_ref.url}/hosts/join", self.refresh_self().to_wire())
+            payload = self.refresh_self().to_wire()
+            payload["mesh_services_version"] = self._host.mesh_services.known_version(remote_ref.url)
+            response = self._host.client.post_json(f"{remote_ref.url}/hosts/join", payload)
+            self._host.mesh_services.merge(remote_ref.url, response.get("mesh_services"))
             hosts = response.get("hosts", [])
             if isinstance(hosts, list):
                 for item in hosts:
@@ -377,32 +428,223 @@ class MeshRegistry:
             return self.hosts(include_self=True)
 
     def gossip_once(self) -> None:
+        """Run one gossip round: bootstrap unknown seeds and probe ``gossip_fanout`` members."""
+
         if not self.enabled:
             return
         self.refresh_self()
         self.discover_lan_once()
-        targets = set(self._seeds)
+        self_url = self._host.address.rstrip("/")
+        with self._lock:
+            bootstrap = sorted(url for url in self._seeds if url not in self._hosts and url != self_url)
+            probes = self._next_probe_targets(self_url)
+            executor = self._gossip_executor()
+        futures = [executor.submit(self.join, url) for url in bootstrap]
+        futures.extend(executor.submit(self._probe, url) for url in probes)
+        wait(futures)
+
+    def handle_gossip(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Answer a peer's probe: merge its deltas and reply with ours."""
+
+        sender = payload.get("host")
+        sender_url = ""
+        if isinstance(sender, dict):
+            try:
+                sender_ref = HostRef.from_wire(sender)
+            except (KeyError, TypeError, ValueError):
+                sender_ref = None
+            if sender_ref is not None:
+                sender_url = sender_ref.url.rstrip("/")
+                self._observe(sender_ref)
+        self._merge_updates(payload.get("updates"))
+        return {"host": self.refresh_self().to_wire(), "updates": self._take_updates(about=sender_url)}
+
+    def handle_ping_request(self, payload: dict[str, Any]) -> dict[str, bool]:
+        """Probe ``payload["target"]`` for a peer whose own probe failed."""
+
+        try:
+            self._ping(normalize_host_url(str(payload["target"])))
+        except Exception:
+            return {"ok": False}
+        return {"ok": True}
+
+    def _gossip_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.gossip_fanout + 2,
+                thread_name_prefix=f"paglets-mesh-gossip-{self._host.name}",
+            )
+        return self._executor
+
+    def _next_probe_targets(self, self_url: str) -> list[str]:
+        members = {url for url in self._hosts if url != self_url}
+        targets: list[str] = []
+        refilled = False
+        while len(targets) < min(self.gossip_fanout, len(members)):
+            if not self._probe_order:
+                if refilled:
+                    break
+                self._probe_order = list(members)
+                random.shuffle(self._probe_order)
+                refilled = True
+            url = self._probe_order.pop()
+            if url in members and url not in targets:
+                targets.append(url)
+        return targets
+
+    def _probe(self, url: str) -> None:
+        try:
+            self._ping(url)
+            return
+        except Exception as exc:
+            error = str(exc) or exc.__class__.__name__
+        with self._lock:
+            target = self._hosts.get(url)
+            helpers = [
+                ref.url
+                for ref in self._hosts.values()
+                if ref.online and ref.url not in {url, self._host.address.rstrip("/")}
+            ]
+        if target is not None and target.online and helpers:
+            helpers = random.sample(helpers, min(MESH_GOSSIP_INDIRECT_PROBES, len(helpers)))
+            with ThreadPoolExecutor(max_workers=len(helpers)) as executor:
+                replies = list(executor.map(lambda helper: self._ping_via(helper, url), helpers))
+            if any(replies):
+                return
+        self.mark_offline(url, error)
+
+    def _ping(self, url: str) -> HostRef | None:
+        payload = self.refresh_self().to_wire()
+        request: dict[str, Any] = {
+            "host": payload,
+            "updates": self._take_updates(about=url),
+            "mesh_services_version": self._host.mesh_services.known_version(url),
+        }
+        response = self._host.client.post_json(
+            f"{url}/hosts/gossip",
+            request,
+            timeout=MESH_GOSSIP_PROBE_TIMEOUT_SECONDS,
+        )
+        if not isinstance(response, dict):
+            raise HostError(f"Invalid gossip reply from {url}")
+        remote: HostRef | None = None
+        if isinstance(response.get("host"), dict):
+            remote = self._observe(HostRef.from_wire(response["host"]))
+        self._merge_updates(response.get("updates"))
+        self._host.mesh_services.merge(url, response.get("mesh_services"))
+        return remote
+
+    def _ping_via(self, helper_url: str, target_url: str) -> bool:
+        try:
+            response = self._host.client.post_json(
+                f"{helper_url}/hosts/ping-req",
+                {"target": target_url},
+                timeout=2.0 * MESH_GOSSIP_PROBE_TIMEOUT_SECONDS,
+            )
+        except Exception:
+            return False
+        return isinstance(response, dict) and bool(response.get("ok"))
+
+    def _observe(self, ref: HostRef) -> HostRef | None:
+        """Record a host that just talked to this one directly."""
+
+        if ref.code_version != self.code_version:
+            return self.register(ref)
+        return self._merge_update(replace(ref, online=True, last_seen=time.time(), error=None))
+
+    def _merge_updates(self, items: Any) -> None:
+        if not isinstance(items, list):
+            return
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            try:
+                ref = HostRef.from_wire(item)
+            except (KeyError, TypeError, ValueError):
+                continue
+            if ref.code_version == self.code_version:
+                self._merge_update(ref)
+
+    def _merge_update(self, ref: HostRef) -> HostRef | None:
+        url = ref.url.rstrip("/")
+        if url == self._host.address.rstrip("/"):
+            if not ref.online and ref.incarnation >= self._incarnation:
+                with self._lock:
+                    self._incarnation = ref.incarnation + 1
+                    self._queue_update(url)
+                self._debug(f"refuting offline report with incarnation {self._incarnation}")
+            return None
+        with self._lock:
+            existing = self._hosts.get(url)
+            if existing is None or _supersedes(ref, existing):
+                merged = replace(ref, url=url)
+                if existing is not None:
+                    merged = replace(merged, last_seen=max(existing.last_seen, ref.last_seen))
+                self._hosts[url] = merged
+                if existing is None or existing.online != merged.online or existing.incarnation != merged.incarnation:
+                    self._queue_update(url)
+                return merged
+            if existing.online and ref.online and ref.last_seen > existing.last_seen:
+                existing = replace(existing, last_seen=ref.last_seen)
+                self._hosts[url] = existing
+            return existing
+
+    def _queue_update(self, url: str) -> None:
         with self._lock:
-            targets.update(url for url in self._hosts if url != self._host.address.rstrip("/"))
-        for url in sorted(targets):
-            self.join(url)
+            members = len(self._hosts)
+            self._updates[url] = MESH_GOSSIP_RETRANSMIT_MULTIPLIER * max(1, math.ceil(math.log2(members + 1)))
+
+    def _take_updates(self, *, about: str = "") -> list[dict[str, Any]]:
+        """Pick the least-sent membership deltas to piggyback on one gossip message.
+
+        A peer that this host believes is offline always receives its own entry,
+        so it can refute the report.
+        """
+
+        self_url = self._host.address.rstrip("/")
+        with self._lock:
+            urls = sorted(self._updates, key=self._updates.__getitem__, reverse=True)[:MESH_GOSSIP_PIGGYBACK_LIMIT]
+            for url in urls:
+                self._updates[url] -= 1
+                if self._updates[url] <= 0:
+                    del self._updates[url]
+            about_ref = self._hosts.get(about.rstrip("/")) if about else None
+            if about_ref is not None and not about_ref.online and about_ref.url not in urls:
+                urls.append(about_ref.url)
+            refs = [self._hosts[url] for url in urls if url in self._hosts and url != self_url]
+        if self_url in urls:
+            refs.append(self.refresh_self())
+        return [ref.to_wire() for ref in refs]
 
     def discover_lan_once(self, *, force: bool = False) -> list[HostRef]:
+        """Sweep the LAN for paglets hosts.
+
+        Sweeps that find no new host stretch the interval, up to
+        ``MESH_LAN_DISCOVERY_MAX_IDLE_FACTOR`` times ``lan_discovery_interval``.
+        ``force`` ignores the interval.
+        """
+
         if not self.enabled or not self.lan_discovery:
             return []
         now = time.monotonic()
-        if not force and now - self._last_lan_discovery_at < self.lan_discovery_interval:
+        interval = self.lan_discovery_interval * min(MESH_LAN_DISCOVERY_MAX_IDLE_FACTOR, 2**self._lan_idle_sweeps)
+        if not force and now - self._last_lan_discovery_at < interval:
             return []
         self._last_lan_discovery_at = now
 
         ports = self._lan_discovery_ports()
         refs = self._discover_lan_refs(ports)
         registered: list[HostRef] = []
+        found_new = False
         for ref in refs:
+            with self._lock:
+                known = ref.url.rstrip("/") in self._hosts
             item = self.register(ref)
             if item is not None:
                 registered.append(item)
                 self.add_seed(item.url)
+                found_new = found_new or not known
+        self._lan_idle_sweeps = 0 if found_new else min(self._lan_idle_sweeps + 1, 8)
         return registered
 
     def _lan_discovery_ports(self) -> set[int]:
@@ -434,21 +676,73 @@ class MeshRegistry:
         if not probe_ports:
             return []
         network = ipaddress.ip_network(f"{lan_host}/24", strict=False)
-        targets = [
-            (str(candidate), port) for candidate in network.hosts() if candidate != address for port in probe_ports
-        ]
+        targets = self._lan_sweep_targets(network, address, probe_ports)
         if not targets:
             return []
 
+        reachable = asyncio.run(
+            _scan_open_ports(targets, MESH_LAN_DISCOVERY_TIMEOUT_SECONDS, MESH_LAN_DISCOVERY_CONCURRENCY)
+        )
         refs: list[HostRef] = []
-        with ThreadPoolExecutor(max_workers=MESH_LAN_DISCOVERY_WORKERS) as executor:
-            futures = [executor.submit(self._probe_lan_host, host, port) for host, port in targets]
-            for future in as_completed(futures):
-                ref = future.result()
-                if ref is not None:
-                    refs.append(ref)
+        answered: set[tuple[str, int]] = set()
+        if reachable:
+            with ThreadPoolExecutor(max_workers=min(MESH_LAN_DISCOVERY_WORKERS, len(reachable))) as executor:
+                futures = {executor.submit(self._probe_lan_host, host, port): (host, port) for host, port in reachable}
+                for future in as_completed(futures):
+                    ref = future.result()
+                    if ref is not None:
+                        refs.append(ref)
+                        answered.add(futures[future])
+        self._note_lan_sweep(targets, answered)
         return refs
 
+    def _lan_sweep_targets(
+        self,
+        network: ipaddress.IPv4Network | ipaddress.IPv6Network,
+        address: ipaddress.IPv4Address,
+        ports: list[int],
+    ) -> list[tuple[str, int]]:
+        """Pick this sweep's ``(address, port)`` targets.
+
+        The first sweep of a network covers every address. Later sweeps cover
+        the next ``MESH_LAN_DISCOVERY_SLICE`` addresses, and targets that are
+        still backing off after unanswered probes are skipped.
+        """
+
+        candidates = [str(candidate) for candidate in network.hosts() if candidate != address]
+        if not candidates:
+            return []
+        now = time.monotonic()
+        with self._lock:
+            if self._lan_network != str(network):
+                self._lan_network = str(network)
+                self._lan_cursor = 0
+                self._lan_misses.clear()
+                chosen = candidates
+            else:
+                start = self._lan_cursor % len(candidates)
+                chosen = (candidates[start:] + candidates[:start])[:MESH_LAN_DISCOVERY_SLICE]
+                self._lan_cursor = start + len(chosen)
+            return [
+                (host, port)
+                for host in chosen
+                for port in ports
+                if self._lan_misses.get((host, port), (0, 0.0))[1] <= now
+            ]
+
+    def _note_lan_sweep(self, targets: list[tuple[str, int]], answered: set[tuple[str, int]]) -> None:
+        """Back off exponentially from targets that did not answer as a paglets host."""
+
+        now = time.monotonic()
+        with self._lock:
+            for target in targets:
+                if target in answered:
+                    self._lan_misses.pop(target, None)
+                    continue
+                misses = self._lan_misses.get(target, (0, 0.0))[0] + 1
+                delay = min(MESH_LAN_DISCOVERY_MAX_BACKOFF_SECONDS, self.lan_discovery_interval * 2 ** (misses - 1))
+                self._lan_misses[target] = (misses, now + delay)
+
     def _probe_lan_host(self, host: str, port: int) -> HostRef | None:
         url = f"http://{host}:{port}"
         if url.rstrip("/") == self._host.address.rstrip("/"):
@@ -494,6 +788,7 @@ class MeshRegistry:
                     error=error,
                 )
             else:
+                was_online = existing.online
                 existing = HostRef(
                     name=existing.name,
                     url=existing.url,
@@ -505,7 +800,10 @@ class MeshRegistry:
                     tags=existing.tags,
                     properties=dict(existing.properties),
                     error=error,
+                    incarnation=existing.incarnation,
                 )
+                if was_online:
+                    self._queue_update(normalized)
             self._hosts[normalized] = existing
 
     def _mark_ref_offline(self, ref: HostRef, error: str) -> None:
@@ -524,6 +822,7 @@ class MeshRegistry:
                 tags=ref.tags,
                 properties=dict(ref.properties),
                 error=error,
+                incarnation=ref.incarnation,
             )
 
     def refresh_self(self) -> HostRef:
@@ -540,6 +839,7 @@ class MeshRegistry:
             inactive_count=inactive_count,
             tags=self._host.tags,
             properties=self._host.host_properties,
+            incarnation=self._incarnation,
         )
         with self._lock:
             self._hosts[ref.url] = ref
@@ -610,10 +910,14 @@ class MeshRegistry:
         now = time.time()
         self_url = self._host.address.rstrip("/")
         with self._lock:
+            # Round-robin probing reaches every member once per ceil(members / fanout)
+            # rounds, so larger meshes need a longer silence before a peer counts as stale.
+            rounds = math.ceil(max(0, len(self._hosts) - 1) / self.gossip_fanout)
+            stale_after = max(self.offline_after, 2.0 * rounds * self.gossip_interval)
             for url, ref in list(self._hosts.items()):
                 if url == self_url or not ref.online:
                     continue
-                if now - ref.last_seen <= self.offline_after:
+                if now - ref.last_seen <= stale_after:
                     continue
                 self._hosts[url] = HostRef(
                     name=ref.name,
@@ -626,6 +930,7 @@ class MeshRegistry:
                     tags=ref.tags,
                     properties=dict(ref.properties),
                     error="stale mesh peer",
+                    incarnation=ref.incarnation,
                 )
 
     def _debug(self, message: str) -> None:
@@ -633,6 +938,30 @@ class MeshRegistry:
             print(f"[paglets mesh] {message}", flush=True)
 
 
+async def _scan_open_ports(
+    targets: list[tuple[str, int]],
+    timeout: float,
+    concurrency: int,
+) -> list[tuple[str, int]]:
+    """Return the targets that accept a TCP connection within ``timeout``."""
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def connect(host: str, port: int) -> tuple[str, int] | None:
+        async with semaphore:
+            try:
+                _reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+            except (OSError, TimeoutError):
+                return None
+            writer.close()
+            with contextlib.suppress(OSError):
+                await writer.wait_closed()
+            return host, port
+
+    results = await asyncio.gather(*(connect(host, port) for host, port in targets))
+    return [result for result in results if result is not None]
+
+
 def _name_from_url(url: str) -> str:
     parsed = urlparse(url)
     return parsed.netloc or url
@@ -659,3 +988,13 @@ def _detect_lan_host() -> str:
     except OSError:
         pass
     return "127.0.0.1"
+
+
+def _supersedes(new: HostRef, old: HostRef) -> bool:
+    """SWIM ordering: a higher incarnation wins; at equal incarnation, offline beats online."""
+
+    if new.incarnation != old.incarnation:
+        return new.incarnation > old.incarnation
+    if new.online != old.online:
+        return not new.online
+    return False
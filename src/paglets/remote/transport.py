@@ -2,13 +2,20 @@
 # Licensed under the MIT License. See LICENSE for details.
 from __future__ import annotations
 
+import array
 import base64
+import bisect
 import contextlib
+import copyreg
 import http.client
+import itertools
+import os
 import pickle
 import threading
 import uuid
-from multiprocessing import resource_tracker, shared_memory
+from collections import ChainMap
+from multiprocessing import resource_tracker, shared_memory, util
+from pathlib import Path
 from typing import Any
 
 from paglets.core.errors import HostError
@@ -16,16 +23,32 @@ from paglets.core.errors import HostError
 PICKLE_CONTENT_TYPE = "application/x-paglets-pickle"
 LOCAL_PICKLE_CHUNK_BYTES = 1024 * 1024
 LOCAL_PICKLE_SEGMENT_BYTES = 64 * 1024 * 1024
-_LOCAL_PICKLE_STREAMS: dict[str, list[shared_memory.SharedMemory]] = {}
+LOCAL_PICKLE_OUT_OF_BAND_BYTES = 64 * 1024
+LOCAL_PICKLE_LINE_SCAN_BYTES = 4096
+LOCAL_PICKLE_INLINE_BYTES = 64 * 1024
+LOCAL_PICKLE_ARENA_MIN_SEGMENT_BYTES = 1024 * 1024
+LOCAL_PICKLE_ARENA_IDLE_BYTES = 64 * 1024 * 1024
+_LOCAL_PICKLE_STREAMS: dict[str, tuple[list[shared_memory.SharedMemory], SharedMemoryArena | None]] = {}
 _LOCAL_PICKLE_STREAMS_LOCK = threading.Lock()
+_LOCAL_PICKLE_ARENA: SharedMemoryArena | None = None
+_LOCAL_PICKLE_ARENA_LOCK = threading.Lock()
 
 
-def dump_pickle(value: Any, target: Any) -> None:
-    pickle.dump(value, target, protocol=pickle.HIGHEST_PROTOCOL)
+def dump_pickle(value: Any, target: Any, *, buffer_callback: Any = None) -> None:
+    """Pickle ``value`` with protocol 5 so typed buffers are written as raw bytes.
 
+    ``array.array`` values and NumPy arrays are emitted as :class:`pickle.PickleBuffer`
+    objects. Without ``buffer_callback`` they are written in-band as one raw
+    block; with it, the callback decides which buffers travel out of band.
+    """
 
-def load_pickle(source: Any) -> Any:
-    return pickle.load(source)
+    pickler = pickle.Pickler(target, protocol=pickle.HIGHEST_PROTOCOL, buffer_callback=buffer_callback)
+    pickler.dispatch_table = _PICKLE_DISPATCH_TABLE
+    pickler.dump(value)
+
+
+def load_pickle(source: Any, *, buffers: Any = None) -> Any:
+    return pickle.load(source, buffers=buffers)
 
 
 def dump_http_chunked_pickle(connection: http.client.HTTPConnection, value: Any) -> None:
@@ -46,15 +69,40 @@ def load_http_pickle_payload(headers: Any, source: Any) -> dict[str, Any]:
     else:
         stream = LimitedRequestReader(source, int(headers.get("Content-Length") or 0))
     payload = load_pickle(stream)
+    # Consume the chunked terminator or any trailing bytes so a keep-alive
+    # connection starts the next request at a request line.
+    stream.read()
     if not isinstance(payload, dict):
         raise HostError(f"Expected pickle payload dict, got {type(payload).__name__}")
     return payload
 
 
 def start_local_pickle_sender(value: Any) -> dict[str, Any]:
-    writer = SharedMemoryPickleWriter(segment_size=LOCAL_PICKLE_SEGMENT_BYTES)
+    """Pickle ``value`` for a local receiver and return the stream metadata.
+
+    Streams below ``LOCAL_PICKLE_INLINE_BYTES`` travel inline in the metadata.
+    Larger ones are written to segments leased from this process's
+    ``SharedMemoryArena``; they return to the arena when the receiver's
+    ``local_pickle_stream_received`` event reaches ``release_local_pickle_sender``.
+    """
+
+    writer = SharedMemoryPickleWriter(
+        segment_size=LOCAL_PICKLE_SEGMENT_BYTES,
+        arena=local_pickle_arena(),
+        inline_bytes=LOCAL_PICKLE_INLINE_BYTES,
+        first_segment_size=LOCAL_PICKLE_ARENA_MIN_SEGMENT_BYTES,
+    )
+    buffers: list[pickle.PickleBuffer] = []
+
+    def out_of_band(buffer: pickle.PickleBuffer) -> bool:
+        if buffer.raw().nbytes < LOCAL_PICKLE_OUT_OF_BAND_BYTES:
+            return True
+        buffers.append(buffer)
+        return False
+
     try:
-        dump_pickle(value, writer)
+        dump_pickle(value, writer, buffer_callback=out_of_band)
+        writer.write_buffers(buffers)
         return writer.finish()
     except Exception:
         writer.abort()
@@ -70,28 +118,89 @@ def release_local_pickle_sender(stream_or_token: dict[str, Any] | str) -> None:
     if not token:
         return
     with _LOCAL_PICKLE_STREAMS_LOCK:
-        handles = _LOCAL_PICKLE_STREAMS.pop(token, [])
+        handles, arena = _LOCAL_PICKLE_STREAMS.pop(token, ([], None))
+    if arena is not None:
+        arena.give_back(handles)
+        return
     for handle in handles:
         with contextlib.suppress(Exception):
             handle.close()
 
 
 def receive_local_pickle(stream: dict[str, Any]) -> Any:
-    if stream.get("kind") != "shared_memory_pickle":
+    kind = stream.get("kind")
+    if kind == "inline_pickle":
+        return _load_inline_pickle(stream)
+    if kind != "shared_memory_pickle":
         raise HostError("Unsupported local pickle stream metadata")
     reader = SharedMemoryPickleReader(stream)
     try:
-        return load_pickle(reader)
+        return reader.load()
     finally:
-        reader.close(unlink=True)
+        # Arena segments belong to the sender, which reuses them after the ack.
+        reader.close(unlink=not stream.get("arena"))
         release_local_pickle_sender(stream)
 
 
+def local_pickle_arena() -> SharedMemoryArena:
+    """Return this process's shared-memory arena, creating it on first use."""
+
+    global _LOCAL_PICKLE_ARENA
+    with _LOCAL_PICKLE_ARENA_LOCK:
+        if _LOCAL_PICKLE_ARENA is None or _LOCAL_PICKLE_ARENA.pid != os.getpid():
+            _LOCAL_PICKLE_ARENA = SharedMemoryArena(max_idle_bytes=LOCAL_PICKLE_ARENA_IDLE_BYTES)
+            util.Finalize(_LOCAL_PICKLE_ARENA, _LOCAL_PICKLE_ARENA.close, exitpriority=0)
+        return _LOCAL_PICKLE_ARENA
+
+
+def unlink_process_arena(pid: int) -> None:
+    """Unlink arena segments left behind by process ``pid`` after it exited."""
+
+    root = Path("/dev/shm")
+    if not root.is_dir():
+        return
+    for path in root.glob(f"{SharedMemoryArena.name_prefix(pid)}*"):
+        with contextlib.suppress(OSError):
+            path.unlink()
+
+
+def _load_inline_pickle(stream: dict[str, Any]) -> Any:
+    data = memoryview(stream.get("data") or b"")
+    buffers = [
+        bytearray(data[int(item["offset"]) : int(item["offset"]) + int(item["size"])])
+        for item in stream.get("buffers") or []
+    ]
+    return pickle.loads(data[: int(stream.get("pickle_size", len(data)))], buffers=buffers)
+
+
+def is_buffer_value(value: Any) -> bool:
+    """Return whether ``value`` is a typed buffer carried as raw bytes by pickle transports."""
+
+    return isinstance(value, (array.array, memoryview)) or _is_ndarray(value)
+
+
 def json_safe(value: Any) -> Any:
     if isinstance(value, bytes):
         return {"__paglets_binary__": "bytes", "base64": base64.b64encode(value).decode("ascii")}
     if isinstance(value, bytearray):
         return {"__paglets_binary__": "bytearray", "base64": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, array.array):
+        return {
+            "__paglets_binary__": "array",
+            "typecode": value.typecode,
+            "base64": base64.b64encode(value.tobytes()).decode("ascii"),
+        }
+    if isinstance(value, memoryview):
+        return {"__paglets_binary__": "bytes", "base64": base64.b64encode(value.tobytes()).decode("ascii")}
+    if _is_ndarray(value):
+        if value.dtype.hasobject:
+            return json_safe(value.tolist())
+        return {
+            "__paglets_binary__": "ndarray",
+            "dtype": value.dtype.str,
+            "shape": list(value.shape),
+            "base64": base64.b64encode(value.tobytes()).decode("ascii"),
+        }
     if isinstance(value, list):
         return [json_safe(item) for item in value]
     if isinstance(value, tuple):
@@ -107,15 +216,34 @@ def json_safe(value: Any) -> Any:
     return value
 
 
+_BINARY_TAG_KEYS: dict[str, frozenset[str]] = {
+    "bytes": frozenset({"__paglets_binary__", "base64"}),
+    "bytearray": frozenset({"__paglets_binary__", "base64"}),
+    "array": frozenset({"__paglets_binary__", "typecode", "base64"}),
+    "ndarray": frozenset({"__paglets_binary__", "dtype", "shape", "base64"}),
+}
+
+
 def restore_binary_tag(value: Any) -> Any:
-    if isinstance(value, dict) and set(value) == {"__paglets_binary__", "base64"}:
-        kind = value.get("__paglets_binary__")
-        raw = base64.b64decode(str(value.get("base64") or "").encode("ascii"))
-        if kind == "bytearray":
-            return bytearray(raw)
-        if kind == "bytes":
-            return raw
-    return value
+    if not isinstance(value, dict) or "__paglets_binary__" not in value or "base64" not in value:
+        return value
+    kind = value.get("__paglets_binary__")
+    if _BINARY_TAG_KEYS.get(kind) != set(value):
+        return value
+    raw = base64.b64decode(str(value.get("base64") or "").encode("ascii"))
+    if kind == "bytearray":
+        return bytearray(raw)
+    if kind == "bytes":
+        return raw
+    if kind == "array":
+        return _restore_array(str(value["typecode"]), raw)
+    try:
+        import numpy
+    except ImportError:
+        # Without NumPy the tag is the most faithful value this host can hold.
+        return value
+    shape = tuple(int(size) for size in value["shape"])
+    return numpy.frombuffer(bytearray(raw), dtype=numpy.dtype(str(value["dtype"]))).reshape(shape)
 
 
 def restore_json_safe(value: Any) -> Any:
@@ -131,6 +259,26 @@ def restore_json_safe(value: Any) -> Any:
     return value
 
 
+def _is_ndarray(value: Any) -> bool:
+    cls = type(value)
+    return cls.__name__ == "ndarray" and cls.__module__ == "numpy"
+
+
+def _reduce_array(value: array.array) -> tuple[Any, tuple[Any, ...]]:
+    return _restore_array, (value.typecode, pickle.PickleBuffer(value))
+
+
+def _restore_array(typecode: str, buffer: Any) -> array.array:
+    restored = array.array(typecode)
+    restored.frombytes(buffer)
+    return restored
+
+
+# NumPy arrays already reduce to PickleBuffer under protocol 5; array.array
+# would otherwise be pickled through a bytes copy of its contents.
+_PICKLE_DISPATCH_TABLE = ChainMap({array.array: _reduce_array}, copyreg.dispatch_table)
+
+
 class ChunkedRequestWriter:
     def __init__(self, connection: http.client.HTTPConnection):
         self._connection = connection
@@ -141,7 +289,7 @@ class ChunkedRequestWriter:
             raise ValueError("chunked request writer is closed")
         if not data:
             return 0
-        view = memoryview(data)
+        view = memoryview(data).cast("B")
         self._connection.send(f"{len(view):X}\r\n".encode("ascii"))
         self._connection.send(view)
         self._connection.send(b"\r\n")
@@ -245,15 +393,107 @@ class ChunkedRequestReader:
                 return
 
 
+class SharedMemoryArena:
+    """Reusable shared-memory segments for the local pickle streams of one process.
+
+    ``lease`` hands out a segment of an exact size, reusing an idle one when
+    possible. Writers ask for a few size classes only, so returned segments
+    fit later streams. ``give_back`` keeps up to ``max_idle_bytes`` of them
+    mapped and unlinks the rest. Segment names start with ``name_prefix(pid)``
+    so a host can unlink what a killed child process left behind.
+    """
+
+    def __init__(self, *, max_idle_bytes: int):
+        self.pid = os.getpid()
+        self.max_idle_bytes = max(0, int(max_idle_bytes))
+        self._lock = threading.Lock()
+        self._idle: dict[int, list[shared_memory.SharedMemory]] = {}
+        self._idle_bytes = 0
+        self._sizes: dict[str, int] = {}
+        self._names = itertools.count()
+        self._closed = False
+
+    @staticmethod
+    def name_prefix(pid: int) -> str:
+        return f"pga{pid:x}x"
+
+    def lease(self, size: int) -> shared_memory.SharedMemory:
+        with self._lock:
+            idle = self._idle.get(size)
+            if idle:
+                self._idle_bytes -= size
+                return idle.pop()
+            name = f"{self.name_prefix(self.pid)}{next(self._names):x}"
+        handle = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _unregister_shared_memory(handle)
+        with self._lock:
+            self._sizes[handle.name] = size
+        return handle
+
+    def give_back(self, handles: list[shared_memory.SharedMemory]) -> None:
+        surplus: list[shared_memory.SharedMemory] = []
+        with self._lock:
+            for handle in handles:
+                size = self._sizes.get(handle.name, 0)
+                if self._closed or self._idle_bytes + size > self.max_idle_bytes:
+                    self._sizes.pop(handle.name, None)
+                    surplus.append(handle)
+                    continue
+                self._idle.setdefault(size, []).append(handle)
+                self._idle_bytes += size
+        _unlink_shared_memory(surplus)
+
+    def status(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "segment_count": len(self._sizes),
+                "idle_segment_count": sum(len(idle) for idle in self._idle.values()),
+                "idle_bytes": self._idle_bytes,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle = [handle for handles in self._idle.values() for handle in handles]
+            self._idle.clear()
+            self._idle_bytes = 0
+            for handle in idle:
+                self._sizes.pop(handle.name, None)
+        _unlink_shared_memory(idle)
+
+
 class SharedMemoryPickleWriter:
-    def __init__(self, *, segment_size: int):
+    """File-like sink that spreads a pickle stream over shared-memory segments.
+
+    Without an arena every segment is ``segment_size`` bytes and the receiver
+    unlinks it. With an arena, segments grow by four from
+    ``first_segment_size`` up to ``segment_size`` and go back to the arena on
+    release. Streams that stay within ``inline_bytes`` never touch shared
+    memory and are returned inline by ``finish``.
+    """
+
+    def __init__(
+        self,
+        *,
+        segment_size: int,
+        arena: SharedMemoryArena | None = None,
+        inline_bytes: int = 0,
+        first_segment_size: int | None = None,
+    ):
         self._segment_size = max(1, int(segment_size))
+        self._first_segment_size = min(self._segment_size, max(1, int(first_segment_size or self._segment_size)))
+        self._arena = arena
+        self._inline: bytearray | None = bytearray() if inline_bytes > 0 else None
+        self._inline_bytes = max(0, int(inline_bytes))
         self._token = uuid.uuid4().hex[:12]
         self._segments: list[dict[str, Any]] = []
         self._handles: list[shared_memory.SharedMemory] = []
         self._current: shared_memory.SharedMemory | None = None
+        self._current_size = 0
         self._current_used = 0
         self._total_size = 0
+        self._pickle_size: int | None = None
+        self._buffers: list[dict[str, int]] = []
         self._closed = False
 
     def write(self, data: bytes) -> int:
@@ -261,13 +501,21 @@ class SharedMemoryPickleWriter:
             raise ValueError("shared-memory pickle writer is closed")
         if not data:
             return 0
-        view = memoryview(data)
+        view = memoryview(data).cast("B")
+        if self._inline is not None:
+            if len(self._inline) + len(view) <= self._inline_bytes:
+                self._inline += view
+                self._total_size += len(view)
+                return len(view)
+            spilled, self._inline = self._inline, None
+            self._total_size -= len(spilled)
+            self.write(spilled)
         written = 0
         while written < len(view):
-            if self._current is None or self._current_used >= self._segment_size:
+            if self._current is None or self._current_used >= self._current_size:
                 self._open_segment()
             assert self._current is not None
-            available = self._segment_size - self._current_used
+            available = self._current_size - self._current_used
             size = min(available, len(view) - written)
             self._current.buf[self._current_used : self._current_used + size] = view[written : written + size]
             self._current_used += size
@@ -279,18 +527,43 @@ class SharedMemoryPickleWriter:
     def flush(self) -> None:
         return None
 
+    def write_buffers(self, buffers: list[pickle.PickleBuffer]) -> None:
+        """Append out-of-band pickle buffers as raw bytes after the pickle stream."""
+
+        if self._pickle_size is None:
+            self._pickle_size = self._total_size
+        for buffer in buffers:
+            view = buffer.raw()
+            self._buffers.append({"offset": self._total_size, "size": view.nbytes})
+            self.write(view)
+
     def finish(self) -> dict[str, Any]:
+        pickle_size = self._total_size if self._pickle_size is None else self._pickle_size
+        buffers = [dict(buffer) for buffer in self._buffers]
+        if self._inline is not None:
+            self._closed = True
+            return {
+                "kind": "inline_pickle",
+                "data": bytes(self._inline),
+                "total_size": self._total_size,
+                "pickle_size": pickle_size,
+                "buffers": buffers,
+            }
         metadata = {
             "kind": "shared_memory_pickle",
             "token": self._token,
             "segment_size": self._segment_size,
             "total_size": self._total_size,
+            "pickle_size": pickle_size,
+            "buffers": buffers,
             "segments": [dict(segment) for segment in self._segments],
         }
+        if self._arena is not None:
+            metadata["arena"] = True
         if not self._closed:
             self._closed = True
             with _LOCAL_PICKLE_STREAMS_LOCK:
-                _LOCAL_PICKLE_STREAMS[self._token] = list(self._handles)
+                _LOCAL_PICKLE_STREAMS[self._token] = (list(self._handles), self._arena)
             self._handles = []
             self._current = None
         return metadata
@@ -298,32 +571,31 @@ class SharedMemoryPickleWriter:
     def abort(self) -> None:
         self._closed = True
         with _LOCAL_PICKLE_STREAMS_LOCK:
-            registered = _LOCAL_PICKLE_STREAMS.pop(self._token, [])
+            registered, _ = _LOCAL_PICKLE_STREAMS.pop(self._token, ([], None))
         self._handles.extend(registered)
-        for handle in self._handles:
-            try:
-                handle.unlink()
-            except FileNotFoundError:
-                pass
-            except Exception:
-                pass
-        self._close_handles()
+        if self._arena is not None:
+            self._arena.give_back(self._handles)
+            self._handles = []
+            self._current = None
+            return
+        _unlink_shared_memory(self._handles)
+        self._handles = []
+        self._current = None
 
     def _open_segment(self) -> None:
-        name = f"pgl{self._token}{len(self._segments):x}"
-        handle = shared_memory.SharedMemory(name=name, create=True, size=self._segment_size)
-        _unregister_shared_memory(handle)
+        if self._arena is not None:
+            size = min(self._segment_size, self._first_segment_size * 4 ** len(self._segments))
+            handle = self._arena.lease(size)
+        else:
+            size = self._segment_size
+            name = f"pgl{self._token}{len(self._segments):x}"
+            handle = shared_memory.SharedMemory(name=name, create=True, size=size)
+            _unregister_shared_memory(handle)
         self._handles.append(handle)
         self._current = handle
+        self._current_size = size
         self._current_used = 0
-        self._segments.append({"name": handle.name, "size": self._segment_size, "used": 0})
-
-    def _close_handles(self) -> None:
-        for handle in self._handles:
-            with contextlib.suppress(Exception):
-                handle.close()
-        self._handles = []
-        self._current = None
+        self._segments.append({"name": handle.name, "size": size, "used": 0})
 
     def close(self) -> None:
         if not self._closed:
@@ -333,6 +605,11 @@ class SharedMemoryPickleWriter:
 class SharedMemoryPickleReader:
     def __init__(self, stream: dict[str, Any]):
         self._segments_meta = [dict(segment) for segment in stream.get("segments") or []]
+        self._segment_starts = list(
+            itertools.accumulate((self._segment_used_of(item) for item in self._segments_meta), initial=0)
+        )
+        self._buffers_meta = [dict(buffer) for buffer in stream.get("buffers") or []]
+        self._remaining = int(stream.get("pickle_size", stream.get("total_size")) or 0)
         self._handles: list[shared_memory.SharedMemory] = []
         self._index = 0
         self._offset = 0
@@ -345,46 +622,114 @@ class SharedMemoryPickleReader:
             self.close(unlink=False)
             raise
 
+    def load(self) -> Any:
+        """Unpickle the stream, reading straight from the mapped segments.
+
+        A pickle that fits in the first segment is loaded from one memoryview
+        without any intermediate copy; longer streams go through ``readinto``.
+        """
+
+        buffers = self.out_of_band_buffers()
+        if self._handles and self._remaining <= self._segment_used(0):
+            with self._handles[0].buf[: self._remaining] as view:
+                value = pickle.loads(view, buffers=buffers)
+            self._offset = self._remaining
+            self._remaining = 0
+            return value
+        return load_pickle(self, buffers=buffers)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, target: Any) -> int:
+        if self._closed:
+            raise ValueError("shared-memory pickle reader is closed")
+        with memoryview(target) as view, view.cast("B") as out:
+            wanted = min(len(out), self._remaining)
+            written = 0
+            while written < wanted:
+                with self._next_view(wanted - written) as chunk:
+                    if not chunk:
+                        break
+                    out[written : written + len(chunk)] = chunk
+                    written += len(chunk)
+        return written
+
     def read(self, size: int = -1) -> bytes:
         if self._closed:
             raise ValueError("shared-memory pickle reader is closed")
-        if size is None or size < 0:
-            chunks: list[bytes] = []
-            while True:
-                chunk = self.read(LOCAL_PICKLE_CHUNK_BYTES)
-                if not chunk:
-                    return b"".join(chunks)
-                chunks.append(chunk)
-        remaining = int(size)
-        chunks: list[bytes] = []
-        while remaining > 0 and self._index < len(self._handles):
-            used = int(self._segments_meta[self._index].get("used") or 0)
-            if self._offset >= used:
-                self._index += 1
-                self._offset = 0
-                continue
-            amount = min(remaining, used - self._offset)
-            handle = self._handles[self._index]
-            chunks.append(bytes(handle.buf[self._offset : self._offset + amount]))
-            self._offset += amount
-            remaining -= amount
-        return b"".join(chunks)
+        size = self._remaining if size is None or size < 0 else min(int(size), self._remaining)
+        with self._next_view(size) as chunk:
+            if len(chunk) == size:
+                return bytes(chunk)
+            head = len(chunk)
+            result = bytearray(size)
+            result[:head] = chunk
+        written = head + self.readinto(memoryview(result)[head:])
+        return bytes(result[:written])
 
     def readline(self, size: int = -1) -> bytes:
-        limit = None if size is None or size < 0 else int(size)
+        if self._closed:
+            raise ValueError("shared-memory pickle reader is closed")
+        limit = self._remaining if size is None or size < 0 else min(int(size), self._remaining)
         chunks: list[bytes] = []
-        while limit is None or sum(len(chunk) for chunk in chunks) < limit:
-            remaining = 1 if limit is None else max(0, limit - sum(len(chunk) for chunk in chunks))
-            if remaining <= 0:
-                break
-            chunk = self.read(1)
-            if not chunk:
-                break
-            chunks.append(chunk)
-            if chunk == b"\n":
+        while limit > 0:
+            with self._next_view(min(limit, LOCAL_PICKLE_LINE_SCAN_BYTES), consume=False) as chunk:
+                if not chunk:
+                    break
+                data = bytes(chunk)
+            newline = data.find(b"\n")
+            if newline >= 0:
+                data = data[: newline + 1]
+            self._advance(len(data))
+            chunks.append(data)
+            limit -= len(data)
+            if newline >= 0:
                 break
         return b"".join(chunks)
 
+    def out_of_band_buffers(self) -> list[bytearray]:
+        """Copy the raw out-of-band buffers that follow the pickle stream."""
+
+        return [self._copy_range(int(buffer["offset"]), int(buffer["size"])) for buffer in self._buffers_meta]
+
+    def _segment_used(self, index: int) -> int:
+        return self._segment_used_of(self._segments_meta[index])
+
+    @staticmethod
+    def _segment_used_of(segment: dict[str, Any]) -> int:
+        return int(segment.get("used") or 0)
+
+    def _next_view(self, size: int, *, consume: bool = True) -> memoryview:
+        """Return a view of up to ``size`` bytes from the current segment."""
+
+        while self._index < len(self._handles) and self._offset >= self._segment_used(self._index):
+            self._index += 1
+            self._offset = 0
+        if size <= 0 or self._index >= len(self._handles):
+            return memoryview(b"")
+        amount = min(size, self._segment_used(self._index) - self._offset)
+        view = self._handles[self._index].buf[self._offset : self._offset + amount]
+        if consume:
+            self._advance(amount)
+        return view
+
+    def _advance(self, amount: int) -> None:
+        self._offset += amount
+        self._remaining -= amount
+
+    def _copy_range(self, offset: int, size: int) -> bytearray:
+        result = bytearray(size)
+        written = 0
+        index = max(0, bisect.bisect_right(self._segment_starts, offset) - 1)
+        while written < size:
+            start = offset + written - self._segment_starts[index]
+            amount = min(size - written, self._segment_used(index) - start)
+            result[written : written + amount] = self._handles[index].buf[start : start + amount]
+            written += amount
+            index += 1
+        return result
+
     def close(self, *, unlink: bool = False) -> None:
         if self._closed:
             return
@@ -402,6 +747,14 @@ class SharedMemoryPickleReader:
         self._closed = True
 
 
+def _unlink_shared_memory(handles: list[shared_memory.SharedMemory]) -> None:
+    for handle in handles:
+        with contextlib.suppress(Exception):
+            handle.unlink()
+        with contextlib.suppress(Exception):
+            handle.close()
+
+
 def _unregister_shared_memory(handle: shared_memory.SharedMemory) -> None:
     with contextlib.suppress(Exception):
         resource_tracker.unregister(handle._name, "shared_memory")
@@ -0,0 +1,364 @@
+# Copyright (c) 2026 by C. Klukas.
+# Licensed under the MIT License. See LICENSE for details.
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import io
+import queue
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler
+from typing import TYPE_CHECKING, Any
+from urllib.parse import parse_qs, urlparse
+
+from paglets.remote.transport import PICKLE_CONTENT_TYPE
+from paglets.runtime.http_api import (
+    HTTP_KEEP_ALIVE_TIMEOUT_SECONDS,
+    RequestHandler,
+    _is_relay_poll_route,
+    _relay_poll_timeout,
+    _route_parts,
+)
+from paglets.runtime.relay import RelayDelivery, _drain_relay_queue, _relay_poll_limit
+
+if TYPE_CHECKING:
+    from paglets.runtime.host import Host
+
+ASYNC_HTTP_MAX_WORKERS = 64
+ASYNC_HTTP_MAX_HEADER_BYTES = 64 * 1024
+ASYNC_HTTP_IO_TIMEOUT_SECONDS = 60.0
+ASYNC_HTTP_SHUTDOWN_GRACE_SECONDS = 1.0
+
+
+class AsyncPagletHTTPServer:
+    """Single-threaded asyncio HTTP/1.1 front end for the host API.
+
+    Connections, request heads and relay long-polls live on one event loop;
+    a waiting relay poll is an awaitable instead of a parked thread. Every
+    other route runs the unchanged :class:`RequestHandler` on a bounded
+    executor, with blocking file-likes bridging its body reads and response
+    writes back to the connection's streams. The public surface mirrors
+    :class:`~paglets.runtime.http_api.PagletHTTPServer` so the host can start,
+    stop and rebind either server the same way.
+    """
+
+    def __init__(
+        self,
+        server_address: tuple[str, int],
+        handler_cls: type[BaseHTTPRequestHandler],
+        host_runtime: Host,
+        *,
+        max_workers: int = ASYNC_HTTP_MAX_WORKERS,
+    ):
+        self.handler_cls = handler_cls
+        self.host_runtime = host_runtime
+        self.keep_alive = True
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.socket.bind(server_address)
+            self.socket.listen(128)
+            self.socket.setblocking(False)
+        except Exception:
+            self.socket.close()
+            raise
+        self.server_address = self.socket.getsockname()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="paglets-http")
+        self._state_lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stop_requested = False
+        self._stop = asyncio.Event()
+        self._stopped = threading.Event()
+        self._writers: set[asyncio.StreamWriter] = set()
+        self._poll_events: set[asyncio.Event] = set()
+
+    def disable_keep_alive(self) -> None:
+        """Answer every further request with ``Connection: close`` while the host stops."""
+
+        self.keep_alive = False
+
+    def serve_forever(self) -> None:
+        with self._state_lock:
+            if self._stop_requested:
+                self._stopped.set()
+                return
+            loop = self._loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(self._serve())
+        finally:
+            loop.run_until_complete(self._drain_connections())
+            loop.close()
+            self._stopped.set()
+
+    def shutdown(self) -> None:
+        with self._state_lock:
+            self._stop_requested = True
+            loop = self._loop
+        if loop is None:
+            return
+        with contextlib.suppress(RuntimeError):
+            loop.call_soon_threadsafe(self._stop.set)
+        self._stopped.wait()
+
+    def server_close(self) -> None:
+        with contextlib.suppress(OSError):
+            self.socket.close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _serve(self) -> None:
+        server = await asyncio.start_server(self._serve_connection, sock=self.socket, limit=ASYNC_HTTP_MAX_HEADER_BYTES)
+        try:
+            await self._stop.wait()
+        finally:
+            server.close()
+            # Idle keep-alive connections would otherwise keep serving requests
+            # against a stopped host until their read timeout expires.
+            for writer in list(self._writers):
+                writer.close()
+            for ready in list(self._poll_events):
+                ready.set()
+
+    async def _drain_connections(self) -> None:
+        pending = asyncio.all_tasks() - {asyncio.current_task()}
+        if not pending:
+            return
+        _done, unfinished = await asyncio.wait(pending, timeout=ASYNC_HTTP_SHUTDOWN_GRACE_SECONDS)
+        for task in unfinished:
+            task.cancel()
+        await asyncio.gather(*unfinished, return_exceptions=True)
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._writers.add(writer)
+        try:
+            while not self._stop.is_set():
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), HTTP_KEEP_ALIVE_TIMEOUT_SECONDS)
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, TimeoutError, OSError):
+                    return
+                if not await self._serve_request(head, reader, writer):
+                    return
+        except asyncio.CancelledError:
+            return  # server shutdown; handled here so asyncio does not report the connection
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+            with contextlib.suppress(Exception):
+                await writer.wait_closed()
+
+    async def _serve_request(self, head: bytes, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        loop = asyncio.get_running_loop()
+        handler = self._new_handler(head, writer.get_extra_info("peername"))
+        head_output = handler.wfile
+        parsed = handler.parse_request()
+        if parsed and not hasattr(handler, f"do_{handler.command}"):
+            handler.send_error(501, f"Unsupported method ({handler.command!r})")
+            parsed = False
+        relay_poll = self._relay_poll_name(handler) if parsed else None
+        if relay_poll is not None and isinstance(handler, RequestHandler):
+            handler._body_consumed = handler.command != "POST"
+            authorized = _authorize(handler)
+            await self._flush(writer, head_output)
+            if authorized:
+                if handler.command == "POST":
+                    length = int(handler.headers.get("Content-Length") or 0)
+                    handler.rfile = io.BytesIO(await reader.readexactly(length))
+                await self._serve_relay_poll(handler, relay_poll[0], relay_poll[1], writer)
+            return not handler.close_connection
+        await self._flush(writer, head_output)
+        if not parsed:
+            return False
+        handler.rfile = _StreamReaderBridge(reader, loop)
+        handler.wfile = _StreamWriterBridge(writer, loop)
+        try:
+            await loop.run_in_executor(self._executor, getattr(handler, f"do_{handler.command}"))
+        except Exception:
+            return False
+        return not handler.close_connection
+
+    def _new_handler(self, head: bytes, client_address: Any) -> BaseHTTPRequestHandler:
+        # Skip StreamRequestHandler.__init__, which would handle a socket
+        # synchronously; the head was already read from the asyncio stream.
+        handler = self.handler_cls.__new__(self.handler_cls)
+        handler.server = self  # type: ignore[assignment]
+        handler.client_address = client_address
+        handler.request = None
+        handler.close_connection = True
+        request_line, _, header_block = head.partition(b"\r\n")
+        handler.raw_requestline = request_line + b"\r\n"
+        handler.rfile = io.BytesIO(header_block)
+        handler.wfile = io.BytesIO()
+        return handler
+
+    def _relay_poll_name(self, handler: BaseHTTPRequestHandler) -> tuple[str, float] | None:
+        if handler.command not in ("GET", "POST"):
+            return None
+        content_type = str(handler.headers.get("Content-Type") or "").split(";", 1)[0].strip().casefold()
+        if handler.command == "POST" and (
+            handler.headers.get("Transfer-Encoding") or content_type == PICKLE_CONTENT_TYPE
+        ):
+            return None
+        parsed = urlparse(handler.path)
+        parts = _route_parts(self.host_runtime.public_url, parsed.path)
+        if not _is_relay_poll_route(parts):
+            return None
+        try:
+            return parts[2], _relay_poll_timeout(parse_qs(parsed.query))
+        except ValueError:
+            return None  # the threaded handler path reports the malformed timeout
+
+    async def _serve_relay_poll(
+        self,
+        handler: RequestHandler,
+        node_name: str,
+        timeout: float,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        host = self.host_runtime
+        loop = asyncio.get_running_loop()
+        handler.wfile = _StreamWriterBridge(writer, loop)
+        payload: dict[str, Any] | None = None
+        if handler.command == "POST":
+            payload = await loop.run_in_executor(self._executor, _apply_relay_acks, handler)
+            if payload is None:
+                return
+        name, delivery_queue = host._relay_poll_begin(node_name)
+        deliveries: list[RelayDelivery] = []
+        try:
+            delivery = await self._next_delivery(name, delivery_queue, timeout)
+            if delivery is not None:
+                deliveries.append(delivery)
+                if payload is not None:
+                    deliveries.extend(_drain_relay_queue(delivery_queue, _relay_poll_limit(payload) - 1))
+        finally:
+            host._relay_poll_end(name)
+        if payload is None:
+            await loop.run_in_executor(
+                self._executor,
+                handler._write_result,
+                lambda: host._relay_poll_result(name, deliveries[0] if deliveries else None),
+            )
+        else:
+            await loop.run_in_executor(
+                self._executor,
+                handler._write_result,
+                lambda: host._relay_batch_result(name, deliveries),
+            )
+
+    async def _next_delivery(
+        self,
+        name: str,
+        delivery_queue: queue.Queue[RelayDelivery | None],
+        timeout: float,
+    ) -> RelayDelivery | None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max(0.0, timeout)
+        ready = asyncio.Event()
+
+        def wake() -> None:
+            with contextlib.suppress(RuntimeError):
+                loop.call_soon_threadsafe(ready.set)
+
+        self.host_runtime._relay_add_waiter(name, wake)
+        self._poll_events.add(ready)
+        try:
+            while not self._stop.is_set():
+                ready.clear()
+                try:
+                    return delivery_queue.get_nowait()
+                except queue.Empty:
+                    pass
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return None
+                try:
+                    await asyncio.wait_for(ready.wait(), remaining)
+                except TimeoutError:
+                    return None
+            return None
+        finally:
+            self._poll_events.discard(ready)
+            self.host_runtime._relay_remove_waiter(name, wake)
+
+    @staticmethod
+    async def _flush(writer: asyncio.StreamWriter, output: Any) -> None:
+        data = output.getvalue()
+        if data:
+            writer.write(data)
+            await writer.drain()
+
+
+def _authorize(handler: RequestHandler) -> bool:
+    with handler._error_responses():
+        handler._require_auth()
+        return True
+    return False
+
+
+def _run_on_loop(coroutine: Any, loop: asyncio.AbstractEventLoop) -> Any:
+    try:
+        future = asyncio.run_coroutine_threadsafe(coroutine, loop)
+    except RuntimeError as exc:
+        coroutine.close()
+        raise ConnectionResetError("HTTP server stopped") from exc
+    return future.result(ASYNC_HTTP_IO_TIMEOUT_SECONDS)
+
+
+def _apply_relay_acks(handler: RequestHandler) -> dict[str, Any] | None:
+    with handler._error_responses():
+        payload = handler._read_payload()
+        handler.server.host_runtime.relay_ack_batch(list(payload.get("acks") or []))
+        return payload
+    return None
+
+
+class _StreamReaderBridge:
+    """Blocking ``rfile`` for executor threads, reading from an asyncio stream.
+
+    Reads never ask the stream for more than the caller wants, so bytes of a
+    following keep-alive request stay in the stream for the event loop.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, loop: asyncio.AbstractEventLoop):
+        self._reader = reader
+        self._loop = loop
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            return self._call(self._reader.read(-1))
+        return self._call(self._read_exactly(size))
+
+    def readline(self, size: int = -1) -> bytes:
+        return self._call(self._reader.readline())
+
+    async def _read_exactly(self, size: int) -> bytes:
+        try:
+            return await self._reader.readexactly(size)
+        except asyncio.IncompleteReadError as exc:
+            return exc.partial
+
+    def _call(self, coroutine: Any) -> bytes:
+        return _run_on_loop(coroutine, self._loop)
+
+
+class _StreamWriterBridge:
+    """Blocking ``wfile`` for executor threads, writing to an asyncio stream with backpressure."""
+
+    def __init__(self, writer: asyncio.StreamWriter, loop: asyncio.AbstractEventLoop):
+        self._writer = writer
+        self._loop = loop
+
+    def write(self, data: Any) -> int:
+        payload = bytes(data)
+        _run_on_loop(self._write(payload), self._loop)
+        return len(payload)
+
+    def flush(self) -> None:
+        return None
+
+    async def _write(self, data: bytes) -> None:
+        if self._writer.is_closing():
+            raise ConnectionResetError("connection closed")
+        self._writer.write(data)
+        await self._writer.drain()
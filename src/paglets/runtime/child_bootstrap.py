@@ -5,6 +5,7 @@ from __future__ import annotations
 import contextlib
 import signal
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from dataclasses import is_dataclass
 from multiprocessing.connection import Connection
 from typing import Any
@@ -65,35 +66,102 @@ def _child_main(config: ChildConfig, conn: Connection) -> None:
     facade.attach_agent(agent)
     endpoint.agent = agent
     endpoint.facade = facade
+    agent.resources.on_change = endpoint.push_status
     agent._attach(PagletContext(facade, agent.agent_id))
 
+    concurrency = agent_cls.message_concurrency()
+    executor = (
+        ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"paglets-message-{agent.agent_id[:8]}")
+        if concurrency > 1
+        else None
+    )
+    in_flight: set[Future[None]] = set()
     try:
         while True:
             request = endpoint.next_request()
-            if request is None:
+            if request is None or facade.terminal:
                 break
             request_id = str(request.get("id") or "")
             op = str(request.get("op") or "")
             payload = dict(request.get("payload") or {})
-            try:
-                result = _handle_child_request(agent, facade, op, payload)
-            except Exception as exc:
-                endpoint.reply_error(request_id, exc)
-            else:
-                if facade.terminal and op == "message" and isinstance(result, dict):
-                    result = {"result": result.get("result"), "resources": result.get("resources", {})}
-                run_after_reply = bool(result.pop(_RUN_AFTER_REPLY, False)) if isinstance(result, dict) else False
-                endpoint.reply_ok(request_id, result)
-                if run_after_reply:
-                    _run_agent_async(agent, endpoint)
-                if facade.terminal:
-                    break
+            if executor is not None and op == "message":
+                future = executor.submit(_serve_concurrent_message, agent, facade, endpoint, request_id, payload)
+                in_flight.add(future)
+                future.add_done_callback(in_flight.discard)
+                continue
+            # Lifecycle and resource ops never overlap a running handler.
+            wait(list(in_flight))
+            if facade.terminal:
+                break
+            _serve_child_request(agent, facade, endpoint, request_id, op, payload)
+            if facade.terminal:
+                break
     finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
         endpoint.close()
         wait_for_local_pickle_senders()
         reader.join(timeout=0.2)
 
 
+def _serve_child_request(
+    agent: Paglet,
+    facade: _ChildHostFacade,
+    endpoint: _ChildEndpoint,
+    request_id: str,
+    op: str,
+    payload: dict[str, Any],
+) -> None:
+    try:
+        result = _handle_child_request(agent, facade, op, payload)
+    except Exception as exc:
+        endpoint.reply_error(request_id, exc)
+        return
+    if facade.terminal and op == "message" and isinstance(result, dict):
+        result = {"result": result.get("result"), "resources": result.get("resources", {})}
+    run_after_reply = bool(result.pop(_RUN_AFTER_REPLY, False)) if isinstance(result, dict) else False
+    endpoint.reply_ok(request_id, result)
+    if run_after_reply:
+        _run_agent_async(agent, endpoint)
+
+
+def _serve_concurrent_message(
+    agent: Paglet,
+    facade: _ChildHostFacade,
+    endpoint: _ChildEndpoint,
+    request_id: str,
+    payload: dict[str, Any],
+) -> None:
+    """Handle one message on the pool and reply with the state as of sending.
+
+    Handlers finish in any order, so the state snapshot taken when the handler
+    returned may already be older than one another handler replied with. The
+    parent patches replies in pipe order, so the snapshot is retaken under the
+    state lock right before the reply goes out.
+    """
+
+    try:
+        reply_result = _handle_message(agent, payload)
+    except Exception as exc:
+        endpoint.reply_error(request_id, exc)
+        return
+    with agent.locked_state():
+        if facade.terminal:
+            reply = {"result": reply_result, "resources": agent.resources.status()}
+        else:
+            reply = _agent_snapshot(agent)
+            reply["result"] = reply_result
+        endpoint.reply_ok(request_id, reply)
+
+
+def _handle_message(agent: Paglet, payload: dict[str, Any]) -> Any:
+    message = Message.from_wire(payload["message"])
+    result = agent.handle_message(message)
+    if result is NOT_HANDLED:
+        raise NotHandledError(f"{agent.__class__.__name__} did not handle {message.kind!r}")
+    return None if payload.get("oneway") else result
+
+
 def _handle_child_request(agent: Paglet, facade: _ChildHostFacade, op: str, payload: dict[str, Any]) -> dict[str, Any]:
     if op == "lifecycle":
         run_after_reply = _run_lifecycle(agent, facade, str(payload["name"]), dict(payload.get("event") or {}))
@@ -102,12 +170,9 @@ def _handle_child_request(agent: Paglet, facade: _ChildHostFacade, op: str, payl
             snapshot[_RUN_AFTER_REPLY] = True
         return snapshot
     if op == "message":
-        message = Message.from_wire(payload["message"])
-        result = agent.handle_message(message)
-        if result is NOT_HANDLED:
-            raise NotHandledError(f"{agent.__class__.__name__} did not handle {message.kind!r}")
+        result = _handle_message(agent, payload)
         snapshot = _agent_snapshot(agent)
-        snapshot["result"] = None if payload.get("oneway") else result
+        snapshot["result"] = result
         return snapshot
     if op == "cleanup_resources":
         agent.resources.cleanup(reason=str(payload.get("reason") or "lifecycle"))
@@ -229,6 +294,8 @@ def _run_agent_async(agent: Paglet, endpoint: _ChildEndpoint) -> None:
             with contextlib.suppress(Exception):
                 endpoint._send({"type": "event", "event": "run_failed", "error": _error_to_wire(exc)})
         finally:
+            with contextlib.suppress(Exception):
+                endpoint.push_status(include_state=True)
             with contextlib.suppress(Exception):
                 endpoint._send({"type": "event", "event": "run_complete"})
 
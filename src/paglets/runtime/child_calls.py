@@ -130,6 +130,7 @@ class _ChildCallMixin:
                 payload.get("name"),
                 capability=payload.get("capability"),
                 scope=enum_from_wire(payload.get("scope") or ServiceScope.LOCAL.value, ServiceScope, "scope"),
+                refresh=bool(payload.get("refresh", False)),
             )
             return {"services": [record.to_wire() for record in records]}
         if op == "lease_service_handle":
@@ -303,11 +304,12 @@ class _ChildCallMixin:
 
     def _handle_child_storage_call(self, agent_id: str, op: str, payload: dict[str, Any]) -> Any:
         storage = self.persistent_storage_for(agent_id, quota_bytes=payload.get("quota_bytes"))
-        if op == "storage_read_bytes":
-            return {"data": storage.read_bytes(str(payload["path"]))}
-        if op == "storage_write_bytes":
-            path = storage.write_bytes(str(payload["path"]), payload.get("data") or b"")
+        if op == "storage_reserve_write":
+            path = storage.reserve_write(str(payload["path"]), int(payload["size"]))
             return {"path": str(path)}
+        if op == "storage_invalidate":
+            storage.usage.invalidate()
+            return {"ok": True}
         if op == "storage_delete":
             storage.delete(str(payload["path"]))
             return {"ok": True}
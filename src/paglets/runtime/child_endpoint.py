@@ -20,6 +20,7 @@ from paglets.runtime.process_protocol import (
     _handle_local_pickle_stream_event,
     _materialize_state_stream,
     _state_stream_token,
+    _StateDeltaTracker,
     _stream_state_payload,
 )
 
@@ -35,6 +36,7 @@ class _ChildEndpoint:
         self._pending_lock = threading.Lock()
         self._requests: queue.Queue[dict[str, Any] | None] = queue.Queue()
         self._closed = threading.Event()
+        self.state_tracker = _StateDeltaTracker()
         self.agent: Paglet | None = None
         self.facade: _ChildHostFacade | None = None
 
@@ -47,7 +49,24 @@ class _ChildEndpoint:
         return self._requests.get()
 
     def reply_ok(self, request_id: str, payload: Any) -> None:
-        self._send({"type": "reply", "id": request_id, "ok": True, "payload": _stream_state_payload(payload)})
+        with self.state_tracker.lock:
+            payload = _stream_state_payload(self.state_tracker.encode(payload))
+            self._send({"type": "reply", "id": request_id, "ok": True, "payload": payload})
+
+    def push_status(self, *, include_state: bool = False) -> None:
+        """Push resource status, and optionally a state delta, without a request.
+
+        The parent keeps the pushed values as its cached view, so listings do
+        not need a pipe round trip per paglet.
+        """
+
+        if self.agent is None or self._closed.is_set():
+            return
+        snapshot = _agent_snapshot(self.agent) if include_state else {"resources": self.agent.resources.status()}
+        with self.state_tracker.lock:
+            payload = _stream_state_payload(self.state_tracker.encode(snapshot))
+            with contextlib.suppress(Exception):
+                self._send({"type": "event", "event": "status", "payload": payload})
 
     def reply_error(self, request_id: str, exc: Exception) -> None:
         self._send({"type": "reply", "id": request_id, "ok": False, "error": _error_to_wire(exc)})
@@ -115,6 +134,8 @@ class _ChildEndpoint:
             if self.agent is None:
                 raise InvalidAgentError("paglet child is not initialized")
             if message.get("op") == "state":
+                if (message.get("payload") or {}).get("full"):
+                    self.state_tracker.invalidate()
                 payload = _agent_snapshot(self.agent)
             else:
                 payload = {"resources": self.agent.resources.status()}
@@ -2,6 +2,7 @@
 # Licensed under the MIT License. See LICENSE for details.
 from __future__ import annotations
 
+import contextlib
 import threading
 import uuid
 from pathlib import Path
@@ -16,7 +17,7 @@ from paglets.core.errors import (
 from paglets.core.events import CloneEvent, MobilityEvent, PersistencyEvent
 from paglets.core.runtime_values import ServiceScope
 from paglets.persistence.persistency import DeactivationPolicy, DeactivationRequest
-from paglets.persistence.storage import StorageStatus
+from paglets.persistence.storage import StorageStatus, resolve_storage_path
 from paglets.remote.client import HostClient
 from paglets.remote.proxy import PagletProxy
 from paglets.remote.transfer import TransferTicket
@@ -93,6 +94,10 @@ class _ChildHostFacade:
         return self._endpoint.host_call(op, payload or {})
 
     def _call_with_state(self, op: str, payload: dict[str, Any], state: Any) -> Any:
+        if self._agent is not None and state is self._agent.state:
+            # The parent replaces its cached state from this call, so the next
+            # reply must be a full snapshot rather than a delta.
+            self._endpoint.state_tracker.invalidate()
         streamed = dict(payload)
         stream = start_local_pickle_sender(dataclass_to_wire(state))
         streamed["state_stream"] = stream
@@ -404,10 +409,11 @@ class _ChildHostFacade:
         *,
         capability: str | None = None,
         scope: ServiceScope = ServiceScope.LOCAL,
+        refresh: bool = False,
     ) -> list[ServiceRecord]:
         payload = self._call(
             "lookup_services",
-            {"name": name, "capability": capability, "scope": scope.value},
+            {"name": name, "capability": capability, "scope": scope.value, "refresh": refresh},
         )
         return [ServiceRecord.from_wire(item) for item in payload.get("services", [])]
 
@@ -440,21 +446,36 @@ class _ChildHostFacade:
 
 
 class _ChildManagedStorage:
+    """Child view of a host ``ManagedStorage``.
+
+    File contents never cross the pipe: reads open the file below ``root``
+    directly, and writes ask the host only to check and book the quota before
+    the child writes the file itself.
+    """
+
     def __init__(self, host: _ChildHostFacade, root: str, *, quota_bytes: int | None):
         self._host = host
         self.root = Path(root)
         self.quota_bytes = quota_bytes
 
     def read_bytes(self, path: Path | str) -> bytes:
-        payload = self._host._call("storage_read_bytes", {"path": str(path), "quota_bytes": self.quota_bytes})
-        return bytes(payload["data"])
+        return resolve_storage_path(self.root, path).read_bytes()
 
     def write_bytes(self, path: Path | str, data: bytes) -> Path:
+        view = memoryview(data)
         payload = self._host._call(
-            "storage_write_bytes",
-            {"path": str(path), "data": bytes(data), "quota_bytes": self.quota_bytes},
+            "storage_reserve_write",
+            {"path": str(path), "size": view.nbytes, "quota_bytes": self.quota_bytes},
         )
-        return Path(payload["path"])
+        target = Path(payload["path"])
+        try:
+            with target.open("wb") as handle:
+                handle.write(view)
+        except BaseException:
+            with contextlib.suppress(Exception):
+                self._host._call("storage_invalidate", {"quota_bytes": self.quota_bytes})
+            raise
+        return target
 
     def write_text(self, path: Path | str, text: str, *, encoding: str = "utf-8") -> Path:
         return self.write_bytes(path, text.encode(encoding))
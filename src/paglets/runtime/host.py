@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 import contextlib
+import functools
 import os
 import queue
 import shutil
 import threading
 import time
 from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -36,27 +38,36 @@ from paglets.core.errors import (
 )
 from paglets.core.messages import DEACTIVATE, UNQUEUED_PRIORITY, Message, ReplySet
 from paglets.core.runtime_values import (
+    HTTPServerMode,
     LaunchConfigSyncAction,
+    enum_from_wire,
 )
 from paglets.persistence.persistency import DeactivationRequest, InactiveRecord, QueuedMessage
-from paglets.persistence.storage import DEFAULT_PERSISTENT_STORAGE_QUOTA_BYTES, ManagedStorage
+from paglets.persistence.storage import (
+    DEFAULT_PERSISTENT_STORAGE_QUOTA_BYTES,
+    ManagedStorage,
+    UsageCounter,
+    directory_size,
+)
 from paglets.remote.client import HostClient
 from paglets.remote.mesh import HostRef, MeshRegistry
 from paglets.remote.proxy import PagletProxy
+from paglets.runtime.async_http import AsyncPagletHTTPServer as _AsyncPagletHTTPServer
 from paglets.runtime.binding import _bind_host_specs, _resolve_bind_hosts, _resolve_public_host
 from paglets.runtime.child_calls import _ChildCallMixin
 from paglets.runtime.http_api import PagletHTTPServer as _PagletHTTPServer
 from paglets.runtime.http_api import RequestHandler as _RequestHandler
 from paglets.runtime.inactive_records import _InactiveRecordsMixin
 from paglets.runtime.lifecycle import _LifecycleMixin
-from paglets.runtime.mailbox import MessageMailbox
-from paglets.runtime.process_runtime import ChildProcessController, make_child_config
+from paglets.runtime.mailbox import DEFAULT_MESSAGE_WORKERS, MessageMailbox, MessageScheduler
+from paglets.runtime.process_runtime import ChildProcessController, ChildProcessPool, make_child_config
 from paglets.runtime.relay import RelayDelivery as _RelayDelivery
 from paglets.runtime.relay import RelayMixin
 from paglets.runtime.relay import RelayNode as _RelayNode
 from paglets.runtime.resident_services import _ManagedResidentService, _ResidentServicesMixin
-from paglets.serialization.codec import dataclass_from_wire, qualified_name
+from paglets.serialization.codec import dataclass_from_wire, qualified_name, resolve_qualified_name
 from paglets.services.contracts import ServiceRegistry
+from paglets.services.directory import MESH_SERVICE_DIRECTORY_MAX_AGE_SECONDS, MeshServiceDirectory
 
 HOST_CAPABILITIES = [
     "agents:list",
@@ -72,6 +83,7 @@ HOST_CAPABILITIES = [
     "events:list",
     "hosts:list",
     "hosts:join",
+    "hosts:gossip",
     "messages:mailbox",
     "services:list",
     "services:mesh",
@@ -91,7 +103,12 @@ NETWORK_BIND_WATCH_INTERVAL_SECONDS = 5.0
 MESH_SERVICE_LOOKUP_TIMEOUT_SECONDS = 1.0
 RELAY_OFFLINE_AFTER_SECONDS = 30.0
 RELAY_QUEUE_LIMIT = 1024
+STORAGE_USAGE_RECONCILE_SECONDS = 300.0
+LIST_AGENTS_STATE_WORKERS = 16
+LIST_AGENTS_STATE_DEADLINE_SECONDS = 5.0
+
 
+_HTTPServer = _PagletHTTPServer | _AsyncPagletHTTPServer
 
 DEFAULT_PERSISTENCE_ROOT = Path.home() / ".paglets" / "hosts"
 
@@ -140,6 +157,11 @@ class Host(_LifecycleMixin, _ResidentServicesMixin, _ChildCallMixin, _InactiveRe
         relay_queue_limit: int = RELAY_QUEUE_LIMIT,
         tags: Sequence[str] | None = None,
         properties: dict[str, str] | None = None,
+        child_pool_size: int = 0,
+        child_pool_preload: Sequence[str] | None = None,
+        child_pool_class_preload: dict[str, Sequence[str]] | None = None,
+        message_workers: int = DEFAULT_MESSAGE_WORKERS,
+        http_server: HTTPServerMode | str = HTTPServerMode.THREADED,
     ):
         self.name = name
         self.tags = _normalize_host_tags(tags or ())
@@ -154,6 +176,7 @@ class Host(_LifecycleMixin, _ResidentServicesMixin, _ChildCallMixin, _InactiveRe
         self._bind_watch_stop = threading.Event()
         self._bind_watch_thread: threading.Thread | None = None
         self._server_lock = threading.RLock()
+        self.http_server = enum_from_wire(str(http_server), HTTPServerMode, "http_server")
         self.bind_hosts = _resolve_bind_hosts(self._bind_host_specs)
         self.bind_host = self.bind_hosts[0]
         self.public_host = _resolve_public_host(self.bind_host)
@@ -165,7 +188,17 @@ class Host(_LifecycleMixin, _ResidentServicesMixin, _ChildCallMixin, _InactiveRe
         if api_key and getattr(self.client, "api_key", None) is None:
             self.client.api_key = api_key
         self._agents: dict[str, ChildProcessController] = {}
+        self._child_pool = ChildProcessPool(
+            child_pool_size,
+            preload_modules=list(child_pool_preload or ()),
+            class_preload_modules=child_pool_class_preload,
+            name=self._safe_host_name(name),
+        )
         self._mailboxes: dict[str, MessageMailbox] = {}
+        self._message_scheduler = MessageScheduler(
+            message_workers,
+            name=f"paglets-messages-{self._safe_host_name(name)}",
+        )
         self.persistence_dir = (
             Path(persistence_dir).expanduser()
             if persistence_dir is not None
@@ -174,6 +207,7 @@ class Host(_LifecycleMixin, _ResidentServicesMixin, _ChildCallMixin, _InactiveRe
         self._inactive_dir = self.persistence_dir / "inactive"
         self._work_root = self.persistence_dir / "work"
         self._storage_root = self.persistence_dir / "storage"
+        self._storage_usage: dict[Path, UsageCounter] = {}
         self._artifact_root = self.persistence_dir / "artifacts"
         self.persistent_storage_quota_bytes = persistent_storage_quota_bytes
         self.artifact_max_bytes = 0 if artifact_max_bytes is None else max(0, int(artifact_max_bytes))
@@ -187,6 +221,7 @@ class Host(_LifecycleMixin, _ResidentServicesMixin, _ChildCallMixin, _InactiveRe
             max_artifact_bytes=self.artifact_max_bytes,
             quota_bytes=self.artifact_storage_quota_bytes,
             spool_ttl_seconds=self.artifact_spool_ttl_seconds,
+            usage_reconcile_seconds=STORAGE_USAGE_RECONCILE_SECONDS,
         )
         self._registered_files: dict[str, dict[str, PagletFileRef]] = {}
         self._inactive: dict[str, InactiveRecord] = {}
@@ -198,8 +233,8 @@ class Host(_LifecycleMixin, _ResidentServicesMixin, _ChildCallMixin, _InactiveRe
         self.launch_config = launch_config
         self.launch_config_sync_result = launch_config_sync_result
         self._lock = threading.RLock()
-        self._server: _PagletHTTPServer | None = None
-        self._servers: list[_PagletHTTPServer] = []
+        self._server: _HTTPServer | None = None
+        self._servers: list[_HTTPServer] = []
         self._thread: threading.Thread | None = None
         self._threads: list[threading.Thread] = []
         self._activation_stop = threading.Event()
@@ -209,8 +244,12 @@ class Host(_LifecycleMixin, _ResidentServicesMixin, _ChildCallMixin, _InactiveRe
         self._relay_stop = threading.Event()
         self._relay_client_thread: threading.Thread | None = None
         self._relay_nodes: dict[str, _RelayNode] = {}
-        self._relay_queues: dict[str, queue.Queue[_RelayDelivery]] = {}
+        self._relay_queues: dict[str, queue.Queue[_RelayDelivery | None]] = {}
         self._relay_pending: dict[str, _RelayDelivery] = {}
+        self._relay_waiters: dict[str, set[Callable[[], None]]] = {}
+        self._relay_ack_lock = threading.Lock()
+        self._relay_acks: list[dict[str, Any]] = []
+        self._relay_polling = False
         self.relay_offline_after = max(0.1, float(relay_offline_after))
         self.relay_delivery_timeout = (
             10.0 if relay_delivery_timeout is None else max(0.01, float(relay_delivery_timeout))
@@ -240,6 +279,11 @@ class Host(_LifecycleMixin, _ResidentServicesMixin, _ChildCallMixin, _InactiveRe
             gossip_interval=mesh_gossip_interval,
             offline_after=mesh_offline_after,
         )
+        self.mesh_services = MeshServiceDirectory(
+            self._fetch_mesh_services,
+            max_age=max(MESH_SERVICE_DIRECTORY_MAX_AGE_SECONDS, 3.0 * self.mesh.gossip_interval),
+            refresh_timeout=MESH_SERVICE_LOOKUP_TIMEOUT_SECONDS,
+        )
         self._load_inactive_records()
 
     def start_background(self) -> None:
@@ -252,6 +296,7 @@ class Host(_LifecycleMixin, _ResidentServicesMixin, _ChildCallMixin, _InactiveRe
             self._clear_work_root()
             servers = self._open_http_servers(self.bind_hosts, self.port)
             self._install_http_servers(servers, self.bind_hosts)
+        self._child_pool.start()
         self._activation_stop.clear()
         self._emit_launch_config_sync_result()
         self._start_resident_services()
@@ -295,13 +340,18 @@ class Host(_LifecycleMixin, _ResidentServicesMixin, _ChildCallMixin, _InactiveRe
             threads = list(self._threads)
             if not threads and self._thread is not None:
                 threads = [self._thread]
+        for running_server in servers:
+            running_server.disable_keep_alive()
         self._stop_relay_client()
         self._stop_activation_scheduler()
         self._stop_artifact_cleanup()
         if deactivate_active:
             self._deactivate_active_for_shutdown()
         self._terminate_active_children()
+        self._message_scheduler.stop()
+        self._child_pool.stop()
         self.mesh.stop()
+        self.mesh_services.close()
         self._emit("context-shutdown")
         with self._server_lock:
             self._clear_http_servers()
@@ -315,6 +365,7 @@ class Host(_LifecycleMixin, _ResidentServicesMixin, _ChildCallMixin, _InactiveRe
             self._clear_work_root()
             self.artifacts.set_host_url(self.address)
             self.artifacts.cleanup_temporary()
+        self._child_pool.start()
         self._activation_stop.clear()
         self._emit_launch_config_sync_result()
         self._activate_startup_records()
@@ -326,19 +377,20 @@ class Host(_LifecycleMixin, _ResidentServicesMixin, _ChildCallMixin, _InactiveRe
         self._start_artifact_cleanup()
         self._emit("context-start")
 
-    def _open_http_servers(self, bind_hosts: list[str], port: int) -> list[_PagletHTTPServer]:
-        servers: list[_PagletHTTPServer] = []
+    def _open_http_servers(self, bind_hosts: list[str], port: int) -> list[_HTTPServer]:
+        servers: list[_HTTPServer] = []
         try:
             for index, bind_host in enumerate(bind_hosts):
                 bind_port = port if index == 0 or port != 0 else int(servers[0].server_address[1])
-                servers.append(_PagletHTTPServer((bind_host, bind_port), _RequestHandler, self))
+                server_cls = _AsyncPagletHTTPServer if self.http_server is HTTPServerMode.ASYNCIO else _PagletHTTPServer
+                servers.append(server_cls((bind_host, bind_port), _RequestHandler, self))
         except Exception:
             for server in servers:
                 server.server_close()
             raise
         return servers
 
-    def _install_http_servers(self, servers: list[_PagletHTTPServer], bind_hosts: list[str]) -> None:
+    def _install_http_servers(self, servers: list[_HTTPServer], bind_hosts: list[str]) -> None:
         _actual_host, actual_port = servers[0].server_address[:2]
         self.bind_hosts = list(bind_hosts)
         self.bind_host = self.bind_hosts[0]
@@ -365,7 +417,7 @@ class Host(_LifecycleMixin, _ResidentServicesMixin, _ChildCallMixin, _InactiveRe
 
     def _shutdown_http_servers(
         self,
-        servers: list[_PagletHTTPServer],
+        servers: list[_HTTPServer],
         threads: list[threading.Thread],
     ) -> None:
         for running_server in servers:
@@ -539,10 +591,16 @@ class Host(_LifecycleMixin, _ResidentServicesMixin, _ChildCallMixin, _InactiveRe
     def persistent_storage_for(self, agent_id: str, *, quota_bytes: int | None = None) -> ManagedStorage:
         record = self._require_agent(agent_id)
         quota = self.persistent_storage_quota_bytes if quota_bytes is None else quota_bytes
-        return ManagedStorage(
-            self._storage_root / self._storage_class_key(record.agent_class_name),
-            quota_bytes=quota,
-        )
+        root = self._storage_root / self._storage_class_key(record.agent_class_name)
+        with self._lock:
+            usage = self._storage_usage.get(root)
+            if usage is None:
+                usage = UsageCounter(
+                    functools.partial(directory_size, root.resolve(strict=False)),
+                    reconcile_interval=STORAGE_USAGE_RECONCILE_SECONDS,
+                )
+                self._storage_usage[root] = usage
+        return ManagedStorage(root, quota_bytes=quota, usage=usage)
 
     def register_file_for(
         self,
@@ -593,15 +651,26 @@ class Host(_LifecycleMixin, _ResidentServicesMixin, _ChildCallMixin, _InactiveRe
         inactive: bool = False,
         include_state: bool = False,
     ) -> list[dict[str, Any]]:
+        """Summarize paglets from cached child status.
+
+        Only ``include_state`` contacts children: their state is fetched in
+        parallel, and paglets that miss the shared deadline report their last
+        known state.
+        """
+
         with self._lock:
             active_records = list(self._agents.values()) if active else []
             inactive_records = list(self._inactive.values()) if inactive else []
-            agents = [self._summary(agent) for agent in active_records]
-            if inactive:
-                agents.extend(self._inactive_summary(record) for record in inactive_records)
-        if not include_state:
+        agents = [self._summary(agent) for agent in active_records]
+        agents.extend(self._inactive_summary(record) for record in inactive_records)
+        if not include_state or not agents:
             return agents
-        return [self._summary_with_state(item) for item in agents]
+        deadline = time.monotonic() + LIST_AGENTS_STATE_DEADLINE_SECONDS
+        with ThreadPoolExecutor(
+            max_workers=min(LIST_AGENTS_STATE_WORKERS, len(agents)),
+            thread_name_prefix="paglets-list-state",
+        ) as executor:
+            return list(executor.map(lambda item: self._summary_with_state(item, deadline=deadline), agents))
 
     def health(self) -> dict[str, Any]:
         with self._lock:
@@ -621,9 +690,12 @@ class Host(_LifecycleMixin, _ResidentServicesMixin, _ChildCallMixin, _InactiveRe
             "capabilities": capabilities,
             "tags": list(self.tags),
             "properties": dict(self.host_properties),
+            "messages": self.message_scheduler_status(),
         }
         if self._relay_nodes:
             payload["relay_nodes"] = self.relay_diagnostics()["nodes"]
+        if self._child_pool.enabled:
+            payload["child_pool"] = self._child_pool.status()
         payload.update(self._git_update_health())
         return payload
 
@@ -634,6 +706,11 @@ class Host(_LifecycleMixin, _ResidentServicesMixin, _ChildCallMixin, _InactiveRe
         self.mesh.register_wire(payload)
         return self.mesh.hosts(include_self=True)
 
+    def gossip_mesh(self, payload: dict[str, Any]) -> dict[str, Any]:
+        response = self.mesh.handle_gossip(payload)
+        response["mesh_services"] = self.mesh_service_gossip(payload.get("mesh_services_version"))
+        return response
+
     def handle_git_update_request(self, payload: dict[str, Any]) -> dict[str, Any]:
         if not self.auto_update_from_git or self.git_repo_root is None:
             status = {
@@ -987,6 +1064,9 @@ class Host(_LifecycleMixin, _ResidentServicesMixin, _ChildCallMixin, _InactiveRe
     def mailbox_status(self, agent_id: str) -> dict[str, int]:
         return self._require_mailbox(agent_id).status().to_wire()
 
+    def message_scheduler_status(self) -> dict[str, int]:
+        return self._message_scheduler.status().to_wire()
+
     def _require_mailbox(self, agent_id: str) -> MessageMailbox:
         with self._lock:
             mailbox = self._mailboxes.get(agent_id)
@@ -1023,6 +1103,9 @@ class Host(_LifecycleMixin, _ResidentServicesMixin, _ChildCallMixin, _InactiveRe
         state: dict[str, Any],
     ) -> ChildProcessController:
         self._validate_agent_classes(agent_class_name, state_class_name)
+        # Resolved before the controller spawns or leases a child, so a bad
+        # class attribute cannot leave that child behind.
+        message_concurrency = resolve_qualified_name(agent_class_name).message_concurrency()
         config = make_child_config(
             host_name=self.name,
             host_address=self.address,
@@ -1039,11 +1122,13 @@ class Host(_LifecycleMixin, _ResidentServicesMixin, _ChildCallMixin, _InactiveRe
             ),
             crash_handler=self._handle_child_crash,
             run_failure_handler=self._handle_child_run_failure,
+            pool=self._child_pool,
         )
         mailbox = MessageMailbox(
             agent_id,
             lambda message, oneway, child_id=agent_id: self._deliver_active_message(child_id, message, oneway=oneway),
-            max_workers=1,
+            max_workers=message_concurrency,
+            scheduler=self._message_scheduler,
         )
         with self._lock:
             old_record = self._agents.pop(agent_id, None)
@@ -1101,7 +1186,7 @@ class Host(_LifecycleMixin, _ResidentServicesMixin, _ChildCallMixin, _InactiveRe
             "exitcode": record.exitcode,
             "error": record.last_error,
             "mailbox": mailbox.status().to_wire() if mailbox is not None else None,
-            "resources": record.resource_status_snapshot(),
+            "resources": dict(record.resource_status),
         }
 
     def _inactive_summary(self, record: InactiveRecord) -> dict[str, Any]:
@@ -1115,9 +1200,9 @@ class Host(_LifecycleMixin, _ResidentServicesMixin, _ChildCallMixin, _InactiveRe
             "deactivated_at": record.deactivated_at,
         }
 
-    def _summary_with_state(self, summary: dict[str, Any]) -> dict[str, Any]:
+    def _summary_with_state(self, summary: dict[str, Any], *, deadline: float | None = None) -> dict[str, Any]:
         try:
-            state_payload = self._state_payload(str(summary["agent_id"]))
+            state_payload = self._state_payload(str(summary["agent_id"]), deadline=deadline)
         except Exception as exc:
             enriched = dict(summary)
             enriched["state_error"] = str(exc)
@@ -1126,14 +1211,17 @@ class Host(_LifecycleMixin, _ResidentServicesMixin, _ChildCallMixin, _InactiveRe
         enriched.update(state_payload)
         return enriched
 
-    def _state_payload(self, agent_id: str) -> dict[str, Any]:
+    def _state_payload(self, agent_id: str, *, deadline: float | None = None) -> dict[str, Any]:
         with self._lock:
             record = self._agents.get(agent_id)
             mailbox = self._mailboxes.get(agent_id)
             inactive = self._inactive.get(agent_id)
         if record is not None:
+            timeout = 2.0 if deadline is None else min(2.0, deadline - time.monotonic())
             try:
-                state_payload = record.fetch_state(timeout=2.0)
+                if timeout <= 0:
+                    raise TimeoutError("state listing deadline passed")
+                state_payload = record.fetch_state(timeout=timeout)
             except Exception:
                 state_payload = dict(record.state)
             return {
@@ -1149,7 +1237,7 @@ class Host(_LifecycleMixin, _ResidentServicesMixin, _ChildCallMixin, _InactiveRe
                 "error": record.last_error,
                 "state": state_payload,
                 "mailbox": mailbox.status().to_wire() if mailbox is not None else None,
-                "resources": record.resource_status_snapshot(),
+                "resources": dict(record.resource_status),
             }
         if inactive is not None:
             return {
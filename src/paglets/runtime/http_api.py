@@ -6,6 +6,9 @@ import contextlib
 import hmac
 import json
 import shutil
+import socket
+import threading
+from collections.abc import Callable, Iterator
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import TYPE_CHECKING, Any
 from urllib.parse import parse_qs, urlparse
@@ -31,6 +34,10 @@ from paglets.services.resident import DEFAULT_SERVICE_LEASE_TTL_SECONDS
 if TYPE_CHECKING:
     from paglets.runtime.host import Host
 
+# Longer than the client pool's idle timeout, so clients normally retire idle
+# sockets before the server does.
+HTTP_KEEP_ALIVE_TIMEOUT_SECONDS = 60.0
+
 
 class PagletHTTPServer(ThreadingHTTPServer):
     daemon_threads = True
@@ -38,10 +45,40 @@ class PagletHTTPServer(ThreadingHTTPServer):
     def __init__(self, server_address: tuple[str, int], handler_cls: type[BaseHTTPRequestHandler], host_runtime: Host):
         super().__init__(server_address, handler_cls)
         self.host_runtime = host_runtime
+        self.keep_alive = True
+        self._connections: set[socket.socket] = set()
+        self._connections_lock = threading.Lock()
+
+    def disable_keep_alive(self) -> None:
+        """Answer every further request with ``Connection: close`` while the host stops."""
+
+        self.keep_alive = False
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        with self._connections_lock:
+            self._connections.add(request)
+        super().process_request(request, client_address)
+
+    def shutdown_request(self, request: Any) -> None:
+        with self._connections_lock:
+            self._connections.discard(request)
+        super().shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        # Idle keep-alive connections would otherwise keep serving requests
+        # against a stopped host until their read timeout expires.
+        with self._connections_lock:
+            connections = list(self._connections)
+        for connection in connections:
+            with contextlib.suppress(OSError):
+                connection.shutdown(socket.SHUT_RDWR)
 
 
 class RequestHandler(BaseHTTPRequestHandler):
     server: PagletHTTPServer
+    protocol_version = "HTTP/1.1"
+    timeout = HTTP_KEEP_ALIVE_TIMEOUT_SECONDS
 
     def log_message(self, format: str, *args: Any) -> None:  # keep examples/tests quiet
         return
@@ -56,13 +93,25 @@ class RequestHandler(BaseHTTPRequestHandler):
         self._handle("DELETE")
 
     def _handle(self, method: str) -> None:
-        try:
+        self._body_consumed = method != "POST"
+        with self._error_responses():
             self._require_auth()
             if self._handle_binary_artifact_route(method):
                 return
             payload = self._read_payload() if method == "POST" else {}
             result = self._route(method, self.path, payload)
             self._write_json(200, result)
+
+    def _write_result(self, produce: Callable[[], Any]) -> None:
+        """Write ``produce()`` as a JSON response, mapping errors like :meth:`_handle`."""
+
+        with self._error_responses():
+            self._write_json(200, produce())
+
+    @contextlib.contextmanager
+    def _error_responses(self) -> Iterator[None]:
+        try:
+            yield
         except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
             return
         except AuthenticationError as exc:
@@ -90,27 +139,34 @@ class RequestHandler(BaseHTTPRequestHandler):
     def _route(self, method: str, path: str, payload: dict[str, Any]) -> Any:
         host = self.server.host_runtime
         parsed = urlparse(path)
-        parts = [part for part in parsed.path.split("/") if part]
+        parts = _route_parts(host.public_url, parsed.path)
         query = parse_qs(parsed.query)
-        public_path_parts = _public_path_parts(host.public_url)
-        if public_path_parts and parts[: len(public_path_parts)] == public_path_parts:
-            parts = parts[len(public_path_parts) :]
 
         if method == "GET" and parts == ["health"]:
             return host.health()
         if method == "GET" and parts == ["hosts"]:
             return {"hosts": [ref.to_wire() for ref in host.list_hosts(include_self=True)]}
         if method == "POST" and parts == ["hosts", "join"]:
-            return {"hosts": [ref.to_wire() for ref in host.join_mesh(payload)]}
+            return {
+                "hosts": [ref.to_wire() for ref in host.join_mesh(payload)],
+                "mesh_services": host.mesh_service_gossip(payload.get("mesh_services_version")),
+            }
+        if method == "POST" and parts == ["hosts", "gossip"]:
+            return host.gossip_mesh(payload)
+        if method == "POST" and parts == ["hosts", "ping-req"]:
+            return host.mesh.handle_ping_request(payload)
         if method == "POST" and parts == ["admin", "git-update"]:
             if host.relay_mode:
                 raise ForbiddenError("Git auto-update is disabled in relay mode")
             return host.handle_git_update_request(payload)
         if method == "POST" and parts == ["relay", "connect"]:
             return host.relay_connect(payload)
-        if method == "GET" and len(parts) == 3 and parts[:2] == ["relay", "poll"]:
-            timeout = float((query.get("timeout") or ["25"])[0])
-            return host.relay_poll(parts[2], timeout=timeout)
+        if method == "GET" and _is_relay_poll_route(parts):
+            return host.relay_poll(parts[2], timeout=_relay_poll_timeout(query))
+        if method == "POST" and _is_relay_poll_route(parts):
+            return host.relay_poll_batch(parts[2], payload, timeout=_relay_poll_timeout(query))
+        if method == "POST" and parts == ["relay", "ack"]:
+            return host.relay_ack_batch(list(payload.get("acks") or []))
         if method == "POST" and len(parts) == 3 and parts[:2] == ["relay", "ack"]:
             return host.relay_ack(parts[2], payload)
         if method == "GET" and parts == ["relay", "diagnostics"]:
@@ -164,6 +220,16 @@ class RequestHandler(BaseHTTPRequestHandler):
             return {"artifacts": [ref.to_wire() for ref in host.artifacts.list(owner_agent_id=owner)]}
         if method == "GET" and len(parts) == 3 and parts[0] == "artifacts" and parts[2] == "metadata":
             return {"artifact": host.artifacts.ref(parts[1]).to_wire()}
+        if method == "POST" and len(parts) == 3 and parts[:2] == ["artifacts", "sha256"]:
+            existing = host.artifacts.create_from_existing(
+                parts[2],
+                size_bytes=int(payload.get("size_bytes", -1)),
+                owner_agent_id=str(payload.get("owner_agent_id") or ""),
+                name=str(payload.get("name") or ""),
+                compression=str(payload.get("compression") or ""),
+                expires_at=float(payload.get("expires_at") or 0.0),
+            )
+            return {"artifact": None if existing is None else existing.ref.to_wire()}
         if method == "DELETE" and len(parts) == 2 and parts[0] == "artifacts":
             host.artifacts.delete(parts[1])
             return {"ok": True}
@@ -171,6 +237,8 @@ class RequestHandler(BaseHTTPRequestHandler):
             name = (query.get("name") or [None])[0]
             capability = (query.get("capability") or [None])[0]
             scope = enum_from_wire((query.get("scope") or [ServiceScope.LOCAL.value])[0], ServiceScope, "scope")
+            if scope is ServiceScope.MESH and name is None and capability is None:
+                return host.mesh_service_gossip((query.get("known_version") or [None])[0])
             if scope is ServiceScope.MESH:
                 records = host._services.lookup_all(name, capability, scope=ServiceScope.MESH)
             else:
@@ -269,11 +337,8 @@ class RequestHandler(BaseHTTPRequestHandler):
     def _handle_binary_artifact_route(self, method: str) -> bool:
         host = self.server.host_runtime
         parsed = urlparse(self.path)
-        parts = [part for part in parsed.path.split("/") if part]
+        parts = _route_parts(host.public_url, parsed.path)
         query = parse_qs(parsed.query)
-        public_path_parts = _public_path_parts(host.public_url)
-        if public_path_parts and parts[: len(public_path_parts)] == public_path_parts:
-            parts = parts[len(public_path_parts) :]
 
         if method == "POST" and parts == ["artifacts"]:
             result = host.artifacts.create_from_http_request(
@@ -311,20 +376,22 @@ class RequestHandler(BaseHTTPRequestHandler):
         self.send_header("Content-Type", "application/octet-stream")
         self.send_header("Content-Length", str(ref.size_bytes))
         self.send_header("X-Paglets-Artifact-Sha256", ref.sha256)
-        self.end_headers()
+        self._end_headers()
         with path.open("rb") as source:
             shutil.copyfileobj(source, self.wfile, length=STREAM_CHUNK_BYTES)
 
     def _read_payload(self) -> dict[str, Any]:
         content_type = str(self.headers.get("Content-Type") or "").split(";", 1)[0].strip().casefold()
         if content_type == PICKLE_CONTENT_TYPE:
-            return load_http_pickle_payload(self.headers, self.rfile)
+            payload = load_http_pickle_payload(self.headers, self.rfile)
+            self._body_consumed = True
+            return payload
         length = int(self.headers.get("Content-Length") or 0)
-        if length == 0:
+        raw = self.rfile.read(length) if length else b""
+        self._body_consumed = True
+        if not raw:
             return {}
-        raw = self.rfile.read(length)
-        payload = json.loads(raw.decode("utf-8"))
-        return restore_json_safe(payload)
+        return restore_json_safe(json.loads(raw.decode("utf-8")))
 
     def _write_json(self, status: int, payload: Any, *, extra_headers: dict[str, str] | None = None) -> None:
         raw = json.dumps(json_safe(payload)).encode("utf-8")
@@ -333,12 +400,20 @@ class RequestHandler(BaseHTTPRequestHandler):
         for name, value in (extra_headers or {}).items():
             self.send_header(name, value)
         self.send_header("Content-Length", str(len(raw)))
-        self.end_headers()
+        self._end_headers()
         self.wfile.write(raw)
 
+    def _end_headers(self) -> None:
+        if not self.server.keep_alive and not self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+
     def _write_error(self, status: int, exc: Exception, *, authenticate: bool = False) -> None:
         try:
-            headers = {"WWW-Authenticate": "Bearer"} if authenticate else None
+            headers = {"WWW-Authenticate": "Bearer"} if authenticate else {}
+            if not getattr(self, "_body_consumed", True):
+                # The unread request body would be parsed as the next request.
+                headers["Connection"] = "close"
             self._write_json(status, {"error_type": exc.__class__.__name__, "error": str(exc)}, extra_headers=headers)
         except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
             return
@@ -350,6 +425,22 @@ def _public_path_parts(public_url: str | None) -> list[str]:
     return [part for part in urlparse(public_url).path.split("/") if part]
 
 
+def _route_parts(public_url: str | None, path: str) -> list[str]:
+    parts = [part for part in path.split("/") if part]
+    public_path_parts = _public_path_parts(public_url)
+    if public_path_parts and parts[: len(public_path_parts)] == public_path_parts:
+        parts = parts[len(public_path_parts) :]
+    return parts
+
+
+def _is_relay_poll_route(parts: list[str]) -> bool:
+    return len(parts) == 3 and parts[:2] == ["relay", "poll"]
+
+
+def _relay_poll_timeout(query: dict[str, list[str]]) -> float:
+    return float((query.get("timeout") or ["25"])[0])
+
+
 def _relay_payload_timeout(
     payload: dict[str, Any],
     *,
@@ -495,6 +495,10 @@ class _LifecycleMixin:
         state_cls = resolve_qualified_name(state_class_name)
         if not issubclass(agent_cls, Paglet):
             raise HostError(f"{agent_class_name} is not a Paglet subclass")
+        try:
+            agent_cls.message_concurrency()
+        except (TypeError, ValueError) as exc:
+            raise HostError(f"{agent_class_name} has an invalid MAX_CONCURRENT_MESSAGES: {exc}") from exc
         if not is_dataclass(state_cls):
             raise HostError(f"{state_class_name} is not a dataclass state")
 
@@ -718,7 +722,6 @@ class _LifecycleMixin:
                 work_dir.mkdir(parents=True, exist_ok=True)
                 target_path = work_dir / safe_target_filename(ref.name)
                 self._materialize_artifact_ref(artifact, target_path)
-                self._delete_artifact_ref(artifact)
                 ref.current_host_name = self.name
                 ref.current_host_url = self.address
                 ref.current_path = str(target_path)
@@ -742,9 +745,9 @@ class _LifecycleMixin:
 
     def _materialize_artifact_ref(self, artifact: ArtifactRef, target_path: Path) -> None:
         if artifact.host_url.rstrip("/") == self.address.rstrip("/"):
-            self.artifacts.export_to_path(artifact.artifact_id, target_path, expected_sha256=artifact.sha256)
+            self.artifacts.export_to_path(artifact.artifact_id, target_path, expected_sha256=artifact.sha256, move=True)
             return
-        self.client.download_artifact(artifact, target_path)
+        self.client.download_artifact(artifact, target_path, move=True)
 
     def _delete_artifact_ref(self, artifact: ArtifactRef) -> None:
         if artifact.host_url.rstrip("/") == self.address.rstrip("/"):
@@ -5,13 +5,18 @@ from __future__ import annotations
 import heapq
 import itertools
 import threading
+from collections import deque
 from collections.abc import Callable
-from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import Future
 from dataclasses import dataclass
 from typing import Any
 
 from paglets.core.messages import Message
 
+DEFAULT_MESSAGE_WORKERS = 16
+DEFAULT_MAX_MESSAGE_WORKERS = 256
+DEFAULT_MESSAGE_WORKER_IDLE_SECONDS = 30.0
+
 
 @dataclass(frozen=True, slots=True)
 class MailboxStatus:
@@ -29,18 +34,200 @@ class MailboxStatus:
         }
 
 
+@dataclass(frozen=True, slots=True)
+class MessageSchedulerStatus:
+    worker_count: int
+    idle_worker_count: int
+    mailbox_count: int
+    ready_mailbox_count: int
+    queued_count: int
+    max_mailbox_queued_count: int
+    unqueued_pending_count: int
+    in_flight_count: int
+
+    def to_wire(self) -> dict[str, int]:
+        return {
+            "worker_count": self.worker_count,
+            "idle_worker_count": self.idle_worker_count,
+            "mailbox_count": self.mailbox_count,
+            "ready_mailbox_count": self.ready_mailbox_count,
+            "queued_count": self.queued_count,
+            "max_mailbox_queued_count": self.max_mailbox_queued_count,
+            "unqueued_pending_count": self.unqueued_pending_count,
+            "in_flight_count": self.in_flight_count,
+        }
+
+
+class MessageScheduler:
+    """Host-wide worker pool that serves all paglet mailboxes.
+
+    Mailboxes with queued work wait in one ready ring. A worker takes the
+    mailbox at the head, runs its highest-priority message and puts the
+    mailbox back at the tail when it still has work, so a busy paglet gets one
+    message per turn like every other ready paglet. Unqueued messages skip the
+    ring and the per-mailbox worker limit.
+
+    ``workers`` threads stay alive once started. When every worker is busy and
+    work is waiting, extra workers start up to ``max_workers`` and retire after
+    ``idle_timeout`` seconds without work. Handlers often block on a child that
+    in turn sends to another paglet on this host, so a hard fixed pool could
+    deadlock on such chains.
+    """
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_MESSAGE_WORKERS,
+        *,
+        max_workers: int | None = None,
+        idle_timeout: float = DEFAULT_MESSAGE_WORKER_IDLE_SECONDS,
+        name: str = "paglets-messages",
+    ):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        max_workers = max(workers, DEFAULT_MAX_MESSAGE_WORKERS) if max_workers is None else max_workers
+        if max_workers < workers:
+            raise ValueError("max_workers must not be smaller than workers")
+        self.workers = workers
+        self.max_workers = max_workers
+        self.idle_timeout = max(0.01, float(idle_timeout))
+        self.name = name
+        self._condition = threading.Condition()
+        self._ready: deque[MessageMailbox] = deque()
+        self._unqueued: deque[tuple[MessageMailbox, Message, bool, Future[Any]]] = deque()
+        self._mailboxes: set[MessageMailbox] = set()
+        self._thread_ids = itertools.count(1)
+        self._worker_count = 0
+        self._idle_count = 0
+        self._stopping = False
+
+    def status(self) -> MessageSchedulerStatus:
+        with self._condition:
+            mailboxes = [mailbox.status() for mailbox in self._mailboxes]
+            return MessageSchedulerStatus(
+                worker_count=self._worker_count,
+                idle_worker_count=self._idle_count,
+                mailbox_count=len(mailboxes),
+                ready_mailbox_count=len(self._ready),
+                queued_count=sum(status.queued_count for status in mailboxes),
+                max_mailbox_queued_count=max((status.queued_count for status in mailboxes), default=0),
+                unqueued_pending_count=len(self._unqueued),
+                in_flight_count=sum(status.in_flight_count for status in mailboxes),
+            )
+
+    def stop(self) -> None:
+        """Let idle workers exit; new work starts workers again."""
+
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+
+    def register(self, mailbox: MessageMailbox) -> None:
+        with self._condition:
+            self._mailboxes.add(mailbox)
+
+    def unregister(self, mailbox: MessageMailbox) -> None:
+        with self._condition:
+            self._mailboxes.discard(mailbox)
+            pending = [item for item in self._unqueued if item[0] is mailbox]
+            if pending:
+                self._unqueued = deque(item for item in self._unqueued if item[0] is not mailbox)
+        for _, _, _, future in pending:
+            if not future.done():
+                future.set_exception(mailbox.closed_error())
+
+    def schedule(self, mailbox: MessageMailbox) -> None:
+        with self._condition:
+            if mailbox.scheduled or not mailbox.runnable():
+                return
+            mailbox.scheduled = True
+            self._ready.append(mailbox)
+            self._wake_worker()
+
+    def submit_unqueued(self, mailbox: MessageMailbox, message: Message, oneway: bool) -> Future[Any]:
+        future: Future[Any] = Future()
+        with self._condition:
+            self._unqueued.append((mailbox, message, oneway, future))
+            self._wake_worker()
+        return future
+
+    def _wake_worker(self) -> None:
+        self._stopping = False
+        waiting = len(self._ready) + len(self._unqueued)
+        if waiting > self._idle_count and self._worker_count < self.max_workers:
+            self._worker_count += 1
+            thread = threading.Thread(
+                target=self._work,
+                name=f"{self.name}-{next(self._thread_ids)}",
+                daemon=True,
+            )
+            thread.start()
+        else:
+            self._condition.notify()
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                task = self._next_task()
+                while task is None:
+                    if self._stopping:
+                        self._worker_count -= 1
+                        return
+                    self._idle_count += 1
+                    woke = self._condition.wait(self.idle_timeout)
+                    self._idle_count -= 1
+                    task = self._next_task()
+                    if task is None and not woke and self._worker_count > self.workers:
+                        self._worker_count -= 1
+                        return
+            task()
+
+    def _next_task(self) -> Callable[[], None] | None:
+        if self._unqueued:
+            mailbox, message, oneway, future = self._unqueued.popleft()
+            return lambda: mailbox.run_unqueued(message, oneway, future)
+        while self._ready:
+            mailbox = self._ready.popleft()
+            mailbox.scheduled = False
+            item = mailbox.take_next()
+            if item is None:
+                continue
+            if mailbox.runnable():
+                mailbox.scheduled = True
+                self._ready.append(mailbox)
+            message, oneway, future = item
+            return lambda: self._run_queued(mailbox, message, oneway, future)
+        return None
+
+    def _run_queued(self, mailbox: MessageMailbox, message: Message, oneway: bool, future: Future[Any]) -> None:
+        mailbox.run_queued(message, oneway, future)
+        self.schedule(mailbox)
+
+
 class MessageMailbox:
-    """Priority mailbox for one paglet."""
+    """Priority mailbox for one paglet.
+
+    Messages run on a ``MessageScheduler``. Without one the mailbox starts a
+    private scheduler, which is convenient for tests and standalone use.
+    """
 
-    def __init__(self, agent_id: str, handler: Callable[[Message, bool], Any], *, max_workers: int = 4):
+    def __init__(
+        self,
+        agent_id: str,
+        handler: Callable[[Message, bool], Any],
+        *,
+        max_workers: int = 4,
+        scheduler: MessageScheduler | None = None,
+    ):
         if max_workers < 1:
             raise ValueError("max_workers must be at least 1")
         self.agent_id = agent_id
         self._handler = handler
         self._max_workers = max_workers
-        self._executor = ThreadPoolExecutor(
-            max_workers=max_workers + 4,
-            thread_name_prefix=f"paglets-mailbox-{agent_id[:8]}",
+        self._owns_scheduler = scheduler is None
+        self._scheduler = scheduler or MessageScheduler(
+            max_workers + 4,
+            idle_timeout=1.0,
+            name=f"paglets-mailbox-{agent_id[:8]}",
         )
         self._condition = threading.Condition()
         self._queue: list[tuple[int, int, Message, bool, Future[Any]]] = []
@@ -50,20 +237,27 @@ class MessageMailbox:
         self._in_flight = 0
         self._delivered = 0
         self._failed = 0
+        self.scheduled = False
+        self._scheduler.register(self)
 
     def submit(self, message: Message, *, oneway: bool = False) -> Future[Any]:
         future: Future[Any] = Future()
         with self._condition:
             if self._closed:
-                future.set_exception(RuntimeError(f"Mailbox for {self.agent_id} is closed"))
+                future.set_exception(self.closed_error())
                 return future
             heapq.heappush(self._queue, (-message.priority, next(self._sequence), message, oneway, future))
             self._condition.notify_all()
-        self._schedule()
+        self._scheduler.schedule(self)
         return future
 
     def submit_unqueued(self, message: Message, *, oneway: bool = False) -> Future[Any]:
-        return self._executor.submit(self._run_message, message, oneway)
+        with self._condition:
+            if self._closed:
+                future: Future[Any] = Future()
+                future.set_exception(self.closed_error())
+                return future
+        return self._scheduler.submit_unqueued(self, message, oneway)
 
     def wait_message(self, timeout: float | None = None) -> bool:
         with self._condition:
@@ -92,25 +286,29 @@ class MessageMailbox:
             while self._queue:
                 _, _, _, _, future = heapq.heappop(self._queue)
                 if not future.done():
-                    future.set_exception(RuntimeError(f"Mailbox for {self.agent_id} is closed"))
+                    future.set_exception(self.closed_error())
             self._condition.notify_all()
-        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._scheduler.unregister(self)
+        if self._owns_scheduler:
+            self._scheduler.stop()
+
+    def closed_error(self) -> RuntimeError:
+        return RuntimeError(f"Mailbox for {self.agent_id} is closed")
 
-    def _schedule(self) -> None:
-        submissions = 0
+    def runnable(self) -> bool:
         with self._condition:
-            while self._queue and self._running + submissions < self._max_workers:
-                submissions += 1
-        for _ in range(submissions):
-            self._executor.submit(self._run_next)
+            return bool(self._queue) and not self._closed and self._running < self._max_workers
 
-    def _run_next(self) -> None:
+    def take_next(self) -> tuple[Message, bool, Future[Any]] | None:
         with self._condition:
-            if not self._queue:
-                return
-            self._running += 1
+            if not self._queue or self._closed or self._running >= self._max_workers:
+                return None
             _, _, message, oneway, future = heapq.heappop(self._queue)
+            self._running += 1
             self._in_flight += 1
+            return message, oneway, future
+
+    def run_queued(self, message: Message, oneway: bool, future: Future[Any]) -> None:
         try:
             result = self._handler(message, oneway)
         except Exception as exc:
@@ -127,21 +325,24 @@ class MessageMailbox:
                 self._running -= 1
                 self._condition.notify_all()
             future.set_result(result)
-        self._schedule()
 
-    def _run_message(self, message: Message, oneway: bool) -> Any:
+    def run_unqueued(self, message: Message, oneway: bool, future: Future[Any]) -> None:
         with self._condition:
+            if self._closed:
+                future.set_exception(self.closed_error())
+                return
             self._in_flight += 1
         try:
             result = self._handler(message, oneway)
-        except Exception:
+        except Exception as exc:
             with self._condition:
                 self._failed += 1
                 self._in_flight -= 1
                 self._condition.notify_all()
-            raise
+            future.set_exception(exc)
+            return
         with self._condition:
             self._delivered += 1
             self._in_flight -= 1
             self._condition.notify_all()
-        return result
+        future.set_result(result)
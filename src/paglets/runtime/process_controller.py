@@ -18,10 +18,13 @@ from paglets.core.errors import (
 from paglets.core.messages import Message
 from paglets.remote.transport import (
     start_local_pickle_sender,
+    unlink_process_arena,
 )
 from paglets.runtime.child_bootstrap import _child_main
+from paglets.runtime.process_pool import ChildProcessPool
 from paglets.runtime.process_protocol import (
     ChildConfig,
+    _apply_state_delta,
     _error_from_wire,
     _error_to_wire,
     _handle_local_pickle_stream_event,
@@ -41,12 +44,15 @@ class ChildProcessController:
         host_call_handler: Callable[[str, dict[str, Any]], Any],
         crash_handler: Callable[[ChildProcessController], None],
         run_failure_handler: Callable[[ChildProcessController], None] | None = None,
+        pool: ChildProcessPool | None = None,
     ):
         self.config = config
         self.agent_id = config.agent_id
         self.agent_class_name = config.agent_class_name
         self.state_class_name = config.state_class_name
         self.state: dict[str, Any] = dict(config.state or {})
+        self.state_version = 0
+        self._state_resync = False
         self.resource_status: dict[str, bool] = {}
         self.ready = False
         self.crashed = False
@@ -68,18 +74,10 @@ class ChildProcessController:
         self._terminal_host_call_complete.set()
         self._run_complete = threading.Event()
         self._run_complete.set()
-        context = mp.get_context("spawn")
-        parent_conn, child_conn = context.Pipe(duplex=True)
-        self._conn = parent_conn
-        self.process = context.Process(
-            target=_child_main,
-            args=(config, child_conn),
-            name=config.process_title,
-            daemon=True,
-        )
-        self.process.start()
+        self.warm_start = self._start_warm(pool)
+        if not self.warm_start:
+            self._start_cold()
         self._pid = self.process.pid
-        child_conn.close()
         self._reader = threading.Thread(
             target=self._reader_loop,
             name=f"paglets-child-reader-{self.agent_id[:8]}",
@@ -91,6 +89,35 @@ class ChildProcessController:
     def pid(self) -> int | None:
         return self._pid
 
+    def _start_warm(self, pool: ChildProcessPool | None) -> bool:
+        warm = pool.acquire(self.agent_class_name) if pool is not None else None
+        if warm is None:
+            return False
+        try:
+            warm.conn.send(self.config)
+        except Exception:
+            with contextlib.suppress(Exception):
+                warm.conn.close()
+            with contextlib.suppress(Exception):
+                warm.process.kill()
+            return False
+        self._conn = warm.conn
+        self.process = warm.process
+        return True
+
+    def _start_cold(self) -> None:
+        context = mp.get_context("spawn")
+        parent_conn, child_conn = context.Pipe(duplex=True)
+        self._conn = parent_conn
+        self.process = context.Process(
+            target=_child_main,
+            args=(self.config, child_conn),
+            name=self.config.process_title,
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
     def terminal_proxy_wire(self) -> dict[str, str] | None:
         if not self._has_terminal_message_result or not isinstance(self._terminal_message_result, dict):
             return None
@@ -151,7 +178,7 @@ class ChildProcessController:
         return None if oneway else reply.get("result")
 
     def fetch_state(self, *, timeout: float | None = None) -> dict[str, Any]:
-        reply = self.request("state", timeout=timeout)
+        reply = self.request("state", {"full": True} if self._state_resync else None, timeout=timeout)
         self._update_from_reply(reply)
         return dict(self.state)
 
@@ -228,6 +255,8 @@ class ChildProcessController:
                             self._run_failure_handler(self)
                     elif event == "run_complete":
                         self._run_complete.set()
+                    elif event == "status":
+                        self._apply_status_event(message.get("payload"))
                     _handle_local_pickle_stream_event(message)
                     continue
         except OSError:
@@ -237,6 +266,9 @@ class ChildProcessController:
                 self.process.join(timeout=0.5)
             self.exitcode = self._safe_exitcode()
             self._close_process_handle()
+            if self.pid is not None and self.exitcode is not None:
+                with contextlib.suppress(Exception):
+                    unlink_process_arena(self.pid)
             if not self.departing and self.exitcode not in (0, None):
                 self._mark_crashed(f"process exited with code {self.exitcode}")
             self._fail_pending(PagletCrashedError(f"Paglet {self.agent_id!r} process exited"))
@@ -277,6 +309,7 @@ class ChildProcessController:
             payload = _materialize_state_stream(message.get("payload"))
             if token:
                 self._send({"type": "event", "event": "local_pickle_stream_received", "token": token})
+            self._apply_state_reply(payload)
             future.set_result(payload)
             return
         future.set_exception(_error_from_wire(message.get("error") or {}))
@@ -309,14 +342,46 @@ class ChildProcessController:
         except Exception:
             self._mark_crashed("could not reply to child host call")
 
-    def _update_from_reply(self, reply: dict[str, Any] | None) -> None:
+    def _apply_state_reply(self, reply: Any) -> None:
+        # Runs on the reader thread so full snapshots and deltas are applied in
+        # the order the child sent them.
         if not isinstance(reply, dict):
             return
-        if "state" in reply and isinstance(reply["state"], dict):
+        if isinstance(reply.get("state"), dict):
             self.state = dict(reply["state"])
-        if "resources" in reply and isinstance(reply["resources"], dict):
+            self.state_version = int(reply.get("state_version", 0))
+            self._state_resync = False
+            return
+        if "state_version" not in reply:
+            return
+        patched = _apply_state_delta(self.state, self.state_version, reply)
+        if patched is None:
+            self._state_resync = True
+            return
+        self.state, self.state_version = patched
+
+    def _apply_status_event(self, payload: Any) -> None:
+        # Pushed by the child when its resources change or run() finishes. Runs
+        # on the reader thread, so a needed resync is left to the next request.
+        token = _state_stream_token(payload)
+        payload = _materialize_state_stream(payload)
+        if token:
+            self._send({"type": "event", "event": "local_pickle_stream_received", "token": token})
+        self._apply_state_reply(payload)
+        self._apply_resources(payload)
+
+    def _apply_resources(self, reply: Any) -> None:
+        if isinstance(reply, dict) and isinstance(reply.get("resources"), dict):
             self.resource_status = {str(key): bool(value) for key, value in reply["resources"].items()}
 
+    def _update_from_reply(self, reply: dict[str, Any] | None) -> None:
+        if not isinstance(reply, dict):
+            return
+        self._apply_resources(reply)
+        if self._state_resync and not self._closed.is_set():
+            with contextlib.suppress(Exception):
+                self.fetch_state(timeout=2.0)
+
     def _mark_crashed(self, error: str) -> None:
         self.crashed = True
         self.last_error = error
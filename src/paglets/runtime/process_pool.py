@@ -0,0 +1,211 @@
+# Copyright (c) 2026 by C. Klukas.
+# Licensed under the MIT License. See LICENSE for details.
+from __future__ import annotations
+
+import contextlib
+import importlib
+import multiprocessing as mp
+import signal
+import threading
+from collections import deque
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import Any
+
+from paglets.runtime.child_bootstrap import _child_main
+from paglets.runtime.process_protocol import ChildConfig, _set_process_title
+
+GENERIC_POOL_KEY = ""
+WARM_CHILD_STOP_TIMEOUT_SECONDS = 1.0
+
+
+@dataclass(slots=True)
+class WarmChild:
+    """One pre-started child process waiting for its :class:`ChildConfig`."""
+
+    process: BaseProcess
+    conn: Connection
+    key: str
+
+
+class ChildProcessPool:
+    """Host-owned pool of pre-started, pre-imported paglet child processes.
+
+    Each warm child is used for exactly one paglet and never returned to the
+    pool, so process isolation is the same as for a freshly spawned child. The
+    pool only moves interpreter start-up and module imports off the activation
+    path. ``class_preload_modules`` maps agent class names to extra modules; such
+    classes get their own warm children that also import the agent module.
+    """
+
+    def __init__(
+        self,
+        size: int = 0,
+        *,
+        preload_modules: Sequence[str] = (),
+        class_preload_modules: Mapping[str, Sequence[str]] | None = None,
+        name: str = "host",
+    ):
+        self.size = max(0, int(size))
+        self.name = name
+        base = tuple(str(module) for module in preload_modules if str(module).strip())
+        self._preloads: dict[str, tuple[str, ...]] = {GENERIC_POOL_KEY: base}
+        for class_name, modules in (class_preload_modules or {}).items():
+            key = str(class_name)
+            module_name = key.split(":", 1)[0]
+            extra = tuple(str(module) for module in modules if str(module).strip())
+            self._preloads[key] = _unique((*base, module_name, *extra))
+        self._idle: dict[str, deque[WarmChild]] = {key: deque() for key in self._preloads}
+        self._lock = threading.Lock()
+        self._refill = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._counter = 0
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    def start(self) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._refill_loop,
+                name=f"paglets-child-pool-{self.name}",
+                daemon=True,
+            )
+            self._thread.start()
+        self._refill.set()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._refill.set()
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+            idle = [child for children in self._idle.values() for child in children]
+            for children in self._idle.values():
+                children.clear()
+        if thread is not None and thread is not threading.current_thread() and thread.is_alive():
+            thread.join(timeout=2)
+        for child in idle:
+            _discard(child)
+
+    def acquire(self, agent_class_name: str) -> WarmChild | None:
+        """Return a live warm child for ``agent_class_name`` or ``None``."""
+
+        if not self.enabled or self._stop.is_set():
+            return None
+        keys = [agent_class_name, GENERIC_POOL_KEY] if agent_class_name in self._idle else [GENERIC_POOL_KEY]
+        stale: list[WarmChild] = []
+        found: WarmChild | None = None
+        with self._lock:
+            for key in keys:
+                children = self._idle[key]
+                while children:
+                    child = children.popleft()
+                    if child.process.is_alive():
+                        found = child
+                        break
+                    stale.append(child)
+                if found is not None:
+                    break
+            if found is not None:
+                self._hits += 1
+            else:
+                self._misses += 1
+        for child in stale:
+            _discard(child)
+        self._refill.set()
+        return found
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "size": self.size,
+                "idle": {key or "*": len(children) for key, children in self._idle.items()},
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+    def _refill_loop(self) -> None:
+        while not self._stop.is_set():
+            self._refill.wait()
+            self._refill.clear()
+            while not self._stop.is_set():
+                key = self._next_missing_key()
+                if key is None:
+                    break
+                try:
+                    child = self._spawn(key)
+                except Exception:
+                    # A broken preload list must not take down the host; cold
+                    # spawns keep working and the next acquire retries.
+                    break
+                with self._lock:
+                    if not self._stop.is_set():
+                        self._idle[key].append(child)
+                        child = None
+                if child is not None:
+                    _discard(child)
+
+    def _next_missing_key(self) -> str | None:
+        with self._lock:
+            for key, children in self._idle.items():
+                if len(children) < self.size:
+                    return key
+        return None
+
+    def _spawn(self, key: str) -> WarmChild:
+        context = mp.get_context("spawn")
+        parent_conn, child_conn = context.Pipe(duplex=True)
+        self._counter += 1
+        process = context.Process(
+            target=_warm_child_main,
+            args=(child_conn, self._preloads[key], f"paglet:{self.name}:warm"),
+            name=f"paglets-warm-{self.name}-{self._counter}",
+            daemon=True,
+        )
+        try:
+            process.start()
+        finally:
+            child_conn.close()
+        return WarmChild(process=process, conn=parent_conn, key=key)
+
+
+def _warm_child_main(conn: Connection, preload_modules: tuple[str, ...], title: str) -> None:
+    with contextlib.suppress(Exception):
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _set_process_title(title)
+    for module in preload_modules:
+        with contextlib.suppress(Exception):
+            importlib.import_module(module)
+    try:
+        config = conn.recv()
+    except (EOFError, OSError):
+        return
+    if not isinstance(config, ChildConfig):
+        return
+    _child_main(config, conn)
+
+
+def _discard(child: WarmChild) -> None:
+    with contextlib.suppress(Exception):
+        child.conn.close()
+    with contextlib.suppress(Exception):
+        child.process.join(timeout=WARM_CHILD_STOP_TIMEOUT_SECONDS)
+        if child.process.is_alive():
+            child.process.kill()
+            child.process.join(timeout=WARM_CHILD_STOP_TIMEOUT_SECONDS)
+
+
+def _unique(values: Sequence[str]) -> tuple[str, ...]:
+    return tuple(dict.fromkeys(value for value in values if value))
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import contextlib
+import threading
 from dataclasses import dataclass
 from typing import Any
 
@@ -129,6 +130,87 @@ def _agent_snapshot(agent: Paglet) -> dict[str, Any]:
     return {"state": state_wire, "resources": agent.resources.status()}
 
 
+class _StateDeltaTracker:
+    """Child-side mirror of the state the parent last received.
+
+    Replies carry only the top-level state fields whose wire value changed since
+    the previous reply, plus a version counter. The parent applies replies in
+    pipe order, so ``lock`` must be held from encoding until the reply is sent.
+    Changes are found by comparing a full wire snapshot with what was sent,
+    because handlers mutate state in place. This shrinks the pipe payload, not
+    the child's per-reply encoding work.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.RLock()
+        self.version = 0
+        self._sent: dict[str, Any] | None = None
+
+    def invalidate(self) -> None:
+        with self.lock:
+            self._sent = None
+
+    def encode(self, payload: Any) -> Any:
+        if not isinstance(payload, dict) or not isinstance(payload.get("state"), dict):
+            return payload
+        encoded = dict(payload)
+        state = encoded.pop("state")
+        with self.lock:
+            if self._sent is None:
+                self.version += 1
+                self._sent = dict(state)
+                encoded["state"] = state
+                encoded["state_version"] = self.version
+                return encoded
+            base = self.version
+            delta = {
+                key: value
+                for key, value in state.items()
+                if key not in self._sent or _wire_value_changed(self._sent[key], value)
+            }
+            if delta:
+                self.version += 1
+                self._sent.update(delta)
+                encoded["state_delta"] = delta
+            encoded["state_base"] = base
+            encoded["state_version"] = self.version
+            return encoded
+
+
+def _wire_value_changed(previous: Any, current: Any) -> bool:
+    try:
+        return bool(previous != current)
+    except (TypeError, ValueError):
+        # NumPy arrays compare elementwise; compare their raw contents instead.
+        # Containers holding arrays are simply treated as changed.
+        if not hasattr(previous, "tobytes"):
+            return True
+        return not (
+            type(previous) is type(current)
+            and getattr(previous, "shape", None) == getattr(current, "shape", None)
+            and getattr(previous, "dtype", None) == getattr(current, "dtype", None)
+            and previous.tobytes() == current.tobytes()
+        )
+
+
+def _apply_state_delta(
+    current: dict[str, Any],
+    version: int,
+    payload: dict[str, Any],
+) -> tuple[dict[str, Any], int] | None:
+    """Patch ``current`` with a delta reply; ``None`` means a full resync is needed."""
+
+    if int(payload.get("state_base", -1)) != version:
+        return None
+    next_version = int(payload.get("state_version", version))
+    delta = payload.get("state_delta")
+    if not isinstance(delta, dict) or not delta:
+        return current, next_version
+    patched = dict(current)
+    patched.update(delta)
+    return patched, next_version
+
+
 def _target_to_wire(target: str | TransferTicket) -> dict[str, Any]:
     if isinstance(target, TransferTicket):
         return {"ticket": target.to_wire()}
@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 from paglets.runtime.process_controller import ChildProcessController, make_child_config
+from paglets.runtime.process_pool import ChildProcessPool
 from paglets.runtime.process_protocol import ChildConfig
 
 __all__ = [
     "ChildConfig",
     "ChildProcessController",
+    "ChildProcessPool",
     "make_child_config",
 ]
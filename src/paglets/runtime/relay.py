@@ -7,8 +7,10 @@ import queue
 import threading
 import time
 import uuid
-from concurrent.futures import Future
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures import wait as wait_futures
 from dataclasses import dataclass, field
 from typing import Any
 from urllib.parse import parse_qs, quote, unquote, urlparse
@@ -35,6 +37,13 @@ from paglets.remote.transfer import TransferTicket
 from paglets.runtime.envelope import PagletEnvelope
 from paglets.services.resident import DEFAULT_SERVICE_LEASE_TTL_SECONDS
 
+RELAY_POLL_MAX_DELIVERIES = 32
+RELAY_HEARTBEAT_INTERVAL_SECONDS = 10.0
+RELAY_CLIENT_WORKERS = 16
+# How long the relay client waits for the previous batch to finish so its acks
+# ride on the next poll instead of separate ack requests.
+RELAY_ACK_LINGER_SECONDS = 0.05
+
 
 @dataclass(slots=True)
 class RelayNode:
@@ -47,6 +56,7 @@ class RelayNode:
     last_poll_started: float = 0.0
     last_poll_finished: float = 0.0
     last_error: str | None = None
+    hosts_stale: bool = False
 
 
 @dataclass(slots=True)
@@ -84,6 +94,7 @@ class RelayMixin:
         now = time.time()
         with self._lock:
             existing = self._relay_nodes.get(name)
+            joined = existing is None or not existing.online
             if existing is None:
                 existing = RelayNode(name=name, health=health, last_seen=now, online=True)
                 self._relay_nodes[name] = existing
@@ -94,8 +105,28 @@ class RelayMixin:
                 existing.last_error = None
             self._relay_queues.setdefault(name, queue.Queue(maxsize=self.relay_queue_limit))
         self._register_relay_node_ref(existing)
+        if joined:
+            self._relay_notify_hosts_changed(name)
         return {"hosts": [ref.to_wire() for ref in self.mesh.hosts(include_self=True)]}
 
+    def _relay_notify_hosts_changed(self, joined: str) -> None:
+        """Wake parked polls of the other nodes so their batch carries the new host list."""
+
+        waiters: list[Callable[[], None]] = []
+        with self._lock:
+            for node in self._relay_nodes.values():
+                if node.name == joined or node.hosts_stale:
+                    continue
+                node.hosts_stale = True
+                delivery_queue = self._relay_queues.get(node.name)
+                if delivery_queue is not None:
+                    # ``None`` only wakes a parked poll; it is never delivered.
+                    with contextlib.suppress(queue.Full):
+                        delivery_queue.put_nowait(None)
+                waiters.extend(self._relay_waiters.get(node.name, ()))
+        for wake in waiters:
+            wake()
+
     def relay_host_health(self, target: str) -> dict[str, Any]:
         name = unquote(target)
         if name == self.name:
@@ -173,8 +204,34 @@ class RelayMixin:
         return f"Relay target {target!r} is offline/not polling (last seen {age:.3f}s ago)"
 
     def relay_poll(self, node_name: str, *, timeout: float = 25.0) -> dict[str, Any]:
-        name = unquote(node_name)
+        name, delivery_queue = self._relay_poll_begin(node_name)
         delivery: RelayDelivery | None = None
+        try:
+            delivery = delivery_queue.get(timeout=max(0.0, timeout))
+        except queue.Empty:
+            pass
+        finally:
+            self._relay_poll_end(name)
+        return self._relay_poll_result(name, delivery)
+
+    def relay_poll_batch(self, node_name: str, payload: dict[str, Any], *, timeout: float = 25.0) -> dict[str, Any]:
+        """Apply piggybacked acks, then wait for up to ``max_deliveries`` queued deliveries."""
+
+        self.relay_ack_batch(payload.get("acks") or [])
+        name, delivery_queue = self._relay_poll_begin(node_name)
+        deliveries: list[RelayDelivery] = []
+        try:
+            with contextlib.suppress(queue.Empty):
+                first = delivery_queue.get(timeout=max(0.0, timeout))
+                if first is not None:
+                    deliveries.append(first)
+                    deliveries.extend(_drain_relay_queue(delivery_queue, _relay_poll_limit(payload) - 1))
+        finally:
+            self._relay_poll_end(name)
+        return self._relay_batch_result(name, deliveries)
+
+    def _relay_poll_begin(self, node_name: str) -> tuple[str, queue.Queue[RelayDelivery | None]]:
+        name = unquote(node_name)
         with self._lock:
             node = self._relay_nodes.get(name)
             if node is not None:
@@ -185,35 +242,63 @@ class RelayMixin:
                 node.last_error = None
                 self._register_relay_node_ref(node)
             delivery_queue = self._relay_queues.setdefault(name, queue.Queue(maxsize=self.relay_queue_limit))
-        try:
-            delivery = delivery_queue.get(timeout=max(0.0, timeout))
-        except queue.Empty:
-            return {"delivery": None}
-        finally:
-            with self._lock:
-                node = self._relay_nodes.get(name)
-                if node is not None:
-                    node.active_polls = max(0, node.active_polls - 1)
-                    node.last_seen = time.time()
-                    node.last_poll_finished = node.last_seen
-                    self._register_relay_node_ref(node)
+        return name, delivery_queue
+
+    def _relay_poll_end(self, name: str) -> None:
+        with self._lock:
+            node = self._relay_nodes.get(name)
+            if node is not None:
+                node.active_polls = max(0, node.active_polls - 1)
+                node.last_seen = time.time()
+                node.last_poll_finished = node.last_seen
+                self._register_relay_node_ref(node)
+
+    def _relay_poll_result(self, name: str, delivery: RelayDelivery | None) -> dict[str, Any]:
         if delivery is None:
             return {"delivery": None}
+        self._relay_mark_dispatched(name, [delivery])
+        return {"delivery": _relay_delivery_wire(delivery)}
+
+    def _relay_batch_result(self, name: str, deliveries: list[RelayDelivery]) -> dict[str, Any]:
+        registered = self._relay_mark_dispatched(name, deliveries)
+        result: dict[str, Any] = {
+            "deliveries": [_relay_delivery_wire(delivery) for delivery in deliveries],
+            "registered": registered,
+        }
+        with self._lock:
+            node = self._relay_nodes.get(name)
+            hosts_stale = node is not None and node.hosts_stale
+            if hosts_stale:
+                node.hosts_stale = False
+        if hosts_stale:
+            result["hosts"] = [ref.to_wire() for ref in self.mesh.hosts(include_self=True)]
+        return result
+
+    def _relay_mark_dispatched(self, name: str, deliveries: list[RelayDelivery]) -> bool:
         with self._lock:
             node = self._relay_nodes.get(name)
             if node is not None:
-                node.in_flight += 1
-        self._emit(
-            "relay-delivery-dispatched",
-            data={"delivery_id": delivery.delivery_id, "target": delivery.target, "kind": delivery.kind},
-        )
-        return {
-            "delivery": {
-                "delivery_id": delivery.delivery_id,
-                "kind": delivery.kind,
-                "payload": delivery.payload,
-            }
-        }
+                node.in_flight += len(deliveries)
+        for delivery in deliveries:
+            self._emit(
+                "relay-delivery-dispatched",
+                data={"delivery_id": delivery.delivery_id, "target": delivery.target, "kind": delivery.kind},
+            )
+        return node is not None
+
+    def _relay_add_waiter(self, name: str, wake: Callable[[], None]) -> None:
+        """Call ``wake`` whenever a delivery for ``name`` is enqueued (used by async long-polls)."""
+
+        with self._lock:
+            self._relay_waiters.setdefault(name, set()).add(wake)
+
+    def _relay_remove_waiter(self, name: str, wake: Callable[[], None]) -> None:
+        with self._lock:
+            waiters = self._relay_waiters.get(name)
+            if waiters is not None:
+                waiters.discard(wake)
+                if not waiters:
+                    self._relay_waiters.pop(name, None)
 
     def relay_ack(self, delivery_id: str, payload: dict[str, Any]) -> dict[str, Any]:
         with self._lock:
@@ -240,6 +325,14 @@ class RelayMixin:
         )
         return {"ok": True}
 
+    def relay_ack_batch(self, acks: list[Any]) -> dict[str, Any]:
+        for ack in acks:
+            if isinstance(ack, dict) and ack.get("delivery_id"):
+                self.relay_ack(
+                    str(ack["delivery_id"]), {key: value for key, value in ack.items() if key != "delivery_id"}
+                )
+        return {"ok": True}
+
     def relay_api(
         self,
         target: str,
@@ -387,6 +480,10 @@ class RelayMixin:
                 error=message,
             )
             raise RemoteHostError(message) from exc
+        with self._lock:
+            waiters = list(self._relay_waiters.get(target, ()))
+        for wake in waiters:
+            wake()
         self._emit(
             "relay-delivery-enqueued",
             data={
@@ -455,24 +552,72 @@ class RelayMixin:
 
     def _relay_client_loop(self) -> None:
         assert self.connect_to is not None
-        while not self._relay_stop.is_set():
-            try:
-                self._relay_register_once()
-                response = self.client.get_json(
-                    f"{self.connect_to.rstrip('/')}/relay/poll/{quote(self.name, safe='')}?timeout=25",
-                    timeout=35.0,
-                )
-                delivery = response.get("delivery") if isinstance(response, dict) else None
-                if isinstance(delivery, dict):
-                    threading.Thread(
-                        target=self._handle_relay_delivery,
-                        args=(delivery,),
-                        name=f"paglets-relay-delivery-{delivery.get('delivery_id', '')}",
-                        daemon=True,
-                    ).start()
-            except Exception as exc:
-                self._emit("relay-client-error", error=str(exc))
-                self._relay_stop.wait(1.0)
+        workers = ThreadPoolExecutor(
+            max_workers=RELAY_CLIENT_WORKERS,
+            thread_name_prefix=f"paglets-relay-delivery-{self.name}",
+        )
+        running: set[Future[None]] = set()
+        next_register = 0.0
+        try:
+            while not self._relay_stop.is_set():
+                try:
+                    if time.monotonic() >= next_register:
+                        self._relay_register_once()
+                        next_register = time.monotonic() + RELAY_HEARTBEAT_INTERVAL_SECONDS
+                    if running:
+                        running = wait_futures(running, timeout=RELAY_ACK_LINGER_SECONDS).not_done
+                    response = self._relay_poll_once()
+                    if not response.get("registered", True):
+                        next_register = 0.0
+                    self._relay_learn_hosts(response.get("hosts"))
+                    for delivery in response.get("deliveries") or []:
+                        if isinstance(delivery, dict):
+                            running.add(workers.submit(self._handle_relay_delivery, delivery))
+                except Exception as exc:
+                    self._emit("relay-client-error", error=str(exc))
+                    next_register = 0.0
+                    self._relay_stop.wait(1.0)
+        finally:
+            workers.shutdown(wait=False, cancel_futures=True)
+
+    def _relay_poll_once(self) -> dict[str, Any]:
+        assert self.connect_to is not None
+        with self._relay_ack_lock:
+            acks, self._relay_acks = self._relay_acks, []
+            self._relay_polling = True
+        try:
+            response = self.client.post_json(
+                f"{self.connect_to.rstrip('/')}/relay/poll/{quote(self.name, safe='')}?timeout=25",
+                {"acks": acks, "max_deliveries": RELAY_POLL_MAX_DELIVERIES},
+                timeout=35.0,
+            )
+        except Exception:
+            self._relay_requeue_acks(acks)
+            raise
+        finally:
+            with self._relay_ack_lock:
+                self._relay_polling = False
+        return response if isinstance(response, dict) else {}
+
+    def _relay_send_ack(self, delivery_id: str, ack: dict[str, Any]) -> None:
+        """Queue an ack for the next poll, or post queued acks now while a poll is parked on the hub."""
+
+        assert self.connect_to is not None
+        with self._relay_ack_lock:
+            self._relay_acks.append({"delivery_id": delivery_id, **ack})
+            if not self._relay_polling:
+                return
+            acks, self._relay_acks = self._relay_acks, []
+        try:
+            self.client.post_json(f"{self.connect_to.rstrip('/')}/relay/ack", {"acks": acks}, timeout=5.0)
+        except Exception as exc:
+            self._relay_requeue_acks(acks)
+            self._emit("relay-client-error", error=str(exc))
+
+    def _relay_requeue_acks(self, acks: list[dict[str, Any]]) -> None:
+        # Acks are idempotent on the hub, so resending one that did arrive is harmless.
+        with self._relay_ack_lock:
+            self._relay_acks[:0] = acks
 
     def _relay_register_once(self) -> None:
         assert self.connect_to is not None
@@ -481,14 +626,17 @@ class RelayMixin:
             {"health": self.health()},
             timeout=5.0,
         )
-        hosts = response.get("hosts", []) if isinstance(response, dict) else []
-        if isinstance(hosts, list):
-            for item in hosts:
-                if isinstance(item, dict):
-                    try:
-                        self.mesh.register_wire(item)
-                    except (KeyError, TypeError, ValueError):
-                        continue
+        self._relay_learn_hosts(response.get("hosts") if isinstance(response, dict) else None)
+
+    def _relay_learn_hosts(self, hosts: Any) -> None:
+        if not isinstance(hosts, list):
+            return
+        for item in hosts:
+            if isinstance(item, dict):
+                try:
+                    self.mesh.register_wire(item)
+                except (KeyError, TypeError, ValueError):
+                    continue
 
     def _handle_relay_delivery(self, delivery: dict[str, Any]) -> None:
         assert self.connect_to is not None
@@ -528,10 +676,21 @@ class RelayMixin:
                 raise HostError(f"Unknown relay delivery kind {kind!r}")
         except Exception as exc:
             ack = {"ok": False, "error_type": exc.__class__.__name__, "error": str(exc)}
-        self.client.post_json(f"{self.connect_to.rstrip('/')}/relay/ack/{delivery_id}", ack, timeout=5.0)
+        self._relay_send_ack(delivery_id, ack)
 
     def _relay_import_artifact(self, payload: dict[str, Any]) -> ArtifactRef:
         source = ArtifactRef.from_wire(payload["source_artifact"])
+        if source.sha256:
+            existing = self.artifacts.create_from_existing(
+                source.sha256,
+                size_bytes=source.size_bytes,
+                owner_agent_id=str(payload.get("owner_agent_id") or ""),
+                name=str(payload.get("name") or source.name),
+                compression=str(payload.get("compression") or source.compression),
+                expires_at=float(payload.get("expires_at") or 0.0),
+            )
+            if existing is not None:
+                return existing.ref
         temp_path = self._artifact_root / "tmp" / f"{uuid.uuid4().hex}.part"
         temp_path.parent.mkdir(parents=True, exist_ok=True)
         try:
@@ -575,7 +734,14 @@ class RelayMixin:
         if method == "GET" and parts == ["hosts"]:
             return {"hosts": [ref.to_wire() for ref in self.list_hosts(include_self=True)]}
         if method == "POST" and parts == ["hosts", "join"]:
-            return {"hosts": [ref.to_wire() for ref in self.join_mesh(payload)]}
+            return {
+                "hosts": [ref.to_wire() for ref in self.join_mesh(payload)],
+                "mesh_services": self.mesh_service_gossip(payload.get("mesh_services_version")),
+            }
+        if method == "POST" and parts == ["hosts", "gossip"]:
+            return self.gossip_mesh(payload)
+        if method == "POST" and parts == ["hosts", "ping-req"]:
+            return self.mesh.handle_ping_request(payload)
         if method == "GET" and parts == ["events"]:
             since = int((query.get("since") or ["0"])[0])
             limit = int((query.get("limit") or ["100"])[0])
@@ -585,6 +751,16 @@ class RelayMixin:
             return {"artifacts": [ref.to_wire() for ref in self.artifacts.list(owner_agent_id=owner)]}
         if method == "GET" and len(parts) == 3 and parts[0] == "artifacts" and parts[2] == "metadata":
             return {"artifact": self.artifacts.ref(parts[1]).to_wire()}
+        if method == "POST" and len(parts) == 3 and parts[:2] == ["artifacts", "sha256"]:
+            existing = self.artifacts.create_from_existing(
+                parts[2],
+                size_bytes=int(payload.get("size_bytes", -1)),
+                owner_agent_id=str(payload.get("owner_agent_id") or ""),
+                name=str(payload.get("name") or ""),
+                compression=str(payload.get("compression") or ""),
+                expires_at=float(payload.get("expires_at") or 0.0),
+            )
+            return {"artifact": None if existing is None else existing.ref.to_wire()}
         if method == "DELETE" and len(parts) == 2 and parts[0] == "artifacts":
             self.artifacts.delete(parts[1])
             return {"ok": True}
@@ -592,6 +768,8 @@ class RelayMixin:
             name = (query.get("name") or [None])[0]
             capability = (query.get("capability") or [None])[0]
             scope = enum_from_wire((query.get("scope") or [ServiceScope.LOCAL.value])[0], ServiceScope, "scope")
+            if scope is ServiceScope.MESH and name is None and capability is None:
+                return self.mesh_service_gossip((query.get("known_version") or [None])[0])
             records = (
                 self._services.lookup_all(name, capability, scope=ServiceScope.MESH)
                 if scope is ServiceScope.MESH
@@ -715,3 +893,25 @@ def relay_error_from_ack(payload: dict[str, Any]) -> PagletError:
     if error_type == "HostError":
         return HostError(message)
     return RemoteHostError(message)
+
+
+def _relay_poll_limit(payload: dict[str, Any]) -> int:
+    return max(1, min(RELAY_POLL_MAX_DELIVERIES, int(payload.get("max_deliveries") or 1)))
+
+
+def _drain_relay_queue(delivery_queue: queue.Queue[RelayDelivery | None], limit: int) -> list[RelayDelivery]:
+    """Take up to ``limit`` deliveries that are already queued, without waiting."""
+
+    deliveries: list[RelayDelivery] = []
+    while len(deliveries) < limit:
+        try:
+            delivery = delivery_queue.get_nowait()
+        except queue.Empty:
+            break
+        if delivery is not None:
+            deliveries.append(delivery)
+    return deliveries
+
+
+def _relay_delivery_wire(delivery: RelayDelivery) -> dict[str, Any]:
+    return {"delivery_id": delivery.delivery_id, "kind": delivery.kind, "payload": delivery.payload}
@@ -103,34 +103,38 @@ class _ResidentServicesMixin:
         *,
         capability: str | None = None,
         scope: ServiceScope = ServiceScope.LOCAL,
+        refresh: bool = False,
     ) -> list[ServiceRecord]:
         require_enum(scope, ServiceScope, "scope")
         records = self._services.lookup_all(name, capability)
         if scope is ServiceScope.MESH:
-            records.extend(self._lookup_mesh_services(name=name, capability=capability))
+            records.extend(self._lookup_mesh_services(name=name, capability=capability, refresh=refresh))
         return records
 
-    def _lookup_mesh_services(self, *, name: str | None = None, capability: str | None = None) -> list[ServiceRecord]:
-        records: list[ServiceRecord] = []
-        for host_ref in self.mesh.hosts(online_only=True, include_self=False):
-            query: dict[str, str] = {}
-            if name is not None:
-                query["name"] = name
-            if capability is not None:
-                query["capability"] = capability
-            suffix = f"?{urlencode(query)}" if query else ""
-            try:
-                separator = "&" if suffix else "?"
-                payload = self.client.get_json(
-                    f"{host_ref.url.rstrip('/')}/services{suffix}{separator}scope=mesh",
-                    timeout=MESH_SERVICE_LOOKUP_TIMEOUT_SECONDS,
-                )
-            except PagletError:
-                continue
-            for item in payload.get("services", []):
-                if isinstance(item, dict):
-                    records.append(ServiceRecord.from_wire(item))
-        return records
+    def _lookup_mesh_services(
+        self,
+        *,
+        name: str | None = None,
+        capability: str | None = None,
+        refresh: bool = False,
+    ) -> list[ServiceRecord]:
+        host_urls = [ref.url for ref in self.mesh.hosts(online_only=True, include_self=False)]
+        return self.mesh_services.lookup(host_urls, name=name, capability=capability, refresh=refresh)
+
+    def mesh_service_gossip(self, known_version: Any = None) -> dict[str, Any]:
+        """Describe this host's mesh services for a peer that last saw ``known_version``."""
+
+        version = self._services.mesh_version
+        if known_version == version:
+            return {"version": version}
+        records = self._services.lookup_all(scope=ServiceScope.MESH)
+        return {"version": version, "services": [record.to_wire() for record in records]}
+
+    def _fetch_mesh_services(self, host_url: str, known_version: str | None, timeout: float) -> dict[str, Any]:
+        query = {"scope": ServiceScope.MESH.value}
+        if known_version is not None:
+            query["known_version"] = known_version
+        return self.client.get_json(f"{host_url.rstrip('/')}/services?{urlencode(query)}", timeout=timeout)
 
     def _start_resident_services(self) -> None:
         config = self.launch_config
@@ -28,15 +28,21 @@ class ResourceCleanupError(LifecycleError):
 
 
 class ResourceRegistry:
-    """Lifecycle-managed cleanup callbacks owned by one paglet."""
+    """Lifecycle-managed cleanup callbacks owned by one paglet.
 
-    def __init__(self):
+    ``on_change`` is called after registrations change; child processes use it
+    to push the new :meth:`status` to the host.
+    """
+
+    def __init__(self, *, on_change: Callable[[], None] | None = None):
         self._resources: OrderedDict[str, ResourceRegistration] = OrderedDict()
+        self.on_change = on_change
 
     def register(self, name: str, cleanup: Cleanup, *, suppress: bool = False) -> None:
         if not name:
             raise ValueError("Resource name cannot be empty")
         self._resources[name] = ResourceRegistration(name=name, cleanup=cleanup, suppress=suppress)
+        self._changed()
 
     def track_closeable(self, name: str, obj: object, *, method: str = "close", suppress: bool = False) -> None:
         cleanup = getattr(obj, method)
@@ -45,9 +51,12 @@ class ResourceRegistry:
         self.register(name, cleanup, suppress=suppress)
 
     def remove(self, name: str) -> None:
-        self._resources.pop(name, None)
+        if self._resources.pop(name, None) is not None:
+            self._changed()
 
     def cleanup(self, *, reason: str = "lifecycle") -> None:
+        if not self._resources:
+            return
         failures: dict[str, Exception] = {}
         for name, registration in reversed(list(self._resources.items())):
             try:
@@ -59,11 +68,18 @@ class ResourceRegistry:
                     self._resources.pop(name, None)
             else:
                 self._resources.pop(name, None)
+        self._changed()
         if failures:
             raise ResourceCleanupError(failures)
 
     def clear(self) -> None:
-        self._resources.clear()
+        if self._resources:
+            self._resources.clear()
+            self._changed()
 
     def status(self) -> dict[str, bool]:
         return {name: registration.suppress for name, registration in self._resources.items()}
+
+    def _changed(self) -> None:
+        if self.on_change is not None:
+            self.on_change()
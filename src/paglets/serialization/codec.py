@@ -2,16 +2,20 @@
 # Licensed under the MIT License. See LICENSE for details.
 from __future__ import annotations
 
+import array
 import importlib
+import threading
 import types
+import weakref
+from collections.abc import Callable
 from dataclasses import fields, is_dataclass
 from enum import Enum
 from pathlib import Path, PurePath
-from typing import Any, get_args, get_origin, get_type_hints
+from typing import Any, Union, get_args, get_origin, get_type_hints
 
 from paglets.core.errors import SerializationError
 from paglets.core.wire import WirePayload, WireValue
-from paglets.remote.transport import restore_binary_tag, restore_json_safe
+from paglets.remote.transport import _is_ndarray, restore_binary_tag, restore_json_safe
 
 
 def qualified_name(obj: type | object) -> str:
@@ -55,7 +59,7 @@ def dataclass_to_wire(instance: Any) -> WirePayload:
 
     if not is_dataclass(instance) or isinstance(instance, type):
         raise SerializationError("Paglet state must be a dataclass instance")
-    return {field.name: _to_wire_value(getattr(instance, field.name)) for field in fields(instance)}
+    return codec_plan(type(instance)).to_wire(instance)
 
 
 def dataclass_from_wire(cls: type, payload: WirePayload) -> Any:
@@ -65,20 +69,89 @@ def dataclass_from_wire(cls: type, payload: WirePayload) -> Any:
         raise SerializationError(f"{cls!r} is not a dataclass class")
     if not isinstance(payload, dict):
         raise SerializationError(f"Expected dict payload for {cls!r}, got {type(payload)!r}")
+    return codec_plan(cls).from_wire(payload)
 
-    type_hints = get_type_hints(cls)
-    kwargs: dict[str, Any] = {}
-    for field in fields(cls):
-        if field.name in payload:
-            field_type = type_hints.get(field.name, field.type)
-            kwargs[field.name] = _from_wire_value(field_type, payload[field.name])
-    try:
-        return cls(**kwargs)
-    except TypeError as exc:
-        raise SerializationError(f"Could not construct {cls!r} from {payload!r}") from exc
+
+class CodecPlan:
+    """Compiled per-field encoders and decoders for one dataclass type.
+
+    Type hints are resolved once when the plan is built. Plans are cached by
+    class identity, so a redefined or reloaded class gets a fresh plan. A plan
+    only holds weak references to dataclass types, its own and nested ones, so
+    it is dropped from the cache together with its class. When the hints
+    cannot be resolved, e.g. for names imported only under ``TYPE_CHECKING``,
+    encoding falls back to the generic value conversion and decoding resolves
+    the hints again on first use.
+    """
+
+    __slots__ = ("_cls", "decoders", "encoders", "names")
+
+    def __init__(self, cls: type):
+        dataclass_fields = fields(cls)
+        self._cls = weakref.ref(cls)
+        self.names = tuple(field.name for field in dataclass_fields)
+        self.decoders: tuple[tuple[str, Callable[[WireValue], Any]], ...] | None = None
+        try:
+            type_hints = get_type_hints(cls)
+        except Exception:
+            self.encoders = tuple((field.name, _to_wire_value) for field in dataclass_fields)
+            return
+        self.encoders = tuple(
+            (field.name, _compile_encoder(type_hints.get(field.name, field.type))) for field in dataclass_fields
+        )
+        self.decoders = self._compile_decoders(type_hints)
+
+    @property
+    def cls(self) -> type:
+        return _live_class(self._cls)
+
+    def _compile_decoders(self, type_hints: dict[str, Any]) -> tuple[tuple[str, Callable[[WireValue], Any]], ...]:
+        return tuple(
+            (field.name, _compile_decoder(type_hints.get(field.name, field.type))) for field in fields(self.cls)
+        )
+
+    def to_wire(self, instance: Any) -> WirePayload:
+        return {name: encode(getattr(instance, name)) for name, encode in self.encoders}
+
+    def from_wire(self, payload: WirePayload) -> Any:
+        if not isinstance(payload, dict):
+            raise SerializationError(f"Expected dict payload for {self.cls!r}, got {type(payload)!r}")
+        decoders = self.decoders
+        if decoders is None:
+            decoders = self.decoders = self._compile_decoders(get_type_hints(self.cls))
+        kwargs = {name: decode(payload[name]) for name, decode in decoders if name in payload}
+        try:
+            return self.cls(**kwargs)
+        except TypeError as exc:
+            raise SerializationError(f"Could not construct {self.cls!r} from {payload!r}") from exc
+
+
+_CODEC_PLANS: weakref.WeakKeyDictionary[type, CodecPlan] = weakref.WeakKeyDictionary()
+_CODEC_PLANS_LOCK = threading.Lock()
+_PRIMITIVE_WIRE_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+def codec_plan(cls: type) -> CodecPlan:
+    """Return the cached compiled codec plan for dataclass ``cls``."""
+
+    plan = _CODEC_PLANS.get(cls)
+    if plan is not None:
+        return plan
+    plan = CodecPlan(cls)
+    with _CODEC_PLANS_LOCK:
+        return _CODEC_PLANS.setdefault(cls, plan)
+
+
+def clear_codec_plans() -> None:
+    """Drop all compiled codec plans, e.g. after monkeypatching annotations."""
+
+    with _CODEC_PLANS_LOCK:
+        _CODEC_PLANS.clear()
 
 
 def _to_wire_value(value: Any) -> WireValue:
+    if type(value) in _PRIMITIVE_WIRE_TYPES:
+        return value
     from paglets.remote.references import PagletProxyRef
 
     if isinstance(value, PagletProxyRef):
@@ -95,6 +168,14 @@ def _to_wire_value(value: Any) -> WireValue:
         return value
     if isinstance(value, bytearray):
         return bytearray(value)
+    # Typed buffers stay contiguous; pickle transports carry them as raw bytes
+    # and json_safe only base64-encodes them at JSON boundaries.
+    if isinstance(value, array.array):
+        return value[:]
+    if isinstance(value, memoryview):
+        return value.tobytes()
+    if _is_ndarray(value):
+        return value.copy()
     if isinstance(value, list):
         return [_to_wire_value(item) for item in value]
     if isinstance(value, tuple):
@@ -109,77 +190,181 @@ def _to_wire_value(value: Any) -> WireValue:
         return {str(key): _to_wire_value(item) for key, item in value.items()}
     raise SerializationError(
         f"Unsupported state value {value!r} of type {type(value).__name__}; "
-        "use dataclasses, primitives, bytes, bytearray, lists, sets, tuples, dicts, enums, or pathlib paths"
+        "use dataclasses, primitives, bytes, bytearray, array.array, memoryview, NumPy arrays, lists, sets, tuples, "
+        "dicts, enums, or pathlib paths"
     )
 
 
-def _from_wire_value(annotation: Any, value: WireValue) -> Any:
+def _compile_encoder(annotation: Any) -> Callable[[Any], WireValue]:
+    # Encoding stays value-driven: every specialized encoder checks the exact
+    # runtime type it was compiled for and otherwise defers to _to_wire_value.
+    from paglets.remote.references import PagletProxyRef
+
+    if annotation is PagletProxyRef:
+        return _to_wire_value
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin is list or origin is tuple:
+        container = origin
+        item = _compile_encoder(args[0]) if args and args[0] is not Ellipsis else _to_wire_value
+
+        def encode_sequence(value: Any) -> WireValue:
+            if type(value) is container:
+                return [item(entry) for entry in value]
+            return _to_wire_value(value)
+
+        return encode_sequence
+    if origin is dict:
+        item = _compile_encoder(args[1]) if len(args) > 1 else _to_wire_value
+
+        def encode_dict(value: Any) -> WireValue:
+            if type(value) is dict:
+                return {str(key): item(entry) for key, entry in value.items()}
+            return _to_wire_value(value)
+
+        return encode_dict
+    if isinstance(annotation, type) and is_dataclass(annotation):
+        nested = weakref.ref(annotation)
+
+        def encode_dataclass(value: Any) -> WireValue:
+            if type(value) is nested():
+                return codec_plan(type(value)).to_wire(value)
+            return _to_wire_value(value)
+
+        return encode_dataclass
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        enum_type = annotation
+
+        def encode_enum(value: Any) -> WireValue:
+            if type(value) is enum_type:
+                return value.value
+            return _to_wire_value(value)
+
+        return encode_enum
+    return _to_wire_value
+
+
+def _compile_decoder(annotation: Any) -> Callable[[WireValue], Any]:
     from paglets.remote.references import PagletProxyRef
 
-    if value is None:
-        return None
     if annotation is Any or annotation is object:
-        return restore_json_safe(value)
+        return _none_or(restore_json_safe)
     if annotation is PagletProxyRef:
-        return PagletProxyRef.from_wire(value)
+        return _none_or(PagletProxyRef.from_wire)
 
     origin = get_origin(annotation)
     args = get_args(annotation)
 
-    if origin in (types.UnionType, None) and isinstance(annotation, types.UnionType):
-        return _from_union(args, value)
-    if origin is types.UnionType:  # defensive for older typing internals
-        return _from_union(args, value)
-    if str(origin) == "typing.Union":
-        return _from_union(args, value)
+    if isinstance(annotation, types.UnionType) or origin is types.UnionType or origin is Union:
+        return _none_or(_compile_union(args))
+
+    if _is_ndarray_type(annotation) or _is_ndarray_type(origin):
+        return _none_or(_decode_ndarray)
 
     if origin in (list, tuple, set, frozenset):
-        inner = args[0] if args else Any
-        items = [_from_wire_value(inner, item) for item in value]
+        item = _compile_decoder(args[0] if args else Any)
         if origin is tuple:
-            return tuple(items)
+            return _none_or(lambda value: tuple([item(entry) for entry in value]))
         if origin is set:
-            return set(items)
+            return _none_or(lambda value: {item(entry) for entry in value})
         if origin is frozenset:
-            return frozenset(items)
-        return items
+            return _none_or(lambda value: frozenset([item(entry) for entry in value]))
+        return _none_or(lambda value: [item(entry) for entry in value])
 
     if origin is dict:
         key_type = args[0] if args else str
-        value_type = args[1] if len(args) > 1 else Any
-        return {_coerce_key(key_type, key): _from_wire_value(value_type, item) for key, item in value.items()}
+        item = _compile_decoder(args[1] if len(args) > 1 else Any)
+        if key_type in (Any, object, str):
+            return _none_or(lambda value: {key: item(entry) for key, entry in value.items()})
+        return _none_or(lambda value: {_coerce_key(key_type, key): item(entry) for key, entry in value.items()})
 
     if isinstance(annotation, type):
         if is_dataclass(annotation):
-            return dataclass_from_wire(annotation, value)
+            nested = weakref.ref(annotation)
+            # Resolved lazily so self-referencing dataclasses do not recurse
+            # while their own plan is being compiled.
+            return _none_or(lambda value: codec_plan(_live_class(nested)).from_wire(value))
         if issubclass(annotation, Enum):
-            return annotation(value)
+            return _none_or(annotation)
         if issubclass(annotation, PurePath):
-            return Path(value)
+            return _none_or(Path)
         if annotation is bytes:
-            restored = restore_binary_tag(value)
-            return bytes(restored)
+            return _none_or(lambda value: bytes(restore_binary_tag(value)))
         if annotation is bytearray:
-            restored = restore_binary_tag(value)
-            return bytearray(restored)
+            return _none_or(lambda value: bytearray(restore_binary_tag(value)))
+        if annotation is array.array:
+            return _none_or(_decode_array)
+        if annotation is memoryview:
+            return _none_or(lambda value: memoryview(_decode_bytes_like(value)))
         if annotation in (str, int, float, bool):
-            return annotation(value)
+            return _none_or(annotation)
 
-    return restore_json_safe(value)
+    return _none_or(restore_json_safe)
 
 
-def _from_union(args: tuple[Any, ...], value: Any) -> Any:
-    last_error: Exception | None = None
-    for arg in args:
-        if arg is type(None):
-            continue
-        try:
-            return _from_wire_value(arg, value)
-        except Exception as exc:  # try the next option
-            last_error = exc
-    if last_error is not None:
-        raise last_error
-    return value
+def _live_class(ref: weakref.ref[type]) -> type:
+    cls = ref()
+    if cls is None:
+        raise SerializationError("Codec plan refers to a dataclass that no longer exists")
+    return cls
+
+
+def _decode_array(value: WireValue) -> array.array:
+    restored = restore_binary_tag(value)
+    if isinstance(restored, array.array):
+        return restored
+    if isinstance(restored, (bytes, bytearray, memoryview)):
+        return array.array("B", restored)
+    items = list(restored)
+    return array.array("q" if all(type(item) is int for item in items) else "d", items)
+
+
+def _decode_bytes_like(value: WireValue) -> bytes | bytearray:
+    restored = restore_binary_tag(value)
+    if isinstance(restored, (bytes, bytearray)):
+        return restored
+    if isinstance(restored, (memoryview, array.array)) or _is_ndarray(restored):
+        return restored.tobytes()
+    return bytes(restored)
+
+
+def _decode_ndarray(value: WireValue) -> Any:
+    restored = restore_binary_tag(value)
+    if _is_ndarray(restored):
+        return restored
+    import numpy
+
+    return numpy.asarray(restored)
+
+
+def _is_ndarray_type(annotation: Any) -> bool:
+    return isinstance(annotation, type) and annotation.__name__ == "ndarray" and annotation.__module__ == "numpy"
+
+
+def _compile_union(args: tuple[Any, ...]) -> Callable[[WireValue], Any]:
+    options = tuple(_compile_decoder(arg) for arg in args if arg is not type(None))
+
+    def decode_union(value: WireValue) -> Any:
+        last_error: Exception | None = None
+        for option in options:
+            try:
+                return option(value)
+            except Exception as exc:  # try the next option
+                last_error = exc
+        if last_error is not None:
+            raise last_error
+        return value
+
+    return decode_union
+
+
+def _none_or(decoder: Callable[[Any], Any]) -> Callable[[WireValue], Any]:
+    def decode(value: WireValue) -> Any:
+        if value is None:
+            return None
+        return decoder(value)
+
+    return decode
 
 
 def _coerce_key(annotation: Any, key: str) -> Any:
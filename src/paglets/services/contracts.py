@@ -2,7 +2,10 @@
 # Licensed under the MIT License. See LICENSE for details.
 from __future__ import annotations
 
+import heapq
+import threading
 import time
+import uuid
 from collections.abc import Callable, Mapping
 from dataclasses import dataclass, field, is_dataclass
 from typing import Any, Generic, TypeVar
@@ -18,6 +21,7 @@ _ROUTE_DEFAULT_UNSET = object()
 
 ReqT = TypeVar("ReqT")
 RepT = TypeVar("RepT")
+_ServiceKey = tuple[str, str]
 
 
 @dataclass(frozen=True, slots=True)
@@ -274,8 +278,33 @@ class ServiceRecord:
 
 
 class ServiceRegistry:
+    """Thread-safe registry of advertised services on one host.
+
+    Records are indexed by name, capability, scope, and owning agent, so
+    lookups only visit candidate records. TTL expiry pops a min-heap of
+    ``expires_at`` instead of walking every record. Heap entries of replaced
+    or removed records are skipped lazily.
+    """
+
     def __init__(self):
-        self._records: dict[tuple[str, str], ServiceRecord] = {}
+        self._records: dict[_ServiceKey, ServiceRecord] = {}
+        self._by_name: dict[str, dict[_ServiceKey, None]] = {}
+        self._by_capability: dict[str, dict[_ServiceKey, None]] = {}
+        self._by_scope: dict[ServiceScope, dict[_ServiceKey, None]] = {}
+        self._by_agent: dict[str, dict[_ServiceKey, None]] = {}
+        self._expiry: list[tuple[float, int, _ServiceKey]] = []
+        self._expiry_seq = 0
+        self._lock = threading.RLock()
+        self._epoch = uuid.uuid4().hex[:12]
+        self._mesh_changes = 0
+
+    @property
+    def mesh_version(self) -> str:
+        """Stamp that changes whenever the set of mesh-scoped records changes."""
+
+        with self._lock:
+            self._expire()
+            return f"{self._epoch}:{self._mesh_changes}"
 
     def advertise(
         self,
@@ -300,19 +329,34 @@ class ServiceRegistry:
             host_url=host_url,
             expires_at=time.time() + ttl if ttl is not None else None,
         )
-        self._records[(name, proxy.agent_id)] = record
+        key = (name, proxy.agent_id)
+        with self._lock:
+            previous = self._records.get(key)
+            if previous is not None:
+                self._unindex(key, previous)
+            self._records[key] = record
+            self._index(key, record)
+            if record.expires_at is not None:
+                self._expiry_seq += 1
+                heapq.heappush(self._expiry, (record.expires_at, self._expiry_seq, key))
+                self._compact_expiry()
+            self._note_changed(previous, record)
         return record
 
     def unadvertise(self, name: str, agent_id: str | None = None) -> list[ServiceRecord]:
-        removed: list[ServiceRecord] = []
-        for key, record in list(self._records.items()):
-            if record.name == name and (agent_id is None or record.proxy.agent_id == agent_id):
-                removed.append(self._records.pop(key))
+        with self._lock:
+            if agent_id is not None:
+                keys = [(name, agent_id)] if (name, agent_id) in self._records else []
+            else:
+                keys = list(self._by_name.get(name, ()))
+            removed = [self._pop(key) for key in keys]
+            self._note_changed(*removed)
         return removed
 
     def record(self, name: str, agent_id: str) -> ServiceRecord | None:
-        self._expire()
-        return self._records.get((name, agent_id))
+        with self._lock:
+            self._expire()
+            return self._records.get((name, agent_id))
 
     def remove_agent(
         self,
@@ -320,17 +364,14 @@ class ServiceRegistry:
         *,
         keep: Callable[[ServiceRecord], bool] | None = None,
     ) -> list[ServiceRecord]:
-        removed: list[ServiceRecord] = []
-        for key, record in list(self._records.items()):
-            if record.proxy.agent_id == agent_id:
-                if keep is not None and keep(record):
-                    continue
-                removed.append(self._records.pop(key))
+        with self._lock:
+            keys = [key for key in self._by_agent.get(agent_id, ()) if keep is None or not keep(self._records[key])]
+            removed = [self._pop(key) for key in keys]
+            self._note_changed(*removed)
         return removed
 
     def lookup(self, name: str, capability: str | None = None) -> ServiceRecord | None:
-        self._expire()
-        matches = [record for record in self._records.values() if record.matches(name, capability)]
+        matches = self.lookup_all(name, capability)
         return matches[0] if matches else None
 
     def lookup_all(
@@ -341,19 +382,70 @@ class ServiceRegistry:
     ) -> list[ServiceRecord]:
         if scope is not None:
             require_enum(scope, ServiceScope, "scope")
-        self._expire()
-        return [
-            record
-            for record in self._records.values()
-            if (name is None or record.name == name)
-            and (capability is None or capability in record.capabilities)
-            and (scope is None or record.scope == scope)
-        ]
+        with self._lock:
+            self._expire()
+            candidates: list[dict[_ServiceKey, None]] = []
+            if name is not None:
+                candidates.append(self._by_name.get(name, {}))
+            if capability is not None:
+                candidates.append(self._by_capability.get(capability, {}))
+            if scope is not None:
+                candidates.append(self._by_scope.get(scope, {}))
+            if not candidates:
+                return list(self._records.values())
+            candidates.sort(key=len)
+            smallest, rest = candidates[0], candidates[1:]
+            return [self._records[key] for key in smallest if all(key in index for index in rest)]
+
+    def _index(self, key: _ServiceKey, record: ServiceRecord) -> None:
+        self._by_name.setdefault(record.name, {})[key] = None
+        for capability in record.capabilities:
+            self._by_capability.setdefault(capability, {})[key] = None
+        self._by_scope.setdefault(record.scope, {})[key] = None
+        self._by_agent.setdefault(record.proxy.agent_id, {})[key] = None
+
+    def _unindex(self, key: _ServiceKey, record: ServiceRecord) -> None:
+        _discard_index(self._by_name, record.name, key)
+        for capability in record.capabilities:
+            _discard_index(self._by_capability, capability, key)
+        _discard_index(self._by_scope, record.scope, key)
+        _discard_index(self._by_agent, record.proxy.agent_id, key)
+
+    def _pop(self, key: _ServiceKey) -> ServiceRecord:
+        record = self._records.pop(key)
+        self._unindex(key, record)
+        return record
 
     def _expire(self) -> None:
-        for key, record in list(self._records.items()):
-            if record.expired:
-                self._records.pop(key, None)
+        now = time.time()
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, _seq, key = heapq.heappop(self._expiry)
+            record = self._records.get(key)
+            if record is not None and record.expires_at == expires_at:
+                self._note_changed(self._pop(key))
+
+    def _compact_expiry(self) -> None:
+        if len(self._expiry) <= 2 * len(self._records) + 64:
+            return
+        self._expiry = [
+            entry
+            for entry in self._expiry
+            if (record := self._records.get(entry[2])) is not None and record.expires_at == entry[0]
+        ]
+        heapq.heapify(self._expiry)
+
+    def _note_changed(self, *records: ServiceRecord | None) -> None:
+        if any(record is not None and record.scope is ServiceScope.MESH for record in records):
+            self._mesh_changes += 1
+
+
+def _discard_index(index: dict[Any, dict[_ServiceKey, None]], value: Any, key: _ServiceKey) -> None:
+    keys = index.get(value)
+    if keys is None:
+        return
+    keys.pop(key, None)
+    if not keys:
+        del index[value]
 
 
 def _schema_name(schema_type: type[Any], field_name: str) -> str:
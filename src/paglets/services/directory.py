@@ -0,0 +1,240 @@
+# Copyright (c) 2026 by C. Klukas.
+# Licensed under the MIT License. See LICENSE for details.
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any
+
+from paglets.services.contracts import ServiceRecord
+
+MESH_SERVICE_DIRECTORY_MAX_AGE_SECONDS = 5.0
+MESH_SERVICE_REFRESH_TIMEOUT_SECONDS = 1.0
+MESH_SERVICE_REFRESH_WORKERS = 16
+MESH_SERVICE_FAILURE_BACKOFF_SECONDS = 1.0
+MESH_SERVICE_FAILURE_MAX_BACKOFF_SECONDS = 60.0
+
+MeshServiceFetch = Callable[[str, str | None, float], Any]
+
+
+@dataclass(frozen=True, slots=True)
+class _HostServices:
+    version: str
+    records: tuple[ServiceRecord, ...]
+    refreshed_at: float
+
+
+@dataclass(frozen=True, slots=True)
+class _HostFailure:
+    failed_at: float
+    backoff: float
+
+    def backing_off(self, now: float) -> bool:
+        return now - self.failed_at < self.backoff
+
+
+class MeshServiceDirectory:
+    """Host-local copy of the mesh-scoped services advertised by other hosts.
+
+    Entries are kept current by version-stamped gossip: a peer only resends its
+    records when its registry version differs from the one this host last saw.
+    Lookups are answered from memory while an entry is younger than ``max_age``.
+    Missing or older entries are fetched concurrently through ``fetch``, with at
+    most one request in flight per host and one shared deadline per lookup.
+    A host whose fetch fails or misses that deadline is not asked again until
+    its backoff, doubled on every further failure, has passed.
+    ``fetch(url, known_version, timeout)`` may omit ``services`` from its reply
+    when the peer still has ``known_version``.
+    """
+
+    def __init__(
+        self,
+        fetch: MeshServiceFetch,
+        *,
+        max_age: float = MESH_SERVICE_DIRECTORY_MAX_AGE_SECONDS,
+        refresh_timeout: float = MESH_SERVICE_REFRESH_TIMEOUT_SECONDS,
+        workers: int = MESH_SERVICE_REFRESH_WORKERS,
+        backoff: float = MESH_SERVICE_FAILURE_BACKOFF_SECONDS,
+        max_backoff: float = MESH_SERVICE_FAILURE_MAX_BACKOFF_SECONDS,
+    ):
+        self._fetch = fetch
+        self.max_age = max(0.0, float(max_age))
+        self.refresh_timeout = max(0.01, float(refresh_timeout))
+        self.workers = max(1, int(workers))
+        self.backoff = max(0.0, float(backoff))
+        self.max_backoff = max(self.backoff, float(max_backoff))
+        self._entries: dict[str, _HostServices] = {}
+        self._failures: dict[str, _HostFailure] = {}
+        self._inflight: dict[str, tuple[Future[None], float]] = {}
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def known_version(self, host_url: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(host_url.rstrip("/"))
+        return None if entry is None else entry.version
+
+    def merge(self, host_url: str, payload: Any) -> None:
+        """Apply a ``{"version": ..., "services": [...]}`` update from ``host_url``.
+
+        ``services`` may be omitted when the peer's version is unchanged; the
+        entry is then only marked fresh again.
+        """
+
+        if not isinstance(payload, dict):
+            return
+        url = host_url.rstrip("/")
+        version = str(payload.get("version") or "")
+        items = payload.get("services")
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(url)
+            if not isinstance(items, list):
+                if entry is not None and entry.version == version:
+                    self._entries[url] = _HostServices(entry.version, entry.records, now)
+                return
+        records: list[ServiceRecord] = []
+        for item in items:
+            if isinstance(item, dict):
+                try:
+                    records.append(ServiceRecord.from_wire(item))
+                except (KeyError, TypeError, ValueError):
+                    continue
+        with self._lock:
+            self._entries[url] = _HostServices(version, tuple(records), now)
+            self._failures.pop(url, None)
+
+    def forget(self, host_url: str) -> None:
+        url = host_url.rstrip("/")
+        with self._lock:
+            self._entries.pop(url, None)
+            self._failures.pop(url, None)
+
+    def lookup(
+        self,
+        host_urls: Iterable[str],
+        *,
+        name: str | None = None,
+        capability: str | None = None,
+        refresh: bool = False,
+    ) -> list[ServiceRecord]:
+        """Return matching records advertised by ``host_urls``, in host order.
+
+        Without ``refresh``, only entries older than ``max_age`` are fetched,
+        unless no cached entry matches at all. A miss revalidates every host, so a
+        service advertised since the last gossip round is still found; peers
+        whose version did not change answer that without resending records.
+        Hosts that are backing off after a failed fetch are never waited on.
+        """
+
+        urls = list(dict.fromkeys(url.rstrip("/") for url in host_urls))
+        now = time.monotonic()
+        if refresh:
+            self._refresh(urls, since=now)
+            return self._matches(urls, name, capability)
+        with self._lock:
+            stale = [
+                url
+                for url in urls
+                if ((entry := self._entries.get(url)) is None or now - entry.refreshed_at > self.max_age)
+                and not self._backing_off(url, now)
+            ]
+        if stale:
+            self._refresh(stale, since=now)
+        records = self._matches(urls, name, capability)
+        if not records:
+            with self._lock:
+                fresh = [url for url in urls if url not in stale and not self._backing_off(url, now)]
+            if fresh:
+                self._refresh(fresh, since=now)
+                records = self._matches(urls, name, capability)
+        return records
+
+    def close(self) -> None:
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _matches(self, urls: list[str], name: str | None, capability: str | None) -> list[ServiceRecord]:
+        with self._lock:
+            entries = [self._entries.get(url) for url in urls]
+        records: list[ServiceRecord] = []
+        seen: set[tuple[str, str, str]] = set()
+        for entry in entries:
+            if entry is None:
+                continue
+            for record in entry.records:
+                if record.expired:
+                    continue
+                if name is not None and record.name != name:
+                    continue
+                if capability is not None and capability not in record.capabilities:
+                    continue
+                key = (record.name, record.proxy.host_url.rstrip("/"), record.proxy.agent_id)
+                if key in seen:
+                    continue
+                seen.add(key)
+                records.append(record)
+        return records
+
+    def _refresh(self, urls: list[str], *, since: float) -> None:
+        # Entries refreshed after ``since`` were fetched by a concurrent lookup
+        # that finished between this lookup's staleness check and now.
+        if not urls:
+            return
+        futures: dict[Future[None], tuple[str, float]] = {}
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="paglets-mesh-services",
+                )
+            now = time.monotonic()
+            for url in urls:
+                if self._backing_off(url, now):
+                    continue
+                inflight = self._inflight.get(url)
+                if inflight is None:
+                    entry = self._entries.get(url)
+                    if entry is not None and entry.refreshed_at >= since:
+                        continue
+                    inflight = (self._executor.submit(self._refresh_one, url, now), now)
+                    self._inflight[url] = inflight
+                future, started = inflight
+                futures[future] = (url, started)
+        _, pending = wait(futures, timeout=self.refresh_timeout)
+        # A host that misses the deadline backs off like one that failed, so
+        # later lookups do not wait on it again while its fetch is still hung.
+        for future in pending:
+            url, started = futures[future]
+            self._record_failure(url, started)
+
+    def _refresh_one(self, url: str, started: float) -> None:
+        try:
+            payload = self._fetch(url, self.known_version(url), self.refresh_timeout)
+        except Exception:
+            with self._lock:
+                self._entries.pop(url, None)
+            self._record_failure(url, started)
+        else:
+            self.merge(url, payload)
+        finally:
+            with self._lock:
+                self._inflight.pop(url, None)
+
+    def _record_failure(self, url: str, started: float) -> None:
+        with self._lock:
+            failure = self._failures.get(url)
+            if failure is not None and failure.failed_at >= started:
+                return  # this attempt was already counted when it missed the deadline
+            backoff = self.backoff if failure is None else min(self.max_backoff, failure.backoff * 2.0)
+            self._failures[url] = _HostFailure(time.monotonic(), backoff)
+
+    def _backing_off(self, url: str, now: float) -> bool:
+        failure = self._failures.get(url)
+        return failure is not None and failure.backing_off(now)
@@ -6,10 +6,12 @@ from .affinity import CpuAffinityResult, apply_current_process_cpu_affinity, app
 from .agent import (
     CANCEL_SLOT_REQUESTS,
     CANDIDATE_HOSTS,
+    COMPUTE_SLOT_DECISION_MESSAGE,
     COMPUTE_SLOTS,
     COMPUTE_USAGE_PATHS_MESSAGE,
     RELEASE_SLOT,
     REQUEST_SLOT,
+    REQUEST_SLOTS_BATCH,
     SCHEDULER_STATUS,
     SYNC_SCHEDULER_STATUS,
     CancelSlotRequestsReply,
@@ -26,6 +28,8 @@ from .agent import (
     SchedulerStatusRequest,
     SchedulerStatusSyncReply,
     SchedulerStatusSyncRequest,
+    SlotBatchReply,
+    SlotBatchRequest,
     SlotDecisionReply,
     SlotLease,
     SlotReleaseReply,
@@ -58,6 +62,7 @@ __all__ = [
     "CANCEL_SLOT_REQUESTS",
     "CANDIDATE_HOSTS",
     "COMPUTE_SLOTS",
+    "COMPUTE_SLOT_DECISION_MESSAGE",
     "COMPUTE_STATUS_COMPLETED",
     "COMPUTE_STATUS_FAILED_FINAL",
     "COMPUTE_STATUS_NEW",
@@ -71,6 +76,7 @@ __all__ = [
     "GROUP_STATUS_WAITING_FOR_HOME",
     "RELEASE_SLOT",
     "REQUEST_SLOT",
+    "REQUEST_SLOTS_BATCH",
     "SCHEDULER_STATUS",
     "SYNC_SCHEDULER_STATUS",
     "CancelSlotRequestsReply",
@@ -95,6 +101,8 @@ __all__ = [
     "SchedulerStatusRequest",
     "SchedulerStatusSyncReply",
     "SchedulerStatusSyncRequest",
+    "SlotBatchReply",
+    "SlotBatchRequest",
     "SlotDecisionReply",
     "SlotLease",
     "SlotReleaseReply",
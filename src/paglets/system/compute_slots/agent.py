@@ -2,7 +2,6 @@
 # Licensed under the MIT License. See LICENSE for details.
 from __future__ import annotations
 
-import contextlib
 import hashlib
 import math
 import os
@@ -10,11 +9,12 @@ import platform
 import threading
 import time
 import uuid
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass, field, replace
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import psutil
 
 from paglets.core.agent import Paglet, PagletState, state_locked
@@ -24,8 +24,11 @@ from paglets.serialization.codec import dataclass_from_wire, dataclass_to_wire
 from paglets.services.contracts import ServiceContract, ServiceOperation
 from paglets.services.resident import ResidentServiceSpec
 
+from ..host_table import HostTable, host_table_from_records
 from ..server_info import GET_DISK, GET_LOAD, GET_SUMMARY, SERVER_INFO, DiskRequest, LoadRequest
 from .affinity import CpuAffinityResult, apply_process_cpu_affinity
+from .slot_queue import SlotRequestQueue, slot_owner_keys, slot_shape
+from .usage import DEFAULT_USAGE_SCAN_ENTRY_BUDGET, UsageSampler
 
 DEFAULT_LOOP_INTERVAL_SECONDS = 5.0
 DEFAULT_GOSSIP_INTERVAL_SECONDS = 5.0
@@ -46,6 +49,8 @@ COMPUTE_SLOTS_LOOP_ERROR_KEY = "compute-slots-loop"
 COMPUTE_SLOTS_EXPIRED_ACTIVE_LEASE_ERROR_KEY = "compute-slots-expired-active-lease"
 COMPUTE_SLOTS_SYNC_TIMEOUT_SECONDS = 1.0
 COMPUTE_USAGE_PATHS_MESSAGE = "compute_usage_paths"
+COMPUTE_SLOT_DECISION_MESSAGE = "compute_slot_decision"
+DECISION_DELIVERY_FAILED_MESSAGE = "decision delivery failed"
 
 DECISION_RUN_NOW = "run_now"
 DECISION_SLEEP = "sleep"
@@ -219,6 +224,20 @@ class ComputeJobRuntimeInfo:
     error: str = ""
 
 
+@dataclass(frozen=True, slots=True)
+class SlotBatchRequest:
+    slots: list[ComputeSlotRequest] = field(default_factory=list)
+    allow_local: bool = True
+    notify_agents: bool = False
+    max_age_seconds: float = DEFAULT_MAX_STATUS_AGE_SECONDS
+
+
+@dataclass(frozen=True, slots=True)
+class SlotBatchReply:
+    generated_at: float
+    decisions: list[SlotDecisionReply] = field(default_factory=list)
+
+
 @dataclass(frozen=True, slots=True)
 class SchedulerStatusRequest:
     include_queue: bool = False
@@ -266,6 +285,7 @@ class CancelSlotRequestsReply:
 
 CANDIDATE_HOSTS = ServiceOperation("candidate_hosts", CandidateHostsRequest, CandidateHostsReply)
 REQUEST_SLOT = ServiceOperation("request_slot", ComputeSlotRequest, SlotDecisionReply)
+REQUEST_SLOTS_BATCH = ServiceOperation("request_slots_batch", SlotBatchRequest, SlotBatchReply)
 RELEASE_SLOT = ServiceOperation("release_slot", SlotReleaseRequest, SlotReleaseReply)
 SCHEDULER_STATUS = ServiceOperation("scheduler_status", SchedulerStatusRequest, SchedulerStatusReply)
 SYNC_SCHEDULER_STATUS = ServiceOperation("sync_scheduler_status", SchedulerStatusSyncRequest, SchedulerStatusSyncReply)
@@ -276,6 +296,7 @@ COMPUTE_SLOTS = ServiceContract(
     operations=(
         CANDIDATE_HOSTS,
         REQUEST_SLOT,
+        REQUEST_SLOTS_BATCH,
         RELEASE_SLOT,
         SCHEDULER_STATUS,
         SYNC_SCHEDULER_STATUS,
@@ -308,6 +329,7 @@ class ComputeSlotsState(PagletState):
     last_gossip_at: float = 0.0
     usage_sample_interval: float = DEFAULT_USAGE_SAMPLE_INTERVAL_SECONDS
     usage_history_limit: int = DEFAULT_USAGE_HISTORY_LIMIT
+    usage_scan_entry_budget: int = DEFAULT_USAGE_SCAN_ENTRY_BUDGET
     last_usage_sample_at: float = 0.0
     active_usage: dict[str, dict[str, Any]] = field(default_factory=dict)
     finished_usage: list[dict[str, Any]] = field(default_factory=list)
@@ -332,7 +354,12 @@ class ComputeSlotsAgent(Paglet[ComputeSlotsState]):
     def __init__(self, state: ComputeSlotsState | None = None, *, agent_id: str | None = None):
         super().__init__(state=state, agent_id=agent_id)
         self._stop = threading.Event()
+        self._wake = threading.Event()
         self._thread: threading.Thread | None = None
+        self._slot_queue = SlotRequestQueue()
+        self._slot_queue_wire: list[dict[str, Any]] | None = None
+        self._usage_sampler = UsageSampler()
+        self._peer_table = _status_table()
 
     def on_creation(self, event):
         self.advertise_contract(COMPUTE_SLOTS, scope=self.state.service_scope)
@@ -344,7 +371,7 @@ class ComputeSlotsAgent(Paglet[ComputeSlotsState]):
         if self._thread is not None and self._thread.is_alive():
             return
         self._stop.clear()
-        self.resources.register("compute-slots-loop", self._stop.set, suppress=True)
+        self.resources.register("compute-slots-loop", self._stop_loop, suppress=True)
         self._thread = threading.Thread(
             target=self._loop,
             name=f"paglets-compute-slots-{self.context.name}",
@@ -358,6 +385,7 @@ class ComputeSlotsAgent(Paglet[ComputeSlotsState]):
             {
                 CANDIDATE_HOSTS: self.candidate_hosts,
                 REQUEST_SLOT: self.request_slot,
+                REQUEST_SLOTS_BATCH: self.request_slots_batch,
                 RELEASE_SLOT: self.release_slot,
                 SCHEDULER_STATUS: self.scheduler_status,
                 SYNC_SCHEDULER_STATUS: self.sync_scheduler_status,
@@ -368,28 +396,27 @@ class ComputeSlotsAgent(Paglet[ComputeSlotsState]):
 
     def candidate_hosts(self, request: CandidateHostsRequest) -> CandidateHostsReply:
         statuses = self._collect_statuses(request.max_age_seconds)
-        candidates: list[CandidateHost] = []
+        table = _status_table(statuses.items())
+        suitable = _can_ever_satisfy_mask(table, request.slot) & _healthy_mask(table) & _load_ok_mask(table)
+        if not request.include_self:
+            suitable &= _url_array(table) != self.context.address.rstrip("/")
+        scores = _candidate_scores(table, request.slot)
         rejected: dict[str, str] = {}
-        for status in statuses.values():
-            if not request.include_self and status.host_url.rstrip("/") == self.context.address.rstrip("/"):
-                rejected[status.host_name or status.host_url] = "self excluded"
-                continue
-            rejection = _can_ever_satisfy(status, request.slot)
+        for row in np.flatnonzero(~suitable):
+            status = table.records[row]
             key = status.host_name or status.host_url
-            if rejection:
-                rejected[key] = rejection
-                continue
-            health = _current_health_rejection(status)
-            if health:
-                rejected[key] = health
-                continue
-            load_rejection = _current_load_rejection(status)
-            if load_rejection:
-                rejected[key] = load_rejection
-                continue
-            candidates.append(
-                CandidateHost(status=status, score=_candidate_score(status, request.slot), reasons=["suitable"])
-            )
+            if not request.include_self and status.host_url.rstrip("/") == self.context.address.rstrip("/"):
+                rejected[key] = "self excluded"
+            else:
+                rejected[key] = (
+                    _can_ever_satisfy(status, request.slot)
+                    or _current_health_rejection(status)
+                    or _current_load_rejection(status)
+                )
+        candidates = [
+            CandidateHost(status=table.records[row], score=float(scores[row]), reasons=["suitable"])
+            for row in np.flatnonzero(suitable)
+        ]
         candidates.sort(key=lambda item: (item.score, item.status.host_name, item.status.host_url))
         limit = max(0, int(request.limit))
         if limit:
@@ -411,30 +438,27 @@ class ComputeSlotsAgent(Paglet[ComputeSlotsState]):
 
     def request_slot(self, request: ComputeSlotRequest) -> SlotDecisionReply:
         request = _normalize_request(request, default_host_url=self.context.address)
-        existing = self._existing_lease_reply(request)
-        if existing is not None:
-            return existing
-        local = self._local_status()
-        rejection = _can_ever_satisfy(local, request)
-        if rejection:
-            redirect = self._redirect_target(request)
-            if redirect is not None:
-                return self._redirect_reply(request, redirect, message="local host cannot satisfy request")
-            return SlotDecisionReply(decision=DECISION_REJECTED, request_id=request.request_id, message=rejection)
-        if self._can_grant_now(request, local, allow_burst=True):
-            return self._grant_now(request, local, send_message=False)
-        redirect = self._redirect_target(request)
-        if redirect is not None and _can_run_now(redirect, request):
-            return self._redirect_reply(request, redirect, message="peer host currently has capacity")
-        self._queue_request(request)
-        return SlotDecisionReply(
-            decision=DECISION_SLEEP,
-            request_id=request.request_id,
-            host_name=local.host_name,
-            host_url=local.host_url,
-            work_dir_base=local.work_dir_base,
-            message="queued for compute slot",
-        )
+        return self._admit_requests([request])[0]
+
+    def request_slots_batch(self, request: SlotBatchRequest) -> SlotBatchReply:
+        """Decide a whole batch of slot requests against one capacity snapshot.
+
+        With ``allow_local`` the batch is packed like consecutive
+        ``request_slot`` calls: grants, then redirects to peers with free
+        capacity, then the local queue. Without it every request is placed on
+        a suitable peer, as ``candidate_hosts`` would for a job that may not
+        run on its home host. With ``notify_agents`` each agent also receives
+        its decision as a ``compute_slot_decision`` message.
+        """
+
+        slots = [_normalize_request(slot, default_host_url=self.context.address) for slot in request.slots]
+        if request.allow_local:
+            decisions = self._admit_requests(slots)
+        else:
+            decisions = self._place_requests(slots, max_age=request.max_age_seconds)
+        if request.notify_agents:
+            decisions = [self._notify_decision(slot, decision) for slot, decision in zip(slots, decisions, strict=True)]
+        return SlotBatchReply(generated_at=time.time(), decisions=decisions)
 
     @state_locked
     def release_slot(self, request: SlotReleaseRequest) -> SlotReleaseReply:
@@ -444,6 +468,7 @@ class ComputeSlotsAgent(Paglet[ComputeSlotsState]):
             if not request.agent_id or request.agent_id == stored.request.agent_id:
                 self._finish_usage_for_lease_locked(stored, reason="released")
                 self.state.leases.pop(request.lease_id, None)
+                self._wake.set()
         return SlotReleaseReply(ok=True)
 
     def scheduler_status(self, request: SchedulerStatusRequest) -> SchedulerStatusReply:
@@ -453,7 +478,7 @@ class ComputeSlotsAgent(Paglet[ComputeSlotsState]):
         finished_usage: list[dict[str, Any]] = []
         if request.include_queue or request.include_jobs:
             with self.locked_state() as state:
-                queued = [dataclass_from_wire(ComputeSlotRequest, item) for item in state.queued_requests]
+                queued = list(self._queued_requests_locked())
                 leases = [dataclass_from_wire(SlotLease, item) for item in state.leases.values()]
         if request.include_usage_history:
             with self.locked_state() as state:
@@ -477,15 +502,10 @@ class ComputeSlotsAgent(Paglet[ComputeSlotsState]):
         if not _has_cancel_filter(request):
             return CancelSlotRequestsReply()
 
-        remaining_requests: list[dict[str, Any]] = []
-        cancelled_requests = 0
-        for item in self.state.queued_requests:
-            queued_request = dataclass_from_wire(ComputeSlotRequest, item)
-            if _matches_cancel_filter(queued_request, request):
-                cancelled_requests += 1
-            else:
-                remaining_requests.append(item)
-        self.state.queued_requests = remaining_requests
+        cancelled_requests = self._queued_requests_locked().remove_where(
+            lambda queued_request: _matches_cancel_filter(queued_request, request)
+        )
+        self._persist_queued_requests_locked()
 
         cancelled_leases = 0
         if request.include_leases:
@@ -495,6 +515,8 @@ class ComputeSlotsAgent(Paglet[ComputeSlotsState]):
                     self._finish_usage_for_lease_locked(lease, reason="cancelled")
                     self.state.leases.pop(lease_id, None)
                     cancelled_leases += 1
+        if cancelled_leases:
+            self._wake.set()
 
         return CancelSlotRequestsReply(
             cancelled_requests=cancelled_requests,
@@ -523,14 +545,41 @@ class ComputeSlotsAgent(Paglet[ComputeSlotsState]):
         statuses.append(self._local_status())
         return SchedulerStatusSyncReply(generated_at=now, accepted=accepted, statuses=statuses)
 
+    def _stop_loop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
     def _loop(self) -> None:
-        while not self._stop.wait(max(0.1, float(self.state.loop_interval))):
+        """Run scheduler passes until stopped.
+
+        Event wakes only grant queued requests, plus lease expiry once a lease
+        deadline has passed. Inactive-lease cleanup and elastic affinity
+        rebalancing keep their ``loop_interval`` cadence, so a burst of queued
+        requests or releases does not repeat them. Gossip and usage sampling
+        check their own intervals.
+        """
+
+        next_housekeeping_at = time.time() + max(0.1, float(self.state.loop_interval))
+        while True:
+            self._wake.wait(self._seconds_until_next_pass(next_housekeeping_at))
+            if self._stop.is_set():
+                return
+            self._wake.clear()
+            now = time.time()
+            housekeeping = now >= next_housekeeping_at
+            if housekeeping:
+                next_housekeeping_at = now + max(0.1, float(self.state.loop_interval))
+            with self.locked_state() as state:
+                lease_expired = _next_lease_expiry(state.leases) <= now
             try:
-                self._expire_leases()
-                self._cleanup_inactive_leases()
+                if housekeeping or lease_expired:
+                    self._expire_leases()
+                if housekeeping:
+                    self._cleanup_inactive_leases()
                 self._maybe_gossip()
                 self._grant_queued_requests()
-                self._rebalance_elastic_affinity()
+                if housekeeping:
+                    self._rebalance_elastic_affinity()
                 self._maybe_sample_usage()
             except Exception as exc:  # pragma: no cover - background diagnostics
                 with self.locked_state() as state:
@@ -539,6 +588,28 @@ class ComputeSlotsAgent(Paglet[ComputeSlotsState]):
                 with self.locked_state() as state:
                     state.errors.pop(COMPUTE_SLOTS_LOOP_ERROR_KEY, None)
 
+    def _seconds_until_next_pass(self, next_housekeeping_at: float) -> float:
+        """Return the wait until the next timed scheduler pass.
+
+        Releases, cancelled leases and newly queued requests wake the loop
+        early through ``_wake``. Timed passes cover ``loop_interval``
+        housekeeping, gossip, usage sampling, lease expiry, and the end of the
+        grant throttle while requests are queued. Deadlines already in the past
+        are ignored, so a request that cannot fit does not make the loop spin.
+        """
+
+        now = time.time()
+        with self.locked_state() as state:
+            due = [next_housekeeping_at, state.last_gossip_at + max(0.1, float(state.gossip_interval))]
+            sample_interval = float(state.usage_sample_interval)
+            if sample_interval > 0 and state.leases:
+                due.append(float(state.last_usage_sample_at or 0.0) + sample_interval)
+            if state.queued_requests:
+                due.append(state.last_grant_at + max(0.0, float(state.grant_interval)))
+            due.append(_next_lease_expiry(state.leases))
+        pending = [deadline for deadline in due if deadline > now]
+        return max(0.01, min(pending) - now) if pending else max(0.1, float(self.state.loop_interval))
+
     def _maybe_gossip(self) -> None:
         now = time.time()
         with self.locked_state() as state:
@@ -568,6 +639,128 @@ class ComputeSlotsAgent(Paglet[ComputeSlotsState]):
                     if status.host_url.rstrip("/") != self.context.address.rstrip("/"):
                         state.peer_statuses[status.host_url.rstrip("/")] = dataclass_to_wire(status)
 
+    def _admit_requests(self, requests: list[ComputeSlotRequest]) -> list[SlotDecisionReply]:
+        """Grant, redirect or queue normalized ``requests`` in order.
+
+        Local and peer capacity are read once. Each grant or redirect is then
+        subtracted from the projected status, so later requests in the same
+        call see the capacity that is actually left.
+        """
+
+        with self.locked_state() as state:
+            max_active_leases = max(0, int(state.max_active_leases))
+            cooldown_seconds = max(0.0, float(state.redirect_cooldown_seconds))
+            leases: dict[tuple[str, str], SlotLease] = {}
+            for wire in state.leases.values():
+                stored = dataclass_from_wire(SlotLease, wire)
+                leases.update(dict.fromkeys(slot_owner_keys(stored.request), stored))
+        local_host_url = self.context.address.rstrip("/")
+        local: SchedulerHostStatus | None = None
+        peers: HostTable[SchedulerHostStatus] | None = None
+        queued: list[ComputeSlotRequest] = []
+        decisions: list[SlotDecisionReply] = []
+        for request in requests:
+            lease = next((leases[key] for key in slot_owner_keys(request) if key in leases), None)
+            if lease is not None:
+                decisions.append(_existing_lease_decision(request, lease))
+                continue
+            if local is None:
+                local = self._local_status()
+            rejection = _can_ever_satisfy(local, request)
+            if not rejection and self._can_grant_now(request, local, allow_burst=True):
+                reply = self._grant_now(request, local, send_message=False)
+                if reply.decision == DECISION_RUN_NOW:
+                    local = _project_local_grant(local, request, max_active_leases=max_active_leases)
+                    with self.locked_state() as state:
+                        granted = dataclass_from_wire(SlotLease, state.leases[reply.lease_id])
+                    leases.update(dict.fromkeys(slot_owner_keys(request), granted))
+                    decisions.append(reply)
+                    continue
+            if _request_redirect_ready(request, now=time.time(), cooldown_seconds=cooldown_seconds):
+                if peers is None:
+                    peers = self._fresh_status_table(DEFAULT_MAX_STATUS_AGE_SECONDS)
+                row = _best_projected_redirect_row(request, peers, local_host_url=local_host_url)
+                if row is not None:
+                    message = "local host cannot satisfy request" if rejection else "peer host currently has capacity"
+                    decisions.append(self._redirect_reply(request, peers.records[row], message=message))
+                    _reserve_projected_capacity(peers, row, request)
+                    continue
+            if rejection:
+                decisions.append(
+                    SlotDecisionReply(decision=DECISION_REJECTED, request_id=request.request_id, message=rejection)
+                )
+                continue
+            queued.append(request)
+            decisions.append(
+                SlotDecisionReply(
+                    decision=DECISION_SLEEP,
+                    request_id=request.request_id,
+                    host_name=local.host_name,
+                    host_url=local.host_url,
+                    work_dir_base=local.work_dir_base,
+                    message="queued for compute slot",
+                )
+            )
+        if queued:
+            with self.locked_state():
+                queue = self._queued_requests_locked()
+                for request in queued:
+                    queue.put(request)
+                self._persist_queued_requests_locked()
+            self._wake.set()
+        return decisions
+
+    def _place_requests(self, requests: list[ComputeSlotRequest], *, max_age: float) -> list[SlotDecisionReply]:
+        """Place normalized ``requests`` on peers from one status collection.
+
+        Each placement is reserved in the projected table, so a batch spreads
+        over the mesh instead of sending every job to the same best host.
+        """
+
+        statuses = self._collect_statuses(max_age)
+        table = _status_table(statuses.items())
+        local_host_url = self.context.address.rstrip("/")
+        decisions: list[SlotDecisionReply] = []
+        for request in requests:
+            row = _best_placement_row(request, table, local_host_url=local_host_url)
+            if row is None:
+                decisions.append(
+                    SlotDecisionReply(
+                        decision=DECISION_REJECTED,
+                        request_id=request.request_id,
+                        message="no suitable compute host",
+                    )
+                )
+                continue
+            target = table.records[row]
+            decisions.append(
+                SlotDecisionReply(
+                    decision=DECISION_REDIRECT,
+                    request_id=request.request_id,
+                    host_name=target.host_name,
+                    host_url=target.host_url.rstrip("/"),
+                    message="placed on peer host",
+                    redirect_count=max(0, int(request.redirect_count)),
+                )
+            )
+            _reserve_projected_capacity(table, row, request)
+            table.column("queue_length")[row] += 1
+        return decisions
+
+    def _notify_decision(self, request: ComputeSlotRequest, reply: SlotDecisionReply) -> SlotDecisionReply:
+        if self._send_decision(request, reply):
+            return reply
+        with self.locked_state() as state:
+            if reply.lease_id:
+                state.leases.pop(reply.lease_id, None)
+            if reply.decision == DECISION_SLEEP:
+                self._remove_queued_request(request.request_id)
+        return SlotDecisionReply(
+            decision=DECISION_REJECTED,
+            request_id=request.request_id,
+            message=DECISION_DELIVERY_FAILED_MESSAGE,
+        )
+
     def _grant_queued_requests(self) -> None:
         grants_this_tick = 0
         with self.locked_state() as state:
@@ -589,7 +782,7 @@ class ComputeSlotsAgent(Paglet[ComputeSlotsState]):
     def _redirect_queued_requests(self) -> None:
         local = self._local_status()
         with self.locked_state() as state:
-            queued = [dataclass_from_wire(ComputeSlotRequest, item) for item in state.queued_requests]
+            queued = list(self._queued_requests_locked())
             redirect_budget = _redirect_budget(
                 queue_length=len(queued),
                 max_fraction=float(state.max_redirect_fraction),
@@ -600,39 +793,46 @@ class ComputeSlotsAgent(Paglet[ComputeSlotsState]):
             return
         if redirect_budget <= 0:
             return
-        projected = self._fresh_statuses(DEFAULT_MAX_STATUS_AGE_SECONDS)
+        projected = self._fresh_status_table(DEFAULT_MAX_STATUS_AGE_SECONDS)
         redirected = 0
         now = time.time()
+        runs_locally: dict[tuple[Any, ...], bool] = {}
         for request in queued:
             if redirected >= redirect_budget:
                 return
-            if _can_run_now(local, request):
+            shape = slot_shape(request)
+            if shape not in runs_locally:
+                runs_locally[shape] = _can_run_now(local, request)
+            if runs_locally[shape]:
                 continue
             if not _request_redirect_ready(request, now=now, cooldown_seconds=cooldown_seconds):
                 continue
-            target = _best_projected_redirect_target(
+            row = _best_projected_redirect_row(
                 request,
-                projected.values(),
+                projected,
                 local_host_url=self.context.address.rstrip("/"),
             )
-            if target is None or not _can_run_now(target, request):
+            if row is None:
                 continue
-            reply = self._redirect_reply(request, target, message="peer scheduler has free capacity")
+            reply = self._redirect_reply(request, projected.records[row], message="peer scheduler has free capacity")
             if self._send_redirect(request, reply):
                 self._remove_queued_request(request.request_id)
-                projected[target.host_url.rstrip("/")] = _reserve_projected_capacity(target, request)
+                _reserve_projected_capacity(projected, row, request)
                 redirected += 1
 
     def _next_grantable_request(self, *, allow_burst: bool) -> ComputeSlotRequest | None:
         local = self._local_status()
         with self.locked_state() as state:
-            queued = [dataclass_from_wire(ComputeSlotRequest, item) for item in state.queued_requests]
-        for request in queued:
-            if self._existing_lease_reply(request) is not None:
-                continue
-            if self._can_grant_now(request, local, allow_burst=allow_burst):
-                return request
-        return None
+            queue = self._queued_requests_locked()
+            if not queue:
+                return None
+            leased_owners: set[tuple[str, str]] = set()
+            for wire in state.leases.values():
+                leased_owners.update(slot_owner_keys(dataclass_from_wire(SlotLease, wire).request))
+            return queue.first_fitting(
+                lambda request: self._can_grant_now(request, local, allow_burst=allow_burst),
+                skip=lambda request: bool(leased_owners & slot_owner_keys(request)),
+            )
 
     def _can_grant_now(self, request: ComputeSlotRequest, status: SchedulerHostStatus, *, allow_burst: bool) -> bool:
         if not _can_run_now(status, request):
@@ -734,6 +934,19 @@ class ComputeSlotsAgent(Paglet[ComputeSlotsState]):
         except Exception:
             return False
 
+    def _send_decision(self, request: ComputeSlotRequest, reply: SlotDecisionReply) -> bool:
+        try:
+            proxy = self.context.get_proxy(request.agent_id, request.agent_host_url or self.context.address)
+            if proxy is None:
+                return False
+            proxy.send_oneway(
+                Message(COMPUTE_SLOT_DECISION_MESSAGE, dataclass_to_wire(reply)),
+                activate_if_inactive=True,
+            )
+            return True
+        except Exception:
+            return False
+
     def _send_redirect(self, request: ComputeSlotRequest, reply: SlotDecisionReply) -> bool:
         try:
             proxy = self.context.get_proxy(request.agent_id, request.agent_host_url or self.context.address)
@@ -774,11 +987,9 @@ class ComputeSlotsAgent(Paglet[ComputeSlotsState]):
             local_host_url = self.context.address.rstrip("/")
         except Exception:
             local_host_url = ""
-        return _best_projected_redirect_target(
-            request,
-            self._fresh_statuses(DEFAULT_MAX_STATUS_AGE_SECONDS).values(),
-            local_host_url=local_host_url,
-        )
+        table = self._fresh_status_table(DEFAULT_MAX_STATUS_AGE_SECONDS)
+        row = _best_projected_redirect_row(request, table, local_host_url=local_host_url)
+        return None if row is None else table.records[row]
 
     def _local_status(self) -> SchedulerHostStatus:
         self._expire_leases()
@@ -1006,6 +1217,10 @@ class ComputeSlotsAgent(Paglet[ComputeSlotsState]):
         include_usage: bool = False,
     ) -> list[ComputeJobRuntimeInfo]:
         info: list[ComputeJobRuntimeInfo] = []
+        sampler = self._usage_sampler
+        sampler.begin()
+        with self.locked_state() as state:
+            entry_budget = max(0, int(state.usage_scan_entry_budget))
         for lease in leases:
             active = False
             pid = 0
@@ -1031,7 +1246,7 @@ class ComputeSlotsAgent(Paglet[ComputeSlotsState]):
                 active = bool(agent_info.get("active"))
                 pid = int(agent_info.get("pid") or 0)
                 if pid > 0:
-                    process = psutil.Process(pid)
+                    process = sampler.process(pid)
                     with process.oneshot():
                         process_status = process.status()
                         memory = process.memory_info()
@@ -1039,19 +1254,19 @@ class ComputeSlotsAgent(Paglet[ComputeSlotsState]):
                         memory_percent = float(process.memory_percent())
                     cpu_percent = float(process.cpu_percent(interval=None))
                     if include_usage:
-                        tree_usage = _process_tree_memory_usage(process)
+                        tree_usage = sampler.process_tree_memory(process)
                         process_tree_count = tree_usage["process_count"]
                         process_tree_memory_rss = tree_usage["rss_bytes"]
                 if include_usage:
                     work_dir = _agent_work_dir(lease.work_dir_base, lease.request.agent_id)
                     work_dir_path = str(work_dir)
-                    disk_usage = _directory_usage(work_dir)
+                    disk_usage = sampler.directory_usage(work_dir, entry_budget=entry_budget)
                     work_dir_bytes = disk_usage["bytes"]
                     work_dir_file_count = disk_usage["files"]
                     usage_error = disk_usage["error"]
                     if proxy is not None and active:
                         extra_work_paths = _compute_job_usage_paths(proxy)
-                        extra_usage = _paths_usage(extra_work_paths)
+                        extra_usage = sampler.paths_usage(extra_work_paths, entry_budget=entry_budget)
                         extra_work_bytes = extra_usage["bytes"]
                         extra_work_file_count = extra_usage["files"]
                         if extra_usage["error"]:
@@ -1122,6 +1337,10 @@ class ComputeSlotsAgent(Paglet[ComputeSlotsState]):
         lease_by_id = {lease.lease_id: lease for lease in leases}
         active_ids = {lease.lease_id for lease in leases}
         samples = self._runtime_info_for_leases(leases, include_usage=True)
+        self._usage_sampler.retain(
+            pids=[sample.pid for sample in samples if sample.pid > 0],
+            paths=[path for sample in samples for path in [sample.work_dir_path, *sample.extra_work_paths] if path],
+        )
         with self.locked_state() as state:
             for lease_id in list(state.active_usage):
                 if lease_id not in active_ids:
@@ -1168,17 +1387,22 @@ class ComputeSlotsAgent(Paglet[ComputeSlotsState]):
         return samples[0] if samples else None
 
     def _fresh_statuses(self, max_age: float) -> dict[str, SchedulerHostStatus]:
+        table = self._fresh_status_table(max_age)
+        return dict(zip(table.keys, table.records, strict=True))
+
+    def _fresh_status_table(self, max_age: float) -> HostTable[SchedulerHostStatus]:
+        """Return a scratch copy of the peer status table without stale rows."""
+
         now = time.time()
         max_age = max(0.0, float(max_age))
         with self.locked_state() as state:
-            items = list(state.peer_statuses.items())
-        statuses: dict[str, SchedulerHostStatus] = {}
-        for key, wire in items:
-            status = dataclass_from_wire(SchedulerHostStatus, wire)
-            if max_age and now - status.observed_at > max_age:
-                continue
-            statuses[key] = status
-        return statuses
+            self._peer_table.sync(state.peer_statuses)
+            table = self._peer_table.copy()
+        if max_age:
+            stale = np.flatnonzero(now - table.column("observed_at") > max_age)
+            for key in [table.keys[row] for row in stale]:
+                table.remove(key)
+        return table
 
     def _collect_statuses(self, max_age: float) -> dict[str, SchedulerHostStatus]:
         statuses = self._fresh_statuses(max_age)
@@ -1208,40 +1432,27 @@ class ComputeSlotsAgent(Paglet[ComputeSlotsState]):
 
     @state_locked
     def _queue_request(self, request: ComputeSlotRequest) -> None:
-        self.state.queued_requests = [
-            item
-            for item in self.state.queued_requests
-            if not _same_slot_request_owner(dataclass_from_wire(ComputeSlotRequest, item), request)
-        ]
-        self.state.queued_requests.append(dataclass_to_wire(request))
+        self._queued_requests_locked().put(request)
+        self._persist_queued_requests_locked()
+        self._wake.set()
 
-    @state_locked
-    def _existing_lease_reply(self, request: ComputeSlotRequest) -> SlotDecisionReply | None:
-        for wire in self.state.leases.values():
-            lease = dataclass_from_wire(SlotLease, wire)
-            if not _same_slot_request_owner(lease.request, request):
-                continue
-            return SlotDecisionReply(
-                decision=DECISION_RUN_NOW,
-                request_id=request.request_id,
-                lease_id=lease.lease_id,
-                host_name=lease.host_name,
-                host_url=lease.host_url,
-                work_dir_base=lease.work_dir_base,
-                message="existing compute slot lease",
-                cpu_core_ids=list(lease.cpu_core_ids),
-                cpu_affinity_supported=lease.cpu_affinity_supported,
-                cpu_affinity_enforced=lease.cpu_affinity_enforced,
-                cpu_affinity_error=lease.cpu_affinity_error,
-            )
+    def _queued_requests_locked(self) -> SlotRequestQueue:
+        """Return the typed queue, rebuilding it if the wire state was replaced."""
+
+        wire = self.state.queued_requests
+        if wire is not self._slot_queue_wire or len(wire) != len(self._slot_queue):
+            self._slot_queue = SlotRequestQueue.from_wire(ComputeSlotRequest, wire)
+            self._slot_queue_wire = wire
+        return self._slot_queue
+
+    def _persist_queued_requests_locked(self) -> None:
+        self.state.queued_requests = self._slot_queue.wire()
+        self._slot_queue_wire = self.state.queued_requests
 
     @state_locked
     def _remove_queued_request(self, request_id: str) -> None:
-        self.state.queued_requests = [
-            item
-            for item in self.state.queued_requests
-            if dataclass_from_wire(ComputeSlotRequest, item).request_id != request_id
-        ]
+        if self._queued_requests_locked().remove(request_id) is not None:
+            self._persist_queued_requests_locked()
 
     @state_locked
     def _expire_leases(self) -> None:
@@ -1274,6 +1485,11 @@ class ComputeSlotsAgent(Paglet[ComputeSlotsState]):
             state.errors.pop(key, None)
 
 
+def _next_lease_expiry(leases: dict[str, dict[str, Any]]) -> float:
+    # Reads expires_at straight from the wire dicts instead of decoding each lease.
+    return min((float(wire.get("expires_at") or 0.0) for wire in leases.values()), default=math.inf)
+
+
 def _normalize_request(request: ComputeSlotRequest, *, default_host_url: str) -> ComputeSlotRequest:
     request_id = request.request_id or f"slot-request-{uuid.uuid4().hex}"
     submitted_at = request.submitted_at or time.time()
@@ -1304,6 +1520,47 @@ def _normalize_request(request: ComputeSlotRequest, *, default_host_url: str) ->
     )
 
 
+def _existing_lease_decision(request: ComputeSlotRequest, lease: SlotLease) -> SlotDecisionReply:
+    return SlotDecisionReply(
+        decision=DECISION_RUN_NOW,
+        request_id=request.request_id,
+        lease_id=lease.lease_id,
+        host_name=lease.host_name,
+        host_url=lease.host_url,
+        work_dir_base=lease.work_dir_base,
+        message="existing compute slot lease",
+        cpu_core_ids=list(lease.cpu_core_ids),
+        cpu_affinity_supported=lease.cpu_affinity_supported,
+        cpu_affinity_enforced=lease.cpu_affinity_enforced,
+        cpu_affinity_error=lease.cpu_affinity_error,
+    )
+
+
+def _project_local_grant(
+    status: SchedulerHostStatus,
+    request: ComputeSlotRequest,
+    *,
+    max_active_leases: int,
+) -> SchedulerHostStatus:
+    cpu = max(1, int(request.cpu_cores))
+    memory = max(0, int(request.memory_bytes))
+    storage = max(0, int(request.temp_storage_bytes))
+    active_leases = status.active_leases + 1
+    free_cpu = max(0, status.free_cpu_cores - cpu)
+    if max_active_leases > 0 and active_leases >= max_active_leases:
+        free_cpu = 0
+    return replace(
+        status,
+        active_leases=active_leases,
+        reserved_cpu_cores=status.reserved_cpu_cores + cpu,
+        reserved_memory_bytes=status.reserved_memory_bytes + memory,
+        reserved_temp_storage_bytes=status.reserved_temp_storage_bytes + storage,
+        free_cpu_cores=free_cpu,
+        free_memory_bytes=max(0, status.free_memory_bytes - memory),
+        free_temp_storage_bytes=max(0, status.free_temp_storage_bytes - storage),
+    )
+
+
 def _has_cancel_filter(request: CancelSlotRequestsRequest) -> bool:
     return bool(request.all or request.request_ids or request.agent_ids or request.job_ids)
 
@@ -1385,70 +1642,69 @@ def _request_redirect_ready(request: ComputeSlotRequest, *, now: float, cooldown
     return not last_redirect_at or now - last_redirect_at >= max(0.0, float(cooldown_seconds))
 
 
-def _best_projected_redirect_target(
+def _best_projected_redirect_row(
     request: ComputeSlotRequest,
-    statuses: Iterable[SchedulerHostStatus],
+    table: HostTable[SchedulerHostStatus],
     *,
     local_host_url: str,
-) -> SchedulerHostStatus | None:
-    candidates = [
-        status
-        for status in statuses
-        if status.host_url.rstrip("/") != local_host_url.rstrip("/")
-        and _can_run_now(status, request)
-        and status.host_url.rstrip("/") != request.last_redirect_from_host_url.rstrip("/")
-    ]
-    if not candidates:
-        candidates = [
-            status
-            for status in statuses
-            if status.host_url.rstrip("/") != local_host_url.rstrip("/") and _can_run_now(status, request)
-        ]
-    if not candidates:
+) -> int | None:
+    """Return the peer row with the shortest queue and most free cores that can run ``request`` now.
+
+    The host that redirected ``request`` here is only chosen when no other peer
+    fits. Remaining ties go to the lower candidate score, then host name and
+    URL.
+    """
+
+    if not len(table):
         return None
-    candidates.sort(
-        key=lambda status: (
-            status.queue_length,
-            -status.free_cpu_cores,
-            _candidate_score(status, request),
-            status.host_name,
-            status.host_url,
-        )
-    )
-    return candidates[0]
-
-
-def _reserve_projected_capacity(status: SchedulerHostStatus, request: ComputeSlotRequest) -> SchedulerHostStatus:
-    return SchedulerHostStatus(
-        host_name=status.host_name,
-        host_url=status.host_url,
-        observed_at=status.observed_at,
-        supports_cpu_jobs=status.supports_cpu_jobs,
-        supports_gpu_jobs=status.supports_gpu_jobs,
-        cpu_count_logical=status.cpu_count_logical,
-        cpu_affinity_supported=status.cpu_affinity_supported,
-        eligible_cpu_ids=list(status.eligible_cpu_ids),
-        cpu_percent=status.cpu_percent,
-        load_average=list(status.load_average),
-        load_per_cpu=status.load_per_cpu,
-        max_load_per_cpu=status.max_load_per_cpu,
-        memory_total_bytes=status.memory_total_bytes,
-        memory_available_bytes=status.memory_available_bytes,
-        work_dir_base=status.work_dir_base,
-        work_total_bytes=status.work_total_bytes,
-        work_free_bytes=status.work_free_bytes,
-        queue_length=status.queue_length,
-        active_leases=status.active_leases + 1,
-        host_tags=status.host_tags,
-        host_properties=dict(status.host_properties),
-        reserved_cpu_cores=status.reserved_cpu_cores + max(1, int(request.cpu_cores)),
-        reserved_memory_bytes=status.reserved_memory_bytes + max(0, int(request.memory_bytes)),
-        reserved_temp_storage_bytes=status.reserved_temp_storage_bytes + max(0, int(request.temp_storage_bytes)),
-        free_cpu_cores=max(0, status.free_cpu_cores - max(1, int(request.cpu_cores))),
-        free_memory_bytes=max(0, status.free_memory_bytes - max(0, int(request.memory_bytes))),
-        free_temp_storage_bytes=max(0, status.free_temp_storage_bytes - max(0, int(request.temp_storage_bytes))),
-        errors=list(status.errors),
-    )
+    urls = _url_array(table)
+    eligible = _run_now_mask(table, request) & (urls != local_host_url.rstrip("/"))
+    preferred = eligible & (urls != request.last_redirect_from_host_url.rstrip("/"))
+    rows = np.flatnonzero(preferred if preferred.any() else eligible)
+    if not rows.size:
+        return None
+    queue = table.column("queue_length")[rows]
+    free_cpu = table.column("free_cpu_cores")[rows]
+    scores = _candidate_scores(table, request)[rows]
+    first = np.lexsort((scores, -free_cpu, queue))[0]
+    tied = rows[(queue == queue[first]) & (free_cpu == free_cpu[first]) & (scores == scores[first])]
+    return int(min(tied, key=lambda row: (table.records[row].host_name, table.records[row].host_url)))
+
+
+def _best_placement_row(
+    request: ComputeSlotRequest,
+    table: HostTable[SchedulerHostStatus],
+    *,
+    local_host_url: str,
+) -> int | None:
+    """Return the best peer row for a job that may not run on ``local_host_url``.
+
+    Peers that can run ``request`` now are preferred. Otherwise the lowest
+    candidate score among suitable peers wins, so the job waits in the
+    shortest, least loaded queue.
+    """
+
+    if not len(table):
+        return None
+    suitable = _can_ever_satisfy_mask(table, request) & _healthy_mask(table) & _load_ok_mask(table)
+    suitable &= _url_array(table) != local_host_url.rstrip("/")
+    run_now = suitable & _run_now_mask(table, request)
+    rows = np.flatnonzero(run_now if run_now.any() else suitable)
+    if not rows.size:
+        return None
+    scores = _candidate_scores(table, request)[rows]
+    tied = rows[scores == scores.min()]
+    return int(min(tied, key=lambda row: (table.records[row].host_name, table.records[row].host_url)))
+
+
+def _reserve_projected_capacity(table: HostTable[SchedulerHostStatus], row: int, request: ComputeSlotRequest) -> None:
+    for column, amount in (
+        ("free_cpu_cores", max(1, int(request.cpu_cores))),
+        ("free_memory_bytes", max(0, int(request.memory_bytes))),
+        ("free_temp_storage_bytes", max(0, int(request.temp_storage_bytes))),
+    ):
+        values = table.column(column)
+        values[row] = max(0.0, values[row] - amount)
 
 
 def _select_placement_candidate(
@@ -1536,6 +1792,97 @@ def _local_cpu_affinity_capability(cpu_count: int) -> tuple[bool, list[int]]:
     return False, fallback
 
 
+_STATUS_COLUMNS: dict[str, Callable[[SchedulerHostStatus], float]] = {
+    "observed_at": lambda status: status.observed_at,
+    "supports_cpu_jobs": lambda status: status.supports_cpu_jobs,
+    "supports_gpu_jobs": lambda status: status.supports_gpu_jobs,
+    "eligible_cpu_count": lambda status: len(_eligible_cpu_ids(status)),
+    "cpu_percent": lambda status: status.cpu_percent,
+    "load_per_cpu": lambda status: status.load_per_cpu,
+    "max_load_per_cpu": lambda status: status.max_load_per_cpu,
+    "memory_total_bytes": lambda status: status.memory_total_bytes,
+    "work_total_bytes": lambda status: status.work_total_bytes,
+    "queue_length": lambda status: status.queue_length,
+    "free_cpu_cores": lambda status: status.free_cpu_cores,
+    "free_memory_bytes": lambda status: status.free_memory_bytes,
+    "free_temp_storage_bytes": lambda status: status.free_temp_storage_bytes,
+    "has_errors": lambda status: bool(status.errors),
+}
+
+
+def _status_table(
+    statuses: Iterable[tuple[str, SchedulerHostStatus]] = (),
+) -> HostTable[SchedulerHostStatus]:
+    return host_table_from_records(SchedulerHostStatus, _STATUS_COLUMNS, statuses, tags=_status_tag_set)
+
+
+def _url_array(table: HostTable[SchedulerHostStatus]) -> np.ndarray:
+    return np.array([status.host_url.rstrip("/") for status in table.records], dtype=object)
+
+
+def _can_ever_satisfy_mask(table: HostTable[SchedulerHostStatus], request: ComputeSlotRequest) -> np.ndarray:
+    """Vectorized ``_can_ever_satisfy`` over every row of ``table``."""
+
+    mask = table.column("supports_cpu_jobs") > 0
+    if request.requires_gpu:
+        mask &= table.column("supports_gpu_jobs") > 0
+    if request.required_host_tags:
+        mask &= table.has_all_tags(request.required_host_tags)
+    if request.excluded_host_tags:
+        mask &= table.tag_matches(request.excluded_host_tags) == 0
+    if request.excluded_host_names:
+        names = {name.strip().casefold() for name in request.excluded_host_names}
+        mask &= np.array([status.host_name.strip().casefold() not in names for status in table.records], dtype=bool)
+    if request.excluded_host_urls:
+        urls = {url.rstrip("/") for url in request.excluded_host_urls}
+        mask &= np.array([status.host_url.rstrip("/") not in urls for status in table.records], dtype=bool)
+    eligible_cpus = table.column("eligible_cpu_count")
+    mask &= ~((eligible_cpus > 0) & (request.cpu_cores > eligible_cpus))
+    memory_total = table.column("memory_total_bytes")
+    mask &= ~((memory_total > 0) & (request.memory_bytes > memory_total))
+    work_total = table.column("work_total_bytes")
+    mask &= ~((work_total > 0) & (request.temp_storage_bytes > work_total))
+    return mask
+
+
+def _healthy_mask(table: HostTable[SchedulerHostStatus]) -> np.ndarray:
+    return table.column("has_errors") == 0
+
+
+def _load_ok_mask(table: HostTable[SchedulerHostStatus]) -> np.ndarray:
+    limit = table.column("max_load_per_cpu")
+    return ~((limit > 0) & (table.column("load_per_cpu") >= limit))
+
+
+def _run_now_mask(table: HostTable[SchedulerHostStatus], request: ComputeSlotRequest) -> np.ndarray:
+    """Vectorized ``_can_run_now`` over every row of ``table``."""
+
+    mask = _can_ever_satisfy_mask(table, request) & _healthy_mask(table) & _load_ok_mask(table)
+    mask &= request.cpu_cores <= np.maximum(table.column("free_cpu_cores"), 0)
+    mask &= request.memory_bytes <= np.maximum(table.column("free_memory_bytes"), 0)
+    mask &= request.temp_storage_bytes <= np.maximum(table.column("free_temp_storage_bytes"), 0)
+    return mask
+
+
+def _candidate_scores(
+    table: HostTable[SchedulerHostStatus],
+    request: ComputeSlotRequest | None = None,
+) -> np.ndarray:
+    """Vectorized ``_candidate_score`` over every row of ``table``."""
+
+    cpu_pressure = np.maximum(0.0, table.column("load_per_cpu")) + np.maximum(0.0, table.column("cpu_percent") / 100.0)
+    memory_total = table.column("memory_total_bytes")
+    work_total = table.column("work_total_bytes")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        memory_pressure = np.where(memory_total != 0, 1.0 - table.column("free_memory_bytes") / memory_total, 1.0)
+        storage_pressure = np.where(work_total != 0, 1.0 - table.column("free_temp_storage_bytes") / work_total, 1.0)
+    preferred_bonus: np.ndarray | float = 0.0
+    if request is not None and request.preferred_host_tags:
+        preferred_bonus = np.minimum(0.75, table.tag_matches(request.preferred_host_tags) * 0.25)
+    total = cpu_pressure + memory_pressure + storage_pressure + table.column("queue_length") * 0.1 - preferred_bonus
+    return np.round(np.maximum(0.0, total), 6)
+
+
 def _candidate_score(status: SchedulerHostStatus, request: ComputeSlotRequest | None = None) -> float:
     cpu_pressure = max(0.0, status.load_per_cpu) + max(0.0, status.cpu_percent / 100.0)
     memory_pressure = 1.0
@@ -1553,72 +1900,6 @@ def _candidate_score(status: SchedulerHostStatus, request: ComputeSlotRequest |
     )
 
 
-def _process_tree_memory_usage(process: psutil.Process) -> dict[str, int]:
-    processes = [process]
-    with contextlib.suppress(psutil.AccessDenied, psutil.NoSuchProcess, psutil.ZombieProcess):
-        processes.extend(process.children(recursive=True))
-    seen: set[int] = set()
-    rss_bytes = 0
-    process_count = 0
-    for item in processes:
-        try:
-            pid = int(item.pid)
-            if pid in seen:
-                continue
-            seen.add(pid)
-            rss_bytes += int(item.memory_info().rss)
-            process_count += 1
-        except (psutil.AccessDenied, psutil.NoSuchProcess, psutil.ZombieProcess):
-            continue
-    return {"process_count": process_count, "rss_bytes": rss_bytes}
-
-
-def _directory_usage(path: Path) -> dict[str, int | str]:
-    total_bytes = 0
-    file_count = 0
-    errors: list[str] = []
-    stack = [path]
-    while stack:
-        current = stack.pop()
-        try:
-            with os.scandir(current) as entries:
-                for entry in entries:
-                    try:
-                        if entry.is_dir(follow_symlinks=False):
-                            stack.append(Path(entry.path))
-                        elif entry.is_file(follow_symlinks=False):
-                            total_bytes += int(entry.stat(follow_symlinks=False).st_size)
-                            file_count += 1
-                    except OSError as exc:
-                        errors.append(str(exc))
-        except FileNotFoundError:
-            continue
-        except OSError as exc:
-            errors.append(str(exc))
-    return {"bytes": total_bytes, "files": file_count, "error": "; ".join(errors[:3])}
-
-
-def _paths_usage(paths: list[str]) -> dict[str, int | str]:
-    total_bytes = 0
-    file_count = 0
-    errors: list[str] = []
-    for value in paths:
-        path = Path(value).expanduser()
-        try:
-            if path.is_dir():
-                usage = _directory_usage(path)
-                total_bytes += int(usage["bytes"])
-                file_count += int(usage["files"])
-                if usage["error"]:
-                    errors.append(str(usage["error"]))
-            elif path.is_file():
-                total_bytes += int(path.stat().st_size)
-                file_count += 1
-        except OSError as exc:
-            errors.append(str(exc))
-    return {"bytes": total_bytes, "files": file_count, "error": "; ".join(errors[:3])}
-
-
 def _merge_usage_sample(record: dict[str, Any], sample: ComputeJobRuntimeInfo, *, sampled_at: float) -> dict[str, Any]:
     total_work_bytes = max(0, int(sample.work_dir_bytes)) + max(0, int(sample.extra_work_bytes))
     record.setdefault("lease_id", sample.lease_id)
@@ -18,8 +18,19 @@ from paglets.remote.references import PagletProxyRef
 from paglets.serialization.codec import dataclass_to_wire
 from paglets.system.user_info import NOTIFY_USER, USER_INFO, UserInfoRequest
 
+from .agent import (
+    COMPUTE_SLOT_DECISION_MESSAGE,
+    COMPUTE_SLOTS,
+    DECISION_DELIVERY_FAILED_MESSAGE,
+    DECISION_REJECTED,
+    REQUEST_SLOTS_BATCH,
+    SlotBatchRequest,
+    SlotDecisionReply,
+)
 from .job import ComputeJobPaglet, ComputeJobState
 
+DEFAULT_BATCH_ADMISSION_TIMEOUT_SECONDS = 30.0
+
 GROUP_STATUS_ACTIVE = "ACTIVE"
 GROUP_STATUS_COMPLETE = "COMPLETE"
 GROUP_STATUS_WAITING_FOR_HOME = "WAITING_FOR_HOME"
@@ -354,7 +365,18 @@ def submit_compute_job_group(
     group_id: str | None = None,
     return_home_when_complete: bool = False,
     job_metadata: list[dict[str, Any]] | None = None,
+    batch_admission: bool = True,
+    admission_timeout_seconds: float = DEFAULT_BATCH_ADMISSION_TIMEOUT_SECONDS,
 ) -> ComputeJobGroupSubmission:
+    """Create a result collector and one compute job per state.
+
+    With ``batch_admission`` the jobs do not request slots one by one. They
+    wait until the local scheduler has decided all of them in one
+    ``request_slots_batch`` call per placement mode and has sent each job its
+    decision. Jobs whose estimates are invalid, or that get no decision, fall
+    back to requesting a slot themselves.
+    """
+
     context = _context_from(context_or_host)
     group_id = group_id or f"group-{uuid.uuid4().hex}"
     if collector_state is None:
@@ -383,7 +405,11 @@ def submit_compute_job_group(
     jobs: list[PagletProxy] = []
     creation_errors: dict[str, str] = {}
     registered_updates: list[dict[str, Any]] = []
+    admitted: list[tuple[CollectingComputeJobState, PagletProxy]] = []
     for state in job_states:
+        state.slot_admission_pending = batch_admission and not job_cls.compute_estimate_error(state)
+        if state.slot_admission_pending and not state.slot_request_id:
+            state.slot_request_id = f"compute-slot-{uuid.uuid4().hex}"
         try:
             proxy = _create_paglet(context, job_cls, state)
         except Exception as exc:
@@ -402,11 +428,61 @@ def submit_compute_job_group(
             continue
         jobs.append(proxy)
         registered_updates.append({"job_key": state.job_key, "agent_id": proxy.agent_id, "host_url": proxy.host_url})
+        if state.slot_admission_pending:
+            admitted.append((state, proxy))
     if registered_updates:
         collector.send(Message("register_jobs", {"jobs": registered_updates}))
+    if admitted:
+        _admit_compute_jobs(context, job_cls, admitted, timeout=admission_timeout_seconds)
     return ComputeJobGroupSubmission(group_id=group_id, collector=collector, jobs=jobs, creation_errors=creation_errors)
 
 
+def _admit_compute_jobs(
+    context: Any,
+    job_cls: type[ComputeJobPaglet],
+    jobs: list[tuple[CollectingComputeJobState, PagletProxy]],
+    *,
+    timeout: float,
+) -> None:
+    """Request slots for freshly created jobs with one scheduler call per placement mode.
+
+    Jobs whose decision the scheduler could not deliver, and all jobs of a
+    failed batch call, are sent a ``rejected`` decision here so they fall back
+    to requesting a slot themselves.
+    """
+
+    modes: dict[bool, list[tuple[CollectingComputeJobState, PagletProxy]]] = {}
+    for state, proxy in jobs:
+        modes.setdefault(bool(state.allow_home_compute), []).append((state, proxy))
+    for allow_local, members in modes.items():
+        slots = [
+            job_cls.compute_slot_request_for_state(state, agent_id=proxy.agent_id, agent_host_url=proxy.host_url)
+            for state, proxy in members
+        ]
+        try:
+            handle = context.require_contract(COMPUTE_SLOTS, operation=REQUEST_SLOTS_BATCH, scope=ServiceScope.LOCAL)
+            reply = handle.call(
+                REQUEST_SLOTS_BATCH,
+                SlotBatchRequest(slots=slots, allow_local=allow_local, notify_agents=True),
+                timeout=max(0.0, float(timeout)),
+            )
+        except Exception as exc:
+            for slot, (_state, proxy) in zip(slots, members, strict=True):
+                _send_admission_fallback(proxy, slot.request_id, f"batch admission failed: {exc}")
+            continue
+        delivered = {decision.request_id: decision for decision in reply.decisions}
+        for slot, (_state, proxy) in zip(slots, members, strict=True):
+            decision = delivered.get(slot.request_id)
+            if decision is None or decision.message == DECISION_DELIVERY_FAILED_MESSAGE:
+                _send_admission_fallback(proxy, slot.request_id, "batch admission decision was not delivered")
+
+
+def _send_admission_fallback(proxy: PagletProxy, request_id: str, message: str) -> None:
+    fallback = SlotDecisionReply(decision=DECISION_REJECTED, request_id=request_id, message=message)
+    with contextlib.suppress(Exception):
+        proxy.send_oneway(Message(COMPUTE_SLOT_DECISION_MESSAGE, dataclass_to_wire(fallback)))
+
+
 def _context_from(context_or_host: Any) -> Any:
     if isinstance(context_or_host, PagletContext):
         return context_or_host
@@ -436,6 +512,11 @@ class _HostSubmitContext:
             return self._host.create_remote(host_url, agent_cls, state)
         return self._host.create(agent_cls, state)
 
+    def require_contract(
+        self, contract: Any, *, operation: Any = None, scope: ServiceScope = ServiceScope.LOCAL
+    ) -> Any:
+        return PagletContext(self._host).require_contract(contract, operation=operation, scope=scope)
+
 
 __all__ = [
     "GROUP_STATUS_ACTIVE",
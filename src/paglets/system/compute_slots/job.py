@@ -19,6 +19,7 @@ from paglets.serialization.codec import dataclass_from_wire, dataclass_to_wire
 
 from .agent import (
     CANDIDATE_HOSTS,
+    COMPUTE_SLOT_DECISION_MESSAGE,
     COMPUTE_SLOTS,
     COMPUTE_USAGE_PATHS_MESSAGE,
     RELEASE_SLOT,
@@ -72,6 +73,8 @@ class ComputeJobState(PagletState):
     cpu_affinity_error: str = ""
     restart_running_on_host_startup: bool = True
     restart_initial_state: dict[str, Any] = field(default_factory=dict)
+    slot_admission_pending: bool = False
+    slot_decision: dict[str, Any] = field(default_factory=dict)
 
 
 StateT = TypeVar("StateT", bound=ComputeJobState)
@@ -86,6 +89,9 @@ class ComputeJobPaglet(Paglet[StateT], Generic[StateT]):
         self._ensure_restart_initial_state()
 
     def run(self) -> None:
+        with self.locked_state() as state:
+            if state.slot_admission_pending:
+                return
         self.start_compute_worker()
 
     def handle_message(self, message: Message):
@@ -115,6 +121,23 @@ class ComputeJobPaglet(Paglet[StateT], Generic[StateT]):
                 state.compute_status = COMPUTE_STATUS_PLACING
             self.start_compute_worker()
             return {"ok": True}
+        if message.kind == COMPUTE_SLOT_DECISION_MESSAGE:
+            reply = dataclass_from_wire(SlotDecisionReply, dict(message.args))
+            stale_lease_id = ""
+            with self.locked_state() as state:
+                accept = state.slot_admission_pending or _is_fallback_decision(state.slot_decision)
+                if accept:
+                    state.slot_decision = dict(message.args)
+                    state.slot_admission_pending = False
+                elif reply.decision == "run_now" and reply.lease_id != state.slot_lease_id:
+                    stale_lease_id = reply.lease_id
+            # A late batch decision is dropped: the job already acts on an
+            # earlier one. A late grant would otherwise hold its lease forever.
+            if accept:
+                self.start_compute_worker()
+            elif stale_lease_id:
+                self._release_compute_lease(stale_lease_id)
+            return {"ok": True}
         return None
 
     def handle_compute_job_message(self, message: Message) -> Any | None:
@@ -153,6 +176,7 @@ class ComputeJobPaglet(Paglet[StateT], Generic[StateT]):
         with self.locked_state() as state:
             if state.compute_status == COMPUTE_STATUS_RUNNING and state.restart_running_on_host_startup:
                 self._restore_restart_initial_state_locked(state)
+            state.slot_admission_pending = False
             should_start = state.compute_status in {
                 COMPUTE_STATUS_NEW,
                 COMPUTE_STATUS_PLACING,
@@ -178,10 +202,18 @@ class ComputeJobPaglet(Paglet[StateT], Generic[StateT]):
         estimated_runtime_seconds: float | None = None,
         candidate_limit: int | None = None,
     ) -> bool:
+        decision = self._take_compute_slot_decision()
         error = self.validate_compute_estimates()
         if error:
+            if decision is not None and decision.decision == "run_now":
+                with self.locked_state() as state:
+                    self._record_compute_slot_grant_locked(state, decision)
             self._fail_compute_job(error)
             return False
+        if decision is not None and decision.decision != "rejected":
+            with self.locked_state() as state:
+                self._ensure_compute_home_locked(state)
+            return self._apply_compute_slot_decision(decision)
         selected = ""
         with self.locked_state() as state:
             self._ensure_compute_home_locked(state)
@@ -240,7 +272,17 @@ class ComputeJobPaglet(Paglet[StateT], Generic[StateT]):
         handle = self.require_contract(COMPUTE_SLOTS, operation=REQUEST_SLOT, scope=ServiceScope.LOCAL)
         with self.locked_state() as state:
             timeout = max(0.0, float(state.scheduler_timeout_seconds))
-        reply = handle.call(REQUEST_SLOT, slot, timeout=timeout)
+        return self._apply_compute_slot_decision(handle.call(REQUEST_SLOT, slot, timeout=timeout))
+
+    def _take_compute_slot_decision(self) -> SlotDecisionReply | None:
+        """Return and clear a decision delivered by batch admission, if any."""
+
+        with self.locked_state() as state:
+            wire = state.slot_decision
+            state.slot_decision = {}
+        return dataclass_from_wire(SlotDecisionReply, wire) if wire else None
+
+    def _apply_compute_slot_decision(self, reply: SlotDecisionReply) -> bool:
         if reply.decision == "run_now":
             with self.locked_state() as state:
                 self._record_compute_slot_grant_locked(state, reply)
@@ -248,7 +290,10 @@ class ComputeJobPaglet(Paglet[StateT], Generic[StateT]):
             return True
         if reply.decision == "redirect" and reply.host_url:
             with self.locked_state() as state:
-                self._record_compute_slot_redirect_locked(state, reply)
+                if reply.redirected_from_host_url:
+                    self._record_compute_slot_redirect_locked(state, reply)
+                else:
+                    state.selected_host_url = reply.host_url.rstrip("/")
                 state.compute_status = COMPUTE_STATUS_PLACING
             self.dispatch(reply.host_url)
             return False
@@ -270,8 +315,10 @@ class ComputeJobPaglet(Paglet[StateT], Generic[StateT]):
         with self.locked_state() as state:
             lease_id = state.slot_lease_id
             state.slot_lease_id = ""
-        if not lease_id:
-            return
+        if lease_id:
+            self._release_compute_lease(lease_id)
+
+    def _release_compute_lease(self, lease_id: str) -> None:
         try:
             handle = self.require_contract(COMPUTE_SLOTS, operation=RELEASE_SLOT, scope=ServiceScope.LOCAL)
             with self.locked_state() as state:
@@ -295,7 +342,7 @@ class ComputeJobPaglet(Paglet[StateT], Generic[StateT]):
     @final
     def compute_job_id(self) -> str:
         """Return the scheduler-facing runtime ID for this compute job."""
-        return f"compute-job-{self.agent_id}"
+        return _compute_job_id(self.agent_id)
 
     def run_compute_job(self) -> None:
         raise NotImplementedError
@@ -313,14 +360,18 @@ class ComputeJobPaglet(Paglet[StateT], Generic[StateT]):
 
     def validate_compute_estimates(self) -> str:
         with self.locked_state() as state:
-            if int(state.cpu_cores) < 1:
-                return "cpu_cores must be at least 1"
-            if float(state.estimated_runtime_seconds) <= 0.0 and not state.allow_zero_runtime_seconds:
-                return "estimated_runtime_seconds must be greater than 0"
-            if int(state.memory_bytes) <= 0 and not state.allow_zero_memory_bytes:
-                return "memory_bytes must be greater than 0"
-            if int(state.temp_storage_bytes) < 0:
-                return "temp_storage_bytes must be greater than or equal to 0"
+            return self.compute_estimate_error(state)
+
+    @staticmethod
+    def compute_estimate_error(state: ComputeJobState) -> str:
+        if int(state.cpu_cores) < 1:
+            return "cpu_cores must be at least 1"
+        if float(state.estimated_runtime_seconds) <= 0.0 and not state.allow_zero_runtime_seconds:
+            return "estimated_runtime_seconds must be greater than 0"
+        if int(state.memory_bytes) <= 0 and not state.allow_zero_memory_bytes:
+            return "memory_bytes must be greater than 0"
+        if int(state.temp_storage_bytes) < 0:
+            return "temp_storage_bytes must be greater than or equal to 0"
         return ""
 
     def notify_user(
@@ -359,13 +410,35 @@ class ComputeJobPaglet(Paglet[StateT], Generic[StateT]):
         *,
         estimated_runtime_seconds: float,
     ) -> ComputeSlotRequest:
+        return self.compute_slot_request_for_state(
+            state,
+            agent_id=self.agent_id,
+            agent_host_url=self.context.address,
+            estimated_runtime_seconds=estimated_runtime_seconds,
+        )
+
+    @staticmethod
+    def compute_slot_request_for_state(
+        state: ComputeJobState,
+        *,
+        agent_id: str,
+        agent_host_url: str,
+        estimated_runtime_seconds: float | None = None,
+    ) -> ComputeSlotRequest:
+        """Build the slot request a job with ``state`` and ``agent_id`` would send.
+
+        Batch admission uses this to request slots for jobs it has just created.
+        """
+
         if not state.slot_request_id:
             state.slot_request_id = f"compute-slot-{uuid.uuid4().hex}"
+        if estimated_runtime_seconds is None:
+            estimated_runtime_seconds = max(0.0, float(state.estimated_runtime_seconds))
         return ComputeSlotRequest(
             request_id=state.slot_request_id,
-            agent_id=self.agent_id,
-            agent_host_url=self.context.address.rstrip("/"),
-            job_id=self.compute_job_id(),
+            agent_id=agent_id,
+            agent_host_url=agent_host_url.rstrip("/"),
+            job_id=_compute_job_id(agent_id),
             cpu_cores=state.cpu_cores,
             memory_bytes=state.memory_bytes,
             temp_storage_bytes=state.temp_storage_bytes,
@@ -442,7 +515,9 @@ class ComputeJobPaglet(Paglet[StateT], Generic[StateT]):
                 return
             if state.compute_status != COMPUTE_STATUS_NEW:
                 return
-            state.restart_initial_state = dataclass_to_wire(replace(state, restart_initial_state={}))
+            state.restart_initial_state = dataclass_to_wire(
+                replace(state, restart_initial_state={}, slot_admission_pending=False, slot_decision={})
+            )
 
     def _restore_restart_initial_state_locked(self, state: StateT) -> None:
         if not state.restart_initial_state:
@@ -487,6 +562,15 @@ class ComputeJobPaglet(Paglet[StateT], Generic[StateT]):
         ) == state.home_host_url.rstrip("/")
 
 
+def _is_fallback_decision(wire: dict[str, Any]) -> bool:
+    # The group's own "rejected" fallback may be overtaken by the real decision.
+    return bool(wire) and wire.get("decision") == "rejected"
+
+
+def _compute_job_id(agent_id: str) -> str:
+    return f"compute-job-{agent_id}"
+
+
 __all__ = [
     "COMPUTE_STATUS_COMPLETED",
     "COMPUTE_STATUS_FAILED_FINAL",
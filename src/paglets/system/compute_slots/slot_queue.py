@@ -0,0 +1,157 @@
+# Copyright (c) 2026 by C. Klukas.
+# Licensed under the MIT License. See LICENSE for details.
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+from typing import TYPE_CHECKING, Any
+
+from paglets.serialization.codec import dataclass_from_wire, dataclass_to_wire
+
+if TYPE_CHECKING:
+    from .agent import ComputeSlotRequest
+
+SlotShape = tuple[Any, ...]
+
+
+class SlotRequestQueue:
+    """FIFO of queued compute-slot requests, indexed by owner and shape.
+
+    Requests are decoded once, when they are queued or loaded from the wire
+    state. Owners (agent ID, request ID and job ID) are indexed, so queueing a
+    request replaces its owner's earlier request without a scan. Requests with
+    the same resource demand and host policy share a shape bucket, so grant
+    selection only has to test the head of each bucket.
+    ``wire()`` returns the queue in persisted form, reusing the stored wire
+    dicts.
+    """
+
+    def __init__(self) -> None:
+        self._requests: dict[str, ComputeSlotRequest] = {}
+        self._wire: dict[str, dict[str, Any]] = {}
+        self._order: dict[str, int] = {}
+        self._owners: dict[tuple[str, str], dict[str, None]] = {}
+        self._shapes: dict[SlotShape, dict[str, None]] = {}
+        self._sequence = 0
+
+    @classmethod
+    def from_wire(cls, request_type: type[ComputeSlotRequest], items: Iterable[dict[str, Any]]) -> SlotRequestQueue:
+        queue = cls()
+        for item in items:
+            queue._append(dataclass_from_wire(request_type, item), item)
+        return queue
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def __iter__(self) -> Iterator[ComputeSlotRequest]:
+        return iter(list(self._requests.values()))
+
+    def wire(self) -> list[dict[str, Any]]:
+        return list(self._wire.values())
+
+    def put(self, request: ComputeSlotRequest, *, wire: dict[str, Any] | None = None) -> None:
+        """Append ``request``, replacing any queued request with the same owner."""
+
+        self.discard_owner(request)
+        self._append(request, dataclass_to_wire(request) if wire is None else wire)
+
+    def _append(self, request: ComputeSlotRequest, wire: dict[str, Any]) -> None:
+        request_id = request.request_id
+        self.remove(request_id)
+        self._sequence += 1
+        self._requests[request_id] = request
+        self._wire[request_id] = wire
+        self._order[request_id] = self._sequence
+        for key in slot_owner_keys(request):
+            self._owners.setdefault(key, {})[request_id] = None
+        self._shapes.setdefault(slot_shape(request), {})[request_id] = None
+
+    def remove(self, request_id: str) -> ComputeSlotRequest | None:
+        request = self._requests.pop(request_id, None)
+        if request is None:
+            return None
+        self._wire.pop(request_id, None)
+        self._order.pop(request_id, None)
+        for key in slot_owner_keys(request):
+            owned = self._owners.get(key)
+            if owned is not None:
+                owned.pop(request_id, None)
+                if not owned:
+                    del self._owners[key]
+        shape = slot_shape(request)
+        bucket = self._shapes.get(shape)
+        if bucket is not None:
+            bucket.pop(request_id, None)
+            if not bucket:
+                del self._shapes[shape]
+        return request
+
+    def discard_owner(self, request: ComputeSlotRequest) -> int:
+        """Remove every queued request owned by the same agent, request or job."""
+
+        request_ids = {request_id for key in slot_owner_keys(request) for request_id in self._owners.get(key, {})}
+        for request_id in request_ids:
+            self.remove(request_id)
+        return len(request_ids)
+
+    def remove_where(self, predicate: Callable[[ComputeSlotRequest], bool]) -> int:
+        request_ids = [request_id for request_id, request in self._requests.items() if predicate(request)]
+        for request_id in request_ids:
+            self.remove(request_id)
+        return len(request_ids)
+
+    def first_fitting(
+        self,
+        fits: Callable[[ComputeSlotRequest], bool],
+        *,
+        skip: Callable[[ComputeSlotRequest], bool] | None = None,
+    ) -> ComputeSlotRequest | None:
+        """Return the oldest request whose shape passes ``fits``.
+
+        ``fits`` is called once per shape, on the oldest request of that shape
+        that ``skip`` does not exclude.
+        """
+
+        best: ComputeSlotRequest | None = None
+        for bucket in self._shapes.values():
+            head = next(
+                (
+                    request
+                    for request in (self._requests[request_id] for request_id in bucket)
+                    if skip is None or not skip(request)
+                ),
+                None,
+            )
+            if head is None:
+                continue
+            if best is not None and self._order[head.request_id] > self._order[best.request_id]:
+                continue
+            if fits(head):
+                best = head
+        return best
+
+
+def slot_shape(request: ComputeSlotRequest) -> SlotShape:
+    """Return the fields that decide whether a host can run ``request`` now."""
+
+    return (
+        max(1, int(request.cpu_cores)),
+        max(0, int(request.memory_bytes)),
+        max(0, int(request.temp_storage_bytes)),
+        bool(request.requires_gpu),
+        tuple(request.required_host_tags),
+        tuple(request.excluded_host_tags),
+        tuple(request.excluded_host_names),
+        tuple(request.excluded_host_urls),
+    )
+
+
+def slot_owner_keys(request: ComputeSlotRequest) -> set[tuple[str, str]]:
+    keys: set[tuple[str, str]] = set()
+    if request.agent_id:
+        keys.add(("agent", request.agent_id))
+    if request.request_id:
+        keys.add(("request", request.request_id))
+    if request.job_id:
+        keys.add(("job", request.job_id))
+    return keys
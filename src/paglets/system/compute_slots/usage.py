@@ -0,0 +1,288 @@
+# Copyright (c) 2026 by C. Klukas.
+# Licensed under the MIT License. See LICENSE for details.
+from __future__ import annotations
+
+import contextlib
+import os
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+import psutil
+
+DEFAULT_USAGE_SCAN_ENTRY_BUDGET = 20_000
+PROC_ROOT = Path("/proc")
+
+
+@dataclass(frozen=True, slots=True)
+class _DirectoryTotals:
+    mtime_ns: int
+    file_bytes: int
+    file_count: int
+    entry_count: int
+    subdirs: tuple[str, ...]
+    scanned_at: int
+
+
+class DirectoryUsageCache:
+    """Incremental byte and file counts for job work directories.
+
+    Every directory remembers its own file totals, its subdirectories, and the
+    mtime it had when it was scanned. A sample stats each known directory and
+    rescans those whose mtime changed. It then spends what is left of the entry
+    budget rescanning unchanged directories, least recently scanned first, so
+    files that grew in place are picked up over the following samples. An entry
+    budget of ``0`` rescans every directory on every sample.
+    """
+
+    def __init__(self, *, entry_budget: int = DEFAULT_USAGE_SCAN_ENTRY_BUDGET):
+        self.entry_budget = max(0, int(entry_budget))
+        self._dirs: dict[str, _DirectoryTotals] = {}
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def usage(self, path: str | Path, *, entry_budget: int | None = None) -> dict[str, int | str]:
+        budget = self.entry_budget if entry_budget is None else max(0, int(entry_budget))
+        with self._lock:
+            self._sequence += 1
+            return self._usage_locked(str(path), budget)
+
+    def paths_usage(self, paths: Iterable[str], *, entry_budget: int | None = None) -> dict[str, int | str]:
+        total_bytes = 0
+        file_count = 0
+        errors: list[str] = []
+        for value in paths:
+            path = Path(value).expanduser()
+            try:
+                if path.is_dir():
+                    usage = self.usage(path, entry_budget=entry_budget)
+                    total_bytes += int(usage["bytes"])
+                    file_count += int(usage["files"])
+                    if usage["error"]:
+                        errors.append(str(usage["error"]))
+                elif path.is_file():
+                    total_bytes += int(path.stat().st_size)
+                    file_count += 1
+            except OSError as exc:
+                errors.append(str(exc))
+        return {"bytes": total_bytes, "files": file_count, "error": "; ".join(errors[:3])}
+
+    def retain(self, roots: Iterable[str]) -> None:
+        """Forget cached directories outside ``roots``."""
+
+        prefixes = tuple(str(root) for root in roots)
+        with self._lock:
+            for path in list(self._dirs):
+                if not any(path == prefix or path.startswith(prefix + os.sep) for prefix in prefixes):
+                    del self._dirs[path]
+
+    def _usage_locked(self, root: str, budget: int) -> dict[str, int | str]:
+        errors: list[str] = []
+        spent = 0
+        visited: list[str] = []
+        unchanged: list[str] = []
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            try:
+                mtime_ns = os.stat(current).st_mtime_ns
+            except FileNotFoundError:
+                continue
+            except OSError as exc:
+                errors.append(str(exc))
+                continue
+            totals = self._dirs.get(current)
+            if totals is None or totals.mtime_ns != mtime_ns or not budget:
+                totals = self._scan(current, mtime_ns, errors)
+                if totals is None:
+                    continue
+                spent += totals.entry_count + 1
+            else:
+                unchanged.append(current)
+            visited.append(current)
+            stack.extend(totals.subdirs)
+        unchanged.sort(key=lambda path: self._dirs[path].scanned_at)
+        for path in unchanged:
+            if spent >= budget:
+                break
+            totals = self._scan(path, self._dirs[path].mtime_ns, errors)
+            if totals is not None:
+                spent += totals.entry_count + 1
+
+        seen = set(visited)
+        prefix = root + os.sep
+        for path in [path for path in self._dirs if path.startswith(prefix) and path not in seen]:
+            del self._dirs[path]
+        if root not in seen:
+            self._dirs.pop(root, None)
+
+        total_bytes = 0
+        file_count = 0
+        for path in visited:
+            totals = self._dirs.get(path)
+            if totals is not None:
+                total_bytes += totals.file_bytes
+                file_count += totals.file_count
+        return {"bytes": total_bytes, "files": file_count, "error": "; ".join(errors[:3])}
+
+    def _scan(self, path: str, mtime_ns: int, errors: list[str]) -> _DirectoryTotals | None:
+        file_bytes = 0
+        file_count = 0
+        entry_count = 0
+        subdirs: list[str] = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    entry_count += 1
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            file_bytes += int(entry.stat(follow_symlinks=False).st_size)
+                            file_count += 1
+                    except OSError as exc:
+                        errors.append(str(exc))
+        except FileNotFoundError:
+            self._dirs.pop(path, None)
+            return None
+        except OSError as exc:
+            errors.append(str(exc))
+            return None
+        totals = _DirectoryTotals(mtime_ns, file_bytes, file_count, entry_count, tuple(subdirs), self._sequence)
+        self._dirs[path] = totals
+        return totals
+
+
+class UsageSampler:
+    """Process and work-directory usage readings for leased compute jobs.
+
+    ``psutil.Process`` handles are kept per PID, so CPU percentages measure the
+    time since the previous sample and PID reuse is detected. Process trees are
+    resolved from one process-table read per sample. On Linux that read takes
+    the parent PID and RSS from ``/proc/<pid>/stat``. Directory usage comes from
+    a ``DirectoryUsageCache``.
+    """
+
+    def __init__(self, *, entry_budget: int = DEFAULT_USAGE_SCAN_ENTRY_BUDGET, proc_root: Path = PROC_ROOT):
+        self.directories = DirectoryUsageCache(entry_budget=entry_budget)
+        self.proc_root = proc_root
+        self._processes: dict[int, psutil.Process] = {}
+        self._table: dict[int, tuple[int, int]] | None = None
+        self._children: dict[int, list[int]] = {}
+        self._lock = threading.Lock()
+
+    def begin(self) -> None:
+        """Start a new sample; the process table is read again on next use."""
+
+        with self._lock:
+            self._table = None
+            self._children = {}
+
+    def process(self, pid: int) -> psutil.Process:
+        with self._lock:
+            cached = self._processes.get(pid)
+        if cached is not None and cached.is_running():
+            return cached
+        process = psutil.Process(pid)
+        with self._lock:
+            self._processes[pid] = process
+        return process
+
+    def process_tree_memory(self, process: psutil.Process) -> dict[str, int]:
+        with self._lock:
+            if self._table is None:
+                self._table = self._read_process_table()
+                self._children = {}
+                for pid, (ppid, _rss) in self._table.items():
+                    self._children.setdefault(ppid, []).append(pid)
+            table = self._table
+            children = self._children
+        root = int(process.pid)
+        if root not in table:
+            return _process_tree_memory_usage(process)
+        rss_bytes = 0
+        process_count = 0
+        seen: set[int] = set()
+        stack = [root]
+        while stack:
+            pid = stack.pop()
+            if pid in seen or pid not in table:
+                continue
+            seen.add(pid)
+            rss_bytes += table[pid][1]
+            process_count += 1
+            stack.extend(children.get(pid, ()))
+        return {"process_count": process_count, "rss_bytes": rss_bytes}
+
+    def directory_usage(self, path: str | Path, *, entry_budget: int | None = None) -> dict[str, int | str]:
+        return self.directories.usage(path, entry_budget=entry_budget)
+
+    def paths_usage(self, paths: Iterable[str], *, entry_budget: int | None = None) -> dict[str, int | str]:
+        return self.directories.paths_usage(paths, entry_budget=entry_budget)
+
+    def retain(self, *, pids: Iterable[int], paths: Iterable[str]) -> None:
+        """Drop cached handles and directories that no active lease uses."""
+
+        keep = set(pids)
+        with self._lock:
+            for pid in [pid for pid in self._processes if pid not in keep]:
+                del self._processes[pid]
+        self.directories.retain(str(Path(path).expanduser()) for path in paths)
+
+    def _read_process_table(self) -> dict[int, tuple[int, int]]:
+        """Return ``{pid: (ppid, rss_bytes)}`` for every visible process."""
+
+        if self.proc_root.is_dir():
+            table = _read_proc_stat_table(self.proc_root)
+            if table:
+                return table
+        table: dict[int, tuple[int, int]] = {}
+        for item in psutil.process_iter(["ppid", "memory_info"]):
+            memory = item.info.get("memory_info")
+            table[int(item.pid)] = (int(item.info.get("ppid") or 0), int(memory.rss) if memory is not None else 0)
+        return table
+
+
+def _read_proc_stat_table(proc_root: Path) -> dict[int, tuple[int, int]]:
+    page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+    table: dict[int, tuple[int, int]] = {}
+    try:
+        names = os.listdir(proc_root)
+    except OSError:
+        return table
+    for name in names:
+        if not name.isdigit():
+            continue
+        try:
+            with open(proc_root / name / "stat", "rb") as handle:
+                data = handle.read()
+        except OSError:
+            continue
+        # The command name may contain spaces and parentheses, so split after the last ")".
+        fields = data.rpartition(b")")[2].split()
+        if len(fields) < 22:
+            continue
+        with contextlib.suppress(ValueError):
+            table[int(name)] = (int(fields[1]), int(fields[21]) * page_size)
+    return table
+
+
+def _process_tree_memory_usage(process: psutil.Process) -> dict[str, int]:
+    processes = [process]
+    with contextlib.suppress(psutil.AccessDenied, psutil.NoSuchProcess, psutil.ZombieProcess):
+        processes.extend(process.children(recursive=True))
+    seen: set[int] = set()
+    rss_bytes = 0
+    process_count = 0
+    for item in processes:
+        try:
+            pid = int(item.pid)
+            if pid in seen:
+                continue
+            seen.add(pid)
+            rss_bytes += int(item.memory_info().rss)
+            process_count += 1
+        except (psutil.AccessDenied, psutil.NoSuchProcess, psutil.ZombieProcess):
+            continue
+    return {"process_count": process_count, "rss_bytes": rss_bytes}
@@ -0,0 +1,168 @@
+# Copyright (c) 2026 by C. Klukas.
+# Licensed under the MIT License. See LICENSE for details.
+"""Columnar host-status tables for vectorized ranking."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any, Generic, TypeVar
+
+import numpy as np
+
+from paglets.serialization.codec import dataclass_from_wire
+
+RecordT = TypeVar("RecordT")
+
+ColumnGetter = Callable[[Any], float]
+TagGetter = Callable[[Any], Iterable[str]]
+
+
+class HostTable(Generic[RecordT]):
+    """Host records plus one float64 column per numeric field and a tag matrix.
+
+    ``sync`` keeps the table in line with a ``{key: wire_dict}`` mapping such
+    as ``peer_statuses``. A row is decoded again only when its wire dict was
+    replaced, so callers can rank all hosts with array operations instead of
+    decoding and scoring them one by one. ``copy`` gives a scratch table whose
+    columns may be changed, for example to project reservations.
+    """
+
+    def __init__(
+        self,
+        record_type: type[RecordT],
+        columns: Mapping[str, ColumnGetter],
+        *,
+        tags: TagGetter | None = None,
+    ):
+        self.record_type = record_type
+        self._getters = dict(columns)
+        self._column_index = {name: index for index, name in enumerate(self._getters)}
+        self._tags_of = tags
+        self.keys: list[str] = []
+        self.records: list[RecordT] = []
+        self._wires: list[dict[str, Any] | None] = []
+        self._rows: dict[str, int] = {}
+        self._values = np.zeros((len(self._getters), 0), dtype=np.float64)
+        self._tag_index: dict[str, int] = {}
+        self._tags = np.zeros((0, 0), dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def sync(self, wires: Mapping[str, dict[str, Any]]) -> None:
+        for key in [key for key in self._rows if key not in wires]:
+            self.remove(key)
+        for key, wire in wires.items():
+            row = self._rows.get(key)
+            if row is not None and self._wires[row] is wire:
+                continue
+            self.put(key, dataclass_from_wire(self.record_type, wire), wire=wire)
+
+    def put(self, key: str, record: RecordT, *, wire: dict[str, Any] | None = None) -> int:
+        row = self._rows.get(key)
+        if row is None:
+            row = len(self.keys)
+            self._reserve(row + 1)
+            self._rows[key] = row
+            self.keys.append(key)
+            self.records.append(record)
+            self._wires.append(wire)
+        else:
+            self.records[row] = record
+            self._wires[row] = wire
+        for index, getter in enumerate(self._getters.values()):
+            self._values[index, row] = float(getter(record))
+        if self._tags_of is not None:
+            self._tags[row, :] = False
+            for tag in self._tags_of(record):
+                column = self._tag_column(tag)
+                self._tags[row, column] = True
+        return row
+
+    def remove(self, key: str) -> None:
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        last = len(self.keys) - 1
+        if row != last:
+            moved = self.keys[last]
+            self.keys[row] = moved
+            self.records[row] = self.records[last]
+            self._wires[row] = self._wires[last]
+            self._values[:, row] = self._values[:, last]
+            self._tags[row, :] = self._tags[last, :]
+            self._rows[moved] = row
+        self.keys.pop()
+        self.records.pop()
+        self._wires.pop()
+
+    def row(self, key: str) -> int | None:
+        return self._rows.get(key)
+
+    def column(self, name: str) -> np.ndarray:
+        """Return a writable view of column ``name``."""
+
+        return self._values[self._column_index[name], : len(self.keys)]
+
+    def has_all_tags(self, tags: Iterable[str]) -> np.ndarray:
+        mask = np.ones(len(self.keys), dtype=bool)
+        for tag in set(tags):
+            column = self._tag_index.get(tag)
+            if column is None:
+                return np.zeros(len(self.keys), dtype=bool)
+            mask &= self._tags[: len(self.keys), column]
+        return mask
+
+    def tag_matches(self, tags: Iterable[str]) -> np.ndarray:
+        columns = [self._tag_index[tag] for tag in set(tags) if tag in self._tag_index]
+        if not columns:
+            return np.zeros(len(self.keys), dtype=np.int64)
+        return self._tags[: len(self.keys), columns].sum(axis=1)
+
+    def copy(self) -> HostTable[RecordT]:
+        table: HostTable[RecordT] = HostTable(self.record_type, self._getters, tags=self._tags_of)
+        table.keys = list(self.keys)
+        table.records = list(self.records)
+        table._wires = list(self._wires)
+        table._rows = dict(self._rows)
+        table._values = self._values[:, : len(self.keys)].copy()
+        table._tag_index = dict(self._tag_index)
+        table._tags = self._tags[: len(self.keys)].copy()
+        return table
+
+    def _reserve(self, rows: int) -> None:
+        capacity = self._values.shape[1]
+        if rows <= capacity:
+            return
+        capacity = max(rows, capacity * 2, 8)
+        values = np.zeros((len(self._getters), capacity), dtype=np.float64)
+        values[:, : self._values.shape[1]] = self._values
+        self._values = values
+        tags = np.zeros((capacity, self._tags.shape[1]), dtype=bool)
+        tags[: self._tags.shape[0]] = self._tags
+        self._tags = tags
+
+    def _tag_column(self, tag: str) -> int:
+        column = self._tag_index.get(tag)
+        if column is not None:
+            return column
+        column = len(self._tag_index)
+        self._tag_index[tag] = column
+        if column >= self._tags.shape[1]:
+            tags = np.zeros((self._tags.shape[0], max(column + 1, self._tags.shape[1] * 2, 8)), dtype=bool)
+            tags[:, : self._tags.shape[1]] = self._tags
+            self._tags = tags
+        return column
+
+
+def host_table_from_records(
+    record_type: type[RecordT],
+    columns: Mapping[str, ColumnGetter],
+    records: Iterable[tuple[str, RecordT]],
+    *,
+    tags: TagGetter | None = None,
+) -> HostTable[RecordT]:
+    table: HostTable[RecordT] = HostTable(record_type, columns, tags=tags)
+    for key, record in records:
+        table.put(key, record)
+    return table
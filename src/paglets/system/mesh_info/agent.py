@@ -4,9 +4,12 @@ from __future__ import annotations
 
 import threading
 import time
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from typing import Any
 
+import numpy as np
+
 from paglets.core.agent import Paglet, PagletState, state_locked
 from paglets.core.messages import Message
 from paglets.core.runtime_values import ResidentLifecycle, ServiceScope
@@ -14,6 +17,7 @@ from paglets.serialization.codec import dataclass_from_wire, dataclass_to_wire
 from paglets.services.contracts import ServiceContract, ServiceOperation
 from paglets.services.resident import ResidentServiceSpec
 
+from ..host_table import HostTable
 from ..server_info import GET_DISK, GET_LOAD, GET_SUMMARY, SERVER_INFO, DiskRequest, LoadRequest
 
 DEFAULT_SAMPLE_INTERVAL_SECONDS = 5.0
@@ -162,6 +166,7 @@ class MeshInfoAgent(Paglet[MeshInfoState]):
         super().__init__(state=state, agent_id=agent_id)
         self._stop = threading.Event()
         self._thread: threading.Thread | None = None
+        self._table: HostTable[MeshHostSnapshot] = HostTable(MeshHostSnapshot, _SNAPSHOT_COLUMNS)
 
     def on_creation(self, event):
         self.advertise_contract(MESH_INFO, scope=self.state.service_scope)
@@ -225,32 +230,37 @@ class MeshInfoAgent(Paglet[MeshInfoState]):
     def select_targets(self, request: TargetSelectionRequest) -> TargetSelectionReply:
         self._refresh_local_snapshot(force=False)
         max_age = request.max_age_seconds if request.max_age_seconds > 0 else self.state.sample_ttl
-        hosts = self._snapshots(max_age=max_age, fresh_only=True)
+        table = self._snapshot_table(max_age=max_age, fresh_only=True)
+        order = sorted(range(len(table)), key=lambda row: (table.records[row].host_name, table.records[row].host_url))
         limit = max(1, request.limit)
-        targets: list[TargetCandidate] = []
+        included = np.ones(len(table), dtype=bool)
+        if not request.include_self:
+            address = self.context.address.rstrip("/")
+            included = np.array([snapshot.host_url.rstrip("/") != address for snapshot in table.records], dtype=bool)
+        eligible = included & _target_mask(table, request)
+        scores = _target_scores(table)
         rejected: dict[str, str] = {}
-        for snapshot in hosts:
-            key = snapshot.host_name or snapshot.host_url
-            if not request.include_self and snapshot.host_url.rstrip("/") == self.context.address.rstrip("/"):
-                rejected[key] = "self excluded"
-                continue
-            rejection = _target_rejection(snapshot, request)
-            if rejection:
-                rejected[key] = rejection
-                continue
-            score = _target_score(snapshot)
-            targets.append(TargetCandidate(snapshot=snapshot, score=score, reasons=["fresh", "eligible"]))
+        for row in order:
+            if not eligible[row]:
+                snapshot = table.records[row]
+                key = snapshot.host_name or snapshot.host_url
+                rejected[key] = "self excluded" if not included[row] else _target_rejection(snapshot, request)
+        targets = [
+            TargetCandidate(snapshot=table.records[row], score=float(scores[row]), reasons=["fresh", "eligible"])
+            for row in order
+            if eligible[row]
+        ]
         if not targets:
             # Keep visibility high even when all candidates fail resource filters.
             # This avoids returning empty results to tooling that expects a host view.
-            for snapshot in hosts:
-                key = snapshot.host_name or snapshot.host_url
-                if not request.include_self and snapshot.host_url.rstrip("/") == self.context.address.rstrip("/"):
+            for row in order:
+                if not included[row]:
                     continue
-                score = _target_score(snapshot)
+                snapshot = table.records[row]
+                key = snapshot.host_name or snapshot.host_url
                 target = TargetCandidate(
                     snapshot=snapshot,
-                    score=score,
+                    score=float(scores[row]),
                     reasons=["fallback", rejected.get(key, "resource-restricted")],
                 )
                 targets.append(target)
@@ -413,23 +423,31 @@ class MeshInfoAgent(Paglet[MeshInfoState]):
                 state.errors.pop(key, None)
 
     def _snapshots(self, *, max_age: float, fresh_only: bool) -> list[MeshHostSnapshot]:
+        table = self._snapshot_table(max_age=max_age, fresh_only=fresh_only)
+        return sorted(table.records, key=lambda item: (item.host_name, item.host_url))
+
+    def _snapshot_table(self, *, max_age: float, fresh_only: bool) -> HostTable[MeshHostSnapshot]:
+        """Return a copy of the snapshot table, without stale rows when ``fresh_only``."""
+
         now = time.time()
         with self.locked_state() as state:
-            snapshots = [dataclass_from_wire(MeshHostSnapshot, item) for item in state.snapshots.values()]
+            self._table.sync(state.snapshots)
+            table = self._table.copy()
         if fresh_only:
-            snapshots = [snapshot for snapshot in snapshots if now - snapshot.observed_at <= max_age]
-        return sorted(snapshots, key=lambda item: (item.host_name, item.host_url))
+            stale = np.flatnonzero(now - table.column("observed_at") > max_age)
+            for key in [table.keys[row] for row in stale]:
+                table.remove(key)
+        return table
 
     def _prune_snapshots(self) -> None:
         now = time.time()
         with self.locked_state() as state:
             max_age = max(float(state.sample_ttl) * 3.0, float(state.sample_ttl) + 1.0)
-            for key, item in list(state.snapshots.items()):
-                snapshot = dataclass_from_wire(MeshHostSnapshot, item)
-                if snapshot.host_url.rstrip("/") == self.context.address.rstrip("/"):
-                    continue
-                if now - snapshot.observed_at > max_age:
-                    state.snapshots.pop(key, None)
+            self._table.sync(state.snapshots)
+            stale = np.flatnonzero(now - self._table.column("observed_at") > max_age)
+            for row in stale:
+                if self._table.records[row].host_url.rstrip("/") != self.context.address.rstrip("/"):
+                    state.snapshots.pop(self._table.keys[row], None)
 
 
 def _target_rejection(snapshot: MeshHostSnapshot, request: TargetSelectionRequest) -> str:
@@ -442,6 +460,41 @@ def _target_rejection(snapshot: MeshHostSnapshot, request: TargetSelectionReques
     return ""
 
 
+_SNAPSHOT_COLUMNS: dict[str, Callable[[MeshHostSnapshot], float]] = {
+    "observed_at": lambda snapshot: snapshot.observed_at,
+    "cpu_percent": lambda snapshot: snapshot.cpu_percent,
+    "load_per_cpu": lambda snapshot: snapshot.load_per_cpu,
+    "memory_total_bytes": lambda snapshot: snapshot.memory_total_bytes,
+    "memory_available_bytes": lambda snapshot: snapshot.memory_available_bytes,
+    "memory_percent": lambda snapshot: snapshot.memory_percent,
+    "work_total_bytes": lambda snapshot: snapshot.work_total_bytes,
+    "work_free_bytes": lambda snapshot: snapshot.work_free_bytes,
+    "work_percent_used": lambda snapshot: snapshot.work_percent_used,
+    "has_errors": lambda snapshot: bool(snapshot.errors),
+}
+
+
+def _target_mask(table: HostTable[MeshHostSnapshot], request: TargetSelectionRequest) -> np.ndarray:
+    """Vectorized ``not _target_rejection`` over every row of ``table``."""
+
+    mask = table.column("has_errors") == 0
+    if request.min_memory_available_bytes > 0:
+        mask &= table.column("memory_available_bytes") >= request.min_memory_available_bytes
+    if request.min_work_free_bytes > 0:
+        mask &= table.column("work_free_bytes") >= request.min_work_free_bytes
+    return mask
+
+
+def _target_scores(table: HostTable[MeshHostSnapshot]) -> np.ndarray:
+    """Vectorized ``_target_score`` over every row of ``table``."""
+
+    load_score = np.maximum(0.0, table.column("load_per_cpu"))
+    cpu_score = np.maximum(0.0, table.column("cpu_percent") / 100.0)
+    memory_score = np.where(table.column("memory_total_bytes") != 0, table.column("memory_percent") / 100.0, 1.0)
+    disk_score = np.where(table.column("work_total_bytes") != 0, table.column("work_percent_used") / 100.0, 1.0)
+    return np.round(load_score + cpu_score + memory_score + disk_score, 6)
+
+
 def _target_score(snapshot: MeshHostSnapshot) -> float:
     load_score = max(0.0, snapshot.load_per_cpu)
     cpu_score = max(0.0, snapshot.cpu_percent / 100.0)
@@ -378,5 +378,16 @@ def _parse_properties(values: list[str]) -> dict[str, str]:
     return properties
 
 
+def _parse_class_preloads(values: list[str]) -> dict[str, list[str]]:
+    preloads: dict[str, list[str]] = {}
+    for value in values:
+        class_name, separator, modules = value.partition("=")
+        class_name = class_name.strip()
+        if not separator or not class_name:
+            raise ValueError("--child-pool-class-preload values must use CLASS=MODULE[,MODULE]")
+        preloads.setdefault(class_name, []).extend(item.strip() for item in modules.split(",") if item.strip())
+    return preloads
+
+
 if __name__ == "__main__":  # pragma: no cover
     raise SystemExit(main())
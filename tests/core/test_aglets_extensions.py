@@ -9,14 +9,14 @@ from dataclasses import dataclass, field
 import pytest
 
 from paglets.core.agent import Paglet, PagletState, state_locked
-from paglets.core.errors import LifecycleError, NotHandledError, TransferError
+from paglets.core.errors import HostError, LifecycleError, NotHandledError, TransferError
 from paglets.core.messages import Message
 from paglets.core.runtime_values import ArrivalMode, ServiceScope
 from paglets.persistence.persistency import DeactivationPolicy
 from paglets.remote.references import PagletProxyRef
 from paglets.remote.transfer import TransferTicket
 from paglets.runtime.host import Host
-from paglets.runtime.mailbox import MessageMailbox
+from paglets.runtime.mailbox import MessageMailbox, MessageScheduler
 from tests.support import free_port
 
 
@@ -164,6 +164,14 @@ class WaitingCollectorAgent(Paglet[WaitingCollectorState]):
         return self.not_handled()
 
 
+class ConcurrentCollectorAgent(WaitingCollectorAgent):
+    MAX_CONCURRENT_MESSAGES = 2
+
+
+class InvalidConcurrencyAgent(WaitingCollectorAgent):
+    MAX_CONCURRENT_MESSAGES = "many"  # type: ignore[assignment]
+
+
 @dataclass
 class RefState(PagletState):
     ref: PagletProxyRef | None = None
@@ -234,6 +242,68 @@ def test_mailbox_priority_and_wait_notify_synchronization():
         mailbox.close()
 
 
+def test_message_scheduler_serves_mailboxes_round_robin_on_shared_workers():
+    started = threading.Event()
+    gate = threading.Event()
+    handled: list[str] = []
+
+    def handler(message: Message, oneway: bool):
+        if message.kind == "gate":
+            started.set()
+            gate.wait(2)
+        handled.append(message.kind)
+        return message.kind
+
+    scheduler = MessageScheduler(1, max_workers=1)
+    chatty = MessageMailbox("chatty", handler, max_workers=1, scheduler=scheduler)
+    quiet = MessageMailbox("quiet", handler, max_workers=1, scheduler=scheduler)
+    try:
+        blocker = chatty.submit(Message("gate"))
+        assert started.wait(1)
+        chatty_futures = [chatty.submit(Message(f"chatty-{index}")) for index in range(3)]
+        quiet_futures = [quiet.submit(Message(f"quiet-{index}")) for index in range(2)]
+        status = scheduler.status()
+        assert status.worker_count == 1
+        assert status.mailbox_count == 2
+        assert status.queued_count == 5
+        assert status.max_mailbox_queued_count == 3
+        assert status.in_flight_count == 1
+        gate.set()
+
+        assert blocker.result(timeout=2) == "gate"
+        for future in [*chatty_futures, *quiet_futures]:
+            future.result(timeout=2)
+        assert handled == ["gate", "quiet-0", "chatty-0", "quiet-1", "chatty-1", "chatty-2"]
+        assert scheduler.status().queued_count == 0
+    finally:
+        chatty.close()
+        quiet.close()
+        scheduler.stop()
+
+
+def test_message_scheduler_runs_unqueued_messages_past_a_busy_mailbox():
+    release = threading.Event()
+
+    def handler(message: Message, oneway: bool):
+        if message.kind == "slow":
+            release.wait(2)
+        return message.kind
+
+    scheduler = MessageScheduler(1, max_workers=2)
+    mailbox = MessageMailbox("agent", handler, max_workers=1, scheduler=scheduler)
+    try:
+        slow = mailbox.submit(Message("slow"))
+        queued = mailbox.submit(Message("queued"))
+        assert mailbox.submit_unqueued(Message("urgent", priority=0)).result(timeout=1) == "urgent"
+        assert not queued.done()
+        release.set()
+        assert slow.result(timeout=2) == "slow"
+        assert queued.result(timeout=2) == "queued"
+    finally:
+        mailbox.close()
+        scheduler.stop()
+
+
 def test_paglet_wait_message_notify_and_notify_all(tmp_path):
     host = Host(
         "alpha",
@@ -349,6 +419,48 @@ def test_default_concurrent_mailbox_allows_collector_replies_while_waiting(tmp_p
         host.stop()
 
 
+def test_max_concurrent_messages_lets_collector_reply_reach_a_waiting_handler(tmp_path):
+    host = Host(
+        "alpha",
+        host="127.0.0.1",
+        port=free_port(),
+        mesh=False,
+        mesh_multicast=False,
+        persistence_dir=tmp_path / "alpha",
+    )
+    host.start_background()
+    try:
+        proxy = host.create(ConcurrentCollectorAgent, WaitingCollectorState())
+        collect = proxy.send_future(Message("collect"))
+        _wait_until(lambda: host.get_state(proxy.agent_id, WaitingCollectorState).pending)
+
+        assert proxy.send(Message("child_result", {"value": "done"})) == {"ok": True}
+        assert collect.get_reply(timeout=2) == {"result": "done"}
+        assert host.get_state(proxy.agent_id, WaitingCollectorState).pending is False
+        assert host.mailbox_status(proxy.agent_id)["delivered_count"] == 2
+    finally:
+        host.stop()
+
+
+def test_invalid_max_concurrent_messages_is_rejected_before_a_child_starts(tmp_path):
+    host = Host(
+        "alpha",
+        host="127.0.0.1",
+        port=free_port(),
+        mesh=False,
+        mesh_multicast=False,
+        persistence_dir=tmp_path / "alpha",
+    )
+    host.start_background()
+    try:
+        with pytest.raises(HostError, match="MAX_CONCURRENT_MESSAGES"):
+            host.create(InvalidConcurrencyAgent, WaitingCollectorState())
+
+        assert host.list_agents() == []
+    finally:
+        host.stop()
+
+
 def test_service_registry_local_ttl_capability_and_mesh_lookup(tmp_path):
     alpha = Host(
         "alpha",
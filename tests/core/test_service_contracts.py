@@ -2,6 +2,8 @@
 # Licensed under the MIT License. See LICENSE for details.
 from __future__ import annotations
 
+import threading
+import time
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any
@@ -21,6 +23,7 @@ from paglets.services.contracts import (
     ServiceHandle,
     ServiceOperation,
     ServiceRecord,
+    ServiceRegistry,
 )
 from tests.support import free_port
 
@@ -336,6 +339,55 @@ def test_contract_failure_modes_are_reported_before_untyped_calls():
     assert FLIGHT_TICKETS.route(Message("unknown"), {}, default="fallback") == "fallback"
 
 
+def test_service_registry_indexes_lookups_expiry_and_agent_removal():
+    registry = ServiceRegistry()
+
+    def advertise(name: str, agent_id: str, capabilities: tuple[str, ...], **kwargs: Any) -> ServiceRecord:
+        return registry.advertise(
+            host_name="alpha",
+            host_url="http://alpha",
+            name=name,
+            proxy=PagletProxyRef("http://alpha", agent_id),
+            capabilities=capabilities,
+            **kwargs,
+        )
+
+    advertise("quotes", "a", ("quote", "price"), scope=ServiceScope.MESH)
+    advertise("quotes", "b", ("quote",))
+    advertise("tickets", "a", ("book",), ttl=0.05)
+    advertise("quotes", "c", ("price",), ttl=0.05)
+    advertise("quotes", "c", ("price",))
+    mesh_version = registry.mesh_version
+
+    assert [record.proxy.agent_id for record in registry.lookup_all("quotes")] == ["a", "b", "c"]
+    assert [record.proxy.agent_id for record in registry.lookup_all("quotes", "price")] == ["a", "c"]
+    assert [record.proxy.agent_id for record in registry.lookup_all(scope=ServiceScope.MESH)] == ["a"]
+    assert registry.lookup("tickets", "book") is not None
+    assert registry.lookup("tickets", "quote") is None
+
+    time.sleep(0.08)
+
+    assert registry.lookup("tickets") is None
+    assert registry.record("quotes", "c") is not None
+    assert registry.mesh_version == mesh_version
+    assert [record.name for record in registry.remove_agent("a")] == ["quotes"]
+    assert registry.mesh_version != mesh_version
+    assert registry.lookup_all("quotes", "price")[0].proxy.agent_id == "c"
+    assert [record.proxy.agent_id for record in registry.unadvertise("quotes")] == ["b", "c"]
+    assert registry.lookup_all() == []
+
+    threads = [
+        threading.Thread(target=lambda index=index: advertise("job", f"job-{index}", ("run",), ttl=60.0))
+        for index in range(16)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(registry.lookup_all("job", "run")) == 16
+
+
 def test_remote_contract_errors_round_trip_as_contract_errors(tmp_path):
     host = Host(
         "alpha",
@@ -10,6 +10,7 @@ from paglets.config.startup import load_launch_config, sync_launch_config
 from paglets.core.agent import PagletContext
 from paglets.core.runtime_values import ServiceScope
 from paglets.runtime.host import Host
+from paglets.system.host_table import host_table_from_records
 from paglets.system.mesh_info import (
     GET_LANDSCAPE,
     GET_SNAPSHOT,
@@ -23,7 +24,13 @@ from paglets.system.mesh_info import (
     SnapshotRequest,
     TargetSelectionRequest,
 )
-from paglets.system.mesh_info.agent import _target_rejection
+from paglets.system.mesh_info.agent import (
+    _SNAPSHOT_COLUMNS,
+    _target_mask,
+    _target_rejection,
+    _target_score,
+    _target_scores,
+)
 from tests.support import free_port
 
 
@@ -141,6 +148,34 @@ def test_mesh_info_target_rejection_is_resource_only_when_load_is_not_used_for_f
     assert _target_rejection(snapshot, request) == ""
 
 
+def test_mesh_info_vectorized_target_ranking_matches_scalar_checks():
+    request = TargetSelectionRequest(min_memory_available_bytes=2 * 10**9, min_work_free_bytes=10**9)
+    snapshots = [
+        MeshHostSnapshot(
+            host_name=f"host-{index}",
+            host_url=f"http://host-{index}",
+            code_version="test",
+            observed_at=time.time(),
+            cpu_percent=index * 7.5,
+            load_per_cpu=index / 4,
+            memory_total_bytes=0 if index == 3 else 8 * 10**9,
+            memory_available_bytes=index * 10**9,
+            memory_percent=100.0 - index * 10,
+            work_total_bytes=4 * 10**9,
+            work_free_bytes=(6 - index) * 10**9,
+            work_percent_used=index * 15.0,
+            errors=["down"] if index == 4 else [],
+        )
+        for index in range(7)
+    ]
+    table = host_table_from_records(
+        MeshHostSnapshot, _SNAPSHOT_COLUMNS, [(snapshot.host_url, snapshot) for snapshot in snapshots]
+    )
+
+    assert _target_mask(table, request).tolist() == [not _target_rejection(item, request) for item in snapshots]
+    assert _target_scores(table).tolist() == [_target_score(item) for item in snapshots]
+
+
 def test_mesh_info_clears_peer_error_when_fresh_snapshot_arrives():
     agent = MeshInfoAgent()
     with agent.locked_state() as state:
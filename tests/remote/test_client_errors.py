@@ -2,26 +2,29 @@
 # Licensed under the MIT License. See LICENSE for details.
 from __future__ import annotations
 
-from io import BytesIO
-from urllib.error import HTTPError
+from pathlib import Path
 
 import pytest
 
 from paglets.core.errors import AuthenticationError
 from paglets.remote.client import HostClient
+from paglets.runtime.host import Host
+from tests.support import free_port
 
 
-def test_missing_api_key_authentication_error_names_default_env(monkeypatch):
-    def raise_unauthorized(*args, **kwargs):
-        raise HTTPError(
-            "https://example.test/paglets/hosts",
-            401,
-            "Unauthorized",
-            {},
-            BytesIO(b'{"error": "Authentication required", "error_type": "AuthenticationError"}'),
-        )
-
-    monkeypatch.setattr("paglets.remote.client.urlopen", raise_unauthorized)
-
-    with pytest.raises(AuthenticationError, match="set PAGLETS_API_KEY"):
-        HostClient(api_key=None).get_json("https://example.test/paglets/hosts")
+def test_missing_api_key_authentication_error_names_default_env(tmp_path: Path):
+    host = Host(
+        "alpha",
+        host="127.0.0.1",
+        port=free_port(),
+        api_key="secret",
+        mesh=False,
+        mesh_multicast=False,
+        persistence_dir=tmp_path / "alpha",
+    )
+    host.start_background()
+    try:
+        with pytest.raises(AuthenticationError, match="set PAGLETS_API_KEY"):
+            HostClient(api_key=None).get_json(f"{host.address}/hosts")
+    finally:
+        host.stop()
@@ -0,0 +1,189 @@
+# Copyright (c) 2026 by C. Klukas.
+# Licensed under the MIT License. See LICENSE for details.
+from __future__ import annotations
+
+import http.client
+import json
+import socket
+import threading
+from pathlib import Path
+from urllib.parse import urlparse
+
+import pytest
+
+import paglets.remote.connections as connections_module
+import paglets.remote.transport as transport_module
+from paglets.core.agent import Paglet
+from paglets.core.errors import RemoteHostError
+from paglets.core.messages import Message
+from paglets.remote.client import HostClient
+from paglets.remote.connections import HTTPConnectionPool
+from paglets.remote.proxy import PagletProxy
+from paglets.runtime.host import Host
+from paglets.serialization.codec import dataclass_to_wire, qualified_name
+from tests.support import free_port
+from tests.test_paglets_core import TravelState
+
+_EMPTY_JSON_RESPONSE = b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: 2\r\n\r\n{}"
+
+
+class EchoAgent(Paglet[TravelState]):
+    State = TravelState
+
+    def handle_message(self, message: Message):
+        if message.kind == "echo":
+            return message.args["value"]
+        return self.not_handled()
+
+
+def test_repeated_requests_reuse_one_keep_alive_connection(tmp_path: Path):
+    host = _host(tmp_path, "alpha", free_port())
+    host.start_background()
+    pool = HTTPConnectionPool()
+    client = HostClient(pool=pool)
+    try:
+        proxy = PagletProxy.from_wire(host.create(EchoAgent, TravelState()).to_wire(), client=client)
+        for index in range(5):
+            assert client.get_json(f"{host.address}/health")["name"] == "alpha"
+            assert proxy.send(Message("echo", {"value": index})) == index
+        assert client.post_pickle(f"{host.address}/agents", _create_payload())["proxy"]
+        assert client.get_json(f"{host.address}/health")["name"] == "alpha"
+    finally:
+        host.stop()
+        pool.clear()
+
+    assert pool.status()["created"] == 1
+    assert pool.status()["reused"] == 11
+
+
+def test_stale_pooled_connection_is_retried_on_a_fresh_socket(tmp_path: Path, monkeypatch):
+    port = free_port()
+    pool = HTTPConnectionPool()
+    client = HostClient(pool=pool)
+    first = _host(tmp_path, "alpha", port)
+    first.start_background()
+    try:
+        assert client.get_json(f"{first.address}/health")["name"] == "alpha"
+    finally:
+        first.stop()
+    monkeypatch.setattr(connections_module, "_is_dropped", lambda _connection: False)
+    second = _host(tmp_path, "beta", port)
+    second.start_background()
+    try:
+        assert client.get_json(f"{second.address}/health")["name"] == "beta"
+    finally:
+        second.stop()
+        pool.clear()
+
+    assert pool.status()["reused"] == 1
+    assert pool.status()["created"] == 2
+
+
+@pytest.mark.parametrize(("method", "resent"), [("GET", True), ("POST", False)])
+def test_request_written_to_a_closing_pooled_connection_is_resent_only_if_idempotent(method: str, resent: bool):
+    # The peer answers the first request, then reads the second one and closes
+    # the socket without replying, as a host that went away mid-request would.
+    listener = socket.create_server(("127.0.0.1", 0))
+    received: list[bytes] = []
+
+    def serve() -> None:
+        while True:
+            try:
+                connection, _address = listener.accept()
+            except OSError:
+                return
+            with connection:
+                while request := _read_request(connection):
+                    received.append(request)
+                    if len(received) == 2:
+                        break
+                    connection.sendall(_EMPTY_JSON_RESPONSE)
+
+    threading.Thread(target=serve, daemon=True).start()
+    pool = HTTPConnectionPool()
+    client = HostClient(pool=pool)
+    url = f"http://127.0.0.1:{listener.getsockname()[1]}/ping"
+    try:
+        assert client.get_json(url) == {}
+        if resent:
+            assert client._request(method, url, None) == {}
+        else:
+            with pytest.raises(RemoteHostError):
+                client._request(method, url, None)
+    finally:
+        listener.close()
+        pool.clear()
+
+    assert len(received) == (3 if resent else 2)
+    assert pool.status()["created"] == (2 if resent else 1)
+
+
+def test_idle_connections_expire_from_the_pool(tmp_path: Path):
+    host = _host(tmp_path, "alpha", free_port())
+    host.start_background()
+    pool = HTTPConnectionPool(idle_timeout=0.0)
+    client = HostClient(pool=pool)
+    try:
+        client.get_json(f"{host.address}/health")
+        client.get_json(f"{host.address}/health")
+    finally:
+        host.stop()
+        pool.clear()
+
+    assert pool.status()["reused"] == 0
+    assert pool.status()["created"] == 2
+
+
+def test_rejected_request_with_unread_body_closes_connection(tmp_path: Path):
+    host = _host(tmp_path, "alpha", free_port(), api_key="secret")
+    host.start_background()
+    parsed = urlparse(host.address)
+    connection = http.client.HTTPConnection(parsed.netloc, timeout=2.0)
+    try:
+        connection.request(
+            "POST",
+            "/agents",
+            body=b"\x00" * 1024,
+            headers={"Content-Type": transport_module.PICKLE_CONTENT_TYPE},
+        )
+        response = connection.getresponse()
+        payload = json.loads(response.read().decode("utf-8"))
+    finally:
+        connection.close()
+        host.stop()
+
+    assert response.status == 401
+    assert response.getheader("Connection") == "close"
+    assert payload["error_type"] == "AuthenticationError"
+
+
+def _read_request(connection: socket.socket) -> bytes:
+    data = b""
+    while b"\r\n\r\n" not in data:
+        chunk = connection.recv(4096)
+        if not chunk:
+            return b""
+        data += chunk
+    return data
+
+
+def _create_payload() -> dict:
+    return {
+        "agent_class_name": qualified_name(EchoAgent),
+        "state_class_name": qualified_name(TravelState),
+        "state": dataclass_to_wire(TravelState()),
+        "init": None,
+        "agent_id": None,
+    }
+
+
+def _host(tmp_path: Path, name: str, port: int, **kwargs) -> Host:
+    return Host(
+        name,
+        host="127.0.0.1",
+        port=port,
+        mesh=False,
+        mesh_multicast=False,
+        persistence_dir=tmp_path / name,
+        **kwargs,
+    )
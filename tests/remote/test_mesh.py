@@ -2,6 +2,9 @@
 # Licensed under the MIT License. See LICENSE for details.
 from __future__ import annotations
 
+import asyncio
+import ipaddress
+import socket
 import tempfile
 import time
 from dataclasses import dataclass, field
@@ -12,8 +15,17 @@ import pytest
 from paglets.core.agent import Paglet, PagletState
 from paglets.core.errors import HostError
 from paglets.core.messages import Message
-from paglets.remote.mesh import HostRef, decode_mesh_beacon, encode_mesh_beacon
+from paglets.core.runtime_values import ServiceScope
+from paglets.remote.mesh import (
+    MESH_GOSSIP_INDIRECT_PROBES,
+    MESH_LAN_DISCOVERY_SLICE,
+    HostRef,
+    _scan_open_ports,
+    decode_mesh_beacon,
+    encode_mesh_beacon,
+)
 from paglets.runtime.host import Host
+from paglets.services.directory import MeshServiceDirectory
 from tests.support import free_port
 
 
@@ -124,6 +136,38 @@ def test_lan_discovery_registers_dynamic_hosts_and_adds_seed():
     assert "http://192.168.86.28:8765" in alpha.mesh.peer_urls()
 
 
+def test_lan_scan_reports_only_listening_ports():
+    listening_port = free_port()
+    closed_port = free_port()
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
+        server.bind(("127.0.0.1", listening_port))
+        server.listen()
+        targets = [("127.0.0.1", listening_port), ("127.0.0.1", closed_port)]
+
+        assert asyncio.run(_scan_open_ports(targets, 0.5, 8)) == [("127.0.0.1", listening_port)]
+
+
+def test_lan_sweeps_rotate_slices_and_back_off_silent_targets():
+    alpha = _host("alpha", lan_discovery=True)
+    network = ipaddress.ip_network("10.1.2.0/24")
+    address = ipaddress.ip_address("10.1.2.7")
+
+    first = alpha.mesh._lan_sweep_targets(network, address, [8765])
+    assert len(first) == 253
+    assert ("10.1.2.7", 8765) not in first
+
+    alpha.mesh._note_lan_sweep(first[:10], answered={first[0]})
+    second = alpha.mesh._lan_sweep_targets(network, address, [8765])
+    assert second == [first[0], *first[10:MESH_LAN_DISCOVERY_SLICE]]
+    assert first[0] not in alpha.mesh._lan_misses
+
+    third = alpha.mesh._lan_sweep_targets(network, address, [8765])
+    assert third == first[MESH_LAN_DISCOVERY_SLICE : 2 * MESH_LAN_DISCOVERY_SLICE]
+
+    other = alpha.mesh._lan_sweep_targets(ipaddress.ip_network("10.9.9.0/24"), address, [8765])
+    assert len(other) == 254
+
+
 def test_offline_peer_is_marked_offline_after_failed_gossip():
     alpha = _host("alpha")
     beta = _host("beta", peers=[alpha.address])
@@ -144,6 +188,202 @@ def test_offline_peer_is_marked_offline_after_failed_gossip():
     assert beta_status.error
 
 
+def test_gossip_rounds_probe_bounded_fanout_converge_and_detect_failures():
+    seed = _host("h00", gossip_interval=60.0)
+    hosts = [seed] + [_host(f"h{index:02d}", peers=[seed.address], gossip_interval=60.0) for index in range(1, 12)]
+    probes: dict[str, int] = {}
+
+    for host in hosts:
+        post_json = host.client.post_json
+
+        def counting_post(url, payload, *, timeout=None, _name=host.name, _post=post_json):
+            if url.endswith("/hosts/gossip"):
+                probes[_name] = probes.get(_name, 0) + 1
+            return _post(url, payload, timeout=timeout)
+
+        host.client.post_json = counting_post  # type: ignore[method-assign]
+
+    def run_round(members: list[Host], *, failures: bool = False) -> None:
+        probes.clear()
+        for host in members:
+            host.mesh.gossip_once()
+        fanout = seed.mesh.gossip_fanout
+        if failures:
+            # Helpers also probe a failed target on behalf of others, at most
+            # MESH_GOSSIP_INDIRECT_PROBES times per failed direct probe.
+            assert sum(probes.values()) <= len(members) * (fanout + MESH_GOSSIP_INDIRECT_PROBES)
+        else:
+            assert max(probes.values(), default=0) <= fanout
+
+    for host in hosts:
+        host.start_background()
+    try:
+        names = {host.name for host in hosts}
+        for _round in range(12):
+            run_round(hosts)
+            if all({ref.name for ref in host.list_hosts(online_only=True)} == names for host in hosts):
+                break
+        converged = [{ref.name for ref in host.list_hosts(online_only=True)} for host in hosts]
+
+        victim = hosts.pop(5)
+        victim.stop()
+        for _round in range(12):
+            run_round(hosts, failures=True)
+            if all(not host.mesh.is_online(victim.name) for host in hosts):
+                break
+        detected = [host.mesh.is_online(victim.name) for host in hosts]
+        still_online = [{ref.name for ref in host.list_hosts(online_only=True)} for host in hosts]
+    finally:
+        for host in hosts:
+            host.stop()
+
+    assert converged == [names] * len(converged)
+    assert detected == [False] * len(hosts)
+    assert still_online == [names - {victim.name}] * len(hosts)
+
+
+def test_offline_report_is_refuted_with_higher_incarnation():
+    alpha = _host("alpha", gossip_interval=60.0)
+    beta = _host("beta", peers=[alpha.address], gossip_interval=60.0)
+    alpha.start_background()
+    beta.start_background()
+    try:
+        beta.mesh.gossip_once()
+        alpha.mesh.mark_offline(beta.address, "probe timed out")
+        assert alpha.mesh.is_online("beta") is False
+
+        alpha.mesh.gossip_once()
+        beta_ref = alpha.mesh.lookup("beta")
+    finally:
+        beta.stop()
+        alpha.stop()
+
+    assert beta_ref is not None
+    assert beta_ref.online is True
+    assert beta_ref.incarnation == 1
+
+
+def test_mesh_service_lookup_is_served_from_gossiped_directory():
+    alpha = _host("alpha")
+    beta = _host("beta", peers=[alpha.address])
+    alpha.start_background()
+    beta.start_background()
+    try:
+        proxy = beta.create(MeshAgent, MeshState())
+        beta.advertise_service(proxy.agent_id, "quotes", capabilities=("quote",), scope=ServiceScope.MESH)
+        beta.mesh.gossip_once()
+        alpha.mesh.gossip_once()
+        fetched: list[tuple[str, str | None]] = []
+        fetch = alpha.mesh_services._fetch
+
+        def counting_fetch(url: str, known_version: str | None, timeout: float):
+            fetched.append((url, known_version))
+            return fetch(url, known_version, timeout)
+
+        alpha.mesh_services._fetch = counting_fetch  # type: ignore[method-assign]
+
+        cached = alpha.lookup_services("quotes", capability="quote", scope=ServiceScope.MESH)
+        refreshed = alpha.lookup_services("quotes", scope=ServiceScope.MESH, refresh=True)
+        known_version = alpha.mesh_services.known_version(beta.address)
+    finally:
+        beta.stop()
+        alpha.stop()
+
+    assert [record.proxy.agent_id for record in cached] == [proxy.agent_id]
+    assert [record.proxy.agent_id for record in refreshed] == [proxy.agent_id]
+    assert fetched == [(beta.address, known_version)]
+
+
+def test_mesh_service_directory_refreshes_concurrently_within_deadline():
+    import threading
+
+    calls: list[str] = []
+    calls_lock = threading.Lock()
+
+    def fetch(url: str, known_version: str | None, timeout: float):
+        with calls_lock:
+            calls.append(url)
+        if url == "http://dead":
+            time.sleep(timeout * 3)
+            raise HostError("unreachable")
+        record = {"name": "quotes", "proxy": {"host_url": url, "agent_id": url[-1]}, "scope": "mesh"}
+        return {"version": "v1", "services": [record]}
+
+    directory = MeshServiceDirectory(fetch, refresh_timeout=0.2)
+    urls = ["http://dead", "http://live-a", "http://live-b"]
+    try:
+        started = time.monotonic()
+        threads = [threading.Thread(target=directory.lookup, args=(urls,), kwargs={"name": "quotes"}) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        records = directory.lookup(urls, name="quotes")
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+        again = directory.lookup(urls[1:], name="quotes")
+    finally:
+        directory.close()
+
+    assert [record.proxy.agent_id for record in records] == ["a", "b"]
+    assert elapsed < 0.5
+    assert sorted(calls) == sorted(urls)
+    assert [record.proxy.agent_id for record in again] == ["a", "b"]
+
+
+def test_mesh_service_directory_backs_off_from_a_hung_host():
+    import threading
+
+    release = threading.Event()
+    calls: list[str] = []
+
+    def fetch(url: str, known_version: str | None, timeout: float):
+        calls.append(url)
+        if url == "http://hung":
+            release.wait(5.0)
+            raise HostError("unreachable")
+        record = {"name": "quotes", "proxy": {"host_url": url, "agent_id": "live"}, "scope": "mesh"}
+        return {"version": "v1", "services": [record]}
+
+    directory = MeshServiceDirectory(fetch, max_age=0.0, refresh_timeout=0.2, backoff=30.0)
+    urls = ["http://hung", "http://live"]
+    try:
+        first = directory.lookup(urls, name="quotes")
+        durations = []
+        for _ in range(5):
+            started = time.monotonic()
+            records = directory.lookup(urls, name="quotes")
+            durations.append(time.monotonic() - started)
+            assert [record.proxy.agent_id for record in records] == ["live"]
+        missing = directory.lookup(urls, name="absent")
+    finally:
+        release.set()
+        directory.close()
+
+    assert [record.proxy.agent_id for record in first] == ["live"]
+    assert max(durations) < 0.1
+    assert missing == []
+    assert calls.count("http://hung") == 1
+
+
+def test_mesh_service_directory_skips_hosts_refreshed_during_a_lookup():
+    calls: list[str] = []
+
+    def fetch(url: str, known_version: str | None, timeout: float):
+        calls.append(url)
+        return {"version": "v1", "services": []}
+
+    directory = MeshServiceDirectory(fetch)
+    started = time.monotonic()
+    # A concurrent lookup finished this host after our staleness check.
+    directory.merge("http://live-a", {"version": "v1", "services": []})
+    try:
+        directory._refresh(["http://live-a", "http://live-b"], since=started)
+    finally:
+        directory.close()
+
+    assert calls == ["http://live-b"]
+
+
 def test_local_address_change_replaces_mesh_self_record():
     host = _host("alpha")
     host.start_background()
@@ -334,6 +574,7 @@ def _host(
     lan_discovery: bool = False,
     tags: list[str] | None = None,
     properties: dict[str, str] | None = None,
+    gossip_interval: float = 0.05,
 ) -> Host:
     return Host(
         name=name,
@@ -344,7 +585,7 @@ def _host(
         mesh_multicast=False,
         mesh_lan_discovery=lan_discovery,
         mesh_version=version,
-        mesh_gossip_interval=0.05,
+        mesh_gossip_interval=gossip_interval,
         mesh_offline_after=0.2,
         persistence_dir=Path(tempfile.mkdtemp(prefix="paglets-test-")) / name,
         tags=tags,
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import io
+import json
 import time
 from dataclasses import dataclass
 from pathlib import Path
@@ -108,6 +109,124 @@ def test_artifact_store_deletes_temp_blob_on_checksum_failure(tmp_path: Path):
     assert list((tmp_path / "artifacts" / "blobs").glob("*.bin")) == []
 
 
+def test_artifact_store_quota_uses_running_usage_counter(tmp_path: Path):
+    store = ArtifactStore(tmp_path / "artifacts", host_url="http://alpha", quota_bytes=10)
+
+    first = store.create_from_stream(io.BytesIO(b"123456"), size_bytes=6)
+    with pytest.raises(TransferError, match="quota exceeded"):
+        store.create_from_stream(io.BytesIO(b"12345"), size_bytes=5)
+    with pytest.raises(TransferError):
+        store.create_from_stream(io.BytesIO(b"1234"), size_bytes=4, expected_sha256="0" * 64)
+    assert store.used_bytes() == 6
+
+    (tmp_path / "artifacts" / "blobs" / "ffff.bin").write_bytes(b"outside")
+    assert store.used_bytes() == 6
+    store.delete(first.ref.artifact_id)
+    store.delete(first.ref.artifact_id)
+    second = store.create_from_stream(io.BytesIO(b"1234"), size_bytes=4)
+
+    assert store.used_bytes() == 4
+    assert ArtifactStore(tmp_path / "artifacts", host_url="http://alpha").used_bytes() == 11
+    assert second.ref.size_bytes == 4
+
+
+def test_artifact_catalog_indexes_owner_and_expiry(tmp_path: Path):
+    store = ArtifactStore(tmp_path / "artifacts", host_url="http://alpha")
+    kept = store.create_from_stream(io.BytesIO(b"kept"), size_bytes=4, owner_agent_id="a").ref
+    expired = store.create_from_stream(io.BytesIO(b"old"), size_bytes=3, owner_agent_id="a", expires_at=1.0).ref
+    other = store.create_from_stream(io.BytesIO(b"other"), size_bytes=5, owner_agent_id="b").ref
+
+    assert [ref.artifact_id for ref in store.list(owner_agent_id="b")] == [other.artifact_id]
+    assert store.catalog.ids_by_sha256(kept.sha256) == [kept.artifact_id]
+    store.cleanup_temporary(now=time.time())
+    assert {ref.artifact_id for ref in store.list()} == {kept.artifact_id, other.artifact_id}
+    store.delete_owner("a")
+
+    reopened = ArtifactStore(tmp_path / "artifacts", host_url="http://beta")
+    assert [ref.artifact_id for ref in reopened.list()] == [other.artifact_id]
+    assert reopened.ref(other.artifact_id).host_url == "http://beta"
+    assert not (tmp_path / "artifacts" / "metadata").exists()
+    with pytest.raises(TransferError, match="No artifact"):
+        reopened.ref(expired.artifact_id)
+
+
+def test_artifact_store_migrates_json_metadata_sidecars(tmp_path: Path):
+    root = tmp_path / "artifacts"
+    (root / "blobs").mkdir(parents=True)
+    (root / "metadata").mkdir()
+    (root / "blobs" / "abc123.bin").write_bytes(b"payload")
+    legacy = ArtifactRef(
+        host_url="http://old",
+        artifact_id="abc123",
+        name="data.txt",
+        size_bytes=7,
+        sha256="AB" * 32,
+        owner_agent_id="agent",
+    )
+    (root / "metadata" / "abc123.json").write_text(json.dumps(legacy.to_wire()), encoding="utf-8")
+    (root / "metadata" / "broken.json").write_text("{", encoding="utf-8")
+
+    store = ArtifactStore(root, host_url="http://alpha")
+
+    assert store.list(owner_agent_id="agent") == [
+        ArtifactRef(
+            host_url="http://alpha",
+            artifact_id="abc123",
+            name="data.txt",
+            size_bytes=7,
+            sha256="ab" * 32,
+            owner_agent_id="agent",
+        )
+    ]
+    assert [path.name for path in (root / "metadata").iterdir()] == ["broken.json"]
+    assert [path.name for path in (root / "blobs").iterdir()] == [f"{'ab' * 32}.bin"]
+    with store.open_reader("abc123") as handle:
+        assert handle.read() == b"payload"
+
+
+def test_artifact_store_shares_blobs_between_identical_uploads(tmp_path: Path):
+    store = ArtifactStore(tmp_path / "artifacts", host_url="http://alpha", quota_bytes=10)
+    first = store.create_from_stream(io.BytesIO(b"dataset"), size_bytes=7, owner_agent_id="a").ref
+    second = store.create_from_stream(io.BytesIO(b"dataset"), size_bytes=7, owner_agent_id="b").ref
+    reused = store.create_from_existing(first.sha256.upper(), size_bytes=7, name="again")
+
+    assert reused is not None
+    assert len({first.artifact_id, second.artifact_id, reused.ref.artifact_id}) == 3
+    assert store.create_from_existing("0" * 64) is None
+    assert store.create_from_existing(first.sha256, size_bytes=8) is None
+    assert [path.name for path in (tmp_path / "artifacts" / "blobs").iterdir()] == [f"{first.sha256}.bin"]
+    assert store.used_bytes() == 7
+
+    store.delete(first.artifact_id)
+    store.delete(reused.ref.artifact_id)
+    with store.open_reader(second.artifact_id) as handle:
+        assert handle.read() == b"dataset"
+    store.delete(second.artifact_id)
+
+    assert list((tmp_path / "artifacts" / "blobs").iterdir()) == []
+    assert store.used_bytes() == 0
+
+
+def test_artifact_export_move_links_unshared_blob(tmp_path: Path):
+    store = ArtifactStore(tmp_path / "artifacts", host_url="http://alpha")
+    shared = store.create_from_stream(io.BytesIO(b"shared"), size_bytes=6)
+    duplicate = store.create_from_stream(io.BytesIO(b"shared"), size_bytes=6).ref
+    single = store.create_from_stream(io.BytesIO(b"single"), size_bytes=6)
+    blob_inode = single.path.stat().st_ino
+
+    store.export_to_path(single.ref.artifact_id, tmp_path / "single.txt", move=True)
+    store.export_to_path(duplicate.artifact_id, tmp_path / "copy.txt", move=True)
+
+    assert (tmp_path / "single.txt").stat().st_ino == blob_inode
+    assert (tmp_path / "copy.txt").stat().st_ino != shared.path.stat().st_ino
+    assert (tmp_path / "copy.txt").read_bytes() == b"shared"
+    assert [ref.artifact_id for ref in store.list()] == [shared.ref.artifact_id]
+    assert not single.path.exists()
+    assert store.used_bytes() == 6
+    with pytest.raises(TransferError, match="checksum mismatch"):
+        store.export_to_path(shared.ref.artifact_id, tmp_path / "bad.txt", expected_sha256="0" * 64)
+
+
 def test_artifact_store_deletes_temp_blob_on_interrupted_stream(tmp_path: Path):
     class InterruptedStream:
         def __init__(self):
@@ -148,6 +267,27 @@ def test_direct_artifact_upload_download_delete(tmp_path: Path):
         host.stop()
 
 
+def test_upload_of_known_content_skips_the_body(tmp_path: Path, monkeypatch):
+    host = _host("alpha", tmp_path / "alpha")
+    source = tmp_path / "source.db"
+    source.write_bytes(b"sqlite-bytes")
+    host.start_background()
+    try:
+        first = host.client.upload_artifact(host.address, source, owner_agent_id="agent")
+
+        def no_body_upload(*_args, **_kwargs):
+            raise AssertionError("known content must not be uploaded again")
+
+        monkeypatch.setattr(host.artifacts, "create_from_http_request", no_body_upload)
+        second = host.client.upload_artifact(host.address, source, owner_agent_id="other", name="copy.db")
+    finally:
+        host.stop()
+
+    assert second.artifact_id != first.artifact_id
+    assert (second.sha256, second.size_bytes, second.name) == (first.sha256, 12, "copy.db")
+    assert host.artifacts.list(owner_agent_id="other") == [second]
+
+
 def test_host_client_download_artifact_requires_id_when_called_with_host_url(tmp_path: Path):
     client = HostClient()
 
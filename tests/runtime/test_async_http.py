@@ -0,0 +1,127 @@
+# Copyright (c) 2026 by C. Klukas.
+# Licensed under the MIT License. See LICENSE for details.
+from __future__ import annotations
+
+import contextlib
+import json
+import socket
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from paglets.core.errors import RemoteHostError
+from paglets.core.messages import Message
+from paglets.remote.client import HostClient
+from paglets.remote.connections import HTTPConnectionPool
+from paglets.remote.proxy import PagletProxy
+from paglets.runtime.async_http import AsyncPagletHTTPServer
+from paglets.runtime.host import Host
+from tests.support import free_port
+from tests.test_paglets_core import TravelAgent, TravelState
+
+
+def test_asyncio_server_runs_host_api_over_keep_alive(tmp_path: Path):
+    host = _host(tmp_path, "alpha")
+    host.start_background()
+    pool = HTTPConnectionPool()
+    client = HostClient(pool=pool)
+    try:
+        assert isinstance(host._server, AsyncPagletHTTPServer)
+        assert client.get_json(f"{host.address}/health")["name"] == "alpha"
+        proxy = PagletProxy.from_wire(host.create(TravelAgent, TravelState()).to_wire(), client=client)
+        for index in range(3):
+            assert proxy.send(Message("remember", {"value": f"v{index}"})) == f"remembered:v{index}"
+        created = host.create_remote(host.address, TravelAgent, TravelState(last_message="posted"), init=None)
+        assert host.get_state(created.agent_id, TravelState).last_message == "posted"
+        assert {agent["agent_id"] for agent in client.get_json(f"{host.address}/agents")["agents"]} >= {
+            proxy.agent_id,
+            created.agent_id,
+        }
+    finally:
+        host.stop()
+        pool.clear()
+
+    assert pool.status()["created"] == 1
+
+
+def test_asyncio_relay_polls_wait_without_executor_threads(tmp_path: Path):
+    host = _host(tmp_path, "alpha", api_key="secret")
+    host.start_background()
+    port = host.port
+    executor_threads = _executor_thread_count()
+    sockets = [socket.create_connection(("127.0.0.1", port), timeout=5.0) for _ in range(40)]
+    try:
+        for index, connection in enumerate(sockets):
+            connection.sendall(
+                f"GET /relay/poll/node-{index}?timeout=1 HTTP/1.1\r\n"
+                f"Host: 127.0.0.1\r\nAuthorization: Bearer secret\r\n\r\n".encode("ascii")
+            )
+        time.sleep(0.3)
+        assert _executor_thread_count() <= executor_threads
+        host.relay_connect({"name": "node-7"})
+        submitter = threading.Thread(target=_submit_ignoring_errors, args=(host, "node-7"), daemon=True)
+        submitter.start()
+        responses = [_read_json_response(connection) for connection in sockets]
+        submitter.join(timeout=5.0)
+    finally:
+        for connection in sockets:
+            connection.close()
+        host.stop()
+
+    assert all(status == 200 for status, _payload in responses)
+    delivered = [payload["delivery"] for _status, payload in responses if payload["delivery"] is not None]
+    assert [delivery["payload"] for delivery in delivered] == [{"value": 7}]
+
+
+def test_asyncio_relay_poll_requires_api_key(tmp_path: Path):
+    host = _host(tmp_path, "alpha", api_key="secret")
+    host.start_background()
+    try:
+        with socket.create_connection(("127.0.0.1", host.port), timeout=5.0) as connection:
+            connection.sendall(b"GET /relay/poll/node?timeout=5 HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n")
+            status, payload = _read_json_response(connection)
+    finally:
+        host.stop()
+
+    assert status == 401
+    assert payload["error_type"] == "AuthenticationError"
+
+
+def test_unknown_http_server_mode_is_rejected(tmp_path: Path):
+    with pytest.raises(ValueError, match="http_server must be one of"):
+        Host("alpha", http_server="forking", mesh=False, persistence_dir=tmp_path / "alpha")
+
+
+def _executor_thread_count() -> int:
+    return sum(1 for thread in threading.enumerate() if thread.name.startswith("paglets-http"))
+
+
+def _submit_ignoring_errors(host: Host, target: str) -> None:
+    with contextlib.suppress(RemoteHostError):
+        host._relay_submit(target, "message", {"value": 7}, timeout=0.5)
+
+
+def _read_json_response(connection: socket.socket) -> tuple[int, dict]:
+    reader = connection.makefile("rb")
+    status = int(reader.readline().split()[1])
+    length = 0
+    while (line := reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().casefold() == "content-length":
+            length = int(value.strip())
+    return status, json.loads(reader.read(length).decode("utf-8"))
+
+
+def _host(tmp_path: Path, name: str, **kwargs) -> Host:
+    return Host(
+        name,
+        host="127.0.0.1",
+        port=free_port(),
+        mesh=False,
+        mesh_multicast=False,
+        persistence_dir=tmp_path / name,
+        http_server="asyncio",
+        **kwargs,
+    )
@@ -2,6 +2,7 @@
 # Licensed under the MIT License. See LICENSE for details.
 from __future__ import annotations
 
+import array
 import io
 import json
 import pickle
@@ -41,6 +42,23 @@ class BinaryTravelAgent(Paglet[BinaryTravelState]):
         return self.not_handled()
 
 
+@dataclass
+class SamplesState(PagletState):
+    samples: array.array = field(default_factory=lambda: array.array("d"))
+    counts: array.array = field(default_factory=lambda: array.array("q"))
+
+
+class SamplesAgent(Paglet[SamplesState]):
+    State = SamplesState
+
+    def handle_message(self, message: Message):
+        if message.kind == "scale":
+            factor = float(message.args["factor"])
+            self.state.samples = array.array("d", (value * factor for value in self.state.samples))
+            return len(self.state.samples)
+        return self.not_handled()
+
+
 class ExplodingArrivalAgent(Paglet[TravelState]):
     State = TravelState
 
@@ -149,7 +167,12 @@ def test_binary_pickle_transport_streams_without_dumps_or_loads(tmp_path: Path,
     def fail_dumps(*_args, **_kwargs):
         raise AssertionError("post_pickle should stream with pickle.dump, not pickle.dumps")
 
-    def fail_loads(*_args, **_kwargs):
+    loads = transport_module.pickle.loads
+
+    def fail_loads(data, *args, **kwargs):
+        # Local shared-memory streams are loaded from a memoryview of the segment.
+        if isinstance(data, memoryview):
+            return loads(data, *args, **kwargs)
         raise AssertionError("host should stream with pickle.load, not pickle.loads")
 
     monkeypatch.setattr("paglets.remote.transport.pickle.dumps", fail_dumps)
@@ -252,21 +275,87 @@ def test_child_startup_streams_state_outside_process_config():
     assert transport_module.receive_local_pickle(config.state_stream) == state
 
 
-def test_local_pickle_stream_uses_shared_memory_and_unlinks_after_receive(monkeypatch):
+def test_local_pickle_stream_reuses_arena_segments_after_release(monkeypatch):
     monkeypatch.setattr(transport_module, "LOCAL_PICKLE_SEGMENT_BYTES", 64)
+    monkeypatch.setattr(transport_module, "LOCAL_PICKLE_ARENA_MIN_SEGMENT_BYTES", 64)
+    monkeypatch.setattr(transport_module, "LOCAL_PICKLE_INLINE_BYTES", 128)
     payload = {"value": b"x" * 512}
 
     stream = transport_module.start_local_pickle_sender(payload)
 
     assert stream["kind"] == "shared_memory_pickle"
+    assert stream["arena"] is True
     assert len(stream["segments"]) > 1
     assert not hasattr(transport_module, "Listener")
-    segment_names = [segment["name"] for segment in stream["segments"]]
+    segment_names = {segment["name"] for segment in stream["segments"]}
     assert transport_module.receive_local_pickle(stream) == payload
     assert stream["token"] not in transport_module._LOCAL_PICKLE_STREAMS
     for name in segment_names:
-        with pytest.raises(FileNotFoundError):
-            transport_module.shared_memory.SharedMemory(name=name)
+        transport_module.shared_memory.SharedMemory(name=name).close()
+
+    again = transport_module.start_local_pickle_sender(payload)
+
+    assert {segment["name"] for segment in again["segments"]} == segment_names
+    assert transport_module.receive_local_pickle(again) == payload
+
+
+def test_small_local_pickle_streams_travel_inline():
+    payload = {"value": b"x" * 512, "samples": array.array("d", range(8))}
+
+    stream = transport_module.start_local_pickle_sender(payload)
+
+    assert stream["kind"] == "inline_pickle"
+    assert "token" not in stream
+    assert transport_module.receive_local_pickle(stream) == payload
+
+
+@pytest.mark.skipif(not Path("/dev/shm").is_dir(), reason="needs /dev/shm")
+def test_unlink_process_arena_removes_segments_left_by_an_exited_process():
+    arena = transport_module.SharedMemoryArena(max_idle_bytes=1024)
+    arena.pid = 0x7FFFFFF0
+    handle = arena.lease(256)
+    name = handle.name
+    handle.close()
+
+    transport_module.unlink_process_arena(arena.pid)
+
+    with pytest.raises(FileNotFoundError):
+        transport_module.shared_memory.SharedMemory(name=name)
+
+
+def test_local_pickle_stream_carries_large_typed_buffers_out_of_band():
+    samples = array.array("d", range(100_000))
+    payload = {"samples": samples, "small": array.array("i", [1, 2, 3]), "text": "x"}
+
+    stream = transport_module.start_local_pickle_sender(payload)
+
+    assert [buffer["size"] for buffer in stream["buffers"]] == [samples.itemsize * len(samples)]
+    assert stream["buffers"][0]["offset"] >= stream["pickle_size"]
+    assert transport_module.receive_local_pickle(stream) == payload
+
+
+def test_typed_buffers_fall_back_to_base64_only_for_json():
+    samples = array.array("f", [0.5, 1.5, -2.0])
+
+    tagged = transport_module.json_safe({"samples": samples, "view": memoryview(b"abc")})
+
+    assert tagged["samples"]["__paglets_binary__"] == "array"
+    assert transport_module.restore_json_safe(json.loads(json.dumps(tagged))) == {"samples": samples, "view": b"abc"}
+    buffer = io.BytesIO()
+    transport_module.dump_pickle(samples, buffer)
+    assert transport_module.load_pickle(io.BytesIO(buffer.getvalue())) == samples
+
+
+def test_numpy_state_values_round_trip_through_json_tags():
+    numpy = pytest.importorskip("numpy")
+    matrix = numpy.arange(12, dtype=numpy.float32).reshape(3, 4)
+
+    tagged = json.loads(json.dumps(transport_module.json_safe(matrix)))
+    restored = transport_module.restore_json_safe(tagged)
+
+    assert tagged["shape"] == [3, 4]
+    assert restored.dtype == matrix.dtype
+    assert numpy.array_equal(restored, matrix)
 
 
 def test_child_host_call_state_payload_uses_local_pickle_stream():
@@ -299,6 +388,29 @@ def test_binary_state_json_projection_and_dataclass_restore(tmp_path: Path):
     assert restored.marker == bytearray(b"\x01marker")
 
 
+def test_typed_buffer_state_moves_between_hosts_and_projects_to_json(tmp_path: Path):
+    samples = array.array("d", (index / 8 for index in range(50_000)))
+    alpha = Host(name="alpha", host="127.0.0.1", port=free_port(), persistence_dir=tmp_path / "alpha")
+    beta = Host(name="beta", host="127.0.0.1", port=free_port(), persistence_dir=tmp_path / "beta")
+    alpha.start_background()
+    beta.start_background()
+    try:
+        proxy = alpha.create(SamplesAgent, SamplesState(samples=samples, counts=array.array("q", [1, 2])))
+        assert proxy.send(Message("scale", {"factor": 2})) == len(samples)
+        moved = proxy.dispatch(beta.address)
+        moved_state = beta.get_state(moved.agent_id, SamplesState)
+        json_state = beta.client.get_json(f"{beta.address}/agents/{moved.agent_id}/state")["state"]
+    finally:
+        beta.stop()
+        alpha.stop()
+
+    expected = array.array("d", (value * 2 for value in samples))
+    assert moved_state.samples == expected
+    assert moved_state.counts == array.array("q", [1, 2])
+    assert json_state["samples"] == expected
+    assert dataclass_from_wire(SamplesState, json_state).samples == expected
+
+
 def test_large_binary_state_moves_clones_and_reactivates(tmp_path: Path):
     payload = b"x" * (16 * 1024 * 1024)
     alpha = Host(name="alpha", host="127.0.0.1", port=free_port(), persistence_dir=tmp_path / "alpha")
@@ -395,3 +507,22 @@ def test_binary_payload_encoding_benchmark_avoids_json_transport_cost():
     assert pickle.loads(binary) == wire
     assert len(binary) < len(json_payload)
     assert pickle_seconds < json_seconds
+
+
+def test_shared_memory_pickle_reader_reads_lines_and_into_buffers_across_segments():
+    writer = transport_module.SharedMemoryPickleWriter(segment_size=16)
+    writer.write(b"short\nthis line crosses two segments\n" + bytes(range(40)))
+    reader = transport_module.SharedMemoryPickleReader(writer.finish())
+    try:
+        assert reader.readline() == b"short\n"
+        assert reader.readline(4) == b"this"
+        assert reader.readline() == b" line crosses two segments\n"
+        target = bytearray(20)
+        assert reader.readinto(target) == 20
+        assert target == bytes(range(20))
+        assert reader.read(5) == bytes(range(20, 25))
+        assert reader.read() == bytes(range(25, 40))
+        assert reader.read(1) == b""
+        assert reader.readinto(bytearray(4)) == 0
+    finally:
+        reader.close(unlink=True)
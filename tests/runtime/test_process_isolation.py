@@ -10,10 +10,12 @@ from pathlib import Path
 
 import pytest
 
+import paglets.runtime.host as host_module
 from paglets.core.agent import Paglet, PagletState
 from paglets.core.errors import HostError, PagletCrashedError
 from paglets.core.messages import Message
 from paglets.runtime.host import Host
+from paglets.runtime.process_controller import ChildProcessController
 from tests.support import free_port
 
 
@@ -82,6 +84,14 @@ class RunFailureAgent(Paglet[IsolationState]):
         return self.not_handled()
 
 
+class BackgroundResourceAgent(Paglet[IsolationState]):
+    State = IsolationState
+
+    def run(self) -> None:
+        self.resources.register("cache", lambda: None)
+        self.state.count = 5
+
+
 class HostInventoryAgent(Paglet[IsolationState]):
     State = IsolationState
 
@@ -175,6 +185,29 @@ def test_child_context_host_can_list_agents(tmp_path: Path):
         host.stop()
 
 
+def test_list_agents_uses_status_pushed_by_children(tmp_path: Path, monkeypatch):
+    host = _host(tmp_path)
+    host.start_background()
+    try:
+        proxy = host.create(BackgroundResourceAgent, IsolationState())
+
+        def no_round_trip(*_args, **_kwargs):
+            raise AssertionError("listing must not query the child")
+
+        monkeypatch.setattr(ChildProcessController, "resource_status_snapshot", no_round_trip)
+        _wait_until(lambda: host.list_agents()[0]["resources"] == {"cache": False})
+        _wait_until(lambda: host._agents[proxy.agent_id].state.get("count") == 5)
+        monkeypatch.setattr(ChildProcessController, "fetch_state", no_round_trip)
+        monkeypatch.setattr(host_module, "LIST_AGENTS_STATE_DEADLINE_SECONDS", 0.0)
+
+        [listed] = host.list_agents(include_state=True)
+    finally:
+        host.stop()
+
+    assert listed["state"]["count"] == 5
+    assert "state_error" not in listed
+
+
 def test_host_stop_terminates_blocked_child_process(tmp_path: Path):
     host = _host(tmp_path)
     host.start_background()
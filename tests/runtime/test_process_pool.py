@@ -0,0 +1,124 @@
+# Copyright (c) 2026 by C. Klukas.
+# Licensed under the MIT License. See LICENSE for details.
+from __future__ import annotations
+
+import os
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+from paglets.core.agent import Paglet, PagletState
+from paglets.core.errors import PagletCrashedError
+from paglets.core.messages import Message
+from paglets.runtime.host import Host
+from paglets.runtime.process_pool import ChildProcessPool
+from paglets.serialization.codec import qualified_name
+from tests.support import free_port
+
+
+@dataclass
+class PoolState(PagletState):
+    count: int = 0
+
+
+class PooledAgent(Paglet[PoolState]):
+    State = PoolState
+
+    def handle_message(self, message: Message):
+        if message.kind == "count":
+            self.state.count += 1
+            return self.state.count
+        if message.kind == "pid":
+            return os.getpid()
+        if message.kind == "loaded":
+            return str(message.args["module"]) in sys.modules
+        if message.kind == "exit":
+            os._exit(5)
+        return self.not_handled()
+
+
+def test_warm_pool_hands_prestarted_child_to_new_paglet(tmp_path: Path):
+    host = _host(tmp_path, child_pool_size=1)
+    host.start_background()
+    try:
+        _wait_until(lambda: _idle(host) == 1, timeout=30.0)
+        warm_pid = host._child_pool._idle[""][0].process.pid
+
+        proxy = host.create(PooledAgent, PoolState())
+
+        assert proxy.send(Message("count")) == 1
+        assert proxy.send(Message("pid")) == warm_pid
+        assert host._agents[proxy.agent_id].warm_start is True
+        assert host.health()["child_pool"]["hits"] == 1
+        _wait_until(lambda: _idle(host) == 1, timeout=30.0)
+    finally:
+        host.stop()
+
+
+def test_warm_child_crash_is_isolated_to_one_paglet(tmp_path: Path):
+    host = _host(tmp_path, child_pool_size=2)
+    host.start_background()
+    try:
+        _wait_until(lambda: _idle(host) == 2, timeout=30.0)
+        stable = host.create(PooledAgent, PoolState())
+        exiting = host.create(PooledAgent, PoolState())
+
+        with pytest.raises(PagletCrashedError):
+            exiting.send(Message("exit"))
+
+        assert stable.send(Message("count")) == 1
+        assert stable.send(Message("pid")) != exiting.info()["pid"]
+    finally:
+        host.stop()
+
+
+def test_class_preload_children_import_requested_modules(tmp_path: Path):
+    class_name = qualified_name(PooledAgent)
+    host = _host(tmp_path, child_pool_size=1, child_pool_class_preload={class_name: ["colorsys"]})
+    host.start_background()
+    try:
+        _wait_until(lambda: len(host._child_pool._idle[class_name]) == 1, timeout=30.0)
+
+        proxy = host.create(PooledAgent, PoolState())
+
+        assert proxy.send(Message("loaded", {"module": "colorsys"})) is True
+        assert host._agents[proxy.agent_id].warm_start is True
+    finally:
+        host.stop()
+
+
+def test_disabled_pool_never_acquires():
+    pool = ChildProcessPool(0)
+    pool.start()
+
+    assert pool.acquire("tests.runtime.test_process_pool:PooledAgent") is None
+    assert pool.status()["misses"] == 0
+    pool.stop()
+
+
+def _idle(host: Host) -> int:
+    return int(host._child_pool.status()["idle"]["*"])
+
+
+def _host(tmp_path: Path, **kwargs) -> Host:
+    return Host(
+        "alpha",
+        host="127.0.0.1",
+        port=free_port(),
+        mesh=False,
+        mesh_multicast=False,
+        persistence_dir=tmp_path / "alpha",
+        **kwargs,
+    )
+
+
+def _wait_until(predicate, *, timeout: float = 3.0, interval: float = 0.02) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return
+        time.sleep(interval)
+    assert predicate()
@@ -85,7 +85,13 @@ def _wait_for(predicate, *, timeout: float = 5.0) -> None:
     raise AssertionError("timed out waiting for condition")
 
 
-def _relay_hosts(tmp_path: Path, *, relay_offline_after: float = 30.0, relay_delivery_timeout: float | None = None):
+def _relay_hosts(
+    tmp_path: Path,
+    *,
+    relay_offline_after: float = 30.0,
+    relay_delivery_timeout: float | None = None,
+    http_server: str = "threaded",
+):
     port = free_port()
     public_url = f"http://127.0.0.1:{port}/paglets"
     hub = Host(
@@ -99,6 +105,7 @@ def _relay_hosts(tmp_path: Path, *, relay_offline_after: float = 30.0, relay_del
         mesh_lan_discovery=False,
         relay_offline_after=relay_offline_after,
         relay_delivery_timeout=relay_delivery_timeout,
+        http_server=http_server,
     )
     beta = Host(
         name="B",
@@ -287,6 +294,84 @@ def test_relay_client_keeps_polling_while_delivery_is_handled(tmp_path: Path, mo
         hub.stop()
 
 
+@pytest.mark.parametrize("http_server", ["threaded", "asyncio"])
+def test_relay_batch_poll_returns_queued_deliveries_and_applies_piggybacked_acks(tmp_path: Path, http_server: str):
+    hub, _beta, _laptop, public_url = _relay_hosts(tmp_path, http_server=http_server)
+    hub.start_background()
+    hub.relay_connect({"health": {"name": "B", "code_version": hub.mesh.code_version}})
+    client = HostClient(api_key="secret")
+    results: dict[str, object] = {}
+
+    def call_relay(path: str) -> None:
+        results[path] = hub.relay_api("B", "GET", path, {}, timeout=5.0)
+
+    calls = [threading.Thread(target=call_relay, args=(f"/call-{index}",), daemon=True) for index in range(3)]
+    try:
+        for call in calls:
+            call.start()
+        _wait_for(lambda: hub._relay_queues["B"].qsize() == 3)
+        first = client.post_json(f"{public_url}/relay/poll/B?timeout=1", {"acks": [], "max_deliveries": 10})
+        deliveries = first["deliveries"]
+        assert first["registered"] is True
+        assert sorted(delivery["payload"]["path"] for delivery in deliveries) == ["/call-0", "/call-1", "/call-2"]
+        assert hub.relay_diagnostics()["nodes"][0]["in_flight"] == 3
+
+        acks = [
+            {"delivery_id": delivery["delivery_id"], "ok": True, "result": delivery["payload"]["path"]}
+            for delivery in deliveries
+        ]
+        second = client.post_json(f"{public_url}/relay/poll/B?timeout=0", {"acks": acks, "max_deliveries": 10})
+        for call in calls:
+            call.join(timeout=2.0)
+    finally:
+        hub.stop()
+
+    assert second["deliveries"] == []
+    assert results == {"/call-0": "/call-0", "/call-1": "/call-1", "/call-2": "/call-2"}
+
+
+def test_relay_client_registers_on_heartbeat_not_before_every_poll(tmp_path: Path, monkeypatch):
+    hub, beta, _laptop, _public_url = _relay_hosts(tmp_path)
+    registrations = 0
+    register_once = beta._relay_register_once
+
+    def counting_register_once() -> None:
+        nonlocal registrations
+        registrations += 1
+        register_once()
+
+    monkeypatch.setattr(beta, "_relay_register_once", counting_register_once)
+    hub.start_background()
+    beta.start_background()
+    try:
+        _wait_for(lambda: "B" in hub._relay_nodes)
+        agent = beta.create(TravelAgent, TravelState(), init=None)
+        for index in range(5):
+            result = hub.relay_deliver_message("B", agent.agent_id, Message("remember", {"value": f"v{index}"}))
+            assert result == f"remembered:v{index}"
+    finally:
+        beta.stop()
+        hub.stop()
+
+    assert registrations == 1
+
+
+@pytest.mark.parametrize("http_server", ["threaded", "asyncio"])
+def test_parked_relay_poll_learns_about_nodes_that_join_later(tmp_path: Path, http_server: str):
+    hub, beta, laptop, _public_url = _relay_hosts(tmp_path, http_server=http_server)
+    hub.start_background()
+    laptop.start_background()
+    try:
+        _wait_for(lambda: "L" in hub._relay_nodes and hub.relay_diagnostics()["nodes"][0]["active_polls"] == 1)
+        beta.start_background()
+
+        _wait_for(lambda: laptop.mesh.lookup("B") is not None, timeout=3.0)
+    finally:
+        beta.stop()
+        laptop.stop()
+        hub.stop()
+
+
 def test_relay_dispatch_to_offline_target_fails_and_keeps_source_active(tmp_path: Path):
     hub, _beta, laptop, public_url = _relay_hosts(tmp_path, relay_offline_after=0.1)
     hub.start_background()
@@ -0,0 +1,99 @@
+# Copyright (c) 2026 by C. Klukas.
+# Licensed under the MIT License. See LICENSE for details.
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from paglets.core.agent import Paglet, PagletState
+from paglets.core.messages import Message
+from paglets.runtime.host import Host
+from paglets.runtime.process_protocol import _apply_state_delta, _StateDeltaTracker
+from tests.support import free_port
+
+
+@dataclass
+class LargeState(PagletState):
+    count: int = 0
+    payload: list[int] = field(default_factory=lambda: list(range(10_000)))
+
+
+class LargeStateAgent(Paglet[LargeState]):
+    State = LargeState
+
+    def handle_message(self, message: Message):
+        if message.kind == "ping":
+            return "pong"
+        if message.kind == "count":
+            self.state.count += 1
+            return self.state.count
+        if message.kind == "append":
+            self.state.payload.append(int(message.args["value"]))
+            return len(self.state.payload)
+        return self.not_handled()
+
+
+def test_tracker_sends_full_snapshot_first_then_changed_fields_only():
+    tracker = _StateDeltaTracker()
+
+    first = tracker.encode({"state": {"count": 0, "payload": [1, 2]}, "resources": {}})
+    unchanged = tracker.encode({"state": {"count": 0, "payload": [1, 2]}, "resources": {}})
+    changed = tracker.encode({"state": {"count": 1, "payload": [1, 2]}, "resources": {}})
+
+    assert first["state"] == {"count": 0, "payload": [1, 2]}
+    assert first["state_version"] == 1
+    assert "state" not in unchanged and "state_delta" not in unchanged
+    assert unchanged["state_base"] == unchanged["state_version"] == 1
+    assert changed["state_delta"] == {"count": 1}
+    assert (changed["state_base"], changed["state_version"]) == (1, 2)
+
+
+def test_tracker_invalidate_forces_full_snapshot():
+    tracker = _StateDeltaTracker()
+    tracker.encode({"state": {"count": 0}})
+
+    tracker.invalidate()
+
+    assert tracker.encode({"state": {"count": 0}})["state"] == {"count": 0}
+
+
+def test_apply_state_delta_patches_or_requests_resync():
+    current = {"count": 0, "payload": [1]}
+
+    assert _apply_state_delta(current, 1, {"state_base": 1, "state_version": 2, "state_delta": {"count": 3}}) == (
+        {"count": 3, "payload": [1]},
+        2,
+    )
+    assert _apply_state_delta(current, 1, {"state_base": 1, "state_version": 1}) == (current, 1)
+    assert _apply_state_delta(current, 2, {"state_base": 1, "state_version": 2, "state_delta": {}}) is None
+
+
+def test_message_replies_only_patch_changed_fields(tmp_path: Path):
+    host = Host(
+        "alpha",
+        host="127.0.0.1",
+        port=free_port(),
+        mesh=False,
+        mesh_multicast=False,
+        persistence_dir=tmp_path / "alpha",
+    )
+    host.start_background()
+    try:
+        proxy = host.create(LargeStateAgent, LargeState())
+        record = host._agents[proxy.agent_id]
+        version = record.state_version
+
+        assert proxy.send(Message("ping")) == "pong"
+        assert record.state_version == version
+
+        assert proxy.send(Message("count")) == 1
+        assert record.state_version == version + 1
+        assert record.state["count"] == 1
+        assert proxy.send(Message("append", {"value": -1})) == 10_001
+
+        state = host.get_state(proxy.agent_id, LargeState)
+        assert state.count == 1
+        assert state.payload[-1] == -1
+        assert len(state.payload) == 10_001
+    finally:
+        host.stop()
@@ -7,6 +7,7 @@ from pathlib import Path
 
 import pytest
 
+import paglets.persistence.storage as storage_module
 from paglets.core.agent import Paglet, PagletState
 from paglets.core.messages import Message
 from paglets.persistence.storage import ManagedStorage, StorageQuotaError
@@ -40,6 +41,11 @@ class StorageAgent(Paglet[StorageState]):
             }
         if message.kind == "read_persistent":
             return self.persistent_storage().read_bytes(str(message.args["path"])).decode("utf-8")
+        if message.kind == "round_trip_blob":
+            storage = self.persistent_storage()
+            blob = bytes(range(256)) * int(message.args["repeat"])
+            storage.write_bytes("blob.bin", blob)
+            return storage.read_bytes("blob.bin") == blob
         return self.not_handled()
 
 
@@ -127,6 +133,45 @@ def test_persistent_storage_quota_is_shared_per_class_and_survives_restart(tmp_p
         restarted.stop()
 
 
+def test_child_storage_payloads_do_not_cross_the_host_pipe(tmp_path: Path):
+    host = _host("alpha", tmp_path / "alpha", quota=2 * 1024 * 1024)
+    calls: list[tuple[str, dict]] = []
+    handle_child_host_call = host._handle_child_host_call
+
+    def recording_host_call(agent_id: str, op: str, payload: dict):
+        calls.append((op, dict(payload)))
+        return handle_child_host_call(agent_id, op, payload)
+
+    host._handle_child_host_call = recording_host_call
+    host.start_background()
+    try:
+        proxy = host.create(StorageAgent, StorageState())
+
+        assert proxy.send(Message("round_trip_blob", {"repeat": 4096})) is True
+        storage_calls = [(op, payload) for op, payload in calls if op.startswith("storage_")]
+        assert storage_calls == [
+            ("storage_reserve_write", {"path": "blob.bin", "size": 1024 * 1024, "quota_bytes": 2 * 1024 * 1024})
+        ]
+        assert host.persistent_storage_for(proxy.agent_id).status().used_bytes == 1024 * 1024
+    finally:
+        host.stop()
+
+
+def test_managed_storage_reserve_write_books_quota_for_caller_writes(tmp_path: Path):
+    storage = ManagedStorage(tmp_path / "storage", quota_bytes=10)
+
+    target = storage.reserve_write("nested/a.bin", 6)
+    target.write_bytes(b"123456")
+    assert target == (tmp_path / "storage" / "nested" / "a.bin").resolve()
+    assert storage.status().used_bytes == 6
+    with pytest.raises(StorageQuotaError):
+        storage.reserve_write("b.bin", 5)
+    storage.reserve_write("nested/a.bin", 10)
+    assert storage.status().used_bytes == 10
+    with pytest.raises(ValueError):
+        storage.reserve_write("../escape.bin", 1)
+
+
 def test_managed_storage_rejects_path_traversal(tmp_path: Path):
     storage = ManagedStorage(tmp_path / "storage")
 
@@ -134,6 +179,38 @@ def test_managed_storage_rejects_path_traversal(tmp_path: Path):
         storage.write_text("../escape.txt", "x")
 
 
+def test_managed_storage_tracks_usage_without_rewalking_the_tree(tmp_path: Path, monkeypatch):
+    storage = ManagedStorage(tmp_path / "storage", quota_bytes=20)
+    (tmp_path / "storage" / "nested").mkdir(parents=True)
+    (tmp_path / "storage" / "nested" / "existing.bin").write_bytes(b"12345")
+    walks = 0
+    directory_size = storage_module.directory_size
+
+    def counting_directory_size(root: Path) -> int:
+        nonlocal walks
+        walks += 1
+        return directory_size(root)
+
+    monkeypatch.setattr(storage_module, "directory_size", counting_directory_size)
+
+    storage.write_bytes("a.bin", b"1234")
+    storage.write_bytes("a.bin", b"12")
+    storage.write_text("b.txt", "123456")
+    with pytest.raises(StorageQuotaError):
+        storage.write_bytes("c.bin", b"x" * 8)
+    assert storage.status().used_bytes == 13
+    storage.delete("a.bin")
+    storage.delete("missing.bin")
+    assert storage.status().used_bytes == 11
+    assert walks == 1
+
+    storage.delete("nested")
+    assert storage.status().used_bytes == 6
+    storage.clear()
+    assert storage.status().used_bytes == 0
+    assert walks == 2
+
+
 def _host(name: str, persistence_dir: Path, *, quota: int | None = None) -> Host:
     kwargs = {}
     if quota is not None:
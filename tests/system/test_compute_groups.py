@@ -3,9 +3,16 @@
 from __future__ import annotations
 
 from pathlib import Path
+from types import SimpleNamespace
 
 from paglets.artifacts import ArtifactRef
 from paglets.core.messages import Message
+from paglets.system.compute_slots.agent import (
+    DECISION_DELIVERY_FAILED_MESSAGE,
+    REQUEST_SLOTS_BATCH,
+    SlotBatchReply,
+    SlotDecisionReply,
+)
 from paglets.system.compute_slots.groups import (
     GROUP_STATUS_COMPLETE,
     GROUP_STATUS_RETURNING_HOME,
@@ -14,6 +21,7 @@ from paglets.system.compute_slots.groups import (
     CollectingComputeJobState,
     ResultCollectorPaglet,
     ResultCollectorState,
+    submit_compute_job_group,
 )
 
 
@@ -159,6 +167,86 @@ def test_after_success_skips_default_report_when_report_was_already_sent():
     assert proxy.messages == []
 
 
+def test_submit_compute_job_group_admits_jobs_with_one_batch_call_per_placement_mode():
+    created: list[CollectingComputeJobState] = []
+    batches: list[tuple[bool, list[str]]] = []
+
+    class Handle:
+        def call(self, operation, payload, *, timeout=None, **kwargs):
+            assert operation == REQUEST_SLOTS_BATCH
+            assert payload.notify_agents is True
+            batches.append((payload.allow_local, [slot.agent_id for slot in payload.slots]))
+            return SlotBatchReply(generated_at=0.0)
+
+    def create_paglet(agent_cls, state, *, host_url=None):
+        created.append(state)
+        return SimpleNamespace(
+            agent_id=f"agent-{len(created)}",
+            host_url="http://alpha",
+            send=lambda message, **kwargs: None,
+        )
+
+    context = SimpleNamespace(
+        name="alpha",
+        address="http://alpha",
+        create_paglet=create_paglet,
+        require_contract=lambda *args, **kwargs: Handle(),
+    )
+    states = [
+        CollectingComputeJobState(estimated_runtime_seconds=1.0, memory_bytes=1024),
+        CollectingComputeJobState(estimated_runtime_seconds=1.0, memory_bytes=1024),
+        CollectingComputeJobState(estimated_runtime_seconds=1.0, memory_bytes=1024, allow_home_compute=True),
+        CollectingComputeJobState(estimated_runtime_seconds=0.0, memory_bytes=1024),
+    ]
+
+    submit_compute_job_group(context, DemoCollectingJob, states)
+
+    assert batches == [(False, ["agent-2", "agent-3"]), (True, ["agent-4"])]
+    assert [state.slot_admission_pending for state in created[1:]] == [True, True, True, False]
+    assert all(state.slot_request_id for state in created[1:4])
+
+
+def test_batch_admission_resends_undelivered_decisions_as_fallbacks():
+    sent: dict[str, list[str]] = {}
+
+    class Handle:
+        def call(self, operation, payload, *, timeout=None, **kwargs):
+            first, second = payload.slots
+            return SlotBatchReply(
+                generated_at=0.0,
+                decisions=[
+                    SlotDecisionReply(decision="run_now", request_id=first.request_id, lease_id="lease-0"),
+                    SlotDecisionReply(
+                        decision="rejected",
+                        request_id=second.request_id,
+                        message=DECISION_DELIVERY_FAILED_MESSAGE,
+                    ),
+                ],
+            )
+
+    def create_paglet(agent_cls, state, *, host_url=None):
+        agent_id = f"agent-{len(sent)}"
+        sent[agent_id] = []
+        return SimpleNamespace(
+            agent_id=agent_id,
+            host_url="http://alpha",
+            send=lambda message, **kwargs: None,
+            send_oneway=lambda message, **kwargs: sent[agent_id].append(message.args["decision"]),
+        )
+
+    context = SimpleNamespace(
+        name="alpha",
+        address="http://alpha",
+        create_paglet=create_paglet,
+        require_contract=lambda *args, **kwargs: Handle(),
+    )
+    states = [CollectingComputeJobState(estimated_runtime_seconds=1.0, memory_bytes=1024) for _ in range(2)]
+
+    submit_compute_job_group(context, DemoCollectingJob, states)
+
+    assert sent == {"agent-0": [], "agent-1": [], "agent-2": ["rejected"]}
+
+
 def test_result_collector_tracks_partial_failure():
     collector = _collector()
 
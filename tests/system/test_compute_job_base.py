@@ -6,10 +6,13 @@ import time
 from dataclasses import dataclass, field
 from typing import Any
 
+import pytest
+
 from paglets.core.messages import Message
 from paglets.persistence.persistency import DeactivationRequest
 from paglets.serialization.codec import dataclass_to_wire
 from paglets.system.compute_slots import (
+    COMPUTE_SLOT_DECISION_MESSAGE,
     COMPUTE_STATUS_COMPLETED,
     COMPUTE_STATUS_FAILED_FINAL,
     COMPUTE_STATUS_NEW,
@@ -25,7 +28,7 @@ from paglets.system.compute_slots import (
     SchedulerHostStatus,
     SlotDecisionReply,
 )
-from paglets.system.compute_slots.agent import REQUEST_SLOT
+from paglets.system.compute_slots.agent import RELEASE_SLOT, REQUEST_SLOT
 
 
 @dataclass
@@ -112,6 +115,70 @@ def test_compute_slot_redirect_records_metadata_and_starts_placement():
     assert paglet.state.last_redirect_from_host_url == "http://alpha"
 
 
+def test_batch_admitted_compute_job_waits_for_decision_and_dispatches_to_placement():
+    paglet = DemoComputePaglet(
+        DemoComputeState(slot_admission_pending=True, home_host_name="alpha", home_host_url="http://alpha")
+    )
+    paglet._attach(_FakeContext(name="alpha", address="http://alpha"))  # type: ignore[arg-type]
+    started: list[bool] = []
+    dispatched: list[str] = []
+    real_start = paglet.start_compute_worker
+    paglet.start_compute_worker = lambda: started.append(True) or real_start()  # type: ignore[method-assign]
+    paglet.dispatch = lambda target: dispatched.append(target)  # type: ignore[method-assign,assignment,return-value]
+    paglet.require_contract = lambda *args, **kwargs: pytest.fail("batch-admitted job contacted the scheduler")  # type: ignore[method-assign]
+
+    paglet.run()
+    assert started == []
+    assert paglet.state.restart_initial_state["slot_admission_pending"] is False
+
+    placement = SlotDecisionReply(decision="redirect", request_id="request-0", host_url="http://beta/")
+    result = paglet.handle_message(Message(COMPUTE_SLOT_DECISION_MESSAGE, dataclass_to_wire(placement)))
+
+    assert result == {"ok": True}
+    _wait_until(lambda: dispatched == ["http://beta/"])
+    assert paglet.state.slot_admission_pending is False
+    assert paglet.state.slot_decision == {}
+    assert paglet.state.compute_status == COMPUTE_STATUS_PLACING
+    assert paglet.state.selected_host_url == "http://beta"
+    assert paglet.state.last_redirect_at == 0.0
+
+
+def test_late_batch_decisions_are_dropped_and_late_grants_released():
+    paglet = DemoComputePaglet(DemoComputeState(slot_admission_pending=True))
+    started: list[bool] = []
+    released: list[str] = []
+
+    class Handle:
+        def call(self, operation, payload, *, timeout=None, **kwargs):
+            assert operation == RELEASE_SLOT
+            released.append(payload.lease_id)
+            return {"ok": True}
+
+    paglet.start_compute_worker = lambda: started.append(True)  # type: ignore[method-assign]
+    paglet.require_contract = lambda *args, **kwargs: Handle()  # type: ignore[method-assign]
+
+    def decide(decision: str, lease_id: str = "") -> None:
+        reply = SlotDecisionReply(decision=decision, request_id="request-0", lease_id=lease_id)
+        assert paglet.handle_message(Message(COMPUTE_SLOT_DECISION_MESSAGE, dataclass_to_wire(reply))) == {"ok": True}
+
+    decide("rejected")
+    decide("run_now", "lease-1")
+    assert paglet.state.slot_decision["lease_id"] == "lease-1"
+    decide("rejected")
+    assert paglet.state.slot_decision["decision"] == "run_now"
+    assert started == [True, True]
+
+    with paglet.locked_state() as state:
+        state.slot_decision = {}
+        state.slot_lease_id = "lease-2"
+    decide("run_now", "lease-2")
+    decide("run_now", "lease-3")
+
+    assert released == ["lease-3"]
+    assert started == [True, True]
+    assert paglet.state.slot_decision == {}
+
+
 def test_compute_job_default_failure_records_status_and_error():
     paglet = DemoComputePaglet(DemoComputeState())
 
@@ -2,10 +2,15 @@
 # Licensed under the MIT License. See LICENSE for details.
 from __future__ import annotations
 
+import random
+import threading
 import time
+from dataclasses import replace
 from pathlib import Path
 from types import SimpleNamespace
 
+import pytest
+
 from paglets.serialization.codec import dataclass_from_wire, dataclass_to_wire
 from paglets.system.compute_slots import (
     CancelSlotRequestsRequest,
@@ -14,6 +19,7 @@ from paglets.system.compute_slots import (
     CpuAffinityResult,
     SchedulerHostStatus,
     SchedulerStatusRequest,
+    SlotBatchRequest,
     SlotLease,
     SlotReleaseRequest,
 )
@@ -24,12 +30,14 @@ from paglets.system.compute_slots.agent import (
     _can_ever_satisfy,
     _can_run_now,
     _candidate_score,
+    _candidate_scores,
     _current_load_rejection,
-    _directory_usage,
     _elastic_cpu_assignments,
-    _paths_usage,
     _redirect_budget,
+    _run_now_mask,
+    _status_table,
 )
+from paglets.system.compute_slots.usage import DirectoryUsageCache
 
 
 def affinity_result(cpu_core_ids: list[int], *, enforced: bool) -> CpuAffinityResult:
@@ -589,8 +597,10 @@ def test_compute_slot_usage_sums_files_and_directories(tmp_path: Path):
     file_path = tmp_path / "single.bin"
     file_path.write_bytes(b"123")
 
-    assert _directory_usage(work_dir) == {"bytes": 6, "files": 2, "error": ""}
-    assert _paths_usage([str(work_dir), str(file_path), str(tmp_path / "missing")]) == {
+    cache = DirectoryUsageCache(entry_budget=0)
+
+    assert cache.usage(work_dir) == {"bytes": 6, "files": 2, "error": ""}
+    assert cache.paths_usage([str(work_dir), str(file_path), str(tmp_path / "missing")]) == {
         "bytes": 9,
         "files": 3,
         "error": "",
@@ -925,3 +935,240 @@ def test_compute_slot_respects_configurable_grants_per_tick():
     assert sent == ["request-0", "request-1"]
     with agent.locked_state() as state:
         assert state.queued_requests == [dataclass_to_wire(request) for request in requests[2:]]
+
+
+def test_compute_slot_grant_skips_oversized_head_and_leased_owners():
+    big = ComputeSlotRequest(request_id="request-big", agent_id="agent-big", cpu_cores=4)
+    leased = ComputeSlotRequest(request_id="request-leased", agent_id="agent-leased", cpu_cores=1)
+    small = [
+        ComputeSlotRequest(request_id=f"request-{index}", agent_id=f"agent-{index}", cpu_cores=1) for index in range(3)
+    ]
+    lease = SlotLease(
+        lease_id="lease-0",
+        request=replace(leased, request_id="request-earlier"),
+        host_name="alpha",
+        host_url="http://alpha",
+        work_dir_base="/tmp",
+        granted_at=time.time(),
+        expires_at=time.time() + 600,
+    )
+    local = SchedulerHostStatus(
+        host_name="alpha",
+        host_url="http://alpha",
+        observed_at=time.time(),
+        cpu_count_logical=8,
+        memory_total_bytes=16 * 1024**3,
+        work_total_bytes=100 * 1024**3,
+        free_cpu_cores=2,
+        free_memory_bytes=16 * 1024**3,
+        free_temp_storage_bytes=100 * 1024**3,
+    )
+    agent = ComputeSlotsAgent(
+        ComputeSlotsState(
+            queued_requests=[dataclass_to_wire(request) for request in [big, leased, *small]],
+            leases={lease.lease_id: dataclass_to_wire(lease)},
+        )
+    )
+    agent._context = SimpleNamespace(address=local.host_url)  # type: ignore[assignment]
+    agent._local_status = lambda: local  # type: ignore[method-assign]
+
+    assert agent._next_grantable_request(allow_burst=False) == small[0]
+
+    agent._queue_request(replace(small[0], request_id="request-0-retry"))
+    agent._remove_queued_request("request-1")
+
+    assert agent._next_grantable_request(allow_burst=False) == small[2]
+    with agent.locked_state() as state:
+        assert [item["request_id"] for item in state.queued_requests] == [
+            "request-big",
+            "request-leased",
+            "request-2",
+            "request-0-retry",
+        ]
+
+
+def test_compute_slot_loop_wakes_on_release_instead_of_waiting_for_interval():
+    lease = SlotLease(
+        lease_id="lease-0",
+        request=ComputeSlotRequest(request_id="request-0", agent_id="agent-0"),
+        host_name="alpha",
+        host_url="http://alpha",
+        work_dir_base="/tmp",
+        granted_at=time.time(),
+        expires_at=time.time() + 600,
+    )
+    agent = ComputeSlotsAgent(
+        ComputeSlotsState(
+            loop_interval=60.0,
+            gossip_interval=3600.0,
+            grant_interval=60.0,
+            last_gossip_at=time.time(),
+            usage_history_limit=0,
+            leases={lease.lease_id: dataclass_to_wire(lease)},
+        )
+    )
+    passes = threading.Event()
+    agent._expire_leases = lambda: None  # type: ignore[method-assign]
+    agent._cleanup_inactive_leases = lambda: None  # type: ignore[method-assign]
+    agent._rebalance_elastic_affinity = lambda: None  # type: ignore[method-assign]
+    agent._maybe_sample_usage = lambda: None  # type: ignore[method-assign]
+    agent._final_usage_sample = lambda lease: None  # type: ignore[method-assign]
+    agent._grant_queued_requests = passes.set  # type: ignore[method-assign]
+
+    assert 590 < agent._seconds_until_next_pass(time.time() + 900) <= 600
+    with agent.locked_state() as state:
+        state.queued_requests = [dataclass_to_wire(ComputeSlotRequest(request_id="request-1", agent_id="agent-1"))]
+        state.last_grant_at = time.time() - 30
+    assert 25 < agent._seconds_until_next_pass(time.time() + 900) <= 30
+
+    thread = threading.Thread(target=agent._loop, daemon=True)
+    thread.start()
+    try:
+        assert not passes.wait(0.2)
+        agent.release_slot(SlotReleaseRequest(lease_id=lease.lease_id))
+        assert passes.wait(2.0)
+    finally:
+        agent._stop_loop()
+        thread.join(timeout=2.0)
+    assert not thread.is_alive()
+
+
+def test_compute_slot_event_wakes_grant_without_repeating_housekeeping():
+    agent = ComputeSlotsAgent(
+        ComputeSlotsState(
+            loop_interval=60.0,
+            gossip_interval=3600.0,
+            last_gossip_at=time.time(),
+            usage_sample_interval=0.0,
+            usage_history_limit=0,
+        )
+    )
+    calls: list[str] = []
+    grants = threading.Semaphore(0)
+    agent._expire_leases = lambda: calls.append("expire")  # type: ignore[method-assign]
+    agent._cleanup_inactive_leases = lambda: calls.append("cleanup")  # type: ignore[method-assign]
+    agent._rebalance_elastic_affinity = lambda: calls.append("rebalance")  # type: ignore[method-assign]
+    agent._maybe_sample_usage = lambda: None  # type: ignore[method-assign]
+
+    def grant() -> None:
+        calls.append("grant")
+        grants.release()
+
+    agent._grant_queued_requests = grant  # type: ignore[method-assign]
+    thread = threading.Thread(target=agent._loop, daemon=True)
+    thread.start()
+    try:
+        for _ in range(5):
+            agent._wake.set()
+            assert grants.acquire(timeout=2.0)
+        with agent.locked_state() as state:
+            state.leases = {"lease-0": {"expires_at": time.time() - 1.0}}
+        agent._wake.set()
+        assert grants.acquire(timeout=2.0)
+    finally:
+        agent._stop_loop()
+        thread.join(timeout=2.0)
+
+    assert calls == ["grant"] * 5 + ["expire", "grant"]
+
+
+def test_compute_slot_vectorized_ranking_matches_scalar_checks():
+    rng = random.Random(7)
+    tags = ["gpu", "ssd", "fast", "lab"]
+    statuses = [
+        SchedulerHostStatus(
+            host_name=f"host-{index}",
+            host_url=f"http://host-{index}",
+            observed_at=time.time(),
+            supports_gpu_jobs=rng.random() < 0.3,
+            cpu_count_logical=rng.choice([0, 4, 8]),
+            cpu_percent=rng.uniform(0, 100),
+            load_per_cpu=rng.uniform(0, 1.5),
+            memory_total_bytes=rng.choice([0, 16 * 1024**3]),
+            work_total_bytes=rng.choice([0, 100 * 1024**3]),
+            queue_length=rng.randrange(3),
+            host_tags=tuple(rng.sample(tags, rng.randrange(3))),
+            free_cpu_cores=rng.randrange(-1, 5),
+            free_memory_bytes=rng.randrange(0, 8) * 1024**3,
+            free_temp_storage_bytes=rng.randrange(0, 8) * 1024**3,
+            errors=["down"] if rng.random() < 0.1 else [],
+        )
+        for index in range(60)
+    ]
+    table = _status_table()
+    table.sync({status.host_url: dataclass_to_wire(status) for status in statuses})
+    table.sync({status.host_url: dataclass_to_wire(status) for status in statuses[5:]})
+    assert sorted(table.keys) == sorted(status.host_url for status in statuses[5:])
+    assert {status.host_url: status for status in table.records} == {status.host_url: status for status in statuses[5:]}
+
+    for _ in range(40):
+        request = ComputeSlotRequest(
+            cpu_cores=rng.randrange(1, 6),
+            memory_bytes=rng.randrange(0, 6) * 1024**3,
+            temp_storage_bytes=rng.randrange(0, 6) * 1024**3,
+            requires_gpu=rng.random() < 0.2,
+            required_host_tags=tuple(rng.sample(tags, rng.randrange(2))),
+            excluded_host_tags=tuple(rng.sample(tags, rng.randrange(2))),
+            preferred_host_tags=tuple(rng.sample(tags, rng.randrange(3))),
+            excluded_host_names=tuple(f"HOST-{rng.randrange(60)}" for _ in range(rng.randrange(2))),
+        )
+        run_now = _run_now_mask(table, request)
+        scores = _candidate_scores(table, request)
+        for row, status in enumerate(table.records):
+            assert run_now[row] == _can_run_now(status, request)
+            assert scores[row] == pytest.approx(_candidate_score(status, request), abs=1e-6)
+
+
+def test_compute_slot_batch_packs_requests_against_one_capacity_snapshot():
+    now = time.time()
+
+    def status(name: str, *, free_cpu: int, load_per_cpu: float = 0.0) -> SchedulerHostStatus:
+        return SchedulerHostStatus(
+            host_name=name,
+            host_url=f"http://{name}",
+            observed_at=now,
+            cpu_count_logical=8,
+            load_per_cpu=load_per_cpu,
+            memory_total_bytes=16 * 1024**3,
+            work_total_bytes=100 * 1024**3,
+            free_cpu_cores=free_cpu,
+            free_memory_bytes=16 * 1024**3,
+            free_temp_storage_bytes=100 * 1024**3,
+        )
+
+    local = status("alpha", free_cpu=2)
+    peer = status("beta", free_cpu=1)
+    agent = ComputeSlotsAgent(ComputeSlotsState(peer_statuses={peer.host_url: dataclass_to_wire(peer)}))
+    agent._context = SimpleNamespace(address=local.host_url)  # type: ignore[assignment]
+    status_reads: list[bool] = []
+    agent._local_status = lambda: status_reads.append(True) or local  # type: ignore[method-assign]
+    slots = [
+        ComputeSlotRequest(request_id=f"request-{index}", agent_id=f"agent-{index}", cpu_cores=1, memory_bytes=1024)
+        for index in range(4)
+    ]
+    slots.append(ComputeSlotRequest(request_id="request-again", agent_id="agent-0", cpu_cores=1, memory_bytes=1024))
+
+    reply = agent.request_slots_batch(SlotBatchRequest(slots=slots))
+
+    assert [decision.decision for decision in reply.decisions] == ["run_now", "redirect", "sleep", "sleep", "run_now"]
+    assert reply.decisions[1].host_url == peer.host_url
+    assert reply.decisions[4].lease_id == reply.decisions[0].lease_id
+    assert status_reads == [True]
+    with agent.locked_state() as state:
+        assert list(state.leases) == [reply.decisions[0].lease_id]
+        assert [item["request_id"] for item in state.queued_requests] == ["request-2", "request-3"]
+
+    placing = ComputeSlotsAgent(ComputeSlotsState())
+    placing._context = SimpleNamespace(address=local.host_url)  # type: ignore[assignment]
+    statuses = [local, status("beta", free_cpu=1), status("gamma", free_cpu=1, load_per_cpu=0.5)]
+    placing._collect_statuses = lambda max_age: {item.host_url: item for item in statuses}  # type: ignore[method-assign]
+    sent: list[tuple[str, str]] = []
+    placing._send_decision = lambda request, reply: sent.append((request.agent_id, reply.host_url)) or True  # type: ignore[method-assign]
+
+    reply = placing.request_slots_batch(SlotBatchRequest(slots=slots[:3], allow_local=False, notify_agents=True))
+
+    assert [decision.host_url for decision in reply.decisions] == ["http://beta", "http://gamma", "http://beta"]
+    assert all(
+        decision.decision == "redirect" and not decision.redirected_from_host_url for decision in reply.decisions
+    )
+    assert sent == [("agent-0", "http://beta"), ("agent-1", "http://gamma"), ("agent-2", "http://beta")]
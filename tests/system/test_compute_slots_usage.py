@@ -0,0 +1,61 @@
+# Copyright (c) 2026 by C. Klukas.
+# Licensed under the MIT License. See LICENSE for details.
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from types import SimpleNamespace
+
+import paglets.system.compute_slots.usage as usage
+from paglets.system.compute_slots.usage import DirectoryUsageCache, UsageSampler
+
+
+def test_directory_usage_cache_rescans_changed_directories_within_budget(tmp_path: Path, monkeypatch):
+    work_dir = tmp_path / "work"
+    nested = work_dir / "nested"
+    nested.mkdir(parents=True)
+    (work_dir / "a.bin").write_bytes(b"1234")
+    (nested / "b.bin").write_bytes(b"12")
+    scanned: list[str] = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(usage.os, "scandir", lambda path: scanned.append(str(path)) or real_scandir(path))
+    cache = DirectoryUsageCache(entry_budget=1)
+
+    assert cache.usage(work_dir) == {"bytes": 6, "files": 2, "error": ""}
+    assert len(scanned) == 2
+
+    scanned.clear()
+    (nested / "c.bin").write_bytes(b"123")
+    os.utime(nested, ns=(1, 1))
+    assert cache.usage(work_dir) == {"bytes": 9, "files": 3, "error": ""}
+    assert scanned == [str(nested)]
+
+    scanned.clear()
+    (work_dir / "a.bin").write_bytes(b"123456")
+    assert cache.usage(work_dir)["bytes"] == 11
+    assert scanned == [str(work_dir)]
+
+    scanned.clear()
+    cache.retain([str(tmp_path / "other")])
+    assert cache.usage(work_dir, entry_budget=0) == {"bytes": 11, "files": 3, "error": ""}
+    assert sorted(scanned) == [str(work_dir), str(nested)]
+
+
+def test_usage_sampler_sums_process_tree_from_one_proc_table_read(tmp_path: Path):
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    for pid, ppid, rss_pages in [(10, 1, 3), (11, 10, 2), (12, 11, 1), (13, 1, 7)]:
+        (tmp_path / str(pid)).mkdir()
+        fields = " ".join(["0"] * 19)
+        (tmp_path / str(pid) / "stat").write_text(f"{pid} (worker (x)) S {ppid} {fields} {rss_pages} 0 0\n")
+    sampler = UsageSampler(proc_root=tmp_path)
+
+    sampler.begin()
+    assert sampler.process_tree_memory(SimpleNamespace(pid=10)) == {  # type: ignore[arg-type]
+        "process_count": 3,
+        "rss_bytes": 6 * page_size,
+    }
+    (tmp_path / "12" / "stat").unlink()
+    assert sampler.process_tree_memory(SimpleNamespace(pid=11))["process_count"] == 2  # type: ignore[arg-type]
+
+    sampler.begin()
+    assert sampler.process_tree_memory(SimpleNamespace(pid=11))["process_count"] == 1  # type: ignore[arg-type]
@@ -2,13 +2,28 @@
 # Licensed under the MIT License. See LICENSE for details.
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import array
+import gc
+from dataclasses import dataclass, field, make_dataclass
+from enum import Enum
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import pytest
 
 from paglets.core.errors import SerializationError
-from paglets.serialization.codec import dataclass_from_wire, dataclass_to_wire, qualified_name, resolve_qualified_name
+from paglets.serialization.codec import (
+    _CODEC_PLANS,
+    clear_codec_plans,
+    codec_plan,
+    dataclass_from_wire,
+    dataclass_to_wire,
+    qualified_name,
+    resolve_qualified_name,
+)
+
+if TYPE_CHECKING:
+    from decimal import Decimal
 
 
 @dataclass
@@ -88,3 +103,125 @@ def test_binary_state_round_trip_from_json_projection():
 
     assert restored.raw == b"\x00payload"
     assert restored.mutable == bytearray(b"\x01mutable")
+
+
+@dataclass
+class BufferState:
+    samples: array.array
+    view: memoryview | None = None
+
+
+def test_typed_buffer_fields_stay_contiguous_and_restore_from_json_tags():
+    samples = array.array("d", [0.25, 1.5, -3.0])
+    state = BufferState(samples=samples, view=memoryview(b"raw"))
+
+    wire = dataclass_to_wire(state)
+    restored = dataclass_from_wire(BufferState, wire)
+    from_json = dataclass_from_wire(
+        BufferState,
+        {"samples": {"__paglets_binary__": "array", "typecode": "d", "base64": "AAAAAAAA0D8AAAAAAAD4PwAAAAAAAAjA"}},
+    )
+
+    assert wire["samples"] == samples and wire["samples"] is not samples
+    assert wire["view"] == b"raw"
+    assert restored.samples == samples
+    assert bytes(restored.view) == b"raw"
+    assert from_json.samples == samples
+    assert dataclass_from_wire(BufferState, {"samples": [1, 2]}).samples == array.array("q", [1, 2])
+
+
+class Color(Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+@dataclass
+class TreeNode:
+    label: str
+    children: list[TreeNode] = field(default_factory=list)
+
+
+@dataclass
+class TypedState:
+    color: Color = Color.RED
+    counts: dict[int, float] = field(default_factory=dict)
+    pair: tuple[int, ...] = ()
+    either: int | str | None = None
+    any_value: Any = None
+
+
+def test_codec_plan_is_cached_per_class_identity():
+    plan = codec_plan(ComplexState)
+
+    assert codec_plan(ComplexState) is plan
+
+    @dataclass
+    class ComplexState2:
+        name: str
+
+    assert codec_plan(ComplexState2) is not plan
+    clear_codec_plans()
+    assert codec_plan(ComplexState) is not plan
+
+
+def test_codec_plan_is_released_with_its_dataclass():
+    gc.collect()
+    before = len(_CODEC_PLANS)
+    node_type = make_dataclass("Node", [("value", int), ("next", Any, field(default=None))])
+    node_type.__annotations__["next"] = node_type | None
+    holder_type = make_dataclass("Holder", [("head", node_type), ("nodes", list[node_type])])
+    holder = holder_type(node_type(1, node_type(2)), [node_type(3)])
+
+    assert dataclass_from_wire(holder_type, dataclass_to_wire(holder)) == holder
+    assert len(_CODEC_PLANS) == before + 2
+
+    del holder, holder_type, node_type
+    gc.collect()
+    assert len(_CODEC_PLANS) == before
+
+
+def test_codec_plan_round_trips_recursive_and_typed_fields():
+    tree = TreeNode("root", [TreeNode("a"), TreeNode("b", [TreeNode("c")])])
+    typed = TypedState(
+        color=Color.BLUE,
+        counts={1: 0.5, 2: 1.5},
+        pair=(1, 2, 3),
+        either="text",
+        any_value={"raw": b"\x00"},
+    )
+
+    assert dataclass_from_wire(TreeNode, dataclass_to_wire(tree)) == tree
+    wire = dataclass_to_wire(typed)
+    assert wire["color"] == "blue"
+    assert wire["counts"] == {"1": 0.5, "2": 1.5}
+    assert wire["pair"] == [1, 2, 3]
+    assert dataclass_from_wire(TypedState, wire) == typed
+    assert dataclass_from_wire(TypedState, {"either": 7}).either == 7
+    assert dataclass_from_wire(TypedState, {"either": None}).either is None
+
+
+@dataclass
+class UnionState:
+    v: Nested | str = "plain"
+    w: Nested | list[int] | None = None
+
+
+@dataclass
+class CheckOnlyHintState:
+    x: int = 1
+    d: Decimal | None = None
+
+
+def test_union_with_dataclass_option_keeps_non_dict_values():
+    restored = dataclass_from_wire(UnionState, {"v": "hello", "w": [1, 2]})
+
+    assert restored == UnionState(v="hello", w=[1, 2])
+    assert dataclass_from_wire(UnionState, {"v": {"count": 3}, "w": {"count": 4}}) == UnionState(
+        v=Nested(3), w=Nested(4)
+    )
+
+
+def test_encoding_does_not_need_resolvable_type_hints():
+    assert dataclass_to_wire(CheckOnlyHintState()) == {"x": 1, "d": None}
+    with pytest.raises(NameError):
+        dataclass_from_wire(CheckOnlyHintState, {"x": 2})